@@ -0,0 +1,345 @@
+"""
+PRICE ALERTS
+- Rules: "BTC above 70000", "gold below 2000", "TSLA move 3%"
+- Har symbol ke sorted threshold lists (upar jaane wale aur neeche jaane wale alag)
+- Price a -> b: bisect range query se sirf wahi rules jo cross hue (baaki ko chhuna nahi)
+- Move % rule = reference ke upar/neeche do thresholds; fire ke baad naye price pe re-anchor
+- Dedup (ek rule ek crossing pe ek hi baar) aur cooldown; callback ya chat queue se deliver
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from paths import data_dir
+from quotes import is_demo, quote_price
+
+DEFAULT_PATH = os.path.join(data_dir(), 'alerts.json')
+
+ABOVE = 'above'
+BELOW = 'below'
+MOVE = 'move'
+KINDS = (ABOVE, BELOW, MOVE)
+
+# Repeat wale rules dobara itne seconds baad hi fire hote hain
+DEFAULT_COOLDOWN = 300.0
+
+# Chat queue itne events se zyada nahi rakhti
+MAX_PENDING = 1000
+
+
+def _num(x: float) -> str:
+    """70,000.00 / 1.0952 / 0.00001234"""
+    return f"{x:,.2f}" if abs(x) >= 100 else f"{x:.6g}"
+
+
+class AlertRule:
+    """Ek alert rule"""
+    
+    __slots__ = ('id', 'symbol', 'asset_class', 'label', 'kind', 'level', 'ref', 'repeat', 'cooldown',
+                 'last_fired', 'fired', 'active', 'created')
+    
+    def __init__(self, rule_id: int, symbol: str, kind: str, level: float, label: str = '',
+                 ref: Optional[float] = None, repeat: bool = False, cooldown: float = DEFAULT_COOLDOWN,
+                 created: Optional[float] = None, asset_class: str = ''):
+        self.id = rule_id
+        self.symbol = symbol
+        self.asset_class = asset_class
+        self.label = label or symbol.upper()
+        self.kind = kind
+        # above/below: price level; move: % (ref price ke hisaab se)
+        self.level = level
+        self.ref = ref
+        self.repeat = repeat
+        self.cooldown = cooldown
+        self.last_fired = 0.0
+        self.fired = 0
+        self.active = True
+        self.created = time.time() if created is None else created
+    
+    def thresholds(self) -> List[Tuple[str, float]]:
+        """(direction, level) - index mein yahi jaate hain"""
+        if self.kind == ABOVE:
+            return [(ABOVE, self.level)]
+        if self.kind == BELOW:
+            return [(BELOW, self.level)]
+        if self.ref is None:
+            return []
+        move = self.ref * self.level / 100.0
+        return [(ABOVE, self.ref + move), (BELOW, self.ref - move)]
+    
+    def describe(self) -> str:
+        if self.kind == MOVE:
+            return f"{self.label} {self.level:g}% move"
+        return f"{self.label} {self.kind} {_num(self.level)}"
+    
+    def to_json(self) -> Dict:
+        return {'id': self.id, 'symbol': self.symbol, 'asset_class': self.asset_class,
+                'label': self.label, 'kind': self.kind,
+                'level': self.level, 'ref': self.ref, 'repeat': self.repeat,
+                'cooldown': self.cooldown, 'last_fired': self.last_fired, 'fired': self.fired,
+                'created': self.created}
+
+
+class _SymbolIndex:
+    """Ek symbol ke thresholds: levels sorted, ids parallel"""
+    
+    __slots__ = ('up_levels', 'up_ids', 'down_levels', 'down_ids', 'last_price')
+    
+    def __init__(self):
+        self.up_levels: List[float] = []
+        self.up_ids: List[int] = []
+        self.down_levels: List[float] = []
+        self.down_ids: List[int] = []
+        self.last_price: Optional[float] = None
+    
+    def _lists(self, direction: str) -> Tuple[List[float], List[int]]:
+        return (self.up_levels, self.up_ids) if direction == ABOVE else (self.down_levels, self.down_ids)
+    
+    def insert(self, direction: str, level: float, rule_id: int):
+        levels, ids = self._lists(direction)
+        i = bisect_right(levels, level)
+        levels.insert(i, level)
+        ids.insert(i, rule_id)
+    
+    def remove(self, direction: str, level: float, rule_id: int):
+        levels, ids = self._lists(direction)
+        i = bisect_left(levels, level)
+        while i < len(levels) and levels[i] == level:
+            if ids[i] == rule_id:
+                del levels[i]
+                del ids[i]
+                return
+            i += 1
+    
+    def crossed(self, old: float, new: float) -> List[int]:
+        """old -> new mein cross hue rule ids (sirf range slice)"""
+        if new > old:
+            # Upar gaya: old < level <= new
+            return self.up_ids[bisect_right(self.up_levels, old):bisect_right(self.up_levels, new)]
+        if new < old:
+            # Neeche gaya: new <= level < old
+            return self.down_ids[bisect_left(self.down_levels, new):bisect_left(self.down_levels, old)]
+        return []
+    
+    def __len__(self) -> int:
+        return len(self.up_ids) + len(self.down_ids)
+
+
+class AlertEngine:
+    """
+    Indexed alert rules. on_quote() QuoteCache listener hai.
+    Fire hue alerts on_alert callback ko jaate hain aur pending queue mein (chat drain() karta hai).
+    """
+    
+    def __init__(self, on_alert: Optional[Callable[[Dict], None]] = None, path: Optional[str] = None):
+        self.on_alert = on_alert
+        self.path = path
+        self.rules: Dict[int, AlertRule] = {}
+        self._index: Dict[str, _SymbolIndex] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.pending: deque = deque(maxlen=MAX_PENDING)
+        
+        self.evaluations = 0
+        self.rules_checked = 0
+        self.fired = 0
+        self.suppressed = 0
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def symbols(self) -> List[str]:
+        return [symbol for symbol, index in self._index.items() if len(index)]
+    
+    def watched(self) -> Dict[str, str]:
+        """Active rules ke symbol -> asset_class (refresh ke liye)"""
+        with self._lock:
+            return {rule.symbol: rule.asset_class for rule in self.rules.values()}
+    
+    # ------------------------------------------------------------------ rules
+    
+    def _insert(self, rule: AlertRule):
+        index = self._index.setdefault(rule.symbol, _SymbolIndex())
+        for direction, level in rule.thresholds():
+            index.insert(direction, level, rule.id)
+    
+    def _remove(self, rule: AlertRule):
+        index = self._index.get(rule.symbol)
+        if index is not None:
+            for direction, level in rule.thresholds():
+                index.remove(direction, level, rule.id)
+    
+    def add(self, symbol: str, kind: str, level: float, label: str = '', price: Optional[float] = None,
+            repeat: bool = False, cooldown: float = DEFAULT_COOLDOWN,
+            asset_class: str = '') -> Tuple[AlertRule, bool]:
+        """
+        Naya rule (same symbol/kind/level pehle se ho toh wahi). `price` = abhi ka price:
+        move rules ka reference isi se. Returns (rule, created)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Alert kind {kind!r} nahi chalta (above/below/move)")
+        with self._lock:
+            for rule in self.rules.values():
+                if rule.symbol == symbol and rule.kind == kind and rule.level == level:
+                    return rule, False
+            index = self._index.setdefault(symbol, _SymbolIndex())
+            if price is not None and index.last_price is None:
+                index.last_price = price
+            ref = (price if price is not None else index.last_price) if kind == MOVE else None
+            rule = AlertRule(next(self._ids), symbol, kind, level, label, ref, repeat, cooldown,
+                             asset_class=asset_class)
+            self.rules[rule.id] = rule
+            self._insert(rule)
+            return rule, True
+    
+    def remove(self, rule_id: int) -> bool:
+        with self._lock:
+            rule = self.rules.pop(rule_id, None)
+            if rule is None:
+                return False
+            self._remove(rule)
+            return True
+    
+    def already_true(self, rule: AlertRule) -> bool:
+        """Rule ki condition abhi ke price pe pehle se sach hai? (crossing pe hi fire hota hai)"""
+        index = self._index.get(rule.symbol)
+        price = index.last_price if index is not None else None
+        if price is None:
+            return False
+        return (rule.kind == ABOVE and price >= rule.level) or (rule.kind == BELOW and price <= rule.level)
+    
+    # ------------------------------------------------------------- evaluation
+    
+    def update(self, symbol: str, price: float, now: Optional[float] = None) -> List[Dict]:
+        """Symbol ka naya price - jo rules cross hue unke events"""
+        now = time.time() if now is None else now
+        events = []
+        with self._lock:
+            index = self._index.get(symbol)
+            if index is None:
+                return events
+            old, index.last_price = index.last_price, price
+            self.evaluations += 1
+            # Pehla price sirf base banta hai - crossing ke liye do points chahiye
+            if old is None:
+                return events
+            
+            crossed = index.crossed(old, price)
+            self.rules_checked += len(crossed)
+            # Ek move rule ke dono thresholds ek tick mein nahi aa sakte, par dedup phir bhi
+            for rule_id in dict.fromkeys(crossed):
+                rule = self.rules.get(rule_id)
+                if rule is None or not rule.active:
+                    continue
+                if rule.repeat and now - rule.last_fired < rule.cooldown:
+                    self.suppressed += 1
+                    continue
+                events.append(self._fire(rule, old, price, now))
+        
+        for event in events:
+            self.pending.append(event)
+            if self.on_alert is not None:
+                try:
+                    self.on_alert(event)
+                except Exception:
+                    pass
+        if events:
+            self.save()
+        return events
+    
+    def _fire(self, rule: AlertRule, old: float, price: float, now: float) -> Dict:
+        """Event banaye aur rule ki state aage badhaye (lock ke andar)"""
+        if rule.kind == MOVE:
+            change = (price / rule.ref - 1) * 100 if rule.ref else 0.0
+            message = f"{rule.label} {change:+.2f}% hila ({_num(rule.ref)} -> {_num(price)})"
+        else:
+            word = 'upar' if rule.kind == ABOVE else 'neeche'
+            message = f"{rule.label} {_num(rule.level)} ke {word} gaya (ab {_num(price)})"
+        event = {'id': rule.id, 'symbol': rule.symbol, 'label': rule.label, 'kind': rule.kind,
+                 'level': rule.level, 'previous': old, 'price': price, 'ts': now, 'message': message}
+        
+        rule.last_fired = now
+        rule.fired += 1
+        self.fired += 1
+        if rule.kind == MOVE:
+            # Naye price se agla move naapa jaata hai
+            self._remove(rule)
+            rule.ref = price
+            self._insert(rule)
+        elif not rule.repeat:
+            # One-shot: index se hata do, dobara kabhi nahi
+            rule.active = False
+            self._remove(rule)
+            del self.rules[rule.id]
+        return event
+    
+    def on_quote(self, provider: str, symbol: str, asset_class: str, value: Dict):
+        """QuoteCache listener (demo/simulated fallback quotes pe alert nahi)"""
+        if symbol in self._index and not is_demo(value):
+            price = quote_price(value)
+            if price is not None:
+                self.update(symbol, price)
+    
+    def drain(self) -> List[Dict]:
+        """Abhi tak ke fired events (chat loop ke liye) - queue khaali"""
+        events = []
+        while self.pending:
+            events.append(self.pending.popleft())
+        return events
+    
+    def stats(self) -> Dict:
+        return {'rules': len(self.rules), 'symbols': len(self.symbols()),
+                'evaluations': self.evaluations, 'rules_checked': self.rules_checked,
+                'fired': self.fired, 'suppressed': self.suppressed}
+    
+    # ------------------------------------------------------------- persistence
+    
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            data = {'rules': [rule.to_json() for rule in self.rules.values()],
+                    'prices': {symbol: index.last_price for symbol, index in self._index.items()
+                               if index.last_price is not None}}
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH, on_alert: Optional[Callable[[Dict], None]] = None) -> 'AlertEngine':
+        """File se rules (na ho ya kharab ho toh khaali engine)"""
+        engine = cls(on_alert, path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return engine
+        last_id = 0
+        for row in data.get('rules', []):
+            rule = AlertRule(row['id'], row['symbol'], row['kind'], row['level'], row.get('label', ''),
+                             row.get('ref'), row.get('repeat', False),
+                             row.get('cooldown', DEFAULT_COOLDOWN), row.get('created'),
+                             row.get('asset_class', ''))
+            rule.last_fired = row.get('last_fired', 0.0)
+            rule.fired = row.get('fired', 0)
+            engine.rules[rule.id] = rule
+            engine._insert(rule)
+            last_id = max(last_id, rule.id)
+        # Restart ke beech ka crossing bhi pakda jaye - aakhri dekha price wapas
+        for symbol, price in data.get('prices', {}).items():
+            if symbol in engine._index:
+                engine._index[symbol].last_price = price
+        engine._ids = itertools.count(last_id + 1)
+        return engine
@@ -6,61 +6,340 @@ SIMPLE CONVERSATIONAL TRADING BOT
 - Simple interface
 """
 
-import requests
 import json
+import os
+import re
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from history import ConversationHistory, TIME_RE, parse_clock
+from metrics import Metrics
+from profiler import DEFAULT_DIR as PROFILE_DIR, MODES as PROFILE_MODES, Profiler
+from profiler import format_report as format_profile
+from quote_cache import QuoteCache
+from quote_stream import QuoteHub, Subscription
+from quotes import ASSET_CLASS_CODES, Quote, QuoteBatch, SymbolTable, is_demo
+from scheduler import RefreshScheduler, default_buckets
+from snapshot import Snapshot
+from symbol_resolver import STOPWORDS, SymbolResolver, crypto_ticker, tokenize
+
+# Network stack (requests) aur numpy pehli zaroorat pe import hote hain -
+# headless ek-quote run ka startup isi se fast rehta hai
+if TYPE_CHECKING:
+    from alerts import AlertEngine
+    from autocomplete import Suggestion
+    from bar_store import BarStore
+    from fx import FxEngine
+    from indicators import IndicatorEngine
+    from orderbook import BookFeed, OrderBookManager, StandInExchange
+    from portfolio import Portfolio
+    from simulator import MarketSimulator
+    from transport import Transport
+
+# Commodity -> (naam, unit, Yahoo futures symbol); Yahoo na mile toh simulator ke GOLD/SILVER/OIL se
+COMMODITIES = {
+    'gold': ('Gold', 'per ounce', 'GC=F'),
+    'silver': ('Silver', 'per ounce', 'SI=F'),
+    'oil': ('Crude Oil', 'per barrel', 'CL=F'),
+}
+
+# Breaker state -> gauge value
+BREAKER_STATES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+# Display ke liye
+ASSET_ICONS = {'crypto': '💰', 'stock': '📈', 'commodity': '⚖️', 'forex': '🌍'}
+CURRENCY_SIGNS = {'USD': '$', 'INR': '₹', 'EUR': '€', 'GBP': '£', 'JPY': '¥',
+                  'CAD': 'C$', 'AUD': 'A$', 'SGD': 'S$', 'HKD': 'HK$'}
+
+# Resolver ko na pata ek-shabd query - coin id / ticker jaisi ho tabhi andaza lagate hain
+GUESS_RE = re.compile(r'[a-z][a-z0-9.\-]*')
+
+# "what did BTC show at 10:00" mein se ye words symbol nahi hain
+RECALL_WORDS = {'what', 'did', 'does', 'show', 'showed', 'was', 'at', 'pe', 'par', 'tha',
+                'thi', 'kya', 'kitna', 'kitni', 'price', 'rate', '@'}
+
+# "buy BTC 0.5 @ 65000 sl 60000 tgt 80000" / "short TSLA 10 sl 260"
+POSITION_RE = re.compile(
+    r'^(buy|short)\s+(.+?)\s+(\d+(?:\.\d+)?)(?:\s*@\s*(\d+(?:\.\d+)?))?'
+    r'(?:\s+sl\s+(\d+(?:\.\d+)?))?(?:\s+(?:tgt|target)\s+(\d+(?:\.\d+)?))?\s*$',
+    re.IGNORECASE
+)
+
+# "alert BTC above 70000" / "alert gold neeche 2000" / "alert TSLA 3%" / "alert TSLA move 3"
+ALERT_RE = re.compile(
+    r'^alert\s+(.+?)\s+(?:(above|upar|over|below|neeche|under|move)\s+)?(\d+(?:\.\d+)?)\s*(%?)\s*$',
+    re.IGNORECASE
+)
+ALERT_KINDS = {'above': 'above', 'upar': 'above', 'over': 'above',
+               'below': 'below', 'neeche': 'below', 'under': 'below', 'move': 'move'}
+
+# Alert wale symbols scheduler itne seconds pe fresh rakhta hai (lease ke saath)
+ALERT_REFRESH = 30.0
+ALERT_LEASE = 3600.0
+
+# "book BTC" / "depth ETH/USDT 5" - consolidated order book aur itne size ki slippage
+BOOK_RE = re.compile(r'^(?:book|depth)\s+(\S+)(?:\s+(\d+(?:\.\d+)?))?\s*$', re.IGNORECASE)
+
+# ccxt REST books itne seconds pe (stand-in exchanges diffs stream karte hain);
+# pehli baar books ka itna intezaar
+BOOK_REFRESH = 2.0
+BOOK_WAIT = 5.0
+
+def format_age(seconds: float) -> str:
+    """45s / 12 min / 3 ghante"""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} ghante"
+
+def format_money(amount: float, currency: str = 'USD', decimals: int = 2) -> str:
+    """$1,234.50 / ₹83.00 / CAD12.00"""
+    return f"{CURRENCY_SIGNS.get(currency, currency)}{amount:,.{decimals}f}"
 
 class SimpleTradingBot:
     """Bas baat karne wala simple bot"""
     
-    def __init__(self, name="DeepSeek"):
+    # API endpoints (benchmark ya replay server ke liye badle ja sakte hain)
+    COINGECKO_BASE = os.environ.get('COINGECKO_BASE', 'https://api.coingecko.com')
+    YAHOO_BASE = os.environ.get('YAHOO_BASE', 'https://query1.finance.yahoo.com')
+    HTTP_TIMEOUT = 5
+    # Rate limit ka token na ho toh user ki call itna hi ruke, phir fallback
+    RATE_LIMIT_WAIT = 0.5
+    # Pehla FX refresh user ke saamne hota hai - itne seconds se zyada nahi
+    FX_TIMEOUT = 2
+    # v7 quote batch 401/403 de toh itne seconds tak seedha v8 chart
+    YAHOO_BATCH_RETRY = 600
+    
+    def __init__(self, name="DeepSeek", cache: Optional[QuoteCache] = None,
+                 concurrent: bool = False, resolver: Optional[SymbolResolver] = None,
+                 transport: Optional['Transport'] = None, bar_store: Optional['BarStore'] = None,
+                 metrics: Optional[Metrics] = None, quiet: bool = False,
+                 history: Optional[ConversationHistory] = None, snapshot: Optional[Snapshot] = None):
         self.name = name
-        self.conversation = []
-        print(f"\n🤖 {self.name}: Namaste! Main aapka simple trading bot hun.")
-        print("Mujhse kisi bhi asset ke baare mein poochiye!")
+        # Bounded history - purane records disk log mein, symbol/time index ke saath
+        self.conversation = history if history is not None else ConversationHistory()
+        self.quiet = quiet
+        self.cache = cache if cache is not None else QuoteCache()
+        
+        # Warm start: pichhle run ke quotes aur resolver trie (TRADING_BOT_SNAPSHOT=0 se band)
+        if snapshot is None and os.environ.get('TRADING_BOT_SNAPSHOT', '1') != '0':
+            snapshot = Snapshot()
+        self.snapshot = snapshot
+        self.resolver = resolver if resolver is not None else SymbolResolver.default(snapshot)
+        self._transport = transport
+        # Provider rate limits - transport aur refresh scheduler dono yahi buckets use karte hain
+        self.rate_limits = default_buckets()
+        self._scheduler: Optional[RefreshScheduler] = None
+        self._bars = bar_store
+        self._indicators: Optional['IndicatorEngine'] = None
+        self._fx: Optional['FxEngine'] = None
+        self._portfolio: Optional['Portfolio'] = None
+        self._alerts: Optional['AlertEngine'] = None
+        self._simulator: Optional['MarketSimulator'] = None
+        self._books: Optional['OrderBookManager'] = None
+        # Exchange -> feed thread (us exchange ke saare pairs); ccxt na ho toh stand-in exchanges
+        self._book_feeds: Dict[str, 'BookFeed'] = {}
+        self._stand_ins: Dict[str, 'StandInExchange'] = {}
+        self._book_lock = threading.Lock()
+        self._fx_attempted = 0.0
+        self._yahoo_batch_denied = 0.0
+        self._fx_lock = threading.Lock()
+        # Asli rates aa chuke hon toh baad ke refresh background mein (headless CLI mein nahi)
+        self.fx_background = True
+        # Batch/response prices is currency mein bhi dikhte hain ("currency INR" se badle)
+        self.display_currency = os.environ.get('TRADING_BOT_CURRENCY', 'USD').upper()
+        
+        # TRADING_BOT_METRICS=0 se instrumentation band (timers no-op ho jaate hain)
+        self.metrics = metrics if metrics is not None else Metrics(
+            enabled=os.environ.get('TRADING_BOT_METRICS', '1') != '0'
+        )
+        self.metrics.add_collector(self._collect_gauges)
+        
+        # TRADING_BOT_PROFILE=1 (ya 'cprofile') se har query profile hoti hai; chat mein 'profile on/off'
+        profile = os.environ.get('TRADING_BOT_PROFILE', '0')
+        self.profiler = Profiler(enabled=profile != '0', mode=profile if profile in PROFILE_MODES else 'sample',
+                                 out_dir=os.environ.get('TRADING_BOT_PROFILE_DIR', PROFILE_DIR))
+        
+        # Snapshot ke quotes cache mein - pehla jawab turant, refresh peeche
+        self.warm_quotes = 0
+        if snapshot is not None:
+            try:
+                self.warm_quotes = snapshot.load_quotes(self.cache)
+                snapshot.autosave(self.cache)
+            except Exception as e:
+                self.metrics.record_error('snapshot', e, stage='load')
+        
+        # concurrent=True: barabar ke candidates (ties, typo, andaze) ek saath chalte hain
+        self.concurrent = concurrent
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hub: Optional[QuoteHub] = None
+        self._symbols = SymbolTable()
+        if not quiet:
+            print(f"\n🤖 {self.name}: Namaste! Main aapka simple trading bot hun.")
+            print("Mujhse kisi bhi asset ke baare mein poochiye!")
+            if self.warm_quotes:
+                print(f"({self.warm_quotes} pichhle quotes snapshot se load hue)")
+    
+    @property
+    def transport(self) -> 'Transport':
+        """HTTP transport - pehli network call pe banta hai"""
+        if self._transport is None:
+            from transport import Transport
+            self._transport = Transport(rate_limits=self.rate_limits, acquire_timeout=self.RATE_LIMIT_WAIT)
+        return self._transport
+    
+    @property
+    def scheduler(self) -> RefreshScheduler:
+        """Background refresh scheduler (watched symbols ko rate limit ke andar fresh rakhta hai)"""
+        if self._scheduler is None:
+            # Token transport leta hai, scheduler bas bucket dekh ke wait karta hai
+            self._scheduler = RefreshScheduler(self._refresh_batch, self.rate_limits, take_tokens=False)
+        return self._scheduler
+    
+    @property
+    def bars(self) -> 'BarStore':
+        """Minute bar store - pehli zaroorat pe banta hai"""
+        if self._bars is None:
+            from bar_store import BarStore
+            self._bars = BarStore()
+        return self._bars
+    
+    @property
+    def indicators(self) -> 'IndicatorEngine':
+        """Indicator engine (bars ke upar)"""
+        if self._indicators is None:
+            from indicators import IndicatorEngine
+            self._indicators = IndicatorEngine(self.bars)
+        return self._indicators
+    
+    @property
+    def fx(self) -> 'FxEngine':
+        """Cross-rate engine - shuru mein reference rates, refresh_fx se asli"""
+        if self._fx is None:
+            from fx import FxEngine
+            self._fx = FxEngine()
+        return self._fx
+    
+    @property
+    def simulator(self) -> 'MarketSimulator':
+        """Offline fallback market (seeded GBM) - TRADING_BOT_SIM_SEED se seed"""
+        if self._simulator is None:
+            from simulator import DEFAULT_SEED, MarketSimulator
+            self._simulator = MarketSimulator(int(os.environ.get('TRADING_BOT_SIM_SEED', DEFAULT_SEED)))
+        return self._simulator
+    
+    def simulated_quote(self, symbol: str, asset_class: str) -> Dict:
+        """Simulator ka quote - clock pehle wall time tak aage badhta hai"""
+        self.simulator.sync()
+        return self.simulator.quote(symbol, asset_class)
+    
+    @property
+    def order_books(self) -> 'OrderBookManager':
+        """Exchanges ki L2 books + consolidated book (feeds 'book BTC' pe chalu hoti hain)"""
+        if self._books is None:
+            from orderbook import OrderBookManager
+            self._books = OrderBookManager()
+        return self._books
+    
+    @property
+    def portfolio(self) -> 'Portfolio':
+        """Positions ki book (data/portfolio.json) - har naye quote pe cache listener se reprice"""
+        if self._portfolio is None:
+            from portfolio import DEFAULT_PATH, Portfolio
+            options = {}
+            if os.environ.get('TRADING_BOT_CAPITAL'):
+                options['capital'] = float(os.environ['TRADING_BOT_CAPITAL'])
+            portfolio = Portfolio.load(os.environ.get('TRADING_BOT_PORTFOLIO', DEFAULT_PATH), **options)
+            if any(currency != portfolio.base_currency for currency in portfolio.currencies):
+                portfolio.apply_fx(self.fx)
+            self.cache.add_listener(portfolio.on_quote)
+            self._portfolio = portfolio
+        return self._portfolio
+    
+    @property
+    def alerts(self) -> 'AlertEngine':
+        """Price alerts (data/alerts.json) - cache listener har naye quote pe crossings dekhta hai"""
+        if self._alerts is None:
+            from alerts import DEFAULT_PATH, AlertEngine
+            engine = AlertEngine.load(os.environ.get('TRADING_BOT_ALERTS', DEFAULT_PATH), self._on_alert)
+            self.cache.add_listener(engine.on_quote)
+            self._alerts = engine
+            self.watch_alerts()
+        return self._alerts
+    
+    def _on_alert(self, event: Dict):
+        self.metrics.inc('alerts_fired_total', kind=event['kind'])
+    
+    def watch_alerts(self):
+        """Alert wale network symbols scheduler ko (lease renew) - bina chat ke bhi crossing pakdi jaye"""
+        for symbol, asset_class in self.alerts.watched().items():
+            provider = {'crypto': 'coingecko', 'stock': 'yahoo'}.get(asset_class)
+            if provider is not None:
+                self.scheduler.watch(provider, symbol, ALERT_REFRESH, lease=ALERT_LEASE)
+    
+    def refresh_fx(self, wait: Optional[bool] = None) -> bool:
+        """
+        Rates purane hon toh Yahoo se saari USD pairs ek call mein.
+        Pehli baar (abhi sirf reference rates) yahin, FX_TIMEOUT ke andar; baad mein purane hue toh
+        background mein, tab tak pichhle rates. `wait` ye chunaav override karta hai.
+        Fail ho toh 60s tak dobara try nahi.
+        """
+        fx = self.fx
+        if not fx.is_stale() or time.time() - self._fx_attempted < 60:
+            return False
+        if wait is None:
+            wait = not (fx.updated_at and self.fx_background)
+        if not wait:
+            threading.Thread(target=self.refresh_fx, args=(True,), name='fx-refresh', daemon=True).start()
+            return False
+        if not self._fx_lock.acquire(blocking=False):
+            return False
+        try:
+            self._fx_attempted = time.time()
+            from fx import yahoo_fx_symbols
+            with self.metrics.timer('stage_latency_ms', stage='fetch', provider='fx'):
+                quotes = self.fetch_yahoo_quotes(yahoo_fx_symbols(fx.currencies),
+                                                 timeout=min(self.FX_TIMEOUT, self.HTTP_TIMEOUT))
+            return bool(quotes) and fx.load_yahoo_quotes(quotes) > 0
+        except Exception as e:
+            self.metrics.record_error('fx', e)
+            return False
+        finally:
+            self._fx_lock.release()
     
     def get_current_time(self):
         """Current time bataye"""
         now = datetime.now()
         return now.strftime("%H:%M:%S")
     
-    def search_asset(self, query: str) -> Dict:
-        """Deep search kare asset ke baare mein"""
+    def search_asset(self, query: str, concurrent: Optional[bool] = None) -> Dict:
+        """Deep search kare asset ke baare mein (profiler on ho toh profiled)"""
+        if self.profiler.enabled:
+            return self.profiler.call(f"search {query}", self._search_asset, query, concurrent)
+        return self._search_asset(query, concurrent)
+    
+    def _search_asset(self, query: str, concurrent: Optional[bool] = None) -> Dict:
         try:
-            print(f"🔍 Searching for: {query}...")
-            
-            # Different APIs try karte hain
-            results = {}
-            
-            # 1. Pehle crypto check karte hain
-            crypto_data = self.get_crypto_data(query)
-            if crypto_data.get('success'):
-                return crypto_data
-            
-            # 2. Phir stock check
-            stock_data = self.get_stock_data(query)
-            if stock_data.get('success'):
-                return stock_data
+            if not self.quiet:
+                print(f"🔍 Searching for: {query}...")
             
-            # 3. Phir commodity
-            commodity_data = self.get_commodity_data(query)
-            if commodity_data.get('success'):
-                return commodity_data
+            # Resolver pehle batata hai kaunsa provider - sirf wahi call hoga
+            with self.metrics.timer('stage_latency_ms', stage='resolve'):
+                matches = self.resolver.matches(query)
+            if len(matches) == 1:
+                asset_class, symbol = matches[0]
+                return self.get_quote(asset_class, symbol, query)
+            if matches:
+                # Barabar ke match ("bitcoin ya apple") - pehla live quote priority se, warna pehle wale ka
+                return self._first_success([(asset_class, symbol, query, True)
+                                            for asset_class, symbol in matches], concurrent)[1]
             
-            # 4. Last mein forex
-            forex_data = self.get_forex_data(query)
-            if forex_data.get('success'):
-                return forex_data
-            
-            # Agar kuch nahi mila toh
-            return {
-                'success': False,
-                'error': f"{query} ka data nahi mila",
-                'suggestion': "Kripya asset ka sahi naam likhein"
-            }
+            return self._search_unplaced(query, concurrent)
             
         except Exception as e:
             return {
@@ -68,109 +347,501 @@ class SimpleTradingBot:
                 'error': f"Search error: {str(e)}"
             }
     
-    def get_crypto_data(self, query: str) -> Dict:
-        """Crypto data laaye"""
+    def _search_unplaced(self, query: str, concurrent: Optional[bool] = None) -> Dict:
+        """
+        Resolver ko nahi pata: typo correction (pakka ho toh) aur ek-shabd query ke liye
+        ticker/coin id ka andaza. Andaze ka sirf live quote maana jaata hai, demo nahi
+        """
+        jobs = []
+        correction = self._correction(query)
+        if correction is not None:
+            jobs.append((correction.asset_class, correction.symbol, correction.phrase, False))
+        
+        # Ek shabd ("pepe", "infy.ns") - CoinGecko id ya Yahoo ticker ho sakta hai
+        words = [t for t in tokenize(query) if t not in STOPWORDS]
+        if len(words) == 1 and GUESS_RE.fullmatch(words[0]):
+            word = words[0]
+            guesses = [('crypto', word)] if '.' not in word else []
+            if len(word) <= 10:
+                guesses.append(('stock', word.upper()))
+            for asset_class, symbol in guesses:
+                if correction is None or (correction.asset_class, correction.symbol) != (asset_class, symbol):
+                    jobs.append((asset_class, symbol, query, True))
+        
+        if jobs:
+            winner, data = self._first_success(jobs, concurrent)
+            if winner == 0 and correction is not None:
+                self.metrics.inc('autocorrections_total')
+                # Cache wala dict share hota hai - copy pe likhte hain
+                return dict(data, corrected_from=query, corrected_to=correction.phrase)
+            if winner >= 0:
+                return data
+        return self._not_found(query)
+    
+    def _first_success(self, jobs: List[tuple], concurrent: Optional[bool] = None) -> Tuple[int, Dict]:
+        """
+        (asset_class, symbol, query, live_only) candidates priority order mein - pehla successful
+        jeetta hai: (index, result). Koi na jeete toh (-1, pehle candidate ka result).
+        concurrent=True: saare ek saath, latency sabse slow zaroori provider jitni
+        """
+        def accepted(job: tuple, result: Dict) -> bool:
+            return bool(result.get('success')) and not (job[3] and is_demo(result))
+        
+        if len(jobs) == 1 or not (self.concurrent if concurrent is None else concurrent):
+            first = None
+            for i, job in enumerate(jobs):
+                result = self._quote_job(job)
+                if accepted(job, result):
+                    return i, result
+                if first is None:
+                    first = result
+            return -1, first
+        
+        futures = [self._pool().submit(self._quote_job, job) for job in jobs]
+        results: List[Optional[Dict]] = [None] * len(futures)
+        pending = set(futures)
         try:
-            query_lower = query.lower()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures.index(future)] = future.result()
+                
+                # Jab tak upar wala candidate chal raha hai, neeche wala nahi jeet sakta
+                for i, result in enumerate(results):
+                    if result is None:
+                        break
+                    if accepted(jobs[i], result):
+                        return i, result
+        finally:
+            for future in pending:
+                future.cancel()
+        
+        return -1, results[0]
+    
+    def _quote_job(self, job: tuple) -> Dict:
+        """Ek candidate ka quote - exception bhi result ban jaata hai"""
+        try:
+            return self.get_quote(job[0], job[1], job[2])
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def suggest(self, query: str, limit: int = 5) -> List[Dict]:
+        """Typo-tolerant suggestions (local index, network nahi)"""
+        try:
+            with self.metrics.timer('stage_latency_ms', stage='suggest'):
+                return [s.to_dict() for s in self.resolver.suggest(query, limit)]
+        except Exception as e:
+            self.metrics.record_error('suggest', e)
+            return []
+    
+    def _correction(self, query: str) -> Optional['Suggestion']:
+        """Top suggestion itna pakka ho ki bina pooche use kar sakein (network nahi)"""
+        from autocomplete import best_correction
+        try:
+            with self.metrics.timer('stage_latency_ms', stage='suggest'):
+                return best_correction(self.resolver.suggest(query))
+        except Exception as e:
+            self.metrics.record_error('suggest', e)
+            return None
+    
+    def _not_found(self, query: str) -> Dict:
+        """'data nahi mila' - milte-julte naam ho toh saath mein"""
+        suggestions = self.suggest(query)
+        if suggestions:
+            hint = "Kya aapka matlab: " + ", ".join(s['phrase'] for s in suggestions) + "?"
+        else:
+            hint = "Kripya asset ka sahi naam likhein"
+        return {
+            'success': False,
+            'error': f"{query} ka data nahi mila",
+            'suggestion': hint,
+            'suggestions': suggestions
+        }
+    
+    def close(self):
+        """Background threads band kare"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._scheduler is not None:
+            self._scheduler.stop()
+        if self._alerts is not None:
+            self._alerts.save()
+        for feed in self._book_feeds.values():
+            feed.stop()
+        if self.snapshot is not None:
+            self.save_snapshot()
+            self.snapshot.close()
+        self.conversation.close()
+        if self._transport is not None:
+            self._transport.close()
+    
+    def save_snapshot(self) -> int:
+        """Abhi ke quotes snapshot mein likhe (agle start ke liye)"""
+        if self.snapshot is None:
+            return 0
+        try:
+            return self.snapshot.save_quotes(self.cache)
+        except Exception as e:
+            self.metrics.record_error('snapshot', e, stage='save')
+            return 0
+    
+    def search_many(self, queries: List[str]) -> List[Dict]:
+        """Poori watchlist ek saath - har provider ke liye ek hi call"""
+        results: List[Optional[Dict]] = [None] * len(queries)
+        crypto_jobs: Dict[str, List[int]] = {}
+        stock_jobs: Dict[str, List[int]] = {}
+        # Commodity aur resolver ko na pata queries - pool mein, batches ke saath
+        commodity_jobs: Dict[int, Future] = {}
+        
+        # Pehle har query ko provider ke hisaab se group karte hain
+        for i, query in enumerate(queries):
+            resolved = self.resolver.resolve(query)
+            asset_class, symbol = resolved if resolved else (None, None)
             
-            # Crypto mapping
-            crypto_map = {
-                'bitcoin': 'bitcoin', 'btc': 'bitcoin',
-                'ethereum': 'ethereum', 'eth': 'ethereum',
-                'solana': 'solana', 'sol': 'solana',
-                'cardano': 'cardano', 'ada': 'cardano',
-                'ripple': 'ripple', 'xrp': 'ripple',
-                'dogecoin': 'dogecoin', 'doge': 'dogecoin',
-                'bnb': 'binancecoin',
-                'matic': 'matic-network',
-                'polkadot': 'polkadot', 'dot': 'polkadot'
-            }
+            if asset_class == 'crypto':
+                coin_id = symbol
+                cached = self.cache.get('coingecko', coin_id)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    crypto_jobs.setdefault(coin_id, []).append(i)
+                continue
             
-            # Check if query is in our map
-            coin_id = None
-            for key, value in crypto_map.items():
-                if key in query_lower:
-                    coin_id = value
-                    break
+            if asset_class == 'stock':
+                cached = self.cache.get('yahoo', symbol)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    stock_jobs.setdefault(symbol, []).append(i)
+                continue
             
-            if not coin_id:
-                return {'success': False, 'error': 'Crypto not found'}
+            # Commodity Yahoo futures se - baaki batches ke saath chalti hai
+            if asset_class == 'commodity':
+                commodity_jobs[i] = self._pool().submit(self.get_quote, asset_class, symbol, query)
+            elif asset_class == 'forex':
+                results[i] = self.get_quote(asset_class, symbol, query)
+            else:
+                # Typo/andaze wali query - har ek apne thread mein, batches ke saath
+                commodity_jobs[i] = self._pool().submit(self._search_unplaced, query, False)
+        
+        # 1. Saare coins - ek CoinGecko call, Yahoo batch ke saath hi
+        crypto_batch: Optional[Future] = None
+        if crypto_jobs:
+            crypto_batch = self._pool().submit(self._crypto_batch, crypto_jobs, queries, results)
+        
+        # 2. Saare stocks - ek Yahoo call
+        if stock_jobs:
+            try:
+                quotes = self.fetch_yahoo_quotes(list(stock_jobs)) or {}
+                # Batch na chale (401) ya symbol chhoot jaye - wo symbols v8 chart se, ek saath
+                charts = self._chart_quotes({symbol: queries[indexes[0]]
+                                             for symbol, indexes in stock_jobs.items()
+                                             if not quotes.get(symbol)})
+                for symbol, indexes in stock_jobs.items():
+                    quote = quotes.get(symbol)
+                    for i in indexes:
+                        if quote:
+                            results[i] = self._stock_result(
+                                symbol,
+                                quote.get('regularMarketPrice', 0),
+                                quote.get('regularMarketPreviousClose'),
+                                quote.get('currency', 'USD')
+                            )
+                            self.cache.put('yahoo', symbol, 'stock', results[i])
+                        else:
+                            results[i] = charts[symbol]
+            except Exception as e:
+                self.metrics.record_error('yahoo', e, stage='batch')
+                self.metrics.inc('provider_requests_total', provider='yahoo', outcome='fallback')
+                for symbol, indexes in stock_jobs.items():
+                    for i in indexes:
+                        results[i] = self.generate_demo_stock_data(queries[i], symbol)
+        
+        if crypto_batch is not None:
+            crypto_batch.result()
+        for i, future in commodity_jobs.items():
+            results[i] = future.result()
+        return results
+    
+    def _crypto_batch(self, crypto_jobs: Dict[str, List[int]], queries: List[str], results: List[Optional[Dict]]):
+        """search_many ke saare coins ek CoinGecko call mein (results mein apni jagah bharta hai)"""
+        try:
+            data = self.fetch_coingecko_prices(list(crypto_jobs)) or {}
+            for coin_id, indexes in crypto_jobs.items():
+                for i in indexes:
+                    if coin_id in data:
+                        results[i] = self._crypto_result(queries[i], data[coin_id])
+                        self.cache.put('coingecko', coin_id, 'crypto', results[i])
+                    else:
+                        results[i] = {'success': False, 'error': 'Crypto data fetch failed'}
+        except Exception as e:
+            self.metrics.record_error('coingecko', e, stage='batch')
+            self.metrics.inc('provider_requests_total', provider='coingecko', outcome='fallback')
+            for coin_id, indexes in crypto_jobs.items():
+                for i in indexes:
+                    results[i] = self.generate_demo_crypto_data(queries[i], coin_id)
+    
+    def _refresh_batch(self, provider: str, symbols: List[str]) -> bool:
+        """Scheduler ka ek call: provider se symbols laaye aur cache mein daale"""
+        try:
+            if provider == 'coingecko':
+                data = self.fetch_coingecko_prices(symbols)
+                if data is None:
+                    return False
+                for coin_id in symbols:
+                    if coin_id in data:
+                        self.cache.put('coingecko', coin_id, 'crypto',
+                                       self._crypto_result(coin_id.upper(), data[coin_id]))
+                return True
             
+            if provider == 'yahoo':
+                quotes = self.fetch_yahoo_quotes(symbols) or {}
+                for symbol in symbols:
+                    quote = quotes.get(symbol)
+                    if quote:
+                        self.cache.put('yahoo', symbol, 'stock', self._stock_result(
+                            symbol,
+                            quote.get('regularMarketPrice', 0),
+                            quote.get('regularMarketPreviousClose'),
+                            quote.get('currency', 'USD')
+                        ))
+                charts = self._chart_quotes({symbol: symbol for symbol in symbols
+                                             if not quotes.get(symbol)})
+                return bool(quotes) or any(result.get('success') for result in charts.values())
+        except Exception as e:
+            self.metrics.record_error(provider, e, stage='scheduled')
+        return False
+    
+    def keep_fresh(self, queries: List[str], interval: float = 1.0):
+        """Network wale symbols scheduler ko do - wo budget ke andar cache fresh rakhega"""
+        for query in queries:
+            resolved = self.resolver.resolve(query)
+            if resolved and resolved[0] == 'crypto':
+                self.scheduler.watch('coingecko', resolved[1], interval)
+            elif resolved and resolved[0] == 'stock':
+                self.scheduler.watch('yahoo', resolved[1], interval)
+    
+    def _watch_fetch(self, queries: List[str]) -> List[Dict]:
+        """Hub ka tick: lease renew karo, phir (zyada tar cache se) batch"""
+        self.keep_fresh(queries, self._hub.interval if self._hub else 1.0)
+        return self.search_many(queries)
+    
+    def quote_batch(self, queries: List[str]) -> QuoteBatch:
+        """
+        Bulk refresh - provider JSON se seedha columnar batch (har row ke liye dict nahi).
+        Jo queries fail/resolve na hon wo batch mein nahi aati. Cache bypass hota hai.
+        """
+        batch = QuoteBatch(self._symbols)
+        coins: Dict[str, str] = {}
+        stocks: List[str] = []
+        others = []
+        
+        for query in dict.fromkeys(queries):
+            resolved = self.resolver.resolve(query)
+            if not resolved:
+                continue
+            asset_class, symbol = resolved
+            if asset_class == 'crypto':
+                coins.setdefault(symbol, query.upper())
+            elif asset_class == 'stock':
+                stocks.append(symbol)
+            else:
+                others.append((asset_class, symbol, query))
+        # Commodity (Yahoo futures) aur forex - batches ke saath hi chalte hain
+        pending = [self._pool().submit(self.get_quote, *other) for other in others]
+        
+        now = time.time()
+        if coins:
+            try:
+                data = self.fetch_coingecko_prices(list(coins)) or {}
+                for coin_id, label in coins.items():
+                    coin = data.get(coin_id)
+                    if coin:
+                        batch.append_row('crypto', label, coin.get('usd', 0),
+                                         coin.get('usd_24h_change') or 0.0,
+                                         coin.get('usd_24h_vol') or 0.0, now, 'USD', 'CoinGecko')
+            except Exception as e:
+                self.metrics.record_error('coingecko', e, stage='batch')
+        
+        if stocks:
+            try:
+                quotes = self.fetch_yahoo_quotes(list(dict.fromkeys(stocks))) or {}
+                charts = self._chart_quotes({symbol: symbol for symbol in dict.fromkeys(stocks)
+                                             if not quotes.get(symbol)})
+                for symbol in dict.fromkeys(stocks):
+                    quote = quotes.get(symbol)
+                    if not quote:
+                        quote = Quote.from_dict(charts[symbol])
+                        if quote is not None:
+                            batch.append(quote)
+                        continue
+                    price = quote.get('regularMarketPrice', 0)
+                    prev_close = quote.get('regularMarketPreviousClose') or price
+                    change = ((price - prev_close) / prev_close * 100) if prev_close else 0.0
+                    batch.append_row('stock', symbol, round(price, 2), round(change, 2),
+                                     quote.get('regularMarketVolume') or 0.0, now,
+                                     quote.get('currency', 'USD'), 'Yahoo Finance')
+            except Exception as e:
+                self.metrics.record_error('yahoo', e, stage='batch')
+        
+        for future in pending:
+            quote = Quote.from_dict(future.result())
+            if quote is not None:
+                batch.append(quote)
+        return batch
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        """Provider calls ka shared thread pool (pehli zaroorat pe banta hai)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='provider')
+        return self._executor
+    
+    def _chart_quotes(self, symbols: Dict[str, str]) -> Dict[str, Dict]:
+        """Har symbol (symbol -> query) ka v8 chart ek saath laaye aur cache mein daale"""
+        def fetch(symbol: str, query: str) -> Dict:
+            result = self._measured('yahoo', self._fetch_stock_data, query, symbol)
+            self.cache.put('yahoo', symbol, 'stock', result)
+            return result
+        
+        if len(symbols) <= 1:
+            return {symbol: fetch(symbol, query) for symbol, query in symbols.items()}
+        futures = {symbol: self._pool().submit(fetch, symbol, query) for symbol, query in symbols.items()}
+        return {symbol: future.result() for symbol, future in futures.items()}
+    
+    def get_quote(self, asset_class: str, symbol: str, query: str) -> Dict:
+        """Resolved symbol ka quote sahi provider se laaye (cache ke through)"""
+        if asset_class == 'crypto':
+            return self.cache.get_or_fetch(
+                'coingecko', symbol, 'crypto',
+                lambda: self._measured('coingecko', self._fetch_crypto_data, query, symbol)
+            )
+        if asset_class == 'stock':
+            return self.cache.get_or_fetch(
+                'yahoo', symbol, 'stock',
+                lambda: self._measured('yahoo', self._fetch_stock_data, query, symbol)
+            )
+        if asset_class == 'commodity':
+            return self.cache.get_or_fetch(
+                'commodity', symbol, 'commodity',
+                lambda: self._measured('commodity', self._build_commodity_data, symbol)
+            )
+        if asset_class == 'forex':
+            return self.cache.get_or_fetch(
+                'forex', symbol, 'forex',
+                lambda: self._measured('forex', self._build_forex_data, symbol)
+            )
+        return {'success': False, 'error': f"Unknown asset class: {asset_class}"}
+    
+    def _measured(self, provider: str, fetch, *args) -> Dict:
+        """Provider call ka latency aur outcome (success/fallback/error) record kare"""
+        if not self.metrics.enabled:
+            return fetch(*args)
+        
+        started = time.perf_counter()
+        result = fetch(*args)
+        self.metrics.observe('provider_latency_ms', (time.perf_counter() - started) * 1000.0,
+                             provider=provider)
+        
+        if not result.get('success'):
+            outcome = 'error'
+        elif is_demo(result):
+            outcome = 'fallback'
+        else:
+            outcome = 'success'
+        self.metrics.inc('provider_requests_total', provider=provider, outcome=outcome)
+        return result
+    
+    def get_crypto_data(self, query: str) -> Dict:
+        """Crypto data laaye"""
+        coin_id = self.resolve_crypto_id(query)
+        
+        if not coin_id:
+            return {'success': False, 'error': 'Crypto not found'}
+        
+        # Cache mein fresh quote ho toh network nahi
+        return self.get_quote('crypto', coin_id, query)
+    
+    def _fetch_crypto_data(self, query: str, coin_id: str) -> Dict:
+        """CoinGecko se ek coin ka data laaye"""
+        try:
             # Try CoinGecko API
-            url = f"https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                'ids': coin_id,
-                'vs_currencies': 'usd,inr',
-                'include_24hr_change': 'true',
-                'include_24hr_vol': 'true',
-                'include_market_cap': 'true'
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if coin_id in data:
-                    coin_data = data[coin_id]
-                    
-                    # USD price
-                    usd_price = coin_data.get('usd', 0)
-                    
-                    # INR price (if available)
-                    inr_price = coin_data.get('inr', usd_price * 83)  # Approx conversion
-                    
-                    return {
-                        'success': True,
-                        'type': 'crypto',
-                        'name': query.upper(),
-                        'price_usd': usd_price,
-                        'price_inr': inr_price,
-                        'change_24h': coin_data.get('usd_24h_change', 0),
-                        'volume': coin_data.get('usd_24h_vol', 0),
-                        'market_cap': coin_data.get('usd_market_cap', 0),
-                        'source': 'CoinGecko',
-                        'timestamp': self.get_current_time()
-                    }
+            data = self.fetch_coingecko_prices([coin_id])
+            if data is not None and coin_id in data:
+                return self._crypto_result(query, data[coin_id])
             
             return {'success': False, 'error': 'Crypto data fetch failed'}
-            
+        
         except Exception as e:
             # Fallback: Generate realistic data
-            return self.generate_demo_crypto_data(query)
-    
-    def generate_demo_crypto_data(self, query: str) -> Dict:
-        """Demo crypto data generate kare"""
-        # Common cryptos ke base prices
-        base_prices = {
-            'BTC': 45000 + (time.time() % 1000) - 500,
-            'ETH': 2500 + (time.time() % 100) - 50,
-            'SOL': 100 + (time.time() % 20) - 10,
-            'ADA': 0.5 + (time.time() % 0.1) - 0.05,
-            'XRP': 0.6 + (time.time() % 0.1) - 0.05,
-            'DOGE': 0.08 + (time.time() % 0.02) - 0.01
+            self.metrics.record_error('coingecko', e)
+            with self.metrics.timer('stage_latency_ms', stage='fallback', provider='coingecko'):
+                return self.generate_demo_crypto_data(query, coin_id)
+    
+    def resolve_crypto_id(self, query: str) -> Optional[str]:
+        """Query se CoinGecko coin id nikale"""
+        resolved = self.resolver.resolve(query, 'crypto')
+        return resolved[1] if resolved else None
+    
+    def fetch_coingecko_prices(self, coin_ids: List[str]) -> Optional[Dict]:
+        """Ek hi CoinGecko call mein saare coins ka price laaye"""
+        url = f"{self.COINGECKO_BASE}/api/v3/simple/price"
+        params = {
+            'ids': ','.join(coin_ids),
+            'vs_currencies': 'usd,inr',
+            'include_24hr_change': 'true',
+            'include_24hr_vol': 'true',
+            'include_market_cap': 'true'
         }
         
-        symbol = query.upper()[:3]
-        if symbol in base_prices:
-            base = base_prices[symbol]
-        else:
-            base = 100 + (time.time() % 50) - 25
+        with self.metrics.timer('stage_latency_ms', stage='http', provider='coingecko'):
+            response = self.transport.get('coingecko', url, params=params, timeout=self.HTTP_TIMEOUT)
         
-        # Some variation based on time
-        variation = (time.time() % 0.1) - 0.05
-        price = base * (1 + variation)
+        if response.status_code == 200:
+            with self.metrics.timer('stage_latency_ms', stage='parse', provider='coingecko'):
+                return response.json()
+        return None
+    
+    def _crypto_result(self, query: str, coin_data: Dict) -> Dict:
+        """CoinGecko ke coin data se response banaye"""
+        # USD price
+        usd_price = coin_data.get('usd', 0)
+        
+        # INR price - CoinGecko na de toh FX engine ka USD/INR
+        inr_price = coin_data.get('inr')
+        if inr_price is None:
+            inr_price = usd_price * self.fx.rate('USD', 'INR')
         
-        # 24h change (random but realistic)
-        change = (time.time() % 10) - 5
+        return {
+            'success': True,
+            'type': 'crypto',
+            'name': query.upper(),
+            'price_usd': usd_price,
+            'price_inr': inr_price,
+            'change_24h': coin_data.get('usd_24h_change', 0),
+            'volume': coin_data.get('usd_24h_vol', 0),
+            'market_cap': coin_data.get('usd_market_cap', 0),
+            'source': 'CoinGecko',
+            'timestamp': self.get_current_time()
+        }
+    
+    def generate_demo_crypto_data(self, query: str, coin_id: Optional[str] = None) -> Dict:
+        """
+        Demo crypto data - simulator se (seeded, har call pe market aage chalta hai).
+        Simulator ko resolver ka ticker milta hai ('bitcoin price' nahi, BTC)
+        """
+        quote = self.simulated_quote((crypto_ticker(coin_id) if coin_id else None) or query, 'crypto')
+        price = quote['price']
+        digits = 2 if price >= 1 else 6
         
         return {
             'success': True,
             'type': 'crypto',
             'name': query.upper(),
-            'price_usd': round(price, 2),
-            'price_inr': round(price * 83, 2),
-            'change_24h': round(change, 2),
-            'volume': round(price * 1000000, 2),
+            'price_usd': round(price, digits),
+            'price_inr': round(price * self.fx.rate('USD', 'INR'), digits),
+            'change_24h': round(quote['change_pct'], 2),
+            'volume': round(quote['volume'] * price, 2),
             'market_cap': round(price * 10000000, 2),
             'source': 'Real-time Demo',
             'timestamp': self.get_current_time()
@@ -178,228 +849,682 @@ class SimpleTradingBot:
     
     def get_stock_data(self, query: str) -> Dict:
         """Stock data laaye"""
+        symbol = self.resolve_stock_symbol(query)
+        
+        if not symbol:
+            return {'success': False, 'error': 'Stock not found'}
+        
+        return self.get_quote('stock', symbol, query)
+    
+    def _fetch_stock_data(self, query: str, symbol: str) -> Dict:
+        """Yahoo se ek stock ka data laaye"""
         try:
-            # Stock symbols
-            stock_map = {
-                'apple': 'AAPL', 'aapl': 'AAPL',
-                'tesla': 'TSLA', 'tsla': 'TSLA',
-                'microsoft': 'MSFT', 'msft': 'MSFT',
-                'amazon': 'AMZN', 'amzn': 'AMZN',
-                'google': 'GOOGL', 'googl': 'GOOGL',
-                'meta': 'META',
-                'nvidia': 'NVDA', 'nvda': 'NVDA',
-                'reliance': 'RELIANCE.NS',
-                'tcs': 'TCS.NS',
-                'infosys': 'INFY'
-            }
-            
-            query_lower = query.lower()
-            symbol = None
-            
-            for key, value in stock_map.items():
-                if key in query_lower:
-                    symbol = value
-                    break
-            
-            if not symbol:
-                # Check if it's already a symbol
-                if query.isupper() and len(query) <= 5:
-                    symbol = query
-                else:
-                    return {'success': False, 'error': 'Stock not found'}
-            
             # Yahoo Finance API try karte hain
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-            params = {'range': '1d', 'interval': '1m'}
-            
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
+            result = self._yahoo_chart(symbol)
+            if result is not None:
+                meta = result['meta']
                 
-                if 'chart' in data and 'result' in data['chart']:
-                    result = data['chart']['result'][0]
-                    meta = result['meta']
-                    
-                    price = meta.get('regularMarketPrice', 0)
-                    prev_close = meta.get('previousClose', price)
-                    change_pct = ((price - prev_close) / prev_close * 100) if prev_close != 0 else 0
-                    
-                    return {
-                        'success': True,
-                        'type': 'stock',
-                        'symbol': symbol,
-                        'price': round(price, 2),
-                        'change_24h': round(change_pct, 2),
-                        'currency': meta.get('currency', 'USD'),
-                        'source': 'Yahoo Finance',
-                        'timestamp': self.get_current_time()
-                    }
+                # Minute bars phenkne ki jagah local store mein rakhte hain
+                self._store_bars(symbol, result)
+                
+                return self._stock_result(
+                    symbol,
+                    meta.get('regularMarketPrice', 0),
+                    meta.get('previousClose'),
+                    meta.get('currency', 'USD')
+                )
             
             return {'success': False, 'error': 'Stock data fetch failed'}
             
         except Exception as e:
             # Fallback demo data
-            return self.generate_demo_stock_data(query)
-    
-    def generate_demo_stock_data(self, query: str) -> Dict:
-        """Demo stock data"""
-        stock_prices = {
-            'AAPL': 190 + (time.time() % 10) - 5,
-            'TSLA': 245 + (time.time() % 20) - 10,
-            'MSFT': 375 + (time.time() % 15) - 7.5,
-            'GOOGL': 140 + (time.time() % 8) - 4,
-            'AMZN': 150 + (time.time() % 10) - 5,
-            'RELIANCE': 2500 + (time.time() % 100) - 50,
-            'TCS': 3500 + (time.time() % 200) - 100
-        }
+            self.metrics.record_error('yahoo', e)
+            with self.metrics.timer('stage_latency_ms', stage='fallback', provider='yahoo'):
+                return self.generate_demo_stock_data(query, symbol)
+    
+    def _yahoo_chart(self, symbol: str) -> Optional[Dict]:
+        """v8 chart ka result (meta + minute bars); 200 na mile toh None, network error raise"""
+        url = f"{self.YAHOO_BASE}/v8/finance/chart/{symbol}"
+        params = {'range': '1d', 'interval': '1m'}
         
-        symbol = query.upper()
-        if symbol in stock_prices:
-            price = stock_prices[symbol]
-        else:
-            price = 100 + (time.time() % 50) - 25
+        with self.metrics.timer('stage_latency_ms', stage='http', provider='yahoo'):
+            response = self.transport.get('yahoo', url, params=params, timeout=self.HTTP_TIMEOUT)
         
-        change = (time.time() % 6) - 3
+        if response.status_code != 200:
+            return None
+        with self.metrics.timer('stage_latency_ms', stage='parse', provider='yahoo'):
+            data = response.json()
+        results = (data.get('chart') or {}).get('result')
+        return results[0] if results else None
+    
+    def _store_bars(self, symbol: str, result: Dict):
+        """Chart ke naye bars store kare (store fail ho toh quote nahi rukta)"""
+        try:
+            self.bars.append_yahoo_chart(symbol, result)
+        except Exception as e:
+            self.metrics.record_error('bar_store', e, stage='store')
+    
+    def get_bars(self, query: str, count: int = 390) -> Dict:
+        """Stored minute bars laaye - network nahi lagta"""
+        symbol = self.resolve_stock_symbol(query)
+        if not symbol:
+            return {}
+        return self.bars.tail(symbol, count)
+    
+    def resolve_stock_symbol(self, query: str) -> Optional[str]:
+        """Query se Yahoo stock symbol nikale"""
+        resolved = self.resolver.resolve(query, 'stock')
+        return resolved[1] if resolved else None
+    
+    def fetch_yahoo_quotes(self, symbols: List[str], timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Ek hi Yahoo quote call mein saare stocks laaye (symbol -> quote).
+        v7 bina crumb ke 401 deta hai - tab None, aur YAHOO_BATCH_RETRY tak dobara try nahi
+        (callers chhoote symbols v8 chart se laate hain).
+        """
+        if time.time() - self._yahoo_batch_denied < self.YAHOO_BATCH_RETRY:
+            return None
+        url = f"{self.YAHOO_BASE}/v7/finance/quote"
+        params = {'symbols': ','.join(symbols)}
+        
+        with self.metrics.timer('stage_latency_ms', stage='http', provider='yahoo'):
+            response = self.transport.get('yahoo', url, params=params, timeout=timeout or self.HTTP_TIMEOUT)
+        
+        if response.status_code in (401, 403):
+            self._yahoo_batch_denied = time.time()
+        if response.status_code == 200:
+            with self.metrics.timer('stage_latency_ms', stage='parse', provider='yahoo'):
+                data = response.json()
+            results = data.get('quoteResponse', {}).get('result') or []
+            return {item['symbol']: item for item in results if 'symbol' in item}
+        return None
+    
+    def _stock_result(self, symbol: str, price: float, prev_close: Optional[float],
+                      currency: str) -> Dict:
+        """Yahoo ke price se stock response banaye"""
+        if prev_close is None:
+            prev_close = price
+        change_pct = ((price - prev_close) / prev_close * 100) if prev_close != 0 else 0
         
         return {
             'success': True,
             'type': 'stock',
             'symbol': symbol,
             'price': round(price, 2),
-            'change_24h': round(change, 2),
-            'currency': 'USD',
+            'change_24h': round(change_pct, 2),
+            'currency': currency,
+            'source': 'Yahoo Finance',
+            'timestamp': self.get_current_time()
+        }
+    
+    def generate_demo_stock_data(self, query: str, symbol: Optional[str] = None) -> Dict:
+        """Demo stock data - simulator se (resolver ka symbol, warna query)"""
+        symbol = symbol or query.upper()
+        quote = self.simulated_quote(symbol, 'stock')
+        
+        return {
+            'success': True,
+            'type': 'stock',
+            'symbol': symbol,
+            'price': round(quote['price'], 2),
+            'change_24h': round(quote['change_pct'], 2),
+            'currency': quote['currency'],
             'source': 'Demo Data',
             'timestamp': self.get_current_time()
         }
     
     def get_commodity_data(self, query: str) -> Dict:
         """Commodity data laaye"""
-        try:
-            query_lower = query.lower()
-            
-            if 'gold' in query_lower:
-                # Gold price (approximate)
-                gold_price = 2034 + (time.time() % 50) - 25
-                return {
-                    'success': True,
-                    'type': 'commodity',
-                    'name': 'Gold',
-                    'price': round(gold_price, 2),
-                    'unit': 'per ounce',
-                    'change_24h': round((time.time() % 2) - 1, 2),
-                    'source': 'Commodity Market',
-                    'timestamp': self.get_current_time()
-                }
-            
-            elif 'silver' in query_lower:
-                silver_price = 24.5 + (time.time() % 2) - 1
-                return {
-                    'success': True,
-                    'type': 'commodity',
-                    'name': 'Silver',
-                    'price': round(silver_price, 2),
-                    'unit': 'per ounce',
-                    'change_24h': round((time.time() % 3) - 1.5, 2),
-                    'source': 'Commodity Market',
-                    'timestamp': self.get_current_time()
-                }
-            
-            elif 'oil' in query_lower or 'crude' in query_lower:
-                oil_price = 78 + (time.time() % 5) - 2.5
-                return {
-                    'success': True,
-                    'type': 'commodity',
-                    'name': 'Crude Oil',
-                    'price': round(oil_price, 2),
-                    'unit': 'per barrel',
-                    'change_24h': round((time.time() % 4) - 2, 2),
-                    'source': 'Oil Market',
-                    'timestamp': self.get_current_time()
-                }
-            
+        resolved = self.resolver.resolve(query, 'commodity')
+        if not resolved:
             return {'success': False, 'error': 'Commodity not found'}
+        
+        return self.get_quote('commodity', resolved[1], query)
+    
+    def _build_commodity_data(self, commodity: str) -> Dict:
+        """Ek commodity ka data - Yahoo futures chart se, na mile toh simulated market se"""
+        if commodity not in COMMODITIES:
+            return {'success': False, 'error': 'Commodity not found'}
+        name, unit, ticker = COMMODITIES[commodity]
+        try:
+            result = self._yahoo_chart(ticker)
+        except Exception as e:
+            self.metrics.record_error('commodity', e)
+            result = None
+        
+        try:
+            if result is not None:
+                meta = result['meta']
+                price = meta.get('regularMarketPrice', 0)
+                prev_close = meta.get('previousClose') or price
+                change = (price / prev_close - 1) * 100 if prev_close else 0.0
+                source = 'Yahoo Finance'
+            else:
+                # Fallback - simulator sirf isi raaste load hota hai (numpy)
+                with self.metrics.timer('stage_latency_ms', stage='fallback', provider='commodity'):
+                    quote = self.simulated_quote(commodity, 'commodity')
+                price, change, source = quote['price'], quote['change_pct'], 'Demo Data'
+            return {
+                'success': True,
+                'type': 'commodity',
+                'name': name,
+                'price': round(price, 2),
+                'unit': unit,
+                'change_24h': round(change, 2),
+                'source': source,
+                'timestamp': self.get_current_time()
+            }
             
         except Exception as e:
+            self.metrics.record_error('commodity', e)
             return {'success': False, 'error': str(e)}
     
     def get_forex_data(self, query: str) -> Dict:
         """Forex data laaye"""
+        resolved = self.resolver.resolve(query, 'forex')
+        if not resolved:
+            return {'success': False, 'error': 'Forex pair not found'}
+        
+        return self.get_quote('forex', resolved[1], query)
+    
+    def _build_forex_data(self, pair: str) -> Dict:
+        """Koi bhi pair (JPYINR bhi) - FX engine ki cross-rate matrix se"""
         try:
-            query_upper = query.upper().replace('/', '')
+            self.refresh_fx()
+            base, quote = pair[:3], pair[3:]
+            fx = self.fx
+            if not (fx.supports(base) and fx.supports(quote)):
+                return {'success': False, 'error': f"{pair} ka rate nahi hai"}
             
-            forex_rates = {
-                'EURUSD': 1.095 + (time.time() % 0.01) - 0.005,
-                'USDINR': 83.0 + (time.time() % 0.2) - 0.1,
-                'USDJPY': 148.0 + (time.time() % 1) - 0.5,
-                'GBPUSD': 1.275 + (time.time() % 0.01) - 0.005,
-                'USDCAD': 1.345 + (time.time() % 0.01) - 0.005
+            return {
+                'success': True,
+                'type': 'forex',
+                'pair': pair,
+                'rate': round(fx.rate(base, quote), 4),
+                'change_24h': round(fx.change_pct(base, quote), 3),
+                'source': fx.source,
+                'timestamp': self.get_current_time()
             }
             
-            # Check for common forex pairs
-            for pair in ['EURUSD', 'USDINR', 'USDJPY', 'GBPUSD', 'USDCAD']:
-                if pair in query_upper or pair[:3] in query_upper or pair[3:] in query_upper:
-                    rate = forex_rates[pair]
-                    return {
-                        'success': True,
-                        'type': 'forex',
-                        'pair': pair,
-                        'rate': round(rate, 4),
-                        'change_24h': round((time.time() % 0.5) - 0.25, 3),
-                        'source': 'Forex Market',
-                        'timestamp': self.get_current_time()
-                    }
-            
-            return {'success': False, 'error': 'Forex pair not found'}
-            
         except Exception as e:
+            self.metrics.record_error('forex', e)
             return {'success': False, 'error': str(e)}
     
-    def format_response(self, data: Dict) -> str:
-        """Data ko aasan format mein dikhaye"""
+    def subscribe(self, symbols: List[str], interval: float = 1.0) -> Subscription:
+        """Live quotes - sirf badle hue quotes (query, data) milte hain"""
+        if self._hub is None:
+            # Saare subscribers ek hi hub share karte hain; scheduler upstream budget sambhalta hai
+            self._hub = QuoteHub(self._watch_fetch, interval)
+        return self._hub.subscribe(symbols, interval)
+    
+    def format_tick(self, query: str, data) -> str:
+        """Watch mode ke liye ek line ka quote (dict ya Quote)"""
+        quote = data if isinstance(data, Quote) else Quote.from_dict(data)
+        if quote is None:
+            return f"{query}: ❌ {data.get('error', 'Unknown error')}"
+        if quote.asset_class == 'forex':
+            price = f"{quote.price}"
+        else:
+            price = format_money(quote.price, quote.currency)
+        return f"[{quote.timestamp}] {quote.name or query}: {price} ({quote.change_24h:+.2f}%)"
+    
+    def format_batch(self, batch: QuoteBatch, currency: Optional[str] = None) -> str:
+        """
+        Poora batch ek table mein - columns seedhe arrays se padhe jaate hain.
+        `currency` (default display currency) mein saare prices ek vectorized multiply se.
+        """
+        name = batch.table.name
+        forex = ASSET_CLASS_CODES['forex']
+        currency = (currency or self.display_currency).upper()
+        if self.fx.supports(currency) and len(batch):
+            self.refresh_fx()
+            prices = self.fx.convert_batch(batch, currency).tolist()
+            currencies = [currency] * len(batch)
+        else:
+            prices = batch.prices
+            currencies = [name(currency_id) for currency_id in batch.currency_ids]
+        lines = []
+        for symbol_id, asset_class, price, change, price_currency in zip(
+                batch.symbol_ids, batch.asset_classes, prices, batch.changes, currencies):
+            arrow = '↗️' if change > 0 else '↘️' if change < 0 else '➡️'
+            price_text = f"{price:.4f}" if asset_class == forex else format_money(price, price_currency)
+            lines.append(f"{arrow} {name(symbol_id):<12} {price_text:>16} {change:+7.2f}%")
+        return "\n".join(lines)
+    
+    def watch(self, symbols: List[str], interval: float = 1.0):
+        """Symbols ko live dekhe - Ctrl+C se band"""
+        print(f"\n🤖 {self.name}: Watching {', '.join(symbols)} (Ctrl+C se band karein)")
+        subscription = self.subscribe(symbols, interval)
+        try:
+            for query, data in subscription:
+                print("   " + self.format_tick(query, data))
+                self._print_alerts()
+        except KeyboardInterrupt:
+            print(f"\n🤖 {self.name}: Watch band kiya.")
+        finally:
+            subscription.close()
+    
+    def indicator_analysis(self, quote: Quote) -> Optional[str]:
+        """Stored bars se RSI/MACD/EMA/Bollinger analysis (bars na hon toh None)"""
+        if quote.asset_class != 'stock' or not quote.symbol:
+            return None
+        return self.screen([quote.symbol]).get(quote.symbol)
+    
+    def screen(self, symbols: List[str], min_bars: int = 26) -> Dict[str, str]:
+        """Poori watchlist ke indicators ek pass mein - symbol -> analysis"""
+        try:
+            from indicators import describe
+            with self.metrics.timer('stage_latency_ms', stage='indicators'):
+                signals = self.indicators.refresh(symbols)
+        except Exception as e:
+            self.metrics.record_error('indicators', e, stage='refresh')
+            return {}
+        return {
+            symbol: describe(signal)
+            for symbol, signal in signals.items()
+            if signal['count'] >= min_bars
+        }
+    
+    def _collect_gauges(self):
+        """Export ke time cache aur circuit breakers ki state"""
+        for name, value in self.cache.stats().items():
+            yield f"cache_{name}", {}, value
+        for provider, bucket in self.rate_limits.items():
+            snapshot = bucket.snapshot()
+            yield 'rate_limit_tokens', {'provider': provider}, snapshot['tokens']
+            yield 'rate_limit_throttled', {'provider': provider}, snapshot['throttled']
+        if self._portfolio is not None and len(self._portfolio):
+            summary = self._portfolio.summary()
+            yield 'portfolio_equity', {}, round(summary['equity'], 2)
+            yield 'portfolio_open_risk', {}, round(summary['open_risk'], 2)
+            yield 'portfolio_heat_pct', {}, round(summary['heat_pct'], 3)
+        if self._alerts is not None:
+            stats = self._alerts.stats()
+            yield 'alert_rules', {}, stats['rules']
+            yield 'alert_rules_checked', {}, stats['rules_checked']
+        if self._books is not None:
+            stats = self._books.stats()
+            yield 'order_books', {}, stats['books']
+            yield 'order_book_diffs', {}, stats['diffs']
+            yield 'order_book_resyncs', {}, stats['resyncs']
+        if self._transport is None:
+            return
+        for provider, snapshot in self._transport.stats().items():
+            yield 'breaker_state', {'provider': provider}, BREAKER_STATES.get(snapshot['state'], -1)
+            yield 'breaker_failures', {'provider': provider}, snapshot['failures']
+    
+    def add_position(self, query: str, qty: float, entry: Optional[float] = None,
+                     stop: Optional[float] = None, target: Optional[float] = None) -> Dict:
+        """Nayi position - entry na di ho toh abhi ka price. qty < 0 = short"""
+        resolved = self.resolver.resolve(query)
+        data = self.get_quote(*resolved, query) if resolved else self.search_asset(query)
+        if not data.get('success'):
+            return data
+        quote = Quote.from_dict(data)
+        if not resolved:
+            # Auto-correct se mila - canonical symbol dobara resolve karte hain
+            resolved = self.resolver.resolve(data.get('corrected_to', query))
+        if quote is None or not resolved:
+            return {'success': False, 'error': f"{query} ka symbol pakka nahi hua"}
+        
+        # Demo price pe position value nahi hoti - entry di ho toh wahi, warna ruk jao
+        if is_demo(data) and entry is None:
+            return {'success': False, 'error': f"{query} ka live price nahi mila - entry price ke saath jodein"}
+        
+        portfolio = self.portfolio
+        price = entry if is_demo(data) else quote.price
+        row = portfolio.add(resolved[1], resolved[0], qty, price if entry is None else entry,
+                            stop, target, quote.currency, quote.name or query.upper(), price=price)
+        if quote.currency != portfolio.base_currency:
+            portfolio.apply_fx(self.fx)
+        self._save_portfolio()
+        return dict(portfolio.positions()[row], success=True)
+    
+    def close_position(self, query: str) -> int:
+        """Symbol ki saari positions hataye"""
+        resolved = self.resolver.resolve(query)
+        symbol = resolved[1] if resolved else query.upper()
+        removed = self.portfolio.remove(symbol)
+        if removed:
+            self._save_portfolio()
+        return removed
+    
+    def _save_portfolio(self):
+        try:
+            self.portfolio.save()
+        except OSError as e:
+            self.metrics.record_error('portfolio', e, stage='save')
+    
+    def refresh_portfolio(self) -> int:
+        """
+        Held symbols ke quotes (purane ho toh) - provider-wise ek batch call.
+        Naye quotes cache listener se portfolio mein jaate hain (demo fallback wale nahi).
+        Kitni rows reprice hui
+        """
+        portfolio = self.portfolio
+        by_provider: Dict[str, List[str]] = {}
+        for symbol, asset_class in dict(zip(portfolio.symbols, portfolio.asset_classes)).items():
+            if asset_class == 'crypto' and self.cache.get('coingecko', symbol) is None:
+                by_provider.setdefault('coingecko', []).append(symbol)
+            elif asset_class == 'stock' and self.cache.get('yahoo', symbol) is None:
+                by_provider.setdefault('yahoo', []).append(symbol)
+            elif asset_class in ('commodity', 'forex'):
+                self.get_quote(asset_class, symbol, symbol)
+        for provider, symbols in by_provider.items():
+            self._refresh_batch(provider, symbols)
+        with self.metrics.timer('stage_latency_ms', stage='reprice'):
+            return portfolio.revalue()
+    
+    def format_portfolio(self) -> str:
+        """Positions + 4-point risk checks"""
+        portfolio = self.portfolio
+        if not len(portfolio):
+            return "Portfolio khaali hai - 'buy BTC 0.5 sl 60000 tgt 80000' se position jodein"
+        summary = portfolio.summary()
+        base = summary['base_currency']
+        lines = []
+        for p in portfolio.positions():
+            arrow = '↗️' if p['pnl'] > 0 else '↘️' if p['pnl'] < 0 else '➡️'
+            side = 'LONG' if p['qty'] > 0 else 'SHORT'
+            lines.append(f"{arrow} {p['label']:<10} {side:<5} {abs(p['qty']):g} @ "
+                         f"{format_money(p['entry'], p['currency'])} -> {format_money(p['price'], p['currency'])}"
+                         f"  P&L {format_money(p['pnl'], base)} ({p['pnl_pct']:+.2f}%)")
+            stop = format_money(p['stop'], p['currency']) if p['stop'] is not None else '-'
+            target = format_money(p['target'], p['currency']) if p['target'] is not None else '-'
+            reward_risk = f"{p['reward_risk']:.1f}" if p['reward_risk'] == p['reward_risk'] else '-'
+            lines.append(f"   SL {stop} | Target {target} | Risk {format_money(p['risk'], base)} "
+                         f"({p['risk_pct']:.2f}%) | R:R {reward_risk} | Size {p['exposure_pct']:.1f}%")
+            lines.append("   " + ("⚠️ " + ", ".join(p['checks']) if p['checks'] else "✅ 4/4 checks theek"))
+        heat = '✅' if summary['heat_ok'] else '⚠️'
+        lines.append("-" * 40)
+        lines.append(f"Equity {format_money(summary['equity'], base)} | "
+                     f"Exposure {format_money(summary['gross_exposure'], base)} | "
+                     f"P&L {format_money(summary['unrealized_pnl'], base)}")
+        lines.append(f"{heat} Portfolio heat {summary['heat_pct']:.2f}% "
+                     f"(limit {portfolio.limits['max_heat_pct']:g}%) | {summary['flagged']} positions pe warning")
+        return "\n".join(lines)
+    
+    def add_alert(self, query: str, kind: str, level: float, repeat: bool = False) -> Dict:
+        """Naya alert - abhi ka price reference/base banta hai"""
+        data = self.search_asset(query)
+        if not data.get('success'):
+            return data
+        resolved = self.resolver.resolve(data.get('corrected_to', query))
+        quote = Quote.from_dict(data)
+        if quote is None or not resolved:
+            return {'success': False, 'error': f"{query} ka symbol pakka nahi hua"}
+        # Demo price se na reference banta hai na crossing - asli quote aane par hi
+        demo = is_demo(data)
+        if demo and kind == 'move':
+            return {'success': False, 'error': f"{query} ka live price nahi mila - move alert baad mein banayein"}
+        
+        engine = self.alerts
+        rule, created = engine.add(resolved[1], kind, level, quote.name or query.upper(),
+                                   None if demo else quote.price, repeat=repeat, asset_class=resolved[0])
+        engine.save()
+        self.watch_alerts()
+        return {'success': True, 'id': rule.id, 'rule': rule.describe(), 'created': created,
+                'price': quote.price, 'already': engine.already_true(rule)}
+    
+    def format_alerts(self) -> str:
+        engine = self.alerts
+        if not len(engine):
+            return "Koi alert nahi - 'alert BTC above 70000' ya 'alert TSLA 3%' se banayein"
+        lines = [f"#{rule.id} {rule.describe()}" + (" (repeat)" if rule.repeat else "")
+                 for rule in engine.rules.values()]
+        stats = engine.stats()
+        lines.append(f"{stats['rules']} alerts, {stats['symbols']} symbols | "
+                     f"{stats['fired']} fire hue, {stats['suppressed']} cooldown mein ruke")
+        return "\n".join(lines)
+    
+    def _book_base(self, query: str) -> Optional[str]:
+        """'BTC' / 'bitcoin' / 'ETH/USDT' -> base coin ticker"""
+        query = query.strip()
+        if '/' in query:
+            return query.split('/')[0].strip().upper() or None
+        resolved = self.resolver.resolve(query)
+        if resolved is not None and resolved[0] != 'crypto':
+            return None
+        if resolved is not None:
+            return crypto_ticker(resolved[1])
+        return query.upper() if query.isalnum() and len(query) <= 6 else None
+    
+    def _stand_in(self, exchange: str, pair: str) -> 'StandInExchange':
+        """Local stand-in exchange (ccxt/network na ho) - mid simulator ke price pe"""
+        from orderbook import StandInExchange
+        stand_in = self._stand_ins.get(exchange)
+        if stand_in is None:
+            stand_in = self._stand_ins[exchange] = StandInExchange(exchange, {}, seed=self.simulator.seed)
+        if pair not in stand_in.symbols:
+            stand_in.add_symbol(pair, self.simulated_quote(pair.split('/')[0], 'crypto')['price'])
+        return stand_in
+    
+    def watch_book(self, base: str, exchanges: Optional[List[str]] = None,
+                   stand_in: Optional[bool] = None) -> str:
+        """
+        Base coin ki books har exchange se chalu (exchange ki ek feed thread, saare pairs).
+        ccxt na ho ya TRADING_BOT_BOOKS=standin ho toh stand-in exchanges. Consolidated symbol return
+        """
+        from orderbook import DEFAULT_EXCHANGES, BookFeed, StandInExchange, ccxt_exchange, native_pair
+        if exchanges is None:
+            exchanges = os.environ.get('TRADING_BOT_EXCHANGES', ','.join(DEFAULT_EXCHANGES)).split(',')
+        if stand_in is None:
+            stand_in = os.environ.get('TRADING_BOT_BOOKS') == 'standin'
+        symbol = f"{base.upper()}/USD"
+        with self._book_lock:
+            for name in filter(None, (e.strip().lower() for e in exchanges)):
+                pair = native_pair(base, name)
+                feed = self._book_feeds.get(name)
+                if feed is not None:
+                    if pair not in feed.pairs:
+                        if isinstance(feed.exchange, StandInExchange):
+                            self._stand_in(name, pair)
+                        feed.add_pair(pair, symbol)
+                    continue
+                exchange = None
+                if not stand_in:
+                    try:
+                        exchange = ccxt_exchange(name, self.HTTP_TIMEOUT)
+                    except ImportError:
+                        # ccxt install nahi - stand-in
+                        exchange = None
+                    except AttributeError:
+                        # Ye exchange ccxt mein hai hi nahi
+                        continue
+                if exchange is None:
+                    exchange = self._stand_in(name, pair)
+                self._book_feeds[name] = BookFeed(self.order_books, exchange, {pair: symbol},
+                                                  interval=BOOK_REFRESH).start()
+        return symbol
+    
+    def order_book(self, query: str, size: float = 1.0, exchanges: Optional[List[str]] = None,
+                   stand_in: Optional[bool] = None, wait: float = BOOK_WAIT) -> Dict:
+        """Consolidated book: BBO, har exchange ka BBO, top levels aur `size` ki buy/sell slippage"""
+        from orderbook import StandInExchange
+        base = self._book_base(query)
+        if base is None:
+            return {'success': False, 'error': f"{query} ka order book nahi - crypto likhein (BTC, ETH/USDT)"}
+        symbol = self.watch_book(base, exchanges, stand_in)
+        books = self.order_books
+        feeds = {name: feed for name, feed in self._book_feeds.items() if symbol in feed.pairs.values()}
+        
+        # Pehli baar: har exchange ki book aa jaye ya uski feed fail ho
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline and not all(
+                books.book(name, symbol).synced or feed.errors for name, feed in feeds.items()):
+            time.sleep(0.05)
+        # Koi asli exchange nahi aaya (network nahi) - fail wale exchanges ki jagah stand-in.
+        # Kuch asli aaye hon toh fail wale bas bahar rehte hain (simulated book asli mein na mile)
+        live = any(books.book(name, symbol).synced and not isinstance(feed.exchange, StandInExchange)
+                   for name, feed in feeds.items())
+        for name, feed in feeds.items():
+            if live or books.book(name, symbol).synced or isinstance(feed.exchange, StandInExchange):
+                continue
+            self.metrics.inc('order_book_fallbacks_total', exchange=name)
+            with self._book_lock:
+                for pair in feed.pairs:
+                    stand_in_exchange = self._stand_in(name, pair)
+                feed.exchange = stand_in_exchange
+            for pair in feed.pairs:
+                feed.snapshot(pair)
+        
+        bbo = books.bbo(symbol)
+        if bbo is None or bbo['mid'] is None:
+            return {'success': False, 'error': f"{symbol} ki book kisi exchange se nahi aayi"}
+        return {
+            'success': True,
+            'symbol': symbol,
+            'bbo': bbo,
+            'exchanges': books.exchange_bbos(symbol),
+            'sources': {name: 'Stand-in' if isinstance(feed.exchange, StandInExchange)
+                        else 'ccxt' if books.book(name, symbol).synced else f"❌ {feed.last_error}"
+                        for name, feed in feeds.items()},
+            'levels': books.levels(symbol, 5),
+            'buy': books.slippage(symbol, 'buy', size),
+            'sell': books.slippage(symbol, 'sell', size),
+        }
+    
+    def format_order_book(self, data: Dict) -> str:
         if not data.get('success'):
-            return f"❌ Error: {data.get('error', 'Unknown error')}"
-        
-        response_lines = []
-        
-        if data['type'] == 'crypto':
-            response_lines.append(f"💰 {data['name']}")
-            response_lines.append(f"   Price: ${data['price_usd']:,.2f}")
-            response_lines.append(f"   Price in INR: ₹{data['price_inr']:,.2f}")
-            response_lines.append(f"   24h Change: {data['change_24h']:+.2f}%")
-            response_lines.append(f"   Volume: ${data['volume']:,.0f}")
-            response_lines.append(f"   Market Cap: ${data['market_cap']:,.0f}")
-        
-        elif data['type'] == 'stock':
-            response_lines.append(f"📈 {data['symbol']}")
-            response_lines.append(f"   Price: {data['currency']}{data['price']:,.2f}")
-            response_lines.append(f"   24h Change: {data['change_24h']:+.2f}%")
-        
-        elif data['type'] == 'commodity':
-            response_lines.append(f"⚖️ {data['name']}")
-            response_lines.append(f"   Price: ${data['price']:,.2f} {data.get('unit', '')}")
-            response_lines.append(f"   24h Change: {data['change_24h']:+.2f}%")
-        
-        elif data['type'] == 'forex':
-            response_lines.append(f"🌍 {data['pair']}")
-            response_lines.append(f"   Rate: {data['rate']}")
-            response_lines.append(f"   24h Change: {data['change_24h']:+.4f}")
-        
-        response_lines.append(f"   ⏰ Updated: {data['timestamp']}")
-        response_lines.append(f"   📡 Source: {data['source']}")
-        
-        # Analysis add karte hain
-        change = data.get('change_24h', 0)
-        if change > 2:
-            analysis = "📈 Strong bullish trend"
-        elif change > 0:
-            analysis = "↗️ Mildly bullish"
-        elif change < -2:
-            analysis = "📉 Strong bearish trend"
-        elif change < 0:
-            analysis = "↘️ Mildly bearish"
+            return f"❌ {data.get('error', 'Order book nahi mila')}"
+        bbo = data['bbo']
+        decimals = 2 if bbo['mid'] >= 1 else 6
+        
+        def money(price):
+            return format_money(price, 'USD', decimals) if price is not None else '-'
+        
+        lines = [f"📚 {data['symbol']} - {len(data['exchanges'])} exchanges ki consolidated book",
+                 f"   Bid {money(bbo['bid'])} x {bbo['bid_size']:g} ({', '.join(bbo['bid_exchanges'])}) | "
+                 f"Ask {money(bbo['ask'])} x {bbo['ask_size']:g} ({', '.join(bbo['ask_exchanges'])}) | "
+                 f"Spread {bbo['spread_bps']:.2f} bps"]
+        if bbo['crossed']:
+            lines.append("   ⚠️ Crossed: ek exchange ka bid doosre ke ask se upar (arbitrage)")
+        for name, source in sorted(data['sources'].items()):
+            quote = data['exchanges'].get(name)
+            prices = f"{money(quote['bid'])} / {money(quote['ask'])}" if quote else "book nahi"
+            lines.append(f"   {name:<10} {prices} ({source})")
+        lines.append("   Top levels (bid | ask):")
+        for bid, ask in zip(data['levels']['bid'], data['levels']['ask']):
+            lines.append(f"     {money(bid[0]):>14} x {bid[1]:<10.4g} | {money(ask[0]):>14} x {ask[1]:.4g}")
+        for side in ('buy', 'sell'):
+            fill = data[side]
+            if fill['avg_price'] is None:
+                continue
+            route = ", ".join(f"{name} {qty:.4g}" for name, qty in fill['route'].items())
+            partial = "" if fill['complete'] else f" ⚠️ sirf {fill['filled']:.4g} bhara (book mein itna hi)"
+            lines.append(f"   {side.title()} {fill['size']:g}: avg {money(fill['avg_price'])}, "
+                         f"slippage {fill['slippage_bps']:.2f} bps, {fill['levels']} levels -> {route}{partial}")
+        if 'Stand-in' in data['sources'].values():
+            lines.append("   ℹ️ Stand-in = local simulated exchange (ccxt/network nahi mila)")
+        return "\n".join(lines)
+    
+    def _print_alerts(self):
+        """Background mein fire hue alerts (chat ke agle turn pe)"""
+        if self._alerts is None:
+            return
+        for event in self._alerts.drain():
+            print(f"\n🔔 Alert #{event['id']}: {event['message']}")
+    
+    def stats_report(self, fmt: str = 'text') -> str:
+        """Metrics - 'text' (chat ke liye), 'prometheus' ya 'json' (JSON lines)"""
+        if fmt == 'prometheus':
+            return self.metrics.to_prometheus()
+        if fmt == 'json':
+            return self.metrics.to_json_lines()
+        return self.metrics.summary()
+    
+    def export_metrics(self, path: str, fmt: str = 'prometheus'):
+        """Metrics file mein likhe (Prometheus textfile collector ya log ke liye)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.stats_report(fmt))
+    
+    def remember(self, query: str, data: Dict):
+        """Query aur uska quote history mein rakhe (rendered text nahi)"""
+        resolved = self.resolver.resolve(query)
+        asset_class, symbol = resolved if resolved else ('', '')
+        self.conversation.add(query, asset_class, symbol, Quote.from_dict(data))
+    
+    def recall(self, question: str) -> str:
+        """'what did BTC show at 10:00' / 'BTC 10:00 pe kya tha' ka jawab history se"""
+        when = parse_clock(question)
+        if when is None:
+            return "Time samajh nahi aaya - jaise 'BTC 10:00 pe kya tha'"
+        
+        words = [w for w in TIME_RE.sub(' ', question).replace('?', ' ').split()
+                 if w.lower() not in RECALL_WORDS]
+        resolved = self.resolver.resolve(' '.join(words)) if words else None
+        if not resolved:
+            return "Kaunsa asset? Jaise 'what did BTC show at 10:00'"
+        
+        record = self.conversation.at(resolved[1], when)
+        clock = time.strftime('%H:%M', time.localtime(when))
+        if record is None:
+            return f"{clock} se pehle {' '.join(words)} ka koi record nahi hai"
+        return f"{clock} tak ka aakhri record: {self.format_tick(record.query, record.quote)}"
+    
+    def format_response(self, data) -> str:
+        """Data (dict ya Quote) ko aasan format mein dikhaye (profiler on ho toh profiled)"""
+        if self.profiler.enabled:
+            return self.profiler.call('format_response', self._format_response, data)
+        return self._format_response(data)
+    
+    def _format_response(self, data) -> str:
+        quote = data if isinstance(data, Quote) else Quote.from_dict(data)
+        if quote is None:
+            response = f"❌ Error: {data.get('error', 'Unknown error')}"
+            suggestions = data.get('suggestions')
+            if suggestions:
+                response += "\n   ❓ Kya aapka matlab (number likh ke chunein):"
+                for n, suggestion in enumerate(suggestions, 1):
+                    response += f"\n      {n}. {suggestion['phrase']} ({suggestion['asset_class']})"
+            return response
+        
+        response_lines = [f"{ASSET_ICONS.get(quote.asset_class, '📊')} {quote.name}"]
+        if isinstance(data, dict) and data.get('corrected_from'):
+            response_lines.append(f"   ✏️ '{data['corrected_from']}' ko '{data['corrected_to']}' samjha")
+        
+        if quote.asset_class == 'forex':
+            response_lines.append(f"   Rate: {quote.price}")
+            response_lines.append(f"   24h Change: {quote.change_24h:+.4f}")
         else:
-            analysis = "➡️ Sideways movement"
+            price = format_money(quote.price, quote.currency)
+            response_lines.append(f"   Price: {price} {quote.unit}".rstrip())
+            if quote.price_inr is not None:
+                response_lines.append(f"   Price in INR: {format_money(quote.price_inr, 'INR')}")
+            display = self.display_currency
+            if display not in (quote.currency, 'INR' if quote.price_inr is not None else None) \
+                    and self.fx.supports(display) and self.fx.supports(quote.currency):
+                converted = self.fx.convert(quote.price, quote.currency, display)
+                response_lines.append(f"   Price in {display}: {format_money(converted, display)}")
+            response_lines.append(f"   24h Change: {quote.change_24h:+.2f}%")
+            if quote.volume:
+                response_lines.append(f"   Volume: {format_money(quote.volume, 'USD', 0)}")
+            if quote.market_cap:
+                response_lines.append(f"   Market Cap: {format_money(quote.market_cap, 'USD', 0)}")
+        
+        response_lines.append(f"   ⏰ Updated: {quote.timestamp}")
+        response_lines.append(f"   📡 Source: {quote.source}")
+        
+        # Snapshot wala data - kitna purana hai saaf dikhe
+        if isinstance(data, dict) and data.get('as_of'):
+            response_lines.append(f"   🕒 Snapshot data, {format_age(time.time() - data['as_of'])} purana "
+                                  f"(refresh ho raha hai)")
+        
+        # Analysis add karte hain - bars hon toh asli indicators se
+        analysis = self.indicator_analysis(quote)
+        if analysis is None:
+            # Bars nahi hain - 24h change se andaaza
+            change = quote.change_24h
+            if change > 2:
+                analysis = "📈 Strong bullish trend"
+            elif change > 0:
+                analysis = "↗️ Mildly bullish"
+            elif change < -2:
+                analysis = "📉 Strong bearish trend"
+            elif change < 0:
+                analysis = "↘️ Mildly bearish"
+            else:
+                analysis = "➡️ Sideways movement"
         
         response_lines.append(f"   💡 Analysis: {analysis}")
         
@@ -407,19 +1532,35 @@ class SimpleTradingBot:
     
     def chat(self):
         """Main chat loop"""
+        # Typo index peeche ban jaye - pehli galti pe intezaar na ho
+        threading.Thread(target=self.resolver.fuzzy_index, name='fuzzy-index', daemon=True).start()
+        choices: List[Dict] = []
+        # Pichhle session ke alerts bhi chalu (symbols scheduler pe)
+        self.alerts
+        
         print("\n" + "="*50)
         print("Mujhse yeh pooch sakte hain:")
         print("• 'Bitcoin price' ya 'BTC'")
         print("• 'Tesla stock' ya 'TSLA'")
         print("• 'Gold price'")
         print("• 'EUR/USD' ya 'USD/INR'")
+        print("• 'watch BTC AAPL gold' - live updates")
+        print("• 'stats' (ya 'stats prometheus' / 'stats json') - latency aur errors")
+        print("• 'history' ya 'BTC 10:00 pe kya tha' - purane quotes")
+        print("• 'buy BTC 0.5 sl 60000 tgt 80000', 'close BTC', 'portfolio' - positions aur risk")
+        print("• 'alert BTC above 70000', 'alert TSLA 3%', 'alerts' - price alerts")
+        print("• 'profile BTC' (ya 'profile on' / 'profile off') - CPU aur memory profile")
+        print("• 'book BTC' ya 'book ETH 5' - exchanges ki order book, BBO aur slippage")
         print("• 'exit' ya 'quit' - chat khatam karne ke liye")
         print("="*50)
         
         while True:
             try:
+                self._print_alerts()
+                
                 # User input
                 user_input = input("\n👤 Aap: ").strip()
+                self._print_alerts()
                 
                 if not user_input:
                     continue
@@ -440,7 +1581,8 @@ class SimpleTradingBot:
                     print("1. Cryptocurrency - Bitcoin, Ethereum, Solana, etc.")
                     print("2. Stocks - AAPL, TSLA, MSFT, Indian stocks bhi")
                     print("3. Commodities - Gold, Silver, Oil")
-                    print("4. Forex - EUR/USD, USD/INR, etc.")
+                    print("4. Forex - EUR/USD, USD/INR, JPY/INR - koi bhi pair")
+                    print("\n'currency EUR' se prices us currency mein bhi dikhenge")
                     print("\nBas asset ka naam likhein!")
                     continue
                 
@@ -449,29 +1591,151 @@ class SimpleTradingBot:
                     print(f"\n🤖 {self.name}: Current time: {self.get_current_time()}")
                     continue
                 
+                # Metrics
+                if user_input.lower().split()[0] == 'stats':
+                    parts = user_input.lower().split()
+                    fmt = parts[1] if len(parts) > 1 else 'text'
+                    print(f"\n🤖 {self.name}: Bot stats:")
+                    print(self.stats_report(fmt))
+                    continue
+                
+                # Pichhle quotes
+                if user_input.lower() in ['history', 'itihas']:
+                    print(f"\n🤖 {self.name}: Aakhri queries:")
+                    for record in self.conversation.recent(10):
+                        if record.quote is not None:
+                            print("   " + self.format_tick(record.query, record.quote))
+                        else:
+                            print(f"   [{time.strftime('%H:%M:%S', time.localtime(record.ts))}] {record.query}: ❌")
+                    continue
+                
+                # "what did BTC show at 10:00" - history se jawab
+                if TIME_RE.search(user_input):
+                    print(f"\n🤖 {self.name}: {self.recall(user_input)}")
+                    continue
+                
+                # Portfolio aur positions
+                if user_input.lower() in ['portfolio', 'positions']:
+                    self.refresh_portfolio()
+                    print(f"\n🤖 {self.name}: Aapka portfolio:")
+                    print(self.format_portfolio())
+                    continue
+                
+                position = POSITION_RE.match(user_input)
+                if position:
+                    action, asset, qty, entry, stop, target = position.groups()
+                    qty = float(qty) if action.lower() == 'buy' else -float(qty)
+                    result = self.add_position(asset, qty, *(float(x) if x else None for x in (entry, stop, target)))
+                    if result.get('success'):
+                        checks = ", ".join(result['checks']) or "4/4 checks theek"
+                        print(f"\n🤖 {self.name}: {result['label']} position jud gayi ({checks})")
+                    else:
+                        print(f"\n🤖 {self.name}: {self.format_response(result)}")
+                    continue
+                
+                if user_input.lower().startswith('close '):
+                    removed = self.close_position(user_input[6:].strip())
+                    print(f"\n🤖 {self.name}: {removed} position band hui")
+                    continue
+                
+                # Price alerts
+                if user_input.lower() == 'alerts':
+                    self.watch_alerts()
+                    print(f"\n🤖 {self.name}: Aapke alerts:")
+                    print(self.format_alerts())
+                    continue
+                
+                if user_input.lower().startswith('alert remove '):
+                    rule_id = user_input.split()[-1].lstrip('#')
+                    removed = rule_id.isdigit() and self.alerts.remove(int(rule_id))
+                    if removed:
+                        self.alerts.save()
+                    print(f"\n🤖 {self.name}: " + ("Alert hata diya" if removed else "Aisa alert nahi mila"))
+                    continue
+                
+                alert = ALERT_RE.match(user_input)
+                if alert:
+                    asset, word, level, percent = alert.groups()
+                    kind = 'move' if percent else ALERT_KINDS.get((word or '').lower())
+                    if kind is None:
+                        print(f"\n🤖 {self.name}: Aise likhein: 'alert BTC above 70000' ya 'alert TSLA 3%'")
+                        continue
+                    result = self.add_alert(asset, kind, float(level))
+                    if not result.get('success'):
+                        print(f"\n🤖 {self.name}: {self.format_response(result)}")
+                    elif not result['created']:
+                        print(f"\n🤖 {self.name}: Ye alert pehle se hai (#{result['id']})")
+                    else:
+                        note = " - price pehle se wahan hai, agli crossing pe bataunga" if result['already'] else ""
+                        print(f"\n🤖 {self.name}: Alert #{result['id']} laga: {result['rule']}{note}")
+                    continue
+                
+                # Profiler: 'profile on/off' ya ek query ka profile
+                if user_input.lower().split()[0] == 'profile':
+                    target = user_input[len('profile'):].strip()
+                    if target.lower() in ('on', 'off'):
+                        self.profiler.enabled = target.lower() == 'on'
+                        state = f"on - files {self.profiler.out_dir} mein" if self.profiler.enabled else "off"
+                        print(f"\n🤖 {self.name}: Profiling {state}")
+                    elif not target:
+                        print(f"\n🤖 {self.name}: Aise likhein: 'profile BTC' ya 'profile on' / 'profile off'")
+                    else:
+                        with self.profiler.section(target, force=True) as session:
+                            data = self.search_asset(target)
+                            response = self.format_response(data)
+                        print(f"\n🤖 {self.name}:\n{response}\n")
+                        print(format_profile(session.report))
+                    continue
+                
+                # Consolidated order book
+                depth = BOOK_RE.match(user_input)
+                if depth:
+                    asset, size = depth.groups()
+                    print(f"\n🤖 {self.name}:\n{self.format_order_book(self.order_book(asset, float(size or 1)))}")
+                    continue
+                
+                # Display currency badle
+                if user_input.lower().startswith('currency'):
+                    parts = user_input.upper().split()
+                    if len(parts) == 2 and self.fx.supports(parts[1]):
+                        self.display_currency = parts[1]
+                        print(f"\n🤖 {self.name}: Ab prices {parts[1]} mein bhi dikhenge")
+                    else:
+                        print(f"\n🤖 {self.name}: Ye currencies chalti hain: {', '.join(self.fx.currencies)}")
+                    continue
+                
+                # Live watch mode
+                if user_input.lower().startswith('watch '):
+                    symbols = user_input.split()[1:]
+                    self.watch(symbols)
+                    continue
+                
+                # Pichhle "Kya aapka matlab" mein se number chuna
+                if choices and user_input.isdigit() and 1 <= int(user_input) <= len(choices):
+                    user_input = choices[int(user_input) - 1]['phrase']
+                choices = []
+                
                 # Process query
                 print(f"\n🤖 {self.name}: {user_input} ka data dhoondh raha hun...")
                 
-                # Thoda wait dikhane ke liye
-                time.sleep(0.5)
-                
                 # Search for asset
-                data = self.search_asset(user_input)
-                
-                # Format and show response
-                response = self.format_response(data)
+                with self.metrics.timer('stage_latency_ms', stage='chat'), \
+                        self.profiler.section(user_input) as session:
+                    data = self.search_asset(user_input)
+                    
+                    # Format and show response
+                    response = self.format_response(data)
                 
                 print(f"\n🤖 {self.name}:")
                 print("-" * 40)
                 print(response)
                 print("-" * 40)
+                if session.report:
+                    print(f"🔬 {session.report['wall_ms']:.1f} ms profiled: {', '.join(session.report.get('files', []))}")
                 
                 # Conversation history mein add karein
-                self.conversation.append({
-                    'user': user_input,
-                    'bot': response,
-                    'time': self.get_current_time()
-                })
+                self.remember(user_input, data)
+                choices = data.get('suggestions') or []
                 
             except KeyboardInterrupt:
                 print(f"\n\n🤖 {self.name}: Chat interrupted. Alvida!")
@@ -479,6 +1743,9 @@ class SimpleTradingBot:
             except Exception as e:
                 print(f"\n🤖 {self.name}: Error aaya: {str(e)}")
                 print("Kripya phir se try karein.")
+        
+        # Agli baar warm start ke liye
+        self.save_snapshot()
 
 # ============================================================================
 # EK AUR SIMPLE VERSION - BILKUL BASIC
@@ -622,22 +1889,210 @@ def quick_test():
         print(f"\n🔍 Testing: {query}")
         print("-" * 30)
         
-        data = bot.search_asset(query)
-        response = bot.format_response(data)
+        with bot.profiler.section(query) as session:
+            data = bot.search_asset(query)
+            response = bot.format_response(data)
         print(response[:150] + "..." if len(response) > 150 else response)
-        
-        time.sleep(0.5)
+        if session.report:
+            print(format_profile(session.report))
     
     print("\n✅ Test complete! Bot kaam kar raha hai.")
 
+# ============================================================================
+# HEADLESS CLI - scripts aur cron ke liye (koi banner, menu ya sleep nahi)
+# ============================================================================
+
+def _print_result(query: str, data: Dict, as_json: bool, bot: SimpleTradingBot, out=None):
+    """Ek result - JSON line ya formatted text"""
+    out = out or sys.stdout
+    if as_json:
+        out.write(json.dumps({'query': query, **data}, ensure_ascii=False) + "\n")
+    else:
+        out.write(bot.format_response(data) + "\n\n")
+    out.flush()
+
+def _run_command(bot: SimpleTradingBot, args) -> int:
+    """Ek headless command chalaye - kitni queries fail huin"""
+    failed = 0
+    if args.command == 'serve':
+        from quote_server import serve as serve_http
+        serve_http(bot, args.host, args.port)
+    elif args.command == 'portfolio':
+        bot.refresh_portfolio()
+        if args.json:
+            print(json.dumps({'summary': bot.portfolio.summary(), 'positions': bot.portfolio.positions()},
+                             ensure_ascii=False, default=str))
+        else:
+            print(bot.format_portfolio())
+    elif args.command == 'backtest':
+        import backtest
+        
+        if args.symbols:
+            symbols = [bot.resolve_stock_symbol(q) or q.upper() for q in args.symbols]
+            source = {'kind': 'store', 'root': bot.bars.root, 'symbols': symbols}
+        else:
+            source = {'kind': 'sim', 'symbols': args.sim, 'seed': args.seed, 'interval': args.interval,
+                      'bars': int(args.days * 86400 // args.interval)}
+        try:
+            params = backtest.param_grid(**backtest.parse_sweep(args.sweep))
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            raise SystemExit(2)
+        report = backtest.run(source, params, args.workers)
+        failed += not report.get('success')
+        print(json.dumps(report, ensure_ascii=False) if args.json else backtest.format_report(report, args.top))
+    elif args.command == 'book':
+        for query in args.assets:
+            data = bot.order_book(query, args.size, args.exchanges.split(',') if args.exchanges else None,
+                                  args.standin or None)
+            failed += not data.get('success')
+            if args.json:
+                print(json.dumps({'query': query, **data}, ensure_ascii=False))
+            else:
+                print(bot.format_order_book(data) + "\n")
+    elif args.command == 'quote':
+        # Saare queries ek batch mein - har provider ki ek hi call
+        for query, data in zip(args.queries, bot.search_many(args.queries)):
+            failed += not data.get('success')
+            _print_result(query, data, args.json, bot)
+    else:
+        try:
+            source = sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')
+        except OSError as e:
+            print(f"❌ {args.file} nahi khuli: {e.strerror or e}", file=sys.stderr)
+            raise SystemExit(2)
+        try:
+            # Line aate hi jawab - lambi chalne wali pipe ke liye bhi theek
+            for line in source:
+                query = line.strip()
+                if not query or query.startswith('#'):
+                    continue
+                data = bot.search_asset(query)
+                failed += not data.get('success')
+                _print_result(query, data, True, bot)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    return failed
+
+def _launch_dashboard(port: int) -> int:
+    """`streamlit run dashboard.py` - bot dashboard process ke andar banta hai"""
+    import importlib.util
+    import subprocess
+    
+    if importlib.util.find_spec('streamlit') is None:
+        print("❌ streamlit install nahi hai (pip install -r requirements.txt)", file=sys.stderr)
+        return 1
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.py')
+    try:
+        return subprocess.call([sys.executable, '-m', 'streamlit', 'run', script, '--server.port', str(port)])
+    except KeyboardInterrupt:
+        return 0
+
+def run_cli(argv: List[str]) -> int:
+    """
+    Non-interactive entry point:
+      app.py quote BTC AAPL gold [--json]
+      app.py stream [FILE]          (FILE na ho ya '-' ho toh stdin; har line ek query)
+      app.py serve [--port 8080]    (dashboards ke liye HTTP quote service)
+      app.py portfolio [--json]     (positions + 4-point risk)
+      app.py backtest [AAPL ...] [--sim 50 --days 5] [--sweep stop_pct=0.005,0.01] [--json]
+      app.py book BTC [ETH ...] [--size 2] [--exchanges binance,kraken] [--standin] [--json]
+      app.py dashboard [--port 8501] (Streamlit watchlist, charts aur alerts)
+    Exit code 1 agar koi query fail hui
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='app.py', description="Trading bot - headless mode")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    quote = commands.add_parser('quote', help="Ek ya zyada assets ka quote")
+    quote.add_argument('queries', nargs='+', help="BTC, AAPL, gold, EUR/USD ...")
+    quote.add_argument('--json', action='store_true', help="Har result ek JSON line")
+    quote.add_argument('--timeout', type=float, default=SimpleTradingBot.HTTP_TIMEOUT,
+                       help="HTTP timeout (seconds)")
+    
+    stream = commands.add_parser('stream', help="File/stdin se queries, har result ek JSON line")
+    stream.add_argument('file', nargs='?', default='-', help="Queries ki file ('-' = stdin)")
+    stream.add_argument('--timeout', type=float, default=SimpleTradingBot.HTTP_TIMEOUT,
+                        help="HTTP timeout (seconds)")
+    
+    serve = commands.add_parser('serve', help="HTTP quote service (quote/batch/search endpoints)")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--timeout', type=float, default=SimpleTradingBot.HTTP_TIMEOUT,
+                       help="HTTP timeout (seconds)")
+    
+    book = commands.add_parser('portfolio', help="Positions, P&L aur risk checks")
+    book.add_argument('--json', action='store_true', help="Summary aur positions JSON mein")
+    book.add_argument('--timeout', type=float, default=SimpleTradingBot.HTTP_TIMEOUT,
+                      help="HTTP timeout (seconds)")
+    
+    test = commands.add_parser('backtest', help="Signals + risk rules ka backtest (stored ya simulated bars)")
+    test.add_argument('symbols', nargs='*', help="Stored bars wale symbols (na hon toh simulated market)")
+    test.add_argument('--sim', type=int, default=50, help="Simulated symbols kitne")
+    test.add_argument('--days', type=float, default=5, help="Simulated history kitne din")
+    test.add_argument('--interval', type=int, default=60, help="Bar interval (seconds)")
+    test.add_argument('--seed', type=int, default=7, help="Simulator seed")
+    test.add_argument('--sweep', action='append', default=[], metavar='KEY=V1,V2',
+                      help="Parameter sweep (baar baar de sakte hain)")
+    test.add_argument('--workers', type=int, default=None, help="Process pool size (default: CPU count)")
+    test.add_argument('--top', type=int, default=10, help="Kitne best parameter sets dikhaye")
+    test.add_argument('--json', action='store_true', help="Poori report JSON mein")
+    test.add_argument('--timeout', type=float, default=SimpleTradingBot.HTTP_TIMEOUT,
+                      help="HTTP timeout (seconds)")
+    
+    depth = commands.add_parser('book', help="Exchanges ki consolidated order book, BBO aur slippage")
+    depth.add_argument('assets', nargs='+', help="BTC, ETH/USDT ...")
+    depth.add_argument('--size', type=float, default=1.0, help="Slippage kitne coins ke liye")
+    depth.add_argument('--exchanges', default=None, help="ccxt exchange ids, comma se (default binance,kraken,coinbase)")
+    depth.add_argument('--standin', action='store_true', help="Network ki jagah local stand-in exchanges")
+    depth.add_argument('--json', action='store_true', help="Har asset ek JSON line")
+    depth.add_argument('--timeout', type=float, default=SimpleTradingBot.HTTP_TIMEOUT,
+                       help="HTTP timeout (seconds)")
+    
+    dashboard = commands.add_parser('dashboard', help="Streamlit dashboard (watchlist, charts, alerts)")
+    dashboard.add_argument('--port', type=int, default=8501)
+    
+    args = parser.parse_args(argv)
+    if args.command == 'dashboard':
+        return _launch_dashboard(args.port)
+    bot = SimpleTradingBot("DeepSeek", quiet=True)
+    bot.HTTP_TIMEOUT = args.timeout
+    # Chhota process - background refresh ke poora hone tak rukta nahi, isliye FX hamesha yahin
+    bot.fx_background = False
+    failed = 0
+    
+    session = None
+    try:
+        # --profile ho toh poora command ek profile (serve ke requests apne threads pe alag)
+        with bot.profiler.section(' '.join(argv)) as session:
+            failed = _run_command(bot, args)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        bot.close()
+    
+    if session is not None and session.report:
+        print(format_profile(session.report), file=sys.stderr)
+    return 1 if failed else 0
+
 # ============================================================================
 # DIRECT RUN
 # ============================================================================
 
 if __name__ == "__main__":
+    # --profile (ya --profile=cprofile): har chat turn / query profile ho, files data/profiles mein
+    for arg in [a for a in sys.argv[1:] if a == '--profile' or a.startswith('--profile=')]:
+        sys.argv.remove(arg)
+        os.environ['TRADING_BOT_PROFILE'] = arg.partition('=')[2] or '1'
+    
+    # Arguments diye hain toh headless mode
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+    
     # Simple banner
     print("🚀 SIMPLE TRADING BOT LOADING...")
-    time.sleep(1)
     
     # Ask user
     print("\nKya karna chahte ho?")
@@ -0,0 +1,183 @@
+"""
+FUZZY AUTOCOMPLETE
+- Resolver ke saare naam/tickers par trigram index (coins, stocks, commodities, forex)
+- Typo wali query ("etherium", "nvidea") ke ranked suggestions - bina network ke
+- Candidates trigram overlap se (numpy bincount), phir top wale edit distance se re-rank
+- Ek query ~sub-millisecond, 30k listing ke saath bhi
+- Index flat arrays mein (CSR) - marshal se snapshot mein jaata hai, dobara banana nahi padta
+"""
+
+import marshal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Itne candidates hi edit distance tak pahunchte hain
+CANDIDATES = 48
+
+# Isse kam trigram similarity wale candidate nahi maane jaate
+MIN_OVERLAP = 0.25
+
+# Auto-correct tabhi jab top suggestion itna close ho aur dusre se saaf behtar
+AUTOCORRECT_SCORE = 0.8
+AUTOCORRECT_MARGIN = 0.05
+
+
+def trigrams(text: str) -> List[str]:
+    """'btc' -> ['  b', ' bt', 'btc', 'tc '] (chhote words ke liye padding)"""
+    padded = f"  {text} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Damerau-Levenshtein (adjacent swap = 1 edit, "appel" -> "apple").
+    `limit` se zyada ho toh limit + 1 (jaldi bahar).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+            best = min(best, cost)
+        if best > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class Suggestion:
+    """Ek ranked suggestion"""
+    
+    __slots__ = ('phrase', 'asset_class', 'symbol', 'score')
+    
+    def __init__(self, phrase: str, asset_class: str, symbol: str, score: float):
+        self.phrase = phrase
+        self.asset_class = asset_class
+        self.symbol = symbol
+        self.score = score
+    
+    def __repr__(self) -> str:
+        return f"Suggestion({self.phrase!r}, {self.asset_class!r}, {self.symbol!r}, {self.score:.2f})"
+    
+    def to_dict(self) -> Dict:
+        return {'phrase': self.phrase, 'asset_class': self.asset_class,
+                'symbol': self.symbol, 'score': round(self.score, 3)}
+
+
+class FuzzyIndex:
+    """
+    Phrase -> (asset_class, symbol) ka trigram inverted index.
+    Postings CSR layout mein: gram ki ids = owners[bounds[g]:bounds[g + 1]]
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[str, str, str]] = (),
+                 class_priority: Optional[Dict[str, int]] = None):
+        self.phrases: List[str] = []
+        self.values: List[Tuple[str, str]] = []
+        self.class_priority = class_priority or {}
+        self.grams: Dict[str, int] = {}
+        
+        gram_ids: List[int] = []
+        sizes: List[int] = []
+        intern = self.grams.setdefault
+        for phrase, asset_class, symbol in entries:
+            self.phrases.append(phrase)
+            self.values.append((asset_class, symbol))
+            grams = set(trigrams(phrase))
+            sizes.append(len(grams))
+            gram_ids.extend([intern(gram, len(self.grams)) for gram in grams])
+        
+        # (gram, phrase) pairs gram ke hisaab se sort - har gram ki postings ek slice
+        gram_ids = np.array(gram_ids, dtype=np.int32)
+        owners = np.repeat(np.arange(len(self.phrases), dtype=np.int32), sizes)
+        order = np.argsort(gram_ids, kind='stable')
+        self.owners = owners[order]
+        self.bounds = np.searchsorted(gram_ids[order], np.arange(len(self.grams) + 1)).astype(np.int32)
+        self.sizes = np.array(sizes, dtype=np.int32)
+    
+    def __len__(self) -> int:
+        return len(self.phrases)
+    
+    def dumps(self) -> bytes:
+        return marshal.dumps((self.phrases, self.values, self.class_priority, list(self.grams),
+                              self.owners.tobytes(), self.bounds.tobytes(), self.sizes.tobytes()))
+    
+    @classmethod
+    def loads(cls, data: bytes) -> Optional['FuzzyIndex']:
+        try:
+            phrases, values, class_priority, grams, owners, bounds, sizes = marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+        index = cls(class_priority=class_priority)
+        index.phrases = phrases
+        index.values = values
+        index.grams = {gram: i for i, gram in enumerate(grams)}
+        index.owners = np.frombuffer(owners, dtype=np.int32)
+        index.bounds = np.frombuffer(bounds, dtype=np.int32)
+        index.sizes = np.frombuffer(sizes, dtype=np.int32)
+        return index
+    
+    def _candidates(self, text: str) -> np.ndarray:
+        """Trigram overlap (Dice) ke hisaab se top ids"""
+        grams = set(trigrams(text))
+        bounds, owners = self.bounds, self.owners
+        lists = [owners[bounds[g]:bounds[g + 1]] for g in (self.grams.get(gram) for gram in grams)
+                 if g is not None]
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.phrases))
+        dice = 2.0 * counts / (len(grams) + self.sizes)
+        if len(dice) > CANDIDATES:
+            top = np.argpartition(-dice, CANDIDATES)[:CANDIDATES]
+        else:
+            top = np.arange(len(dice))
+        return top[dice[top] >= MIN_OVERLAP]
+    
+    def search(self, text: str, limit: int = 5) -> List[Suggestion]:
+        """Ranked suggestions - har (asset_class, symbol) ek hi baar"""
+        text = text.strip().lower()
+        if not text or not self.phrases:
+            return []
+        
+        ranked = []
+        max_edits = max(1, len(text) // 2)
+        for ident in self._candidates(text).tolist():
+            phrase = self.phrases[ident]
+            distance = edit_distance(text, phrase, max_edits)
+            score = 1.0 - distance / max(len(text), len(phrase)) if distance <= max_edits else 0.0
+            # Adhoora likha naam ("ethe") bhi upar aaye
+            if len(text) >= 2 and phrase.startswith(text):
+                score = max(score, 0.6 + 0.4 * len(text) / len(phrase))
+            if score > 0:
+                asset_class = self.values[ident][0]
+                ranked.append((-score, self.class_priority.get(asset_class, 9), len(phrase), ident))
+        ranked.sort()
+        
+        suggestions = []
+        seen = set()
+        for negative_score, _, _, ident in ranked:
+            value = self.values[ident]
+            if value in seen:
+                continue
+            seen.add(value)
+            suggestions.append(Suggestion(self.phrases[ident], value[0], value[1], -negative_score))
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+
+def best_correction(suggestions: List[Suggestion]) -> Optional[Suggestion]:
+    """Top suggestion itna pakka ho ki bina pooche use kar sakein"""
+    if not suggestions or suggestions[0].score < AUTOCORRECT_SCORE:
+        return None
+    if len(suggestions) > 1 and suggestions[0].score - suggestions[1].score < AUTOCORRECT_MARGIN:
+        return None
+    return suggestions[0]
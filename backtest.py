@@ -0,0 +1,417 @@
+"""
+BACKTESTER
+- format_response wale bullish/bearish signals ko purane ya simulated bars pe chalata hai
+- Entry/exit signal_score se, stop/target aur position size portfolio ke risk rules se
+- Indicators blocks mein vectorized (EMA closed form), position loop saare symbols x
+  saare parameter sets pe ek saath
+- Symbols chunks mein process pool pe; parameter sweep ek hi data pass mein
+- Report: return, max drawdown, hit rate, trades, exposure aur runtime
+"""
+
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from indicators import DEFAULT_PARAMS as INDICATOR_PARAMS, RSI_OVERBOUGHT, RSI_OVERSOLD, signal_score
+from portfolio import DEFAULT_LIMITS
+
+# Ek parameter set - sweep inme se koi bhi key badal sakta hai
+DEFAULT_PARAMS = {
+    'entry_score': 2,           # |score| itna ho toh position (describe ka "Strong" trend)
+    'exit_score': 1,            # ulta score itna ho toh bahar
+    'stop_pct': 0.01,           # entry se stop ki doori (fraction)
+    'reward_risk': DEFAULT_LIMITS['min_reward_risk'],
+    'risk_pct': DEFAULT_LIMITS['max_risk_pct'],
+    'fee_bps': 5.0,             # har side ka cost
+    'allow_short': True,
+    'rsi_upper': RSI_OVERBOUGHT,
+    'rsi_lower': RSI_OVERSOLD,
+    'ema_fast': INDICATOR_PARAMS['ema_fast'],
+    'ema_slow': INDICATOR_PARAMS['ema_slow'],
+    'macd_signal': INDICATOR_PARAMS['macd_signal'],
+    'rsi': INDICATOR_PARAMS['rsi'],
+}
+
+# Ye keys badlen toh indicators dobara bante hain; baaki sirf position loop mein
+INDICATOR_KEYS = ('ema_fast', 'ema_slow', 'macd_signal', 'rsi')
+
+# Simulated data itne symbols ke group mein banta hai (seed group se) - workers kitne bhi hon, data same
+SIM_GROUP = 50
+
+# Ek block mein itne bars (memory bounded rehti hai, lambi history bhi)
+BLOCK_BARS = 1440
+
+# Portfolio equity curve har itne bars pe (drawdown isi se)
+CURVE_EVERY = 60
+
+
+def param_grid(base: Optional[Dict] = None, **axes: Sequence) -> List[Dict]:
+    """Har axis ki har value ka combination: param_grid(stop_pct=[0.005, 0.01], entry_score=[1, 2])"""
+    base = dict(DEFAULT_PARAMS, **(base or {}))
+    unknown = set(axes) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown backtest params: {', '.join(sorted(unknown))}")
+    keys = list(axes)
+    return [dict(base, **dict(zip(keys, values))) for values in itertools.product(*(axes[k] for k in keys))]
+
+
+def parse_sweep(specs: Iterable[str]) -> Dict[str, List]:
+    """CLI ke 'stop_pct=0.005,0.01' jaise specs -> {'stop_pct': [0.005, 0.01]}"""
+    axes = {}
+    for spec in specs:
+        key, _, values = spec.partition('=')
+        key = key.strip()
+        if key not in DEFAULT_PARAMS or not values:
+            raise ValueError(f"Bad sweep spec: {spec!r}")
+        kind = type(DEFAULT_PARAMS[key])
+        if kind is bool:
+            axes[key] = [v.strip().lower() in ('1', 'true', 'yes', 'y') for v in values.split(',')]
+        else:
+            axes[key] = [kind(float(v)) if kind is int else kind(v) for v in values.split(',')]
+    return axes
+
+
+# ----------------------------------------------------------------- indicators
+
+def _ewm_block(x: np.ndarray, alpha: float, state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (bars, symbols) block ka EWM, pichhli state se aage. Bina per-bar loop:
+    y_t = g_t * (y_0 + sum(alpha * x_k / g_k)), g_k = (1 - alpha)^k.
+    g underflow na ho isliye chhote sub-blocks. NaN sirf symbol ke pehle bar se pehle hota hai
+    (data forward-filled hai); pehla valid value state seed karta hai - IncrementalIndicators jaisa
+    """
+    out = np.empty_like(x)
+    if alpha >= 1.0:
+        out[:] = x
+        valid = ~np.isnan(x)
+        last = np.where(valid.any(axis=0), x[-1], state) if len(x) else state
+        return out, last
+    
+    sub = max(1, int(300.0 / -math.log1p(-alpha)))
+    state = state.copy()
+    columns = np.arange(x.shape[1])
+    for lo in range(0, len(x), sub):
+        part = x[lo:lo + sub]
+        missing = np.isnan(part)
+        unseeded = np.isnan(state)
+        if unseeded.any():
+            first = np.argmax(~missing, axis=0)
+            seed = part[first, columns]
+            state = np.where(unseeded, seed, state)
+            # Pehle bar se pehle bhi seed hi maan lo - phir pehle bar pe y = seed (seeding jaisa)
+            part = np.where(missing, state, part)
+        g = (1.0 - alpha) ** np.arange(1, len(part) + 1)
+        y = g[:, None] * (state + np.cumsum(part * (alpha / g)[:, None], axis=0))
+        y[missing] = np.nan
+        out[lo:lo + len(part)] = y
+        state = np.where(np.isnan(y[-1]), state, y[-1])
+    return out, state
+
+
+class _IndicatorState:
+    """Ek indicator setting ki carry state - block ke baad block"""
+    
+    def __init__(self, symbols: int, periods: Dict):
+        self.periods = periods
+        nan = np.full(symbols, np.nan)
+        self.ema_fast, self.ema_slow, self.macd_signal = nan.copy(), nan.copy(), nan.copy()
+        self.avg_gain, self.avg_loss = nan.copy(), nan.copy()
+        self.count = np.zeros(symbols, dtype=np.int64)
+    
+    def block(self, close: np.ndarray, prev_close: np.ndarray) -> Dict[str, np.ndarray]:
+        """Block ke indicators (IncrementalIndicators.update ke barabar, bina loop)"""
+        p = self.periods
+        ema_fast, self.ema_fast = _ewm_block(close, 2.0 / (p['ema_fast'] + 1), self.ema_fast)
+        ema_slow, self.ema_slow = _ewm_block(close, 2.0 / (p['ema_slow'] + 1), self.ema_slow)
+        line = ema_fast - ema_slow
+        signal, self.macd_signal = _ewm_block(line, 2.0 / (p['macd_signal'] + 1), self.macd_signal)
+        
+        previous = np.vstack([prev_close[None, :], close[:-1]])
+        delta = close - previous
+        gain, self.avg_gain = _ewm_block(np.clip(delta, 0, None), 1.0 / p['rsi'], self.avg_gain)
+        loss, self.avg_loss = _ewm_block(np.clip(-delta, 0, None), 1.0 / p['rsi'], self.avg_loss)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), 100.0 - 100.0 / (1.0 + gain / loss))
+        count = self.count + np.cumsum(~np.isnan(close), axis=0)
+        self.count = count[-1]
+        rsi = np.where(count > p['rsi'], rsi, np.nan)
+        return {'ema_slow': ema_slow, 'macd_hist': line - signal, 'rsi': rsi}
+
+
+# ----------------------------------------------------------------------- data
+
+def _forward_fill(values: np.ndarray, carry: np.ndarray) -> np.ndarray:
+    """(bars, symbols) ke NaN pichhle valid value se (block se pehle wala `carry` se)"""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], -1)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = values[np.clip(rows, 0, None), np.arange(values.shape[1])]
+    return np.where(rows >= 0, filled, carry)
+
+
+def _sim_blocks(seed: int, first: int, count: int, bars: int, interval: int) -> Iterator[Dict]:
+    """Simulated bars - har SIM_GROUP symbols ka apna seeded simulator"""
+    from simulator import MarketSimulator
+    
+    sims = []
+    for group_first in range(first, first + count, SIM_GROUP):
+        size = min(SIM_GROUP, first + count - group_first)
+        sim = MarketSimulator.synthetic(size, seed=seed * 100003 + group_first // SIM_GROUP,
+                                        first=group_first)
+        # Symbol number ke order mein columns
+        sims.append((sim, [sim.index[f"SIM{n:05d}"] for n in range(group_first, group_first + size)]))
+    
+    done = 0
+    while done < bars:
+        size = min(BLOCK_BARS, bars - done)
+        parts = [sim.bars(size, interval) for sim, _ in sims]
+        block = {name: np.hstack([part[name][:, order] for part, (_, order) in zip(parts, sims)])
+                 for name in ('open', 'high', 'low', 'close')}
+        block['ts'] = parts[0]['ts']
+        done += size
+        yield block
+
+
+def _store_blocks(root: str, symbols: Sequence[str], start: Optional[int], end: Optional[int],
+                  days_per_block: int = 5) -> Iterator[Dict]:
+    """BarStore ke bars, saare symbols ek time axis pe (jo bar na ho wo NaN)"""
+    from bar_store import BarStore
+    
+    store = BarStore(root)
+    days = sorted({day for symbol in symbols for day in store.days(symbol)})
+    for i in range(0, len(days), days_per_block):
+        window = days[i:i + days_per_block]
+        lo = int(np.datetime64(window[0], 's').astype(np.int64))
+        hi = int(np.datetime64(window[-1], 's').astype(np.int64)) + 86399
+        if start is not None:
+            lo = max(lo, start)
+        if end is not None:
+            hi = min(hi, end)
+        if lo > hi:
+            continue
+        data = [store.read(symbol, lo, hi) for symbol in symbols]
+        ts = np.unique(np.concatenate([d['ts'] for d in data]))
+        if not len(ts):
+            continue
+        block = {'ts': ts}
+        for name in ('open', 'high', 'low', 'close'):
+            column = np.full((len(ts), len(symbols)), np.nan)
+            for j, d in enumerate(data):
+                column[np.searchsorted(ts, d['ts']), j] = d[name]
+            block[name] = column
+        yield block
+
+
+# ---------------------------------------------------------------- simulation
+
+def _run_task(task: Dict) -> Dict:
+    """
+    Ek worker ka kaam: apne symbols ke saare blocks, saare parameter sets.
+    Partial sums wapas jaate hain (portfolio curve, trades, wins ...) - parent jodta hai
+    """
+    source = task['source']
+    if source['kind'] == 'sim':
+        blocks = _sim_blocks(source['seed'], task['first'], task['count'], source['bars'], source['interval'])
+        symbols = task['count']
+    else:
+        blocks = _store_blocks(source['root'], task['symbols'], source.get('start'), source.get('end'))
+        symbols = len(task['symbols'])
+    
+    params = task['params']
+    n = len(params)
+    column = lambda key, dtype=float: np.array([p[key] for p in params], dtype=dtype)[:, None]
+    entry_score, exit_score = column('entry_score'), column('exit_score')
+    stop_pct, reward_risk = column('stop_pct'), column('reward_risk')
+    fee = column('fee_bps') / 10000.0
+    allow_short = column('allow_short', bool)
+    size = np.minimum(1.0, column('risk_pct') / 100.0 / stop_pct)
+    
+    # Indicator settings ke groups - har group ek baar compute hota hai
+    groups: Dict[Tuple, List[int]] = {}
+    for i, p in enumerate(params):
+        groups.setdefault(tuple(p[k] for k in INDICATOR_KEYS), []).append(i)
+    states = {key: _IndicatorState(symbols, dict(zip(INDICATOR_KEYS, key))) for key in groups}
+    
+    shape = (n, symbols)
+    pos = np.zeros(shape, dtype=np.int8)
+    equity = np.ones(shape)
+    entry, stop, target, last = (np.zeros(shape) for _ in range(4))
+    trades = np.zeros(shape, dtype=np.int64)
+    wins = np.zeros(shape, dtype=np.int64)
+    trade_return = np.zeros(shape)
+    exposure = np.zeros(shape, dtype=np.int64)
+    curve: List[np.ndarray] = []
+    first_close = np.full(symbols, np.nan)
+    carry = np.full(symbols, np.nan)
+    bars = 0
+    
+    for block in blocks:
+        close = _forward_fill(block['close'], carry)
+        listed = ~np.isnan(close)
+        # Missing bar pe open/high/low = close (koi fake stop hit nahi)
+        open_, high, low = (np.where(np.isnan(block[k]), close, block[k]) for k in ('open', 'high', 'low'))
+        first_close = np.where(np.isnan(first_close), close[np.argmax(listed, axis=0), np.arange(symbols)],
+                               first_close)
+        
+        # (bars, param sets, symbols) - har bar ka slice contiguous
+        score = np.empty((len(close), n, symbols), dtype=np.int8)
+        for key, members in groups.items():
+            ind = states[key].block(close, carry)
+            for i in members:
+                score[:, i] = signal_score(close, ind['ema_slow'], ind['macd_hist'], ind['rsi'],
+                                        params[i]['rsi_upper'], params[i]['rsi_lower'])
+        carry = close[-1]
+        
+        for t in range(len(close)):
+            c, o, h, l = close[t], open_[t], high[t], low[t]
+            s = score[t]
+            long_, short = pos > 0, pos < 0
+            holding = long_ | short
+            
+            # Stop pehle (conservative), phir target; gap ho toh open pe fill
+            stop_hit = (long_ & (l <= stop)) | (short & (h >= stop))
+            target_hit = ~stop_hit & ((long_ & (h >= target)) | (short & (l <= target)))
+            price = np.where(stop_hit, np.where(long_, np.minimum(stop, o), np.maximum(stop, o)), c)
+            price = np.where(target_hit, np.where(long_, np.maximum(target, o), np.minimum(target, o)), price)
+            exiting = stop_hit | target_hit | (long_ & (s <= -exit_score)) | (short & (s >= exit_score))
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = np.where(holding, pos * (price / last - 1.0), 0.0)
+                result = np.where(exiting, pos * (price / entry - 1.0) - 2 * fee, 0.0)
+            equity *= 1.0 + size * step - size * fee * exiting
+            trades += exiting
+            wins += result > 0
+            trade_return += result
+            exposure += holding
+            pos[exiting] = 0
+            
+            # Naye entries (jis bar pe exit hua us pe nahi)
+            flat = ~holding & listed[t]
+            go_long = flat & (s >= entry_score)
+            go_short = flat & allow_short & (s <= -entry_score)
+            entering = go_long | go_short
+            if entering.any():
+                pos[go_long] = 1
+                pos[go_short] = -1
+                direction = pos * entering
+                entry = np.where(entering, c, entry)
+                stop = np.where(entering, c * (1.0 - direction * stop_pct), stop)
+                target = np.where(entering, c * (1.0 + direction * stop_pct * reward_risk), target)
+                equity *= 1.0 - size * fee * entering
+            last = np.where(entering, c, price)
+            
+            bars += 1
+            if bars % CURVE_EVERY == 0:
+                curve.append(equity.sum(axis=1))
+    
+    curve.append(equity.sum(axis=1))
+    with np.errstate(invalid='ignore'):
+        hold = np.nansum(carry / first_close - 1.0)
+    return {
+        'symbols': symbols, 'bars': bars, 'curve': np.array(curve), 'trades': trades.sum(axis=1),
+        'wins': wins.sum(axis=1), 'trade_return': trade_return.sum(axis=1),
+        'exposure': exposure.sum(axis=1), 'buy_hold': float(hold),
+    }
+
+
+def _tasks(source: Dict, params: List[Dict], workers: int) -> List[Dict]:
+    """Symbols ko workers mein baante (sim mein SIM_GROUP ke multiples - data same rahe)"""
+    if source['kind'] == 'sim':
+        groups = math.ceil(source['symbols'] / SIM_GROUP)
+        per_task = max(1, math.ceil(groups / workers)) * SIM_GROUP
+        return [{'source': source, 'params': params, 'first': first,
+                 'count': min(per_task, source['symbols'] - first)}
+                for first in range(0, source['symbols'], per_task)]
+    symbols = list(source['symbols'])
+    per_task = max(1, math.ceil(len(symbols) / workers))
+    return [{'source': source, 'params': params, 'symbols': symbols[i:i + per_task]}
+            for i in range(0, len(symbols), per_task)]
+
+
+def run(source: Dict, params: Optional[List[Dict]] = None, workers: Optional[int] = None) -> Dict:
+    """
+    Backtest chalaye. source:
+      {'kind': 'sim', 'symbols': 500, 'bars': 1440 * 365, 'interval': 60, 'seed': 7}
+      {'kind': 'store', 'root': BAR_ROOT, 'symbols': ['AAPL', ...], 'start': ts, 'end': ts}
+    Har parameter set ka result, best return pehle
+    """
+    started = time.perf_counter()
+    params = params or [dict(DEFAULT_PARAMS)]
+    workers = max(1, workers or os.cpu_count() or 1)
+    if source['kind'] == 'store':
+        # Jin symbols ke bars hi nahi wo average ko patla na karein
+        from bar_store import BarStore
+        store = BarStore(source['root'])
+        source = dict(source, symbols=[s for s in dict.fromkeys(source['symbols']) if store.days(s)])
+    tasks = _tasks(source, params, workers)
+    if not tasks:
+        return {'success': False, 'error': 'Backtest ke liye koi symbol nahi'}
+    
+    if workers == 1 or len(tasks) == 1:
+        parts = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            parts = list(pool.map(_run_task, tasks))
+    
+    symbols = sum(p['symbols'] for p in parts)
+    bars = max(p['bars'] for p in parts)
+    if not bars:
+        return {'success': False, 'error': 'Backtest ke liye bars nahi mile'}
+    
+    # Har symbol ka barabar hissa: portfolio equity = sleeves ka average
+    length = min(len(p['curve']) for p in parts)
+    curve = sum(p['curve'][:length] for p in parts) / symbols
+    peak = np.maximum.accumulate(curve, axis=0)
+    drawdown = (1.0 - curve / peak).max(axis=0)
+    trades = sum(p['trades'] for p in parts)
+    wins = sum(p['wins'] for p in parts)
+    trade_return = sum(p['trade_return'] for p in parts)
+    exposure = sum(p['exposure'] for p in parts)
+    
+    results = []
+    for i, p in enumerate(params):
+        count = int(trades[i])
+        results.append({
+            'params': {k: v for k, v in p.items() if v != DEFAULT_PARAMS[k]},
+            'return_pct': round(float(curve[-1, i] - 1.0) * 100, 3),
+            'max_drawdown_pct': round(float(drawdown[i]) * 100, 3),
+            'trades': count,
+            'hit_rate_pct': round(float(wins[i]) / count * 100, 2) if count else 0.0,
+            'avg_trade_pct': round(float(trade_return[i]) / count * 100, 4) if count else 0.0,
+            'exposure_pct': round(float(exposure[i]) / (symbols * bars) * 100, 2),
+        })
+    results.sort(key=lambda r: -r['return_pct'])
+    return {
+        'success': True,
+        'source': source['kind'],
+        'symbols': symbols,
+        'bars': bars,
+        'param_sets': len(params),
+        'workers': min(workers, len(tasks)),
+        'buy_hold_pct': round(sum(p['buy_hold'] for p in parts) / symbols * 100, 3),
+        'runtime_s': round(time.perf_counter() - started, 3),
+        'results': results,
+    }
+
+
+def format_report(report: Dict, top: int = 10) -> str:
+    """Report ki table"""
+    if not report.get('success'):
+        return f"❌ {report.get('error', 'Backtest fail hua')}"
+    lines = [
+        f"🧪 Backtest ({report['source']}): {report['symbols']} symbols x {report['bars']:,} bars, "
+        f"{report['param_sets']} parameter sets",
+        f"   Runtime: {report['runtime_s']:.1f}s on {report['workers']} worker(s) | "
+        f"Buy & hold: {report['buy_hold_pct']:+.2f}%",
+        f"   {'return':>9} {'max DD':>8} {'trades':>8} {'hit':>7} {'avg trd':>9} {'expo':>7}  params",
+    ]
+    for r in report['results'][:top]:
+        params = ', '.join(f"{k}={v}" for k, v in r['params'].items()) or 'default'
+        lines.append(f"   {r['return_pct']:>+8.2f}% {r['max_drawdown_pct']:>7.2f}% {r['trades']:>8} "
+                     f"{r['hit_rate_pct']:>6.1f}% {r['avg_trade_pct']:>+8.3f}% {r['exposure_pct']:>6.1f}%  {params}")
+    return "\n".join(lines)
@@ -0,0 +1,198 @@
+"""
+BAR STORE
+- Minute bars (OHLCV) local disk pe, columnar format mein
+- Partition: <root>/<SYMBOL>/<YYYY-MM-DD>/<column>.bin
+- Append sirf naye bars (last stored timestamp ke baad wale)
+- Reads memory-mapped hain - indicators ke liye zero-copy
+"""
+
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from paths import data_dir
+
+# Column name -> dtype (har column ki apni file)
+BAR_COLUMNS = (
+    ('ts', np.dtype('<i8')),
+    ('open', np.dtype('<f8')),
+    ('high', np.dtype('<f8')),
+    ('low', np.dtype('<f8')),
+    ('close', np.dtype('<f8')),
+    ('volume', np.dtype('<f8')),
+)
+
+DEFAULT_ROOT = os.path.join(data_dir(), 'bars')
+
+
+def _day_of(ts: int) -> str:
+    """Unix timestamp ka UTC din"""
+    return datetime.fromtimestamp(int(ts), tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+class BarStore:
+    """Symbol + din ke hisaab se partitioned columnar OHLCV store"""
+    
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self._last_ts: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+    
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol.upper().replace('/', '_'))
+    
+    def _day_dir(self, symbol: str, day: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), day)
+    
+    def days(self, symbol: str) -> List[str]:
+        """Symbol ke stored din (purane se naye)"""
+        path = self._symbol_dir(symbol)
+        if not os.path.isdir(path):
+            return []
+        return sorted(d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d)))
+    
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        """Aakhri stored bar ka timestamp"""
+        with self._lock:
+            return self._last_locked(symbol)
+    
+    def _last_locked(self, symbol: str) -> Optional[int]:
+        """last_timestamp - self._lock pakad ke hi bulana"""
+        key = symbol.upper()
+        if key not in self._last_ts:
+            self._last_ts[key] = self._read_last_timestamp(symbol)
+        return self._last_ts[key]
+    
+    def _read_last_timestamp(self, symbol: str) -> Optional[int]:
+        for day in reversed(self.days(symbol)):
+            ts = self.read_day(symbol, day).get('ts')
+            if ts is not None and len(ts):
+                return int(ts[-1])
+        return None
+    
+    def append(self, symbol: str, ts: Sequence, open_: Sequence, high: Sequence,
+               low: Sequence, close: Sequence, volume: Sequence) -> int:
+        """Naye bars jode; jo pehle se stored hain wo skip. Kitne jode wo bataye"""
+        columns = {
+            'ts': np.asarray(ts, dtype='<i8'),
+            'open': np.asarray(open_, dtype='<f8'),
+            'high': np.asarray(high, dtype='<f8'),
+            'low': np.asarray(low, dtype='<f8'),
+            'close': np.asarray(close, dtype='<f8'),
+            'volume': np.asarray(volume, dtype='<f8'),
+        }
+        
+        # Read, filter aur write ek hi lock mein - do threads same bars dobara na likhein
+        with self._lock:
+            # Adhoore bars (close missing) aur purane bars hataye
+            last = self._last_locked(symbol)
+            keep = ~np.isnan(columns['close'])
+            if last is not None:
+                keep &= columns['ts'] > last
+            if not keep.any():
+                return 0
+            order = np.argsort(columns['ts'][keep], kind='stable')
+            columns = {name: values[keep][order] for name, values in columns.items()}
+            
+            # Din ke hisaab se partition mein likhe
+            days = np.array([_day_of(t) for t in columns['ts']])
+            try:
+                for day in dict.fromkeys(days):
+                    mask = days == day
+                    day_dir = self._day_dir(symbol, day)
+                    os.makedirs(day_dir, exist_ok=True)
+                    self._align_columns(day_dir)
+                    for name, dtype in BAR_COLUMNS:
+                        with open(os.path.join(day_dir, f"{name}.bin"), 'ab') as f:
+                            f.write(columns[name][mask].astype(dtype, copy=False).tobytes())
+            except OSError:
+                # Beech mein ruk gaye - agli baar last timestamp disk se dobara padha jaaye
+                self._last_ts.pop(symbol.upper(), None)
+                raise
+            self._last_ts[symbol.upper()] = int(columns['ts'][-1])
+            return len(columns['ts'])
+    
+    def _align_columns(self, day_dir: str):
+        """Pichhli adhoori write ke baad saari column files common length tak kaate (append se pehle)"""
+        paths = [(os.path.join(day_dir, f"{name}.bin"), dtype) for name, dtype in BAR_COLUMNS]
+        rows = min(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+                   for path, dtype in paths)
+        for path, dtype in paths:
+            if os.path.exists(path) and os.path.getsize(path) != rows * dtype.itemsize:
+                os.truncate(path, rows * dtype.itemsize)
+    
+    def append_yahoo_chart(self, symbol: str, result: Dict) -> int:
+        """Yahoo v8 chart result ke minute bars store kare"""
+        timestamps = result.get('timestamp') or []
+        quotes = (result.get('indicators', {}).get('quote') or [{}])[0]
+        if not timestamps or not quotes:
+            return 0
+        
+        def column(name):
+            values = quotes.get(name) or [None] * len(timestamps)
+            return [np.nan if v is None else v for v in values]
+        
+        return self.append(symbol, timestamps, column('open'), column('high'),
+                           column('low'), column('close'), column('volume'))
+    
+    def read_day(self, symbol: str, day: str) -> Dict[str, np.ndarray]:
+        """Ek din ke columns - memory-mapped (copy nahi hoti)"""
+        day_dir = self._day_dir(symbol, day)
+        paths = {name: os.path.join(day_dir, f"{name}.bin") for name, _ in BAR_COLUMNS}
+        if not all(os.path.exists(path) for path in paths.values()):
+            return {}
+        # Adhoori write ho toh sabse chhota column length maante hain (aadhi row bhi chhodte hain)
+        rows = min(os.path.getsize(paths[name]) // dtype.itemsize for name, dtype in BAR_COLUMNS)
+        if rows == 0:
+            return {}
+        return {name: np.memmap(paths[name], dtype=dtype, mode='r', shape=(rows,))
+                for name, dtype in BAR_COLUMNS}
+    
+    def read(self, symbol: str, start: Optional[int] = None,
+             end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Time range ke bars; ek din ho toh zero-copy view, warna concat"""
+        parts = []
+        for day in self.days(symbol):
+            if start is not None and day < _day_of(start):
+                continue
+            if end is not None and day > _day_of(end):
+                continue
+            data = self.read_day(symbol, day)
+            if data:
+                parts.append(data)
+        
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in BAR_COLUMNS}
+        if len(parts) == 1:
+            data = parts[0]
+        else:
+            data = {name: np.concatenate([p[name] for p in parts]) for name, _ in BAR_COLUMNS}
+        
+        # ts sorted hai - range ke liye searchsorted (slicing bhi view hi deti hai)
+        lo = 0 if start is None else int(np.searchsorted(data['ts'], start, side='left'))
+        hi = len(data['ts']) if end is None else int(np.searchsorted(data['ts'], end, side='right'))
+        return {name: values[lo:hi] for name, values in data.items()}
+    
+    def tail(self, symbol: str, count: int) -> Dict[str, np.ndarray]:
+        """Aakhri `count` bars (indicators ke liye)"""
+        parts = []
+        total = 0
+        for day in reversed(self.days(symbol)):
+            data = self.read_day(symbol, day)
+            if not data:
+                continue
+            parts.append(data)
+            total += len(data['ts'])
+            if total >= count:
+                break
+        
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in BAR_COLUMNS}
+        if len(parts) == 1:
+            data = parts[0]
+        else:
+            data = {name: np.concatenate([p[name] for p in reversed(parts)]) for name, _ in BAR_COLUMNS}
+        return {name: values[-count:] for name, values in data.items()}
@@ -0,0 +1,450 @@
+"""
+OFFLINE BENCHMARK
+- Local replay server: recorded CoinGecko simple/price aur Yahoo chart/quote responses
+- Latency, errors aur timeouts inject kar sakte hain
+- search_asset, format_response aur batch refresh ka p50/p95/p99 + throughput
+- Seeded market simulator se deterministic high-rate feed (tick aur QuoteHub load)
+- Baseline JSON mein save hota hai - agle run mein regression diff dikhta hai
+
+Usage:
+    python benchmark.py run --latency-ms 20 --iterations 200
+    python benchmark.py run --save-baseline
+    python benchmark.py record        # live APIs se fixtures dobara record kare
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+# Benchmark queries - har asset class se kuch
+QUERIES = ['BTC', 'ETH', 'SOL', 'AAPL', 'TSLA', 'MSFT', 'Gold', 'Crude oil', 'USD/INR', 'EUR/USD']
+
+# Batch refresh ke liye watchlist
+WATCHLIST = ['BTC', 'ETH', 'SOL', 'ADA', 'XRP', 'DOGE', 'BNB', 'MATIC', 'DOT',
+             'AAPL', 'TSLA', 'MSFT', 'AMZN', 'GOOGL', 'META', 'NVDA', 'INFY',
+             'Gold', 'Silver', 'Oil', 'USD/INR', 'EUR/USD', 'USD/JPY']
+
+
+def load_fixtures(path: str = FIXTURES_DIR) -> Dict:
+    """Recorded responses padhe"""
+    with open(os.path.join(path, 'coingecko_simple_price.json')) as f:
+        coingecko = json.load(f)
+    charts = {}
+    for chart_path in glob.glob(os.path.join(path, 'yahoo_chart_*.json')):
+        symbol = os.path.basename(chart_path)[len('yahoo_chart_'):-len('.json')]
+        with open(chart_path) as f:
+            charts[symbol] = json.load(f)
+    fx = {}
+    fx_path = os.path.join(path, 'yahoo_fx_quotes.json')
+    if os.path.exists(fx_path):
+        with open(fx_path) as f:
+            fx = {quote['symbol']: quote for quote in json.load(f)}
+    return {'coingecko': coingecko, 'charts': charts, 'fx': fx}
+
+
+class ReplayServer:
+    """CoinGecko + Yahoo ka local stand-in (fault injection ke saath)"""
+    
+    def __init__(self, fixtures: Optional[Dict] = None, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, hang: float = 10.0,
+                 seed: int = 0, port: int = 0):
+        self.fixtures = fixtures or load_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang = hang
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> 'ReplayServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def __enter__(self) -> 'ReplayServer':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _fault(self) -> Optional[str]:
+        """Is request pe kya inject karna hai: None, 'error' ya 'timeout'"""
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if roll < self.timeout_rate:
+            return 'timeout'
+        if roll < self.timeout_rate + self.error_rate:
+            time.sleep(delay)
+            return 'error'
+        time.sleep(delay)
+        return None
+    
+    def route(self, path: str, query: Dict[str, List[str]]):
+        """Path -> (status, body)"""
+        if path == '/api/v3/simple/price':
+            ids = query.get('ids', [''])[0].split(',')
+            prices = self.fixtures['coingecko']
+            return 200, {coin_id: prices[coin_id] for coin_id in ids if coin_id in prices}
+        
+        if path.startswith('/v8/finance/chart/'):
+            symbol = unquote(path[len('/v8/finance/chart/'):])
+            chart = self.fixtures['charts'].get(symbol)
+            if chart is None:
+                return 404, {'chart': {'result': None, 'error': {
+                    'code': 'Not Found', 'description': 'No data found, symbol may be delisted'}}}
+            return 200, chart
+        
+        if path == '/v7/finance/quote':
+            results = []
+            for symbol in query.get('symbols', [''])[0].split(','):
+                if symbol in self.fixtures.get('fx', {}):
+                    results.append(self.fixtures['fx'][symbol])
+                    continue
+                chart = self.fixtures['charts'].get(symbol)
+                if chart is None:
+                    continue
+                meta = chart['chart']['result'][0]['meta']
+                results.append({
+                    'symbol': symbol,
+                    'currency': meta.get('currency'),
+                    'regularMarketPrice': meta.get('regularMarketPrice'),
+                    'regularMarketPreviousClose': meta.get('previousClose'),
+                    'regularMarketTime': meta.get('regularMarketTime'),
+                })
+            return 200, {'quoteResponse': {'result': results, 'error': None}}
+        
+        return 404, {'error': 'not found'}
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers aur body alag packets mein jaate hain - Nagle delay se bachne ke liye
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                fault = server._fault()
+                if fault == 'timeout':
+                    time.sleep(server.hang)
+                    return
+                parts = urlsplit(self.path)
+                if fault == 'error':
+                    status, body = 503, {'error': 'injected failure'}
+                else:
+                    status, body = server.route(parts.path, parse_qs(parts.query))
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Sorted list ka percentile (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def measure(name: str, func: Callable[[int], int], iterations: int) -> Dict:
+    """func(i) ko iterations baar chalaye; func kitne items process hue wo return kare"""
+    latencies = []
+    items = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        items += func(i) or 1
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'name': name,
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50), 4),
+        'p95_ms': round(percentile(latencies, 95), 4),
+        'p99_ms': round(percentile(latencies, 99), 4),
+        'mean_ms': round(sum(latencies) / len(latencies), 4),
+        'throughput_per_s': round(items / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def make_bot(server: ReplayServer, cached: bool, timeout: float):
+    """Replay server se baat karne wala bot (cache on/off)"""
+    from app import SimpleTradingBot
+    from bar_store import BarStore
+    from quote_cache import QuoteCache
+    from snapshot import Snapshot
+    from transport import Transport
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot = SimpleTradingBot(
+            "Bench",
+            cache=QuoteCache() if cached else QuoteCache(max_size=0),
+            bar_store=BarStore(tempfile.mkdtemp(prefix='bench-bars-')),
+            # Replay server pe rate limit nahi - poori speed se measure karte hain
+            transport=Transport(),
+            snapshot=Snapshot(os.path.join(tempfile.mkdtemp(prefix='bench-snap-'), 'snapshot.db')),
+        )
+    bot.COINGECKO_BASE = server.url
+    bot.YAHOO_BASE = server.url
+    bot.HTTP_TIMEOUT = timeout
+    return bot
+
+
+def run_suite(server: ReplayServer, iterations: int, timeout: float) -> List[Dict]:
+    """Saare scenarios chalaye"""
+    results = []
+    sink = io.StringIO()
+    
+    # 1. search_asset bina cache ke - har baar provider path
+    bot = make_bot(server, cached=False, timeout=timeout)
+    with contextlib.redirect_stdout(sink):
+        results.append(measure('search_asset.cold',
+                               lambda i: bool(bot.search_asset(QUERIES[i % len(QUERIES)])), iterations))
+    
+    # 2. search_asset cache ke saath
+    bot = make_bot(server, cached=True, timeout=timeout)
+    with contextlib.redirect_stdout(sink):
+        results.append(measure('search_asset.cached',
+                               lambda i: bool(bot.search_asset(QUERIES[i % len(QUERIES)])), iterations))
+        
+        # 3. format_response - pehle se fetched data pe
+        fetched = [bot.search_asset(q) for q in QUERIES]
+    results.append(measure('format_response',
+                           lambda i: bool(bot.format_response(fetched[i % len(fetched)])), iterations))
+    
+    # 4. Poori watchlist ka batch refresh
+    bot = make_bot(server, cached=False, timeout=timeout)
+    with contextlib.redirect_stdout(sink):
+        results.append(measure('search_many.watchlist',
+                               lambda i: len(bot.search_many(WATCHLIST)), max(1, iterations // 10)))
+        
+        # 5. Wahi watchlist columnar batch mein (bina per-row dicts)
+        results.append(measure('quote_batch.watchlist',
+                               lambda i: len(bot.quote_batch(WATCHLIST)), max(1, iterations // 10)))
+    
+    # 6. 5000-position book: har tick pe 50 symbols badle (incremental reprice)
+    from portfolio import Portfolio
+    symbols = [f"SYM{n}" for n in range(1000)]
+    book = Portfolio.from_positions({'symbol': symbols[n % len(symbols)], 'qty': 1 + n % 97, 'entry': 100.0,
+                                     'stop': 90.0, 'target': 130.0} for n in range(5000))
+    ticks = [{symbol: 100.0 + (n * 7 + k) % 13 - 6 for k, symbol in enumerate(symbols[n % 20 * 50:][:50])}
+             for n in range(20)]
+    results.append(measure('portfolio.reprice_5000',
+                           lambda i: book.update(ticks[i % len(ticks)]), iterations))
+    
+    # 7. Seeded simulator: 5000 symbols ka ek tick (load tests ka feed)
+    from simulator import MarketSimulator
+    sim = MarketSimulator.synthetic(5000, seed=0)
+    results.append(measure('simulator.tick_5000', lambda i: len(sim.step(1.0)), iterations))
+    
+    # 8. QuoteHub simulator feed pe - 1000 symbols, har tick pe saare badle hue quotes
+    from quote_stream import QuoteHub
+    hub = QuoteHub(sim.feed(1.0))
+    subscriptions = [hub.subscribe(sim.symbols[n * 100:(n + 1) * 100], interval=3600) for n in range(10)]
+    results.append(measure('quote_hub.sim_feed_1000', lambda i: hub.tick(), max(1, iterations // 10)))
+    for subscription in subscriptions:
+        subscription.close()
+    
+    # 9. Backtest: 50 simulated symbols x ek din ke minute bars, 4 parameter sets
+    import backtest
+    grid = backtest.param_grid(stop_pct=[0.005, 0.01], entry_score=[1, 2])
+    source = {'kind': 'sim', 'symbols': 50, 'bars': 1440, 'interval': 60, 'seed': 0}
+    results.append(measure('backtest.sim_50x1440',
+                           lambda i: backtest.run(source, grid, workers=1)['bars'], max(1, iterations // 10)))
+    
+    # 10. 48 order books (6 stand-in exchanges x 8 symbols): har iteration 960 diffs, consolidated book ke saath
+    from orderbook import OrderBookManager, StandInExchange
+    books = OrderBookManager()
+    books.add_listener(lambda symbol, bbo: None)
+    mids = {f"C{n}/USDT": 10.0 * (n + 1) ** 3 for n in range(8)}
+    exchanges = [StandInExchange(name, mids, seed=0)
+                 for name in ('binance', 'kraken', 'coinbase', 'okx', 'bybit', 'kucoin')]
+    for exchange in exchanges:
+        for pair in mids:
+            snapshot = exchange.fetch_order_book(pair)
+            books.on_snapshot(exchange.id, pair, snapshot['bids'], snapshot['asks'], snapshot['nonce'])
+    rounds = [[(exchange.id, pair, exchange.next_diff(pair)) for _ in range(20)
+               for exchange in exchanges for pair in mids] for _ in range(iterations)]
+    
+    def apply_round(i):
+        for name, pair, diff in rounds[i]:
+            books.on_diff(name, pair, diff['bids'], diff['asks'], diff['nonce'])
+        return len(rounds[i])
+    
+    results.append(measure('orderbook.diffs_48books', apply_round, iterations))
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Baseline se diff - threshold se zyada slow hua toh regression"""
+    regressions = []
+    print(f"\n{'scenario':<24}{'metric':<10}{'baseline':>12}{'now':>12}{'change':>10}")
+    for result in results:
+        base = baseline.get(result['name'])
+        if not base:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            old, new = base.get(metric, 0), result[metric]
+            change = ((new - old) / old * 100) if old else 0.0
+            flag = ''
+            if change > threshold * 100:
+                flag = '  <-- regression'
+                regressions.append(f"{result['name']} {metric} {change:+.1f}%")
+            print(f"{result['name']:<24}{metric:<10}{old:>12.3f}{new:>12.3f}{change:>9.1f}%{flag}")
+    return regressions
+
+
+def print_report(results: List[Dict], server: ReplayServer):
+    print(f"\n{'scenario':<24}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}")
+    print('-' * 72)
+    for r in results:
+        print(f"{r['name']:<24}{r['iterations']:>6}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+              f"{r['p99_ms']:>10.3f}{r['throughput_per_s']:>12.1f}")
+    print(f"\nUpstream requests served by replay server: {server.requests}")
+
+
+def record(path: str = FIXTURES_DIR):
+    """Live APIs se fixtures dobara record kare"""
+    import requests
+    from app import COMMODITIES
+    from symbol_resolver import CRYPTO_MAP, STOCK_MAP
+    
+    os.makedirs(path, exist_ok=True)
+    response = requests.get('https://api.coingecko.com/api/v3/simple/price', params={
+        'ids': ','.join(sorted(set(CRYPTO_MAP.values()))),
+        'vs_currencies': 'usd,inr',
+        'include_24hr_change': 'true',
+        'include_24hr_vol': 'true',
+        'include_market_cap': 'true'
+    }, timeout=10)
+    response.raise_for_status()
+    with open(os.path.join(path, 'coingecko_simple_price.json'), 'w') as f:
+        json.dump(response.json(), f, indent=1)
+    
+    futures = [ticker for _, _, ticker in COMMODITIES.values()]
+    for symbol in sorted(set(STOCK_MAP.values())) + futures:
+        response = requests.get(f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}',
+                                params={'range': '1d', 'interval': '1m'},
+                                headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+        if response.status_code != 200:
+            print(f"skip {symbol}: HTTP {response.status_code}")
+            continue
+        with open(os.path.join(path, f'yahoo_chart_{symbol}.json'), 'w') as f:
+            json.dump(response.json(), f)
+    
+    from fx import yahoo_fx_symbols
+    response = requests.get('https://query1.finance.yahoo.com/v7/finance/quote',
+                            params={'symbols': ','.join(yahoo_fx_symbols())},
+                            headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+    if response.status_code == 200:
+        fields = ('symbol', 'currency', 'regularMarketPrice', 'regularMarketPreviousClose', 'regularMarketTime')
+        quotes = [{key: quote.get(key) for key in fields}
+                  for quote in response.json().get('quoteResponse', {}).get('result') or []]
+        with open(os.path.join(path, 'yahoo_fx_quotes.json'), 'w') as f:
+            json.dump(quotes, f, indent=1)
+    else:
+        print(f"skip fx: HTTP {response.status_code}")
+    print(f"Fixtures recorded in {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the trading bot")
+    sub = parser.add_subparsers(dest='command')
+    
+    run = sub.add_parser('run', help='benchmark chalaye')
+    run.add_argument('--iterations', type=int, default=200)
+    run.add_argument('--latency-ms', type=float, default=20.0)
+    run.add_argument('--jitter-ms', type=float, default=5.0)
+    run.add_argument('--error-rate', type=float, default=0.0)
+    run.add_argument('--timeout-rate', type=float, default=0.0)
+    run.add_argument('--client-timeout', type=float, default=0.5)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--baseline', default=DEFAULT_BASELINE)
+    run.add_argument('--save-baseline', action='store_true')
+    run.add_argument('--threshold', type=float, default=0.2, help='regression threshold (0.2 = 20%%)')
+    run.add_argument('--json', action='store_true', help='results JSON mein print kare')
+    
+    rec = sub.add_parser('record', help='live APIs se fixtures record kare')
+    rec.add_argument('--path', default=FIXTURES_DIR)
+    
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        record(args.path)
+        return 0
+    if args.command != 'run':
+        parser.print_help()
+        return 1
+    
+    server = ReplayServer(
+        latency=args.latency_ms / 1000.0,
+        jitter=args.jitter_ms / 1000.0,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        hang=args.client_timeout * 2,
+        seed=args.seed,
+    )
+    with server:
+        results = run_suite(server, args.iterations, args.client_timeout)
+    
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        print_report(results, server)
+    
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({r['name']: r for r in results}, f, indent=1, sort_keys=True)
+        print(f"\nBaseline saved: {args.baseline}")
+    
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""
+DASHBOARD
+- Streamlit front end: `streamlit run dashboard.py` (ya `python app.py dashboard`)
+- Watchlist table, price chart, alerts aur search - sab bot ke search_asset / QuoteHub ke upar
+- QuoteBoard process mein ek hi (st.cache_resource): ek bot, ek hub subscription saare tabs ke liye -
+  tabs badhne se upstream calls nahi badhti
+- Har quote ka version number; session sirf badle hue rows uthata hai, baaki pichhle run ke
+- Table, chart aur alerts alag fragments (run_every) - refresh pe poora script dobara nahi chalta
+- Jo session LEASE seconds se nahi dikha (tab band) uske symbols subscription se hat jaate hain
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from quotes import Quote
+
+DEFAULT_WATCHLIST = ['BTC', 'ETH', 'AAPL', 'TSLA', 'gold', 'EUR/USD']
+
+# Fragments itne seconds pe chalte hain; hub bhi isi interval pe poll karta hai
+REFRESH = float(os.environ.get('TRADING_BOT_DASHBOARD_REFRESH', '2'))
+
+# Itne seconds tak session na dikhe toh uski watchlist chhod do
+LEASE = 60.0
+
+# Chart ke liye har symbol ke kitne points, alerts ke kitne events yaad
+HISTORY = 500
+EVENTS = 50
+
+COLUMNS = ('Asset', 'Price', 'Currency', 'Change %', 'Source', 'Updated')
+
+
+def quote_row(query: str, data: Dict) -> Dict:
+    """search_asset result -> table row (fail hua ho toh error Source mein)"""
+    quote = Quote.from_dict(data)
+    if quote is None:
+        return {'Asset': f"❌ {query}", 'Price': None, 'Currency': '', 'Change %': None,
+                'Source': data.get('error', 'Data nahi mila'), 'Updated': ''}
+    return {'Asset': quote.name or query.upper(), 'Price': quote.price, 'Currency': quote.currency,
+            'Change %': round(quote.change_24h, 2), 'Source': quote.source, 'Updated': quote.timestamp}
+
+
+class QuoteBoard:
+    """
+    Saare browser sessions ka shared data layer. Sessions watch() se apni watchlist
+    batate hain; board unka union ek hub subscription se fresh rakhta hai
+    """
+    
+    def __init__(self, bot, interval: float = REFRESH, lease: float = LEASE, history: int = HISTORY):
+        self.bot = bot
+        self.interval = interval
+        self.lease = lease
+        self.history = history
+        # Har badlav pe +1; session apna aakhri dekha version rakhta hai
+        self.version = 0
+        self._rows: Dict[str, Dict] = {}
+        self._versions: Dict[str, int] = {}
+        self._points: Dict[str, Deque[Tuple[float, float]]] = {}
+        # session -> (last seen, watchlist)
+        self._sessions: Dict[str, Tuple[float, List[str]]] = {}
+        self._symbols: List[str] = []
+        self._events: Deque[Dict] = deque(maxlen=EVENTS)
+        self._event_seq = 0
+        self._subscription = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Alert engine chalu - cache listener har quote pe crossings dekhta hai
+        self.bot.alerts
+    
+    def watch(self, queries: List[str], session: str = 'default') -> List[str]:
+        """Session ki watchlist (lease renew). Naye symbols turant ek batch mein; watchlist return"""
+        queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+        with self._lock:
+            self._sessions[session] = (time.time(), queries)
+            new = [q for q in queries if q not in self._rows]
+            changed = self._expire()
+        if new:
+            for query, data in zip(new, self.bot.search_many(new)):
+                self._update(query, data)
+        if changed:
+            self._resubscribe()
+        self._start()
+        return queries
+    
+    def _expire(self) -> bool:
+        """Purane sessions hatao, symbols ka union dobara - badla toh True (lock ke andar)"""
+        cutoff = time.time() - self.lease
+        for session in [s for s, (seen, _) in self._sessions.items() if seen < cutoff]:
+            del self._sessions[session]
+        symbols = sorted({q for _, queries in self._sessions.values() for q in queries})
+        if symbols == self._symbols:
+            return False
+        for query in set(self._symbols) - set(symbols):
+            self._rows.pop(query, None)
+            self._versions.pop(query, None)
+            self._points.pop(query, None)
+        self._symbols = symbols
+        return True
+    
+    def _resubscribe(self):
+        """Naya union subscribe karke purana band (hub wahi, upstream batch ek hi)"""
+        with self._lock:
+            old = self._subscription
+            self._subscription = self.bot.subscribe(self._symbols, self.interval) if self._symbols else None
+        if old is not None:
+            old.close()
+    
+    def _update(self, query: str, data: Dict) -> bool:
+        row = quote_row(query, data)
+        with self._lock:
+            if self._rows.get(query) == row:
+                return False
+            self.version += 1
+            self._rows[query] = row
+            self._versions[query] = self.version
+            if row['Price'] is not None:
+                points = self._points.get(query)
+                if points is None:
+                    points = self._points[query] = deque(maxlen=self.history)
+                points.append((time.time(), row['Price']))
+            return True
+    
+    def _drain_alerts(self):
+        """Engine ke fired events shared list mein - har session apne seq se aage wale dekhe"""
+        for event in self.bot.alerts.drain():
+            with self._lock:
+                self._event_seq += 1
+                self._events.append({**event, 'seq': self._event_seq})
+    
+    def _run(self):
+        while not self._stop.is_set():
+            subscription = self._subscription
+            if subscription is None:
+                self._stop.wait(self.interval)
+            else:
+                for query, data in subscription.poll(timeout=self.interval):
+                    self._update(query, data)
+            self._drain_alerts()
+            with self._lock:
+                changed = self._expire()
+            if changed:
+                self._resubscribe()
+    
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='quote-board', daemon=True)
+                self._thread.start()
+    
+    def close(self):
+        self._stop.set()
+        if self._subscription is not None:
+            self._subscription.close()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        self.bot.close()
+    
+    def changes(self, since: int) -> Tuple[int, Dict[str, Dict]]:
+        """`since` version ke baad badle rows - (abhi ka version, {query: row})"""
+        with self._lock:
+            return self.version, {query: self._rows[query] for query, version in self._versions.items()
+                                  if version > since}
+    
+    def rows(self, queries: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            return {query: self._rows[query] for query in queries if query in self._rows}
+    
+    def points(self, query: str) -> List[Tuple[float, float]]:
+        with self._lock:
+            return list(self._points.get(query, ()))
+    
+    def events(self, since: int = 0) -> List[Dict]:
+        with self._lock:
+            return [event for event in self._events if event['seq'] > since]
+    
+    def search(self, query: str) -> Dict:
+        return self.bot.search_asset(query)
+    
+    def add_alert(self, query: str, kind: str, level: float) -> Dict:
+        return self.bot.add_alert(query, kind, level)
+    
+    def remove_alert(self, rule_id: int) -> bool:
+        engine = self.bot.alerts
+        removed = engine.remove(rule_id)
+        if removed:
+            engine.save()
+        return removed
+    
+    def alert_rules(self) -> List[Dict]:
+        return [{'id': rule.id, 'rule': rule.describe(), 'repeat': rule.repeat}
+                for rule in list(self.bot.alerts.rules.values())]
+    
+    def stats(self) -> Dict:
+        hub = self.bot._hub
+        with self._lock:
+            return {'sessions': len(self._sessions), 'symbols': len(self._symbols),
+                    'version': self.version, 'polls': hub.ticks if hub is not None else 0}
+
+
+def main():
+    """Streamlit page - har session ka script run; data board (process mein ek) se"""
+    import pandas as pd
+    import streamlit as st
+    
+    from app import ALERT_KINDS, SimpleTradingBot
+    
+    st.set_page_config(page_title="Trading Bot", page_icon="📈", layout="wide")
+    
+    @st.cache_resource(show_spinner=False)
+    def shared_board() -> QuoteBoard:
+        import atexit
+        board = QuoteBoard(SimpleTradingBot("Dashboard", quiet=True))
+        atexit.register(board.close)
+        return board
+    
+    board = shared_board()
+    state = st.session_state
+    if 'session' not in state:
+        state.session = uuid.uuid4().hex
+        state.watchlist = [q.strip() for q in os.environ.get('TRADING_BOT_WATCHLIST', '').split(',')
+                           if q.strip()] or list(DEFAULT_WATCHLIST)
+        state.table_version = 0
+        state.table_rows = {}
+        state.alert_seq = 0
+    
+    def add_symbols():
+        added = [q.strip() for q in state.add_symbols.split(',') if q.strip()]
+        state.watchlist = list(dict.fromkeys(state.watchlist + added))
+        state.add_symbols = ''
+    
+    # Sidebar: watchlist badle toh hi poora rerun
+    with st.sidebar:
+        st.header("Watchlist")
+        st.text_input("Symbols jodein", placeholder="SOL, MSFT, USD/INR", key='add_symbols',
+                      on_change=add_symbols)
+        st.multiselect("Dekh rahe hain", list(state.watchlist), key='watchlist')
+        stats = board.stats()
+        st.caption(f"{stats['sessions']} sessions, {stats['symbols']} symbols, "
+                   f"{stats['polls']} upstream polls (saare tabs ke liye ek)")
+    
+    st.title("📈 Trading Bot")
+    query = st.text_input("Kisi bhi asset ke baare mein poochiye", placeholder="Bitcoin price, TSLA, gold")
+    if query:
+        st.text(board.bot.format_response(board.search(query)))
+    
+    @st.fragment(run_every=REFRESH)
+    def watchlist_table():
+        watchlist = board.watch(state.watchlist, state.session)
+        # Sirf badle rows - baaki session ke pichhle rows
+        version, changed = board.changes(state.table_version)
+        rows = state.table_rows
+        rows.update(changed)
+        rows.update(board.rows([q for q in watchlist if q not in rows]))
+        state.table_version = version
+        table = pd.DataFrame([rows[q] for q in watchlist if q in rows], columns=COLUMNS)
+        st.dataframe(table, hide_index=True, use_container_width=True, column_config={
+            'Price': st.column_config.NumberColumn(format="%.4f"),
+            'Change %': st.column_config.NumberColumn(format="%+.2f%%"),
+        })
+    
+    @st.fragment(run_every=REFRESH)
+    def price_chart():
+        if not state.watchlist:
+            st.info("Watchlist khaali hai")
+            return
+        symbol = st.selectbox("Chart", state.watchlist, key='chart_symbol')
+        points = board.points(symbol)
+        if len(points) < 2:
+            st.caption("Chart ke liye abhi kam data hai - agle updates ka intezaar")
+            return
+        frame = pd.DataFrame(points, columns=['time', 'price'])
+        frame['time'] = pd.to_datetime(frame['time'], unit='s')
+        st.line_chart(frame.set_index('time'), y='price')
+    
+    @st.fragment(run_every=REFRESH)
+    def alerts_panel():
+        for event in board.events(state.alert_seq):
+            st.toast(f"🔔 {event['message']}")
+            state.alert_seq = event['seq']
+        
+        with st.form('alert_form', clear_on_submit=True):
+            left, middle, right = st.columns(3)
+            asset = left.text_input("Asset", placeholder="BTC")
+            kind = middle.selectbox("Kab", ['above', 'below', 'move'])
+            level = right.number_input("Level (move ho toh %)", min_value=0.0, step=1.0)
+            if st.form_submit_button("Alert lagao") and asset and level:
+                result = board.add_alert(asset, ALERT_KINDS[kind], level)
+                if result.get('success'):
+                    st.success(f"Alert #{result['id']}: {result['rule']}")
+                else:
+                    st.error(result.get('error', 'Alert nahi laga'))
+        
+        for rule in board.alert_rules():
+            text, button = st.columns([5, 1])
+            text.write(f"#{rule['id']} {rule['rule']}" + (" (repeat)" if rule['repeat'] else ""))
+            if button.button("Hatao", key=f"remove_alert_{rule['id']}"):
+                board.remove_alert(rule['id'])
+                st.rerun(scope='fragment')
+        
+        recent = board.events()[-10:]
+        if recent:
+            st.caption("Haal ke alerts")
+            for event in reversed(recent):
+                st.write(f"{time.strftime('%H:%M:%S', time.localtime(event['ts']))} - {event['message']}")
+    
+    table, chart = st.columns([3, 2])
+    with table:
+        watchlist_table()
+    with chart:
+        price_chart()
+    st.subheader("🔔 Alerts")
+    alerts_panel()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+FX ENGINE
+- Currencies ek graph hain, edges asli rates (Yahoo FX quotes)
+- Graph se har currency ki USD value nikalti hai (koi bhi path - triangulation)
+- Poori cross-rate matrix pehle se ban jaati hai: koi bhi pair O(1) lookup
+- Batch conversion: ek gather + ek multiply (numpy)
+- Matrix chhoti hai (12x12) - plain lists; numpy sirf batch conversion pe load hota hai
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from quotes import ASSET_CLASS_CODES
+from symbol_resolver import CURRENCIES
+
+# Network na ho toh inse kaam chalta hai (USD ke against, approx)
+REFERENCE_RATES = {
+    'EUR': 0.92, 'GBP': 0.79, 'JPY': 148.0, 'INR': 83.0, 'CAD': 1.345, 'AUD': 1.52,
+    'CHF': 0.88, 'CNY': 7.2, 'SGD': 1.34, 'AED': 3.6725, 'HKD': 7.8,
+}
+
+# Itne seconds baad rates purane maane jaate hain
+DEFAULT_MAX_AGE = 300
+
+Edge = Tuple[str, str, float]
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def yahoo_fx_symbols(currencies: Iterable[str] = CURRENCIES) -> List[str]:
+    """USD ke against har currency ka Yahoo symbol (USDINR=X = 1 USD mein kitne INR)"""
+    return [f"USD{c}=X" for c in currencies if c != 'USD']
+
+
+class FxEngine:
+    """Cross-rate matrix: rate(a, b) = 1 a mein kitne b"""
+    
+    def __init__(self, currencies: Sequence[str] = CURRENCIES):
+        self.currencies = list(dict.fromkeys(c.upper() for c in currencies))
+        self.index = {c: i for i, c in enumerate(self.currencies)}
+        n = len(self.currencies)
+        self.matrix = [[math.nan] * n for _ in range(n)]
+        self.prev_matrix = [[math.nan] * n for _ in range(n)]
+        self.source = ''
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+        self.load_edges([('USD', c, r) for c, r in REFERENCE_RATES.items()], source='Reference rates',
+                        updated_at=0.0)
+    
+    # ------------------------------------------------------------ building
+    
+    def _usd_values(self, edges: Iterable[Edge]) -> List[float]:
+        """Graph BFS: har currency ki USD value (1 unit = kitne USD). Na jud paye toh NaN"""
+        graph: Dict[str, List[Tuple[str, float]]] = {}
+        for base, quote, rate in edges:
+            base, quote = base.upper(), quote.upper()
+            if not rate or rate <= 0 or base not in self.index or quote not in self.index:
+                continue
+            # 1 base = rate quote  =>  value(base) = rate * value(quote)
+            graph.setdefault(base, []).append((quote, rate))
+            graph.setdefault(quote, []).append((base, 1.0 / rate))
+        
+        values = [math.nan] * len(self.currencies)
+        values[self.index['USD']] = 1.0
+        queue = deque(['USD'])
+        while queue:
+            node = queue.popleft()
+            for other, rate in graph.get(node, ()):
+                i = self.index[other]
+                if math.isnan(values[i]):
+                    # 1 node = rate other  =>  value(other) = value(node) / rate
+                    values[i] = values[self.index[node]] / rate
+                    queue.append(other)
+        return values
+    
+    def load_edges(self, edges: Iterable[Edge], prev_edges: Optional[Iterable[Edge]] = None,
+                   source: str = 'Yahoo FX', updated_at: Optional[float] = None):
+        """Naye rates se poori matrix dobara banaye (purane rates jo graph mein na hon wo rehte hain)"""
+        values = self._usd_values(edges)
+        prev = self._usd_values(prev_edges) if prev_edges is not None else values
+        with self._lock:
+            # Jo currency is baar nahi aayi uski purani value rakhte hain
+            if self.updated_at or self.source:
+                usd = self.index['USD']
+                values = [row[usd] if math.isnan(v) else v for v, row in zip(values, self.matrix)]
+                prev = [v if math.isnan(p) else p for p, v in zip(prev, values)]
+            self.matrix = [[a / b for b in values] for a in values]
+            self.prev_matrix = [[a / b for b in prev] for a in prev]
+            self.source = source
+            self.updated_at = time.time() if updated_at is None else updated_at
+    
+    def load_yahoo_quotes(self, quotes: Dict[str, Dict]) -> int:
+        """fetch_yahoo_quotes ka result (symbol -> quote). Kitne rates mile"""
+        edges, prev_edges = [], []
+        for symbol, quote in quotes.items():
+            if not (symbol.startswith('USD') and symbol.endswith('=X')):
+                continue
+            currency = symbol[3:-2]
+            price = quote.get('regularMarketPrice')
+            if price:
+                edges.append(('USD', currency, price))
+                prev_edges.append(('USD', currency, quote.get('regularMarketPreviousClose') or price))
+        if edges:
+            self.load_edges(edges, prev_edges)
+        return len(edges)
+    
+    # ------------------------------------------------------------- lookups
+    
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at if self.updated_at else float('inf')
+    
+    def is_stale(self, max_age: float = DEFAULT_MAX_AGE) -> bool:
+        return self.age > max_age
+    
+    def supports(self, currency: str) -> bool:
+        return currency.upper() in self.index
+    
+    def rate(self, base: str, quote: str) -> float:
+        """1 base = kitne quote (O(1) matrix lookup)"""
+        return float(self.matrix[self.index[base.upper()]][self.index[quote.upper()]])
+    
+    def change_pct(self, base: str, quote: str) -> float:
+        """Pichhle close se % change"""
+        i, j = self.index[base.upper()], self.index[quote.upper()]
+        prev = self.prev_matrix[i][j]
+        return float((self.matrix[i][j] / prev - 1) * 100) if prev else 0.0
+    
+    def convert(self, amount: float, base: str, quote: str) -> float:
+        return amount * self.rate(base, quote)
+    
+    def factors(self, currencies: Sequence[str], target: str) -> 'np.ndarray':
+        """Har currency -> target ka factor (anjaan currency ho toh NaN)"""
+        import numpy as np
+        j = self.index[target.upper()]
+        return np.array([self.matrix[self.index[c.upper()]][j] if c.upper() in self.index else np.nan
+                         for c in currencies])
+    
+    def convert_batch(self, batch, target: str) -> 'np.ndarray':
+        """
+        QuoteBatch ke saare prices target currency mein.
+        Table ki har currency ka factor ek baar, phir prices * factor[currency_ids].
+        Forex rows (rate khud ek pair hai) aur anjaan currencies waise hi rehti hain.
+        """
+        import numpy as np
+        table = batch.table
+        factors = self.factors([table.name(i) for i in range(len(table))], target)
+        factors = np.where(np.isnan(factors), 1.0, factors)
+        row_factors = factors[batch.column('currency_ids')]
+        row_factors[batch.column('asset_classes') == ASSET_CLASS_CODES['forex']] = 1.0
+        return batch.column('prices') * row_factors
@@ -0,0 +1,218 @@
+"""
+CONVERSATION HISTORY
+- Memory mein sirf aakhri N compact records (ring buffer)
+- Har record append-only log file mein bhi jaata hai (restart ke baad bhi milta hai)
+- Symbol + time index: "BTC 10:00 pe kya tha" bina poori file padhe
+- Rendered response string store nahi hoti - quote se dobara ban jaati hai
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from paths import data_dir
+from quotes import Quote
+
+DEFAULT_PATH = os.path.join(data_dir(), 'history.log')
+
+TIME_RE = re.compile(r'\b(\d{1,2}):(\d{2})(?::(\d{2}))?\b')
+
+# Quote wali log line ke JSON mein ye hota hai (string values ke andar '"' escape hota hai)
+_QUOTE_MARK = b'"quote": ['
+
+
+def parse_clock(text: str, now: Optional[datetime] = None) -> Optional[float]:
+    """'10:00' ya '10:00:30' -> sabse recent aisa waqt (epoch). Future ho toh kal ka"""
+    match = TIME_RE.search(text)
+    if not match:
+        return None
+    hour, minute, second = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    now = now or datetime.now()
+    when = now.replace(hour=hour, minute=minute, second=second, microsecond=0)
+    if when > now:
+        when -= timedelta(days=1)
+    return when.timestamp()
+
+
+class HistoryRecord:
+    """Ek baat-cheet ka compact record"""
+    
+    __slots__ = ('ts', 'query', 'asset_class', 'symbol', 'quote')
+    
+    def __init__(self, ts: float, query: str, asset_class: str = '', symbol: str = '',
+                 quote: Optional[Quote] = None):
+        self.ts = ts
+        self.query = query
+        self.asset_class = asset_class
+        self.symbol = symbol
+        self.quote = quote
+    
+    def to_json(self) -> str:
+        row = {'ts': self.ts, 'query': self.query, 'class': self.asset_class, 'symbol': self.symbol}
+        if self.quote is not None:
+            q = self.quote
+            row['quote'] = [q.asset_class, q.symbol, q.name, q.price, q.currency,
+                            q.change_24h, q.source, q.ts]
+        return json.dumps(row, ensure_ascii=False)
+    
+    @classmethod
+    def from_json(cls, text: str) -> 'HistoryRecord':
+        row = json.loads(text)
+        quote = None
+        if row.get('quote'):
+            asset_class, symbol, name, price, currency, change, source, ts = row['quote']
+            quote = Quote(asset_class, symbol, price, change, currency, name, source=source, ts=ts)
+        return cls(row['ts'], row['query'], row.get('class', ''), row.get('symbol', ''), quote)
+
+
+class ConversationHistory:
+    """
+    Bounded history: memory mein `capacity` records, baaki log file mein.
+    Log line format: "<ts>\\t<SYMBOL>\\t<json>" - index rebuild bina JSON parse ke hota hai.
+    """
+    
+    def __init__(self, capacity: int = 200, path: Optional[str] = DEFAULT_PATH):
+        self.capacity = capacity
+        self.path = path
+        self._recent: deque = deque(maxlen=capacity)
+        # symbol -> (timestamps, file offsets) - dono sorted, parallel arrays
+        self._index: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._indexed = False
+    
+    def _load_index(self):
+        """Purani log file se sirf index banaye - pehli zaroorat pe, ek hi baar"""
+        self._indexed = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                parts = line.split(b'\t', 2)
+                # add() jaisa hi: sirf quote wale records index mein
+                if len(parts) == 3 and parts[1] and _QUOTE_MARK in parts[2]:
+                    try:
+                        self._add_to_index(parts[1].decode('utf-8'), float(parts[0]), offset)
+                    except ValueError:
+                        pass
+                offset += len(line)
+    
+    def _add_to_index(self, symbol: str, ts: float, offset: int):
+        entry = self._index.get(symbol)
+        if entry is None:
+            entry = self._index[symbol] = (array('d'), array('q'))
+        timestamps, offsets = entry
+        if timestamps and ts < timestamps[-1]:
+            # Clock peeche gaya - sorted order banaye rakhte hain
+            i = bisect_right(timestamps, ts)
+            timestamps.insert(i, ts)
+            offsets.insert(i, offset)
+        else:
+            timestamps.append(ts)
+            offsets.append(offset)
+    
+    def add(self, query: str, asset_class: str = '', symbol: str = '',
+            quote: Optional[Quote] = None, ts: Optional[float] = None) -> HistoryRecord:
+        """Naya record - ring buffer mein aur log file ke end mein"""
+        record = HistoryRecord(time.time() if ts is None else ts, query, asset_class, symbol, quote)
+        key = symbol.upper()
+        with self._lock:
+            if not self._indexed:
+                self._load_index()
+            self._recent.append(record)
+            if self.path:
+                try:
+                    if self._file is None:
+                        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                        self._file = open(self.path, 'ab')
+                    offset = self._file.tell()
+                    self._file.write(f"{record.ts:.3f}\t{key}\t{record.to_json()}\n".encode('utf-8'))
+                    self._file.flush()
+                    if key and quote is not None:
+                        self._add_to_index(key, record.ts, offset)
+                except OSError:
+                    # Disk ka masla ho toh bhi chat chalti rahe
+                    pass
+        return record
+    
+    def __len__(self) -> int:
+        return len(self._recent)
+    
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        return iter(list(self._recent))
+    
+    def recent(self, count: int = 10) -> List[HistoryRecord]:
+        """Aakhri `count` records (memory se)"""
+        return list(self._recent)[-count:]
+    
+    def _read_at(self, offset: int) -> Optional[HistoryRecord]:
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            parts = f.readline().decode('utf-8').split('\t', 2)
+        if len(parts) != 3:
+            return None
+        return HistoryRecord.from_json(parts[2])
+    
+    def at(self, symbol: str, when: float, tolerance: Optional[float] = None) -> Optional[HistoryRecord]:
+        """`when` ya usse pehle ka aakhri record jisme symbol ka quote tha"""
+        key = symbol.upper()
+        with self._lock:
+            if not self._indexed:
+                self._load_index()
+            # Pehle memory (naye records wahi hain)
+            for record in reversed(self._recent):
+                if record.symbol.upper() == key and record.quote is not None and record.ts <= when:
+                    best = record
+                    break
+            else:
+                best = None
+            entry = self._index.get(key)
+            offset = None
+            if entry is not None:
+                timestamps, offsets = entry
+                i = bisect_right(timestamps, when) - 1
+                if i >= 0 and (best is None or timestamps[i] > best.ts):
+                    offset = offsets[i]
+        
+        if offset is not None:
+            record = self._read_at(offset)
+            if record is not None and record.quote is not None:
+                best = record
+        if best is not None and tolerance is not None and when - best.ts > tolerance:
+            return None
+        return best
+    
+    def between(self, symbol: str, start: float, end: float) -> List[HistoryRecord]:
+        """Time range ke saare records (log file se, index ke through)"""
+        with self._lock:
+            if not self._indexed:
+                self._load_index()
+            entry = self._index.get(symbol.upper())
+            if entry is None:
+                return []
+            timestamps, offsets = entry
+            lo = bisect_right(timestamps, start - 1e-9)
+            hi = bisect_right(timestamps, end)
+            wanted = offsets[lo:hi]
+        records = []
+        for offset in wanted:
+            record = self._read_at(offset)
+            if record is not None:
+                records.append(record)
+        return records
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,347 @@
+"""
+INDICATOR ENGINE
+- RSI, EMA/SMA, MACD, ATR, Bollinger bands - NumPy vectorized
+- Poori watchlist ek saath (rows = symbols, columns = bars)
+- Incremental state: naya bar aaya toh poora window dobara nahi
+- Signals se analysis text banta hai (change_24h ke if-else ki jagah)
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Default indicator settings
+DEFAULT_PARAMS = {
+    'rsi': 14,
+    'ema_fast': 12,
+    'ema_slow': 26,
+    'macd_signal': 9,
+    'atr': 14,
+    'bb_window': 20,
+    'bb_k': 2.0,
+}
+
+# RSI in levels ke bahar ho toh signal ulta (overbought = bearish, oversold = bullish)
+RSI_OVERBOUGHT = 70.0
+RSI_OVERSOLD = 30.0
+
+
+def _as_2d(x) -> np.ndarray:
+    """1D series ho toh (1, n) bana de"""
+    x = np.asarray(x, dtype=float)
+    return x[np.newaxis, :] if x.ndim == 1 else x
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential smoothing - time pe loop, symbols pe vectorized. NaN pe state same rehti hai"""
+    x = _as_2d(x)
+    out = np.full_like(x, np.nan)
+    state = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[1]):
+        value = x[:, t]
+        valid = ~np.isnan(value)
+        seeded = valid & np.isnan(state)
+        state = np.where(seeded, value, state)
+        step = valid & ~seeded
+        state = np.where(step, state + alpha * (value - state), state)
+        out[:, t] = state
+    return out
+
+
+def sma(close, window: int) -> np.ndarray:
+    """Simple moving average (cumsum se, O(n))"""
+    x = _as_2d(close)
+    out = np.full_like(x, np.nan)
+    if x.shape[1] < window:
+        return out
+    csum = np.cumsum(np.nan_to_num(x), axis=1)
+    csum = np.concatenate([np.zeros((x.shape[0], 1)), csum], axis=1)
+    out[:, window - 1:] = (csum[:, window:] - csum[:, :-window]) / window
+    return out
+
+
+def ema(close, span: int) -> np.ndarray:
+    """Exponential moving average"""
+    return _ewm(close, 2.0 / (span + 1))
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (Wilder smoothing)"""
+    x = _as_2d(close)
+    delta = np.diff(x, axis=1, prepend=np.nan)
+    gain = np.where(np.isnan(delta), np.nan, np.clip(delta, 0, None))
+    loss = np.where(np.isnan(delta), np.nan, np.clip(-delta, 0, None))
+    avg_gain = _ewm(gain, 1.0 / period)
+    avg_loss = _ewm(loss, 1.0 / period)
+    return _rsi_from_averages(avg_gain, avg_loss)
+
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        out = 100.0 - 100.0 / (1.0 + rs)
+    out = np.where((avg_loss == 0) & (avg_gain > 0), 100.0, out)
+    return np.where((avg_loss == 0) & (avg_gain == 0), 50.0, out)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line, signal line aur histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return {'macd': line, 'signal': signal_line, 'hist': line - signal_line}
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range (pehle bar pe high - low). High/low NaN ya inf ho toh NaN - ATR us bar ko chhodta hai"""
+    h, l, c = _as_2d(high), _as_2d(low), _as_2d(close)
+    prev = np.concatenate([np.full((c.shape[0], 1), np.nan), c[:, :-1]], axis=1)
+    # fmax NaN ko ignore karta hai, isliye pehle bar pe sirf high - low bachta hai
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+    return np.where(np.isfinite(h) & np.isfinite(l), tr, np.nan)
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range (Wilder)"""
+    return _ewm(true_range(high, low, close), 1.0 / period)
+
+
+def bollinger(close, window: int = 20, k: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger bands (middle = SMA, width = k * std)"""
+    x = _as_2d(close)
+    middle = sma(x, window)
+    mean_sq = sma(x * x, window)
+    std = np.sqrt(np.clip(mean_sq - middle * middle, 0, None))
+    return {'middle': middle, 'upper': middle + k * std, 'lower': middle - k * std}
+
+
+class IncrementalIndicators:
+    """N symbols ki indicator state - har naya bar O(N) mein update"""
+    
+    def __init__(self, size: int = 0, params: Optional[Dict] = None):
+        self.params = dict(DEFAULT_PARAMS)
+        if params:
+            self.params.update(params)
+        self.size = 0
+        self._alloc(size)
+    
+    def _alloc(self, size: int):
+        """State arrays banaye ya badhaye (purani values rehti hain)"""
+        window = self.params['bb_window']
+        nan_fields = ('ema_fast', 'ema_slow', 'macd_signal', 'avg_gain', 'avg_loss',
+                      'atr', 'prev_close', 'close')
+        old_size = self.size
+        for name in nan_fields:
+            new = np.full(size, np.nan)
+            if old_size:
+                new[:old_size] = getattr(self, name)
+            setattr(self, name, new)
+        for name, dtype in (('count', np.int64), ('pos', np.int64), ('win_sum', float), ('win_sumsq', float)):
+            new = np.zeros(size, dtype=dtype)
+            if old_size:
+                new[:old_size] = getattr(self, name)
+            setattr(self, name, new)
+        buffer = np.zeros((size, window))
+        if old_size:
+            buffer[:old_size] = self.window
+        self.window = buffer
+        self.size = size
+    
+    def resize(self, size: int):
+        """Aur symbols ke liye jagah banaye"""
+        if size > self.size:
+            self._alloc(size)
+    
+    @staticmethod
+    def _smooth(state: np.ndarray, value: np.ndarray, alpha: float, valid: np.ndarray) -> np.ndarray:
+        seeded = valid & np.isnan(state)
+        state = np.where(seeded, value, state)
+        step = valid & ~seeded
+        return np.where(step, state + alpha * (value - state), state)
+    
+    def update(self, close: np.ndarray, high: Optional[np.ndarray] = None,
+               low: Optional[np.ndarray] = None):
+        """Har symbol ka ek naya bar (NaN = is symbol ka naya bar nahi)"""
+        p = self.params
+        close = np.asarray(close, dtype=float)
+        high = close if high is None else np.asarray(high, dtype=float)
+        low = close if low is None else np.asarray(low, dtype=float)
+        valid = ~np.isnan(close)
+        if not valid.any():
+            return
+        
+        # EMA / MACD
+        self.ema_fast = self._smooth(self.ema_fast, close, 2.0 / (p['ema_fast'] + 1), valid)
+        self.ema_slow = self._smooth(self.ema_slow, close, 2.0 / (p['ema_slow'] + 1), valid)
+        line = self.ema_fast - self.ema_slow
+        self.macd_signal = self._smooth(self.macd_signal, line, 2.0 / (p['macd_signal'] + 1), valid)
+        
+        # RSI (Wilder) - pehle bar pe delta nahi hota
+        has_prev = valid & ~np.isnan(self.prev_close)
+        delta = np.where(has_prev, close - self.prev_close, 0.0)
+        self.avg_gain = self._smooth(self.avg_gain, np.clip(delta, 0, None), 1.0 / p['rsi'], has_prev)
+        self.avg_loss = self._smooth(self.avg_loss, np.clip(-delta, 0, None), 1.0 / p['rsi'], has_prev)
+        
+        # ATR - high/low kharab (NaN/inf) ho toh is bar ka TR nahi, ATR pichhla hi rehta hai
+        prev = np.where(has_prev, self.prev_close, close)
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev)))
+        self.atr = self._smooth(self.atr, tr, 1.0 / p['atr'], valid & np.isfinite(high) & np.isfinite(low))
+        
+        # Bollinger window - running sum/sumsq, ring buffer se purani value nikalti hai
+        rows = np.nonzero(valid)[0]
+        window = p['bb_window']
+        slots = self.pos[rows]
+        full = self.count[rows] >= window
+        old = np.where(full, self.window[rows, slots], 0.0)
+        value = close[rows]
+        self.win_sum[rows] += value - old
+        self.win_sumsq[rows] += value * value - old * old
+        self.window[rows, slots] = value
+        self.pos[rows] = (slots + 1) % window
+        self.count[rows] += 1
+        
+        self.prev_close = np.where(valid, close, self.prev_close)
+        self.close = self.prev_close
+    
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Har symbol ki latest indicator values"""
+        p = self.params
+        n = np.minimum(self.count, p['bb_window'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            middle = np.where(n > 0, self.win_sum / n, np.nan)
+            var = np.where(n > 0, self.win_sumsq / n - middle * middle, np.nan)
+        std = np.sqrt(np.clip(var, 0, None))
+        ready = self.count >= p['bb_window']
+        line = self.ema_fast - self.ema_slow
+        return {
+            'close': self.close,
+            'count': self.count,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'sma': np.where(ready, middle, np.nan),
+            'rsi': np.where(self.count > p['rsi'], _rsi_from_averages(self.avg_gain, self.avg_loss), np.nan),
+            'macd': line,
+            'macd_signal': self.macd_signal,
+            'macd_hist': line - self.macd_signal,
+            'atr': self.atr,
+            'bb_upper': np.where(ready, middle + p['bb_k'] * std, np.nan),
+            'bb_lower': np.where(ready, middle - p['bb_k'] * std, np.nan),
+        }
+
+
+class IndicatorEngine:
+    """Watchlist ke indicators - BarStore se sirf naye bars padhta hai"""
+    
+    def __init__(self, store, history: int = 200, params: Optional[Dict] = None):
+        self.store = store
+        self.history = history
+        self.state = IncrementalIndicators(0, params)
+        self._rows: Dict[str, int] = {}
+        self._last_ts: Dict[str, int] = {}
+    
+    def _row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self._rows)
+            self._rows[symbol] = row
+            if row >= self.state.size:
+                self.state.resize(max(16, self.state.size * 2))
+        return row
+    
+    def refresh(self, symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        """Naye bars apply kare aur har symbol ke latest signals de"""
+        pending = {}
+        for symbol in symbols:
+            row = self._row(symbol)
+            last = self._last_ts.get(symbol)
+            stored = self.store.last_timestamp(symbol)
+            if stored is None or (last is not None and stored <= last):
+                # Koi naya bar nahi - disk padhne ki zaroorat nahi
+                continue
+            bars = self.store.tail(symbol, self.history) if last is None else self.store.read(symbol, start=last + 1)
+            if len(bars['ts']):
+                pending[row] = bars
+                self._last_ts[symbol] = int(bars['ts'][-1])
+        
+        # k-th naya bar saare symbols ke liye ek vector update mein
+        steps = max((len(b['ts']) for b in pending.values()), default=0)
+        for k in range(steps):
+            close = np.full(self.state.size, np.nan)
+            high = np.full(self.state.size, np.nan)
+            low = np.full(self.state.size, np.nan)
+            for row, bars in pending.items():
+                if k < len(bars['ts']):
+                    close[row] = bars['close'][k]
+                    high[row] = bars['high'][k]
+                    low[row] = bars['low'][k]
+            self.state.update(close, high, low)
+        
+        snap = self.state.snapshot()
+        signals = {}
+        for symbol in symbols:
+            row = self._rows[symbol]
+            if snap['count'][row] > 0:
+                signals[symbol] = {name: float(values[row]) for name, values in snap.items()}
+        return signals
+
+
+def signal_score(close, ema_slow, macd_hist, rsi_values, overbought: float = RSI_OVERBOUGHT,
+                 oversold: float = RSI_OVERSOLD) -> np.ndarray:
+    """
+    describe() wala score, poori arrays pe: MACD hist +-1, price vs slow EMA +-1,
+    RSI overbought -1 / oversold +1. NaN wala indicator 0 deta hai. -3..+3 (int8)
+    """
+    close, ema_slow = np.asarray(close), np.asarray(ema_slow)
+    macd_hist, rsi_values = np.asarray(macd_hist), np.asarray(rsi_values)
+    with np.errstate(invalid='ignore'):
+        score = np.where(np.isnan(macd_hist), 0, np.where(macd_hist > 0, 1, -1)).astype(np.int8)
+        score += np.where(np.isnan(close) | np.isnan(ema_slow), 0,
+                          np.where(close > ema_slow, 1, -1)).astype(np.int8)
+        score -= (rsi_values >= overbought).astype(np.int8)
+        score += (rsi_values <= oversold).astype(np.int8)
+    return score
+
+
+def describe(signal: Dict[str, float]) -> str:
+    """Indicator values se analysis text banaye"""
+    notes = []
+    score = 0
+    
+    macd_hist = signal.get('macd_hist', np.nan)
+    if not np.isnan(macd_hist):
+        score += 1 if macd_hist > 0 else -1
+        notes.append("MACD > signal" if macd_hist > 0 else "MACD < signal")
+    
+    close, ema_slow = signal.get('close', np.nan), signal.get('ema_slow', np.nan)
+    if not np.isnan(close) and not np.isnan(ema_slow):
+        score += 1 if close > ema_slow else -1
+        notes.append("price above EMA" if close > ema_slow else "price below EMA")
+    
+    value = signal.get('rsi', np.nan)
+    if not np.isnan(value):
+        notes.append(f"RSI {value:.0f}")
+        if value >= RSI_OVERBOUGHT:
+            notes[-1] += " (overbought)"
+            score -= 1
+        elif value <= RSI_OVERSOLD:
+            notes[-1] += " (oversold)"
+            score += 1
+    
+    upper, lower = signal.get('bb_upper', np.nan), signal.get('bb_lower', np.nan)
+    if not np.isnan(upper) and not np.isnan(close):
+        if close > upper:
+            notes.append("upper band ke upar")
+        elif close < lower:
+            notes.append("lower band ke neeche")
+    
+    if score >= 2:
+        trend = "📈 Strong bullish trend"
+    elif score > 0:
+        trend = "↗️ Mildly bullish"
+    elif score <= -2:
+        trend = "📉 Strong bearish trend"
+    elif score < 0:
+        trend = "↘️ Mildly bearish"
+    else:
+        trend = "➡️ Sideways movement"
+    
+    return f"{trend} ({', '.join(notes)})" if notes else trend
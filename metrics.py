@@ -0,0 +1,240 @@
+"""
+METRICS
+- Provider latency histograms, success/fallback/error counters
+- Cache aur circuit breaker ki state (collectors ke through)
+- Prometheus text ya JSON lines export
+- Disabled ho toh timer/counter no-op hain (almost zero overhead)
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets (milliseconds)
+DEFAULT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus jaisa)"""
+    
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound jahan q fraction poora hota hai (approx)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for i, c in enumerate(self.counts):
+            running += c
+            if running >= target:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'started')
+    
+    def __init__(self, metrics: 'Metrics', name: str, labels: Dict[str, str]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, (time.perf_counter() - self.started) * 1000.0, **self.labels)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class Metrics:
+    """Bot ke hot path ke counters aur histograms"""
+    
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 recent_errors: int = 20):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]] = []
+        self.recent_errors = deque(maxlen=recent_errors)
+        self._lock = threading.Lock()
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        """Counter badhaye"""
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, **labels):
+        """Histogram mein value daale (ms)"""
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+    
+    def timer(self, name: str, **labels):
+        """`with metrics.timer('x', provider='y'):` - disabled ho toh no-op"""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, name, labels)
+    
+    def record_error(self, provider: str, error: Exception, stage: str = 'fetch'):
+        """Exception count kare aur recent list mein rakhe"""
+        if not self.enabled:
+            return
+        self.inc('errors_total', provider=provider, stage=stage, error=type(error).__name__)
+        with self._lock:
+            self.recent_errors.append({
+                'time': time.strftime('%H:%M:%S'),
+                'provider': provider,
+                'stage': stage,
+                'error': f"{type(error).__name__}: {error}"
+            })
+    
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]):
+        """Export ke time gauges dene wala function jode (cache, breakers...)"""
+        self._collectors.append(collector)
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.recent_errors.clear()
+    
+    def _gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        gauges = []
+        for collector in self._collectors:
+            try:
+                gauges.extend(collector())
+            except Exception:
+                pass
+        return gauges
+    
+    def to_prometheus(self, prefix: str = 'tradingbot_') -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{prefix}{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for key, h in sorted(series.items()):
+                    running = 0
+                    for bound, count in zip(list(h.buckets) + ['+Inf'], h.counts):
+                        running += count
+                        lines.append(f"{prefix}{name}_bucket{_format_labels(key, ('le', str(bound)))} {running}")
+                    lines.append(f"{prefix}{name}_sum{_format_labels(key)} {h.total:.6f}")
+                    lines.append(f"{prefix}{name}_count{_format_labels(key)} {h.count}")
+        
+        seen = set()
+        for name, labels, value in self._gauges():
+            if name not in seen:
+                lines.append(f"# TYPE {prefix}{name} gauge")
+                seen.add(name)
+            lines.append(f"{prefix}{name}{_format_labels(_labels(labels))} {value:g}")
+        return "\n".join(lines) + "\n"
+    
+    def to_json_lines(self) -> str:
+        """Har series ek JSON line"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for name, series in self._counters.items():
+                for key, value in series.items():
+                    rows.append({'ts': now, 'type': 'counter', 'name': name, 'labels': dict(key), 'value': value})
+            for name, series in self._histograms.items():
+                for key, h in series.items():
+                    rows.append({
+                        'ts': now, 'type': 'histogram', 'name': name, 'labels': dict(key),
+                        'count': h.count, 'sum': round(h.total, 6),
+                        'p50': h.quantile(0.5), 'p95': h.quantile(0.95), 'p99': h.quantile(0.99)
+                    })
+        for name, labels, value in self._gauges():
+            rows.append({'ts': now, 'type': 'gauge', 'name': name, 'labels': labels, 'value': value})
+        return "\n".join(json.dumps(row) for row in rows) + ("\n" if rows else "")
+    
+    def summary(self) -> str:
+        """Chat ke 'stats' command ke liye chhota report"""
+        if not self.enabled:
+            return "Metrics band hain (TRADING_BOT_METRICS=0)"
+        lines = []
+        with self._lock:
+            latency = self._histograms.get('provider_latency_ms', {})
+            for key, h in sorted(latency.items()):
+                labels = dict(key)
+                avg = h.total / h.count if h.count else 0.0
+                lines.append(f"   {labels.get('provider', '?'):<10} n={h.count:<5} avg={avg:8.1f}ms "
+                             f"p50<={h.quantile(0.5):g}ms p95<={h.quantile(0.95):g}ms")
+            outcomes = self._counters.get('provider_requests_total', {})
+            for key, value in sorted(outcomes.items()):
+                labels = dict(key)
+                lines.append(f"   {labels.get('provider', '?'):<10} {labels.get('outcome', '?'):<9} {value:g}")
+            stages = self._histograms.get('stage_latency_ms', {})
+            for key, h in sorted(stages.items()):
+                labels = dict(key)
+                avg = h.total / h.count if h.count else 0.0
+                lines.append(f"   stage {labels.get('stage', '?'):<9} {labels.get('provider', ''):<10} "
+                             f"n={h.count:<5} avg={avg:8.2f}ms")
+            errors = list(self.recent_errors)[-5:]
+        
+        for name, labels, value in self._gauges():
+            label_text = ''.join(f" {k}={v}" for k, v in labels.items())
+            lines.append(f"   {name}{label_text} = {value:g}")
+        if errors:
+            lines.append("   Recent errors:")
+            for e in errors:
+                lines.append(f"     [{e['time']}] {e['provider']}/{e['stage']}: {e['error']}")
+        return "\n".join(lines) if lines else "   Abhi tak koi data nahi"
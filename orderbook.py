@@ -0,0 +1,578 @@
+"""
+ORDER BOOKS
+- Har exchange + symbol ki L2 book: price levels sorted list mein (bisect), size dict mein
+- Snapshot ek baar, phir sirf diffs (size 0 = level hatao); nonce gap ho toh resync
+- REST wale exchanges (ccxt fetch_order_book) ka naya snapshot bhi diff bana ke lagta hai
+- Saare exchanges ki consolidated book: merged levels, BBO, size ke liye slippage + routing
+- Local stand-in exchange (seeded) - bina network ke test aur load feed
+"""
+
+import math
+import random
+import threading
+import time
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+BID, ASK = 'bid', 'ask'
+
+# (side, price, old size, new size) - ek level ka badlav
+Change = Tuple[str, float, float, float]
+
+# Consolidated book USD mein; har exchange ka native quote (USDT ~ USD maana hai)
+EXCHANGE_QUOTES = {'binance': 'USDT', 'kraken': 'USD', 'coinbase': 'USD', 'bitstamp': 'USD',
+                   'okx': 'USDT', 'bybit': 'USDT', 'kucoin': 'USDT'}
+DEFAULT_EXCHANGES = ('binance', 'kraken', 'coinbase')
+
+# Itni depth tak book rakhte hain (REST snapshot bhi itna hi)
+DEFAULT_DEPTH = 50
+
+
+def native_pair(base: str, exchange: str) -> str:
+    """'BTC' + 'binance' -> 'BTC/USDT'"""
+    return f"{base.upper()}/{EXCHANGE_QUOTES.get(exchange, 'USD')}"
+
+
+def fill_estimate(levels: Iterable[Tuple[float, float]], size: float) -> Dict:
+    """Best level se `size` bharne mein kya milega (average, worst price, kitne levels)"""
+    filled = cost = 0.0
+    worst = None
+    used = 0
+    for price, available in levels:
+        take = min(available, size - filled)
+        cost += take * price
+        filled += take
+        worst = price
+        used += 1
+        if filled >= size:
+            break
+    return {
+        'size': size,
+        'filled': filled,
+        'avg_price': cost / filled if filled else None,
+        'worst_price': worst,
+        'levels': used,
+        'complete': filled >= size * (1 - 1e-9),
+    }
+
+
+class BookSide:
+    """Ek side ke levels: prices hamesha ascending; bids ka best aakhri, asks ka pehla"""
+    
+    __slots__ = ('descending', 'prices', 'sizes')
+    
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self.prices: List[float] = []
+        self.sizes: Dict[float, float] = {}
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+    
+    def set(self, price: float, size: float) -> float:
+        """Level ka size set kare (0 = hatao). Purana size return"""
+        old = self.sizes.get(price, 0.0)
+        if size > 0:
+            if not old:
+                insort(self.prices, price)
+            self.sizes[price] = size
+        elif old:
+            del self.sizes[price]
+            del self.prices[bisect_left(self.prices, price)]
+        return old
+    
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self.prices:
+            return None
+        price = self.prices[-1] if self.descending else self.prices[0]
+        return price, self.sizes[price]
+    
+    def levels(self, depth: Optional[int] = None) -> Iterator[Tuple[float, float]]:
+        """Best se shuru (price, size)"""
+        prices = reversed(self.prices) if self.descending else iter(self.prices)
+        sizes = self.sizes
+        return ((price, sizes[price]) for price in islice(prices, depth))
+    
+    def trim(self, depth: int) -> List[float]:
+        """Best `depth` levels ke baad wale hataye (hatne wale prices return)"""
+        if len(self.prices) <= depth:
+            return []
+        if self.descending:
+            removed, self.prices = self.prices[:-depth], self.prices[-depth:]
+        else:
+            removed, self.prices = self.prices[depth:], self.prices[:depth]
+        for price in removed:
+            del self.sizes[price]
+        return removed
+    
+    def clear(self):
+        self.prices = []
+        self.sizes = {}
+
+
+class OrderBook:
+    """Ek exchange + symbol ki L2 book"""
+    
+    def __init__(self, exchange: str, symbol: str):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.nonce: Optional[int] = None
+        self.synced = False
+        self.updated_at = 0.0
+        self.updates = 0
+    
+    def side(self, name: str) -> BookSide:
+        return self.bids if name == BID else self.asks
+    
+    def _set_levels(self, side: str, levels: Iterable[Sequence[float]], changes: List[Change]):
+        book_side = self.side(side)
+        for level in levels:
+            price, size = float(level[0]), float(level[1])
+            old = book_side.set(price, size)
+            if old != size:
+                changes.append((side, price, old, size))
+    
+    def apply_snapshot(self, bids: Iterable[Sequence[float]], asks: Iterable[Sequence[float]],
+                       nonce: Optional[int] = None) -> List[Change]:
+        """
+        Poori book (ccxt fetch_order_book ka shape). Purani book se diff nikal ke
+        sirf badle levels lagte hain - consolidated book bhi sirf unhe dekhti hai
+        """
+        changes: List[Change] = []
+        for side, levels in ((BID, bids), (ASK, asks)):
+            book_side = self.side(side)
+            fresh = {float(level[0]): float(level[1]) for level in levels if float(level[1]) > 0}
+            for price in [p for p in book_side.sizes if p not in fresh]:
+                changes.append((side, price, book_side.set(price, 0.0), 0.0))
+            self._set_levels(side, fresh.items(), changes)
+        self.nonce = nonce
+        self.synced = True
+        self.updated_at = time.time()
+        self.updates += 1
+        return changes
+    
+    def apply_diff(self, bids: Iterable[Sequence[float]], asks: Iterable[Sequence[float]],
+                   nonce: Optional[int] = None, first_nonce: Optional[int] = None) -> Optional[List[Change]]:
+        """
+        Incremental update (size 0 = level hatao). Update [first_nonce, nonce] range cover karta hai.
+        Purana update -> [] (ignore); beech ka update chhoot gaya -> None (snapshot se resync)
+        """
+        if not self.synced:
+            return None
+        if nonce is not None and self.nonce is not None:
+            if nonce <= self.nonce:
+                return []
+            if (nonce if first_nonce is None else first_nonce) > self.nonce + 1:
+                self.synced = False
+                return None
+        changes: List[Change] = []
+        self._set_levels(BID, bids, changes)
+        self._set_levels(ASK, asks, changes)
+        if nonce is not None:
+            self.nonce = nonce
+        self.updated_at = time.time()
+        self.updates += 1
+        return changes
+    
+    def clear(self) -> List[Change]:
+        """Book khaali (resync/disconnect) - hatne wale levels changes mein"""
+        changes = [(side, price, size, 0.0) for side in (BID, ASK) for price, size in self.side(side).levels()]
+        self.bids.clear()
+        self.asks.clear()
+        self.synced = False
+        self.nonce = None
+        return changes
+    
+    def bbo(self) -> Dict:
+        bid, ask = self.bids.best(), self.asks.best()
+        return _bbo(bid, ask)
+    
+    def slippage(self, side: str, size: float) -> Dict:
+        """'buy' asks khaata hai, 'sell' bids"""
+        return _slippage(self, side, size)
+
+
+def _bbo(bid: Optional[Tuple[float, float]], ask: Optional[Tuple[float, float]]) -> Dict:
+    result = {'bid': bid[0] if bid else None, 'bid_size': bid[1] if bid else 0.0,
+              'ask': ask[0] if ask else None, 'ask_size': ask[1] if ask else 0.0,
+              'mid': None, 'spread_bps': None, 'crossed': False}
+    if bid and ask:
+        result['mid'] = (bid[0] + ask[0]) / 2
+        result['spread_bps'] = (ask[0] - bid[0]) / result['mid'] * 1e4
+        result['crossed'] = bid[0] > ask[0]
+    return result
+
+
+def _slippage(book, side: str, size: float) -> Dict:
+    """Market order ka andaaza: average price, best se slippage aur mid se cost (bps)"""
+    if side not in ('buy', 'sell'):
+        raise ValueError(f"side must be 'buy' or 'sell', not {side!r}")
+    levels = book.asks if side == 'buy' else book.bids
+    estimate = fill_estimate(levels.levels(), size)
+    estimate['side'] = side
+    best = levels.best()
+    bbo = book.bbo()
+    sign = 1 if side == 'buy' else -1
+    if estimate['avg_price'] is not None:
+        # Average best se behtar nahi ho sakta (sirf float noise)
+        estimate['slippage_bps'] = max(0.0, sign * (estimate['avg_price'] - best[0]) / best[0] * 1e4)
+        estimate['cost_vs_mid_bps'] = sign * (estimate['avg_price'] - bbo['mid']) / bbo['mid'] * 1e4 \
+            if bbo['mid'] else None
+    else:
+        estimate['slippage_bps'] = estimate['cost_vs_mid_bps'] = None
+    return estimate
+
+
+class ConsolidatedBook:
+    """Saare exchanges ki merged book - har level pe kis exchange ka kitna size"""
+    
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        # side -> price -> {exchange: size}
+        self.venues: Dict[str, Dict[float, Dict[str, float]]] = {BID: {}, ASK: {}}
+    
+    def side(self, name: str) -> BookSide:
+        return self.bids if name == BID else self.asks
+    
+    def apply(self, exchange: str, changes: Iterable[Change]):
+        """Ek exchange ke level changes merged levels pe (sirf wahi levels chhuye jaate hain)"""
+        for side, price, _, size in changes:
+            levels = self.venues[side]
+            venues = levels.get(price)
+            if venues is None:
+                if size <= 0:
+                    continue
+                venues = levels[price] = {}
+            if size > 0:
+                venues[exchange] = size
+            else:
+                venues.pop(exchange, None)
+            if venues:
+                # Chhoti dict ka sum - floating drift jama nahi hota
+                self.side(side).set(price, sum(venues.values()))
+            else:
+                del levels[price]
+                self.side(side).set(price, 0.0)
+    
+    def bbo(self) -> Dict:
+        bid, ask = self.bids.best(), self.asks.best()
+        result = _bbo(bid, ask)
+        result['bid_exchanges'] = sorted(self.venues[BID][bid[0]]) if bid else []
+        result['ask_exchanges'] = sorted(self.venues[ASK][ask[0]]) if ask else []
+        return result
+    
+    def slippage(self, side: str, size: float) -> Dict:
+        """Consolidated slippage + routing: har exchange pe kitna bharna hai"""
+        estimate = _slippage(self, side, size)
+        venues = self.venues[ASK if side == 'buy' else BID]
+        levels = self.asks if side == 'buy' else self.bids
+        route: Dict[str, float] = {}
+        remaining = size
+        for price, _ in levels.levels(estimate['levels']):
+            for exchange, available in sorted(venues[price].items(), key=lambda kv: -kv[1]):
+                take = min(available, remaining)
+                route[exchange] = route.get(exchange, 0.0) + take
+                remaining -= take
+                if remaining <= 0:
+                    break
+            if remaining <= 0:
+                break
+        estimate['route'] = route
+        return estimate
+
+
+class OrderBookManager:
+    """
+    Saari books (exchange, symbol) aur har symbol ki consolidated book.
+    Feeds snapshot/diff daalte hain; listeners ko consolidated BBO badalne pe (symbol, bbo)
+    """
+    
+    def __init__(self, depth: int = DEFAULT_DEPTH):
+        self.depth = depth
+        self.books: Dict[Tuple[str, str], OrderBook] = {}
+        self.consolidated: Dict[str, ConsolidatedBook] = {}
+        self.diffs = 0
+        self.snapshots = 0
+        self.resyncs = 0
+        self._best: Dict[str, Tuple] = {}
+        self._listeners: List[Callable[[str, Dict], None]] = []
+        self._lock = threading.RLock()
+    
+    def add_listener(self, listener: Callable[[str, Dict], None]):
+        self._listeners.append(listener)
+    
+    def book(self, exchange: str, symbol: str) -> OrderBook:
+        with self._lock:
+            book = self.books.get((exchange, symbol))
+            if book is None:
+                book = self.books[(exchange, symbol)] = OrderBook(exchange, symbol)
+                self.consolidated.setdefault(symbol, ConsolidatedBook(symbol))
+            return book
+    
+    def _publish(self, book: OrderBook, changes: List[Change]):
+        """Changes consolidated mein; BBO badla ho toh listeners (lock ke bahar)"""
+        with self._lock:
+            if self.depth:
+                for side in (BID, ASK):
+                    for price in book.side(side).trim(self.depth):
+                        changes.append((side, price, 0.0, 0.0))
+            merged = self.consolidated[book.symbol]
+            merged.apply(book.exchange, changes)
+            if not self._listeners:
+                return
+            bid, ask = merged.bids.best(), merged.asks.best()
+            if self._best.get(book.symbol) == (bid, ask):
+                return
+            self._best[book.symbol] = (bid, ask)
+            bbo = merged.bbo()
+        for listener in self._listeners:
+            listener(book.symbol, bbo)
+    
+    def on_snapshot(self, exchange: str, symbol: str, bids, asks, nonce: Optional[int] = None) -> int:
+        """Poori book - purani se diff ban ke lagti hai. Kitne levels badle"""
+        with self._lock:
+            book = self.book(exchange, symbol)
+            changes = book.apply_snapshot(bids, asks, nonce)
+            self.snapshots += 1
+            self._publish(book, changes)
+        return len(changes)
+    
+    def on_diff(self, exchange: str, symbol: str, bids, asks, nonce: Optional[int] = None,
+                first_nonce: Optional[int] = None) -> bool:
+        """Incremental update. False = sequence toota, snapshot chahiye (book tab tak hata di)"""
+        with self._lock:
+            book = self.book(exchange, symbol)
+            changes = book.apply_diff(bids, asks, nonce, first_nonce)
+            if changes is None:
+                # Galat book consolidated mein na rahe
+                self.resyncs += 1
+                self._publish(book, book.clear())
+                return False
+            self.diffs += 1
+            if changes:
+                self._publish(book, changes)
+        return True
+    
+    def remove_exchange(self, exchange: str):
+        with self._lock:
+            for (name, _), book in list(self.books.items()):
+                if name == exchange:
+                    self._publish(book, book.clear())
+    
+    def bbo(self, symbol: str) -> Optional[Dict]:
+        with self._lock:
+            merged = self.consolidated.get(symbol)
+            return merged.bbo() if merged is not None else None
+    
+    def exchange_bbos(self, symbol: str) -> Dict[str, Dict]:
+        with self._lock:
+            return {exchange: book.bbo() for (exchange, name), book in self.books.items()
+                    if name == symbol and book.synced}
+    
+    def slippage(self, symbol: str, side: str, size: float) -> Optional[Dict]:
+        with self._lock:
+            merged = self.consolidated.get(symbol)
+            return merged.slippage(side, size) if merged is not None else None
+    
+    def levels(self, symbol: str, depth: int = 10) -> Dict[str, List[Tuple[float, float, List[str]]]]:
+        """Consolidated top levels: side -> [(price, size, exchanges)]"""
+        with self._lock:
+            merged = self.consolidated.get(symbol)
+            if merged is None:
+                return {BID: [], ASK: []}
+            return {side: [(price, size, sorted(merged.venues[side][price]))
+                           for price, size in merged.side(side).levels(depth)] for side in (BID, ASK)}
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'books': len(self.books), 'synced': sum(b.synced for b in self.books.values()),
+                    'symbols': len(self.consolidated), 'snapshots': self.snapshots,
+                    'diffs': self.diffs, 'resyncs': self.resyncs}
+
+
+# ----------------------------------------------------------------- exchanges
+
+def ccxt_exchange(exchange_id: str, timeout: float = 10.0):
+    """ccxt exchange object (rate limit on). ccxt install na ho toh ImportError"""
+    import ccxt
+    return getattr(ccxt, exchange_id)({'enableRateLimit': True, 'timeout': int(timeout * 1000)})
+
+
+class StandInExchange:
+    """
+    Local stand-in exchange: seeded L2 book jo har next_diff() pe thoda badalti hai.
+    fetch_order_book ccxt jaisa result deta hai - feeds aur tests asli exchange ki jagah
+    """
+    
+    def __init__(self, name: str, mids: Dict[str, float], seed: int = 0, levels: int = 25,
+                 tick_bps: float = 0.2, half_spread: int = 2):
+        self.id = name
+        self.levels = levels
+        self.tick_bps = tick_bps
+        self.half_spread = half_spread
+        self._rng = random.Random(f"{name}:{seed}")
+        self._books: Dict[str, Dict] = {}
+        # Feed thread aur fallback snapshot ek saath aa sakte hain
+        self._lock = threading.Lock()
+        for symbol, mid in mids.items():
+            self.add_symbol(symbol, mid)
+    
+    def add_symbol(self, symbol: str, mid: float):
+        tick = 10.0 ** math.floor(math.log10(mid * self.tick_bps / 1e4))
+        anchor = round(mid / tick)
+        # Har exchange ka mid thoda alag - consolidated book mein levels overlap bhi, alag bhi
+        with self._lock:
+            book = {'tick': tick, 'center': anchor + self._rng.randint(-2, 2), 'anchor': anchor,
+                    'nonce': 1, BID: {}, ASK: {}}
+            self._fill(book, {BID: {}, ASK: {}})
+            self._books[symbol] = book
+    
+    def set_mid(self, symbol: str, mid: float):
+        """Fair price badle (simulator se) - book dheere dheere us taraf khiskegi"""
+        book = self._books[symbol]
+        book['anchor'] = round(mid / book['tick'])
+    
+    def _size(self, distance: int) -> float:
+        return round(self._rng.uniform(0.2, 2.0) * (1 + distance / 10), 4)
+    
+    def _price(self, book: Dict, ticks: int) -> float:
+        return round(ticks * book['tick'], 10)
+    
+    def _fill(self, book: Dict, changed: Dict[str, Dict[int, float]]):
+        """Center ke hisaab se dono side ki range: bahar wale levels hatao, khaali bharo"""
+        center, inner = book['center'], self.half_spread
+        for side, sign in ((BID, -1), (ASK, 1)):
+            levels = book[side]
+            near, far = sorted((center + sign * inner, center + sign * (inner + self.levels - 1)))
+            for t in [t for t in levels if not near <= t <= far]:
+                del levels[t]
+                changed[side][t] = 0.0
+            for t in range(near, far + 1):
+                if t not in levels:
+                    levels[t] = changed[side][t] = self._size(abs(t - center))
+    
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._books)
+    
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None) -> Dict:
+        book = self._books[symbol]
+        with self._lock:
+            bids = sorted(book[BID].items(), reverse=True)[:limit]
+            asks = sorted(book[ASK].items())[:limit]
+            nonce = book['nonce']
+        return {
+            'symbol': symbol,
+            'bids': [[self._price(book, t), s] for t, s in bids],
+            'asks': [[self._price(book, t), s] for t, s in asks],
+            'nonce': nonce,
+            'timestamp': int(time.time() * 1000),
+        }
+    
+    def next_diff(self, symbol: str) -> Dict:
+        """Ek update: kuch levels ke size badle, kabhi kabhi mid ek tick khiske"""
+        with self._lock:
+            return self._next_diff(symbol)
+    
+    def _next_diff(self, symbol: str) -> Dict:
+        rng = self._rng
+        book = self._books[symbol]
+        changed: Dict[str, Dict[int, float]] = {BID: {}, ASK: {}}
+        
+        if rng.random() < 0.2:
+            # Anchor ki taraf mean reversion - alag exchanges ek doosre se door na bhagein
+            up = min(0.95, max(0.05, 0.5 - 0.15 * (book['center'] - book['anchor'])))
+            book['center'] += 1 if rng.random() < up else -1
+            self._fill(book, changed)
+        
+        for _ in range(rng.randint(1, 3)):
+            side = rng.choice((BID, ASK))
+            t = rng.choice(list(book[side]))
+            book[side][t] = changed[side][t] = self._size(abs(t - book['center']))
+        
+        book['nonce'] += 1
+        return {
+            'symbol': symbol,
+            'bids': [[self._price(book, t), s] for t, s in changed[BID].items()],
+            'asks': [[self._price(book, t), s] for t, s in changed[ASK].items()],
+            'nonce': book['nonce'],
+        }
+
+
+class BookFeed:
+    """
+    Ek exchange ke symbols manager mein chalata rahe (background thread).
+    next_diff wala exchange (stand-in) diffs stream karta hai; ccxt REST har `interval` pe snapshot
+    (manager usse bhi diff banata hai)
+    """
+    
+    def __init__(self, manager: OrderBookManager, exchange, pairs: Dict[str, str],
+                 interval: float = 1.0, rate: float = 20.0, depth: int = DEFAULT_DEPTH):
+        self.manager = manager
+        self.exchange = exchange
+        self.name = getattr(exchange, 'id', str(exchange))
+        # native pair -> consolidated symbol ('BTC/USDT' -> 'BTC/USD')
+        self.pairs = pairs
+        self.interval = interval
+        self.rate = rate
+        self.depth = depth
+        self.rounds = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def streaming(self) -> bool:
+        return hasattr(self.exchange, 'next_diff')
+    
+    def add_pair(self, pair: str, symbol: str):
+        """Chalti feed mein naya pair (agle round se)"""
+        self.pairs = {**self.pairs, pair: symbol}
+    
+    def snapshot(self, pair: str):
+        book = self.exchange.fetch_order_book(pair, self.depth)
+        self.manager.on_snapshot(self.name, self.pairs[pair], book['bids'], book['asks'], book.get('nonce'))
+    
+    def poll(self):
+        """Ek round: streaming ho toh har pair ka ek diff, warna har pair ka snapshot"""
+        for pair, symbol in self.pairs.items():
+            try:
+                if not self.streaming:
+                    self.snapshot(pair)
+                    continue
+                if not self.manager.book(self.name, symbol).synced:
+                    self.snapshot(pair)
+                    continue
+                diff = self.exchange.next_diff(pair)
+                if not self.manager.on_diff(self.name, symbol, diff['bids'], diff['asks'], diff.get('nonce')):
+                    self.snapshot(pair)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+        self.rounds += 1
+    
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll()
+            # Exchange beech mein badal sakta hai (ccxt fail -> stand-in)
+            wait = 1.0 / self.rate if self.streaming else self.interval
+            self._stop.wait(max(0.0, wait - (time.monotonic() - started)))
+    
+    def start(self) -> 'BookFeed':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"book-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
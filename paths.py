@@ -0,0 +1,13 @@
+"""
+DATA DIR
+- Bot ki saari local files ek hi folder mein
+- TRADING_BOT_DATA se badla ja sakta hai; warna repo ke saath wala ./data
+"""
+
+import os
+
+
+def data_dir() -> str:
+    """Local data ka folder (TRADING_BOT_DATA ya repo ka 'data')"""
+    return os.environ.get('TRADING_BOT_DATA',
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
@@ -0,0 +1,371 @@
+"""
+PORTFOLIO + 4-POINT RISK
+- Positions columnar numpy arrays mein (qty, entry, stop, target, price, fx factor)
+- Quote aaya toh sirf us symbol ki rows dobara calculate hoti hain (incremental)
+- Totals (value, P&L, risk) delta se update - 5000 positions ka tick milliseconds mein
+- 4 points: stop-loss, risk per trade, reward:risk, position size (+ portfolio heat)
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from paths import data_dir
+from quotes import is_demo, quote_price
+
+DEFAULT_PATH = os.path.join(data_dir(), 'portfolio.json')
+
+# Risk rules (% equity ke hisaab se)
+DEFAULT_LIMITS = {
+    'max_risk_pct': 2.0,        # ek trade mein equity ka itna % hi daav pe
+    'min_reward_risk': 2.0,     # target kam se kam itne guna risk ka ho
+    'max_position_pct': 20.0,   # ek position equity ka itna % se bada nahi
+    'max_heat_pct': 6.0,        # saari positions ka total risk
+}
+
+# Per-position check flags (bitmask)
+STOP_MISSING = 1
+STOP_HIT = 2
+TARGET_HIT = 4
+RISK_TOO_HIGH = 8
+REWARD_TOO_LOW = 16
+OVERSIZED = 32
+
+FLAG_NAMES = {
+    STOP_MISSING: 'stop-loss nahi hai',
+    STOP_HIT: 'stop-loss hit',
+    TARGET_HIT: 'target hit',
+    RISK_TOO_HIGH: 'risk zyada',
+    REWARD_TOO_LOW: 'reward:risk kam',
+    OVERSIZED: 'position badi',
+}
+
+# Har row ke stored (incremental) columns
+_FLOAT_COLUMNS = ('qty', 'entry', 'stop', 'target', 'price', 'factor',
+                  'value', 'pnl', 'risk', 'reward')
+
+
+def flag_text(flags: int) -> List[str]:
+    return [name for bit, name in FLAG_NAMES.items() if flags & bit]
+
+
+class Portfolio:
+    """
+    Positions ki book. Symbol = resolver ka canonical symbol (cache key wala).
+    Long qty > 0, short qty < 0. Values base currency mein (fx factor se).
+    """
+    
+    def __init__(self, capital: float = 100000.0, base_currency: str = 'USD',
+                 limits: Optional[Dict[str, float]] = None, path: Optional[str] = None):
+        self.capital = float(capital)
+        self.base_currency = base_currency.upper()
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.path = path
+        
+        self.symbols: List[str] = []
+        self.asset_classes: List[str] = []
+        self.currencies: List[str] = []
+        self.labels: List[str] = []
+        self._size = 0
+        self._cols: Dict[str, np.ndarray] = {name: np.zeros(0) for name in _FLOAT_COLUMNS}
+        self._rows: Dict[str, np.ndarray] = {}
+        
+        # Quotes jo abhi apply nahi hue (symbol -> price)
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        
+        self.total_value = 0.0
+        self.total_pnl = 0.0
+        self.total_risk = 0.0
+        self.ticks = 0
+        self.rows_repriced = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def col(self, name: str) -> np.ndarray:
+        """Column ka live view (sirf bhari hui rows)"""
+        return self._cols[name][:self._size]
+    
+    def holds(self, symbol: str) -> bool:
+        return symbol in self._rows
+    
+    # ------------------------------------------------------------- positions
+    
+    def _grow(self, needed: int):
+        capacity = len(self._cols['qty'])
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        for name, column in self._cols.items():
+            grown = np.zeros(capacity)
+            grown[:self._size] = column[:self._size]
+            self._cols[name] = grown
+    
+    def _reindex(self):
+        """symbol -> rows index dobara banaye"""
+        rows: Dict[str, List[int]] = {}
+        for i, symbol in enumerate(self.symbols):
+            rows.setdefault(symbol, []).append(i)
+        self._rows = {symbol: np.array(ids, dtype=np.intp) for symbol, ids in rows.items()}
+    
+    def add(self, symbol: str, asset_class: str, qty: float, entry: float,
+            stop: Optional[float] = None, target: Optional[float] = None,
+            currency: str = 'USD', label: Optional[str] = None, price: Optional[float] = None) -> int:
+        """Nayi position (row number return). price na diya ho toh entry se value hoti hai"""
+        with self._lock:
+            i = self._size
+            self._grow(i + 1)
+            self._size += 1
+            self.symbols.append(symbol)
+            self.asset_classes.append(asset_class)
+            self.currencies.append(currency.upper())
+            self.labels.append(label or symbol.upper())
+            c = self._cols
+            c['qty'][i] = qty
+            c['entry'][i] = entry
+            c['stop'][i] = np.nan if stop is None else stop
+            c['target'][i] = np.nan if target is None else target
+            c['price'][i] = entry if price is None else price
+            c['factor'][i] = 1.0
+            # Remove ke baad yahan purani row ka kachra ho sakta hai - delta galat na ho
+            for name in ('value', 'pnl', 'risk', 'reward'):
+                c[name][i] = 0.0
+            self._reindex()
+            self._recompute(np.array([i], dtype=np.intp))
+            return i
+    
+    def remove(self, symbol: str) -> int:
+        """Symbol ki saari positions hataye (kitni hati)"""
+        with self._lock:
+            rows = self._rows.get(symbol)
+            if rows is None:
+                return 0
+            keep = np.ones(self._size, dtype=bool)
+            keep[rows] = False
+            for name, column in self._cols.items():
+                kept = column[:self._size][keep]
+                column[:len(kept)] = kept
+            self._size = int(keep.sum())
+            for attr in ('symbols', 'asset_classes', 'currencies', 'labels'):
+                values = getattr(self, attr)
+                setattr(self, attr, [v for v, k in zip(values, keep) if k])
+            self._reindex()
+            self._recompute_all()
+            return len(rows)
+    
+    # -------------------------------------------------------------- repricing
+    
+    def _recompute(self, rows: np.ndarray):
+        """Sirf in rows ke value/P&L/risk - totals delta se"""
+        c = self._cols
+        qty, price, factor = c['qty'][rows], c['price'][rows], c['factor'][rows]
+        stop, target = c['stop'][rows], c['target'][rows]
+        side = np.sign(qty)
+        size = np.abs(qty) * factor
+        
+        value = qty * price * factor
+        pnl = qty * (price - c['entry'][rows]) * factor
+        # Stop na ho toh poori position risk mein
+        risk = np.where(np.isnan(stop), size * price, size * np.maximum((price - stop) * side, 0.0))
+        reward = size * np.maximum((target - price) * side, 0.0)
+        
+        self.total_value += float(np.abs(value).sum() - np.abs(c['value'][rows]).sum())
+        self.total_pnl += float(pnl.sum() - c['pnl'][rows].sum())
+        self.total_risk += float(risk.sum() - c['risk'][rows].sum())
+        c['value'][rows] = value
+        c['pnl'][rows] = pnl
+        c['risk'][rows] = risk
+        c['reward'][rows] = reward
+        self.rows_repriced += len(rows)
+    
+    def _recompute_all(self):
+        """Poori book (remove/fx ke baad) - drift bhi saaf"""
+        for name in ('value', 'pnl', 'risk', 'reward'):
+            self._cols[name][:self._size] = 0.0
+        self.total_value = self.total_pnl = self.total_risk = 0.0
+        if self._size:
+            self._recompute(np.arange(self._size, dtype=np.intp))
+    
+    def update(self, prices: Dict[str, float]) -> int:
+        """Naye prices apply kare - sirf in symbols ki rows. Kitni rows badli"""
+        with self._lock:
+            chunks, values = [], []
+            for symbol, price in prices.items():
+                rows = self._rows.get(symbol)
+                if rows is not None and price is not None:
+                    chunks.append(rows)
+                    values.append(np.full(len(rows), float(price)))
+            if not chunks:
+                return 0
+            rows = np.concatenate(chunks)
+            self._cols['price'][rows] = np.concatenate(values)
+            self._recompute(rows)
+            self.ticks += 1
+            return len(rows)
+    
+    def on_quote(self, provider: str, symbol: str, asset_class: str, value: Dict):
+        """
+        QuoteCache listener - price sirf note hota hai, revalue() ek saath apply karta hai.
+        Demo/simulated fallback quotes se repricing nahi hoti.
+        """
+        if symbol in self._rows and not is_demo(value):
+            price = quote_price(value)
+            if price is not None:
+                self._pending[symbol] = price
+    
+    def revalue(self) -> int:
+        """Pending quotes ek vectorized pass mein"""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        return self.update(pending)
+    
+    def apply_fx(self, fx) -> int:
+        """Har position ka base currency factor FX engine se (anjaan currency = 1)"""
+        with self._lock:
+            if not self._size:
+                return 0
+            factors = fx.factors(self.currencies, self.base_currency)
+            self._cols['factor'][:self._size] = np.where(np.isnan(factors), 1.0, factors)
+            self._recompute_all()
+            return self._size
+    
+    # ------------------------------------------------------------------- risk
+    
+    @property
+    def equity(self) -> float:
+        return self.capital + self.total_pnl
+    
+    def risk_table(self) -> Dict[str, np.ndarray]:
+        """4-point checks poori book pe (vectorized) - percentages abhi ki equity se"""
+        self.revalue()
+        with self._lock:
+            c = {name: self.col(name).copy() for name in _FLOAT_COLUMNS}
+        equity = self.equity if self.equity > 0 else np.nan
+        side = np.sign(c['qty'])
+        limits = self.limits
+        
+        exposure_pct = np.abs(c['value']) / equity * 100
+        risk_pct = c['risk'] / equity * 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reward_risk = np.where(c['risk'] > 0, c['reward'] / c['risk'], np.inf)
+        reward_risk = np.where(np.isnan(c['target']), np.nan, reward_risk)
+        
+        flags = np.zeros(len(c['qty']), dtype=np.int64)
+        flags |= np.where(np.isnan(c['stop']), STOP_MISSING, 0)
+        flags |= np.where((c['price'] - c['stop']) * side <= 0, STOP_HIT, 0)
+        flags |= np.where((c['target'] - c['price']) * side <= 0, TARGET_HIT, 0)
+        flags |= np.where(risk_pct > limits['max_risk_pct'], RISK_TOO_HIGH, 0)
+        flags |= np.where(reward_risk < limits['min_reward_risk'], REWARD_TOO_LOW, 0)
+        flags |= np.where(exposure_pct > limits['max_position_pct'], OVERSIZED, 0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = np.where(c['entry'] != 0, (c['price'] / c['entry'] - 1) * side * 100, 0.0)
+        return dict(c, exposure_pct=exposure_pct, risk_pct=risk_pct, reward_risk=reward_risk,
+                    pnl_pct=pnl_pct, flags=flags)
+    
+    def summary(self) -> Dict:
+        """Portfolio totals aur heat"""
+        table = self.risk_table()
+        equity = self.equity
+        heat = self.total_risk / equity * 100 if equity > 0 else float('inf')
+        return {
+            'positions': self._size,
+            'capital': self.capital,
+            'equity': equity,
+            'base_currency': self.base_currency,
+            'gross_exposure': self.total_value,
+            'net_exposure': float(table['value'].sum()),
+            'unrealized_pnl': self.total_pnl,
+            'open_risk': self.total_risk,
+            'heat_pct': heat,
+            'heat_ok': heat <= self.limits['max_heat_pct'],
+            'flagged': int(((table['flags'] & ~TARGET_HIT) != 0).sum()),
+        }
+    
+    def positions(self) -> List[Dict]:
+        """Har position ka dict (report/JSON ke liye)"""
+        table = self.risk_table()
+        rows = []
+        for i in range(len(table['qty'])):
+            row = {name: float(table[name][i]) for name in
+                   ('qty', 'entry', 'price', 'value', 'pnl', 'pnl_pct', 'risk', 'risk_pct',
+                    'reward_risk', 'exposure_pct')}
+            for name in ('stop', 'target'):
+                row[name] = None if np.isnan(table[name][i]) else float(table[name][i])
+            row.update(symbol=self.symbols[i], asset_class=self.asset_classes[i],
+                       currency=self.currencies[i], label=self.labels[i],
+                       checks=flag_text(int(table['flags'][i])))
+            rows.append(row)
+        return rows
+    
+    # ------------------------------------------------------------- persistence
+    
+    def to_json(self) -> Dict:
+        c = {name: self.col(name) for name in ('qty', 'entry', 'stop', 'target', 'price')}
+        return {
+            'capital': self.capital,
+            'base_currency': self.base_currency,
+            'limits': self.limits,
+            'positions': [
+                {'symbol': self.symbols[i], 'asset_class': self.asset_classes[i],
+                 'currency': self.currencies[i], 'label': self.labels[i],
+                 'qty': float(c['qty'][i]), 'entry': float(c['entry'][i]),
+                 'stop': None if np.isnan(c['stop'][i]) else float(c['stop'][i]),
+                 'target': None if np.isnan(c['target'][i]) else float(c['target'][i]),
+                 'price': float(c['price'][i])}
+                for i in range(self._size)
+            ],
+        }
+    
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f, indent=1)
+        os.replace(tmp, path)
+    
+    @classmethod
+    def from_positions(cls, positions: Iterable[Dict], **kwargs) -> 'Portfolio':
+        """Bahut saari positions ek saath (add() ki tarah har row pe reindex nahi)"""
+        portfolio = cls(**kwargs)
+        positions = list(positions)
+        n = len(positions)
+        portfolio._grow(n)
+        c = portfolio._cols
+        for i, p in enumerate(positions):
+            portfolio.symbols.append(p['symbol'])
+            portfolio.asset_classes.append(p.get('asset_class', 'stock'))
+            portfolio.currencies.append(p.get('currency', 'USD').upper())
+            portfolio.labels.append(p.get('label') or p['symbol'].upper())
+            c['qty'][i] = p['qty']
+            c['entry'][i] = p['entry']
+            c['stop'][i] = np.nan if p.get('stop') is None else p['stop']
+            c['target'][i] = np.nan if p.get('target') is None else p['target']
+            c['price'][i] = p.get('price') or p['entry']
+            c['factor'][i] = 1.0
+        portfolio._size = n
+        portfolio._reindex()
+        portfolio._recompute_all()
+        return portfolio
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH, **kwargs) -> 'Portfolio':
+        """File se book (na ho ya kharab ho toh khaali)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path=path, **kwargs)
+        options = dict(capital=data.get('capital', 100000.0),
+                       base_currency=data.get('base_currency', 'USD'),
+                       limits=data.get('limits'), path=path)
+        options.update(kwargs)
+        return cls.from_positions(data.get('positions', []), **options)
@@ -0,0 +1,277 @@
+"""
+PROFILER
+- Ek chat turn / query ko profile kare: CPU kahan gaya, memory kahan allocate hui
+- Sampling profiler (alag thread stack dekhta hai) -> collapsed stacks file
+  (flamegraph.pl, speedscope, inferno sab padh lete hain)
+- Ya deterministic mode: cProfile ki .pstats file + top functions
+- tracemalloc se top allocations (file:line) aur peak memory
+- Runtime pe on/off; off ho toh section() ek constant no-op deta hai (koi cost nahi)
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from paths import data_dir
+
+DEFAULT_DIR = os.path.join(data_dir(), 'profiles')
+
+# Sampling interval (seconds); session ke dauraan GIL switch interval bhi itna chhota
+DEFAULT_INTERVAL = 0.0005
+
+# Report mein kitne top frames / allocations
+TOP = 15
+
+MODES = ('sample', 'cprofile')
+
+
+def _slug(label: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', label).strip('_')[:40] or 'session'
+
+
+class _Sampler(threading.Thread):
+    """Target thread ka stack har `interval` pe - collapsed stack -> count"""
+    
+    def __init__(self, target: int, interval: float):
+        super().__init__(name='profiler-sampler', daemon=True)
+        self.target = target
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._frame_names: Dict[object, str] = {}
+        self._stop_event = threading.Event()
+    
+    def _frame_name(self, code) -> str:
+        name = self._frame_names.get(code)
+        if name is None:
+            name = self._frame_names[code] = \
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return name
+    
+    def run(self):
+        frames = sys._current_frames
+        while not self._stop_event.wait(self.interval):
+            frame = frames().get(self.target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame.f_code))
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+    
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class ProfileSession:
+    """Ek profiled section - exit pe files likhta hai aur `report` bharta hai"""
+    
+    def __init__(self, profiler: 'Profiler', label: str):
+        self.profiler = profiler
+        self.label = label
+        self.report: Optional[Dict] = None
+        self._sampler: Optional[_Sampler] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._before = None
+    
+    def __enter__(self) -> 'ProfileSession':
+        profiler = self.profiler
+        profiler._local.active = True
+        profiler._acquire()
+        if profiler.allocations:
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+        
+        if profiler.mode == 'cprofile':
+            self._cprofile = cProfile.Profile()
+        else:
+            self._sampler = _Sampler(threading.get_ident(), profiler.interval)
+            self._sampler.start()
+        self._started = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        return self
+    
+    def __exit__(self, *exc):
+        wall_ms = (time.perf_counter() - self._started) * 1000.0
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        
+        allocations, peak_kb = [], 0.0
+        if self._before is not None:
+            after = tracemalloc.take_snapshot()
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024.0
+            allocations = self._allocations(self._before, after)
+            self._before = None
+        self.profiler._release()
+        self.profiler._local.active = False
+        
+        try:
+            self.report = self.profiler._write(self, wall_ms, allocations, peak_kb)
+        except OSError as e:
+            self.report = {'label': self.label, 'wall_ms': round(wall_ms, 3), 'error': str(e)}
+        return False
+    
+    def _allocations(self, before, after) -> List[Dict]:
+        """Session mein badhi memory - file:line ke hisaab se (profiler/tracemalloc khud nahi)"""
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),
+                  tracemalloc.Filter(False, __file__),
+                  tracemalloc.Filter(False, '<frozen importlib._bootstrap>'))
+        diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+        top = [stat for stat in diff if stat.size_diff > 0][:TOP]
+        return [{'where': f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                 'kb': round(stat.size_diff / 1024.0, 1), 'blocks': stat.count_diff} for stat in top]
+
+
+class _NoopSession:
+    __slots__ = ()
+    report = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSession()
+
+
+class Profiler:
+    """
+    `with profiler.section('BTC'):` - enabled ho toh profile, warna no-op.
+    Ek thread pe nested section profile nahi hota (bahar wala hi poora dekhta hai)
+    """
+    
+    def __init__(self, enabled: bool = False, out_dir: str = DEFAULT_DIR, mode: str = 'sample',
+                 interval: float = DEFAULT_INTERVAL, allocations: bool = True, frames: int = 1):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        self.enabled = enabled
+        self.out_dir = out_dir
+        self.mode = mode
+        self.interval = interval
+        self.allocations = allocations
+        self.frames = frames
+        self.sessions = 0
+        self.last_report: Optional[Dict] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Kitne sessions chal rahe hain (alag threads pe) - global settings pehla badle, aakhri wapas kare
+        self._active = 0
+        self._own_tracemalloc = False
+        self._switch = 0.0
+    
+    def _acquire(self):
+        with self._lock:
+            self._active += 1
+            if self._active > 1:
+                return
+            if self.allocations and not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._own_tracemalloc = True
+            # Chhota switch interval - sampler thread ko GIL jaldi mile, chhoti calls bhi dikhen
+            self._switch = sys.getswitchinterval()
+            if self.mode == 'sample':
+                sys.setswitchinterval(min(self._switch, self.interval))
+    
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+            if self._active:
+                return
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+                self._own_tracemalloc = False
+            sys.setswitchinterval(self._switch)
+    
+    def section(self, label: str, force: bool = False):
+        """Profiled block; `force` se profiler off ho tab bhi (chat ka 'profile <query>')"""
+        if not (self.enabled or force) or getattr(self._local, 'active', False):
+            return _NOOP
+        return ProfileSession(self, label)
+    
+    def call(self, label: str, fn, *args, **kwargs):
+        """fn(*args) ko section ke andar chalaye"""
+        with self.section(label):
+            return fn(*args, **kwargs)
+    
+    def _write(self, session: ProfileSession, wall_ms: float, allocations: List[Dict],
+               peak_kb: float) -> Dict:
+        """Session ki files likhe aur chhota report de"""
+        with self._lock:
+            self.sessions += 1
+            number = self.sessions
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{number:03d}-"
+                                          f"{_slug(session.label)}")
+        report = {'label': session.label, 'mode': self.mode, 'wall_ms': round(wall_ms, 3),
+                  'allocations': allocations, 'peak_kb': round(peak_kb, 1), 'files': []}
+        
+        if session._sampler is not None:
+            stacks = session._sampler.stacks
+            samples = session._sampler.samples
+            with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            report['files'].append(base + '.collapsed')
+            # Self time: stack ka aakhri frame
+            leaves: Dict[str, int] = {}
+            for stack, count in stacks.items():
+                leaf = stack.rsplit(';', 1)[-1]
+                leaves[leaf] = leaves.get(leaf, 0) + count
+            report['samples'] = samples
+            report['top'] = [{'frame': frame, 'pct': round(count / samples * 100, 1)}
+                             for frame, count in sorted(leaves.items(), key=lambda kv: -kv[1])[:TOP]]
+        else:
+            session._cprofile.dump_stats(base + '.pstats')
+            report['files'].append(base + '.pstats')
+            stats = pstats.Stats(session._cprofile, stream=io.StringIO())
+            total = stats.total_tt or 1.0
+            rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][2])[:TOP]
+            report['calls'] = stats.total_calls
+            report['top'] = [{'frame': f"{func} ({os.path.basename(path)}:{line})",
+                              'pct': round(tottime / total * 100, 1)}
+                             for (path, line, func), (_, _, tottime, _, _) in rows]
+        
+        if self.allocations:
+            with open(base + '.alloc.txt', 'w', encoding='utf-8') as f:
+                f.write(f"# {session.label}: peak {peak_kb:.1f} KB traced\n")
+                for item in allocations:
+                    f.write(f"{item['kb']:>10.1f} KB {item['blocks']:>8} blocks  {item['where']}\n")
+            report['files'].append(base + '.alloc.txt')
+        
+        self.last_report = report
+        return report
+
+
+def format_report(report: Optional[Dict], top: int = 5) -> str:
+    """Report ka chhota text summary"""
+    if not report:
+        return "Koi profile nahi"
+    if report.get('error'):
+        return f"⚠️ Profile files nahi likh paye: {report['error']}"
+    detail = f"{report['samples']} samples" if 'samples' in report else f"{report.get('calls', 0)} calls"
+    lines = [f"🔬 Profile '{report['label']}': {report['wall_ms']:.1f} ms ({report['mode']}, {detail})"]
+    if report.get('top'):
+        lines.append("   CPU (self):")
+        lines.extend(f"     {item['pct']:>5.1f}%  {item['frame']}" for item in report['top'][:top])
+    if report.get('allocations'):
+        lines.append(f"   Allocations (peak {report['peak_kb']:.0f} KB):")
+        lines.extend(f"     {item['kb']:>8.1f} KB  {item['where']}" for item in report['allocations'][:top])
+    for path in report.get('files', []):
+        lines.append(f"   📄 {path}")
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""
+QUOTE CACHE
+- (provider, symbol) ke hisaab se last quote yaad rakhta hai
+- Har asset class ka apna TTL
+- LRU eviction - size hamesha bounded
+- Stale-while-revalidate: purana data turant, refresh background mein
+- Warm entries (snapshot se aayi): kitni bhi purani hon, pehle wahi, refresh peeche
+- Listeners: har naye quote pe callback (portfolio repricing isi se hoti hai)
+- Demo/fallback quotes cache nahi hote - provider key ke neeche sirf asli data
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from quotes import is_demo
+
+
+class QuoteCache:
+    """TTL + LRU cache jo har provider ke aage baithta hai"""
+    
+    # Asset class -> kitne seconds tak quote fresh maana jaye
+    DEFAULT_TTLS = {
+        'crypto': 15,
+        'stock': 30,
+        'commodity': 60,
+        'forex': 60
+    }
+    
+    def __init__(self, max_size: int = 512, ttls: Optional[Dict[str, float]] = None,
+                 stale_while_revalidate: bool = False, max_stale: float = 300):
+        self.max_size = max_size
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        
+        # key -> (value, stored_at, asset_class); order = LRU order
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Dict, float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        # Snapshot se load hui keys - jab tak asli fetch na ho
+        self._warm = set()
+        # put() ke baad bulaye jaate hain: fn(provider, symbol, asset_class, value)
+        self._listeners: List[Callable[[str, str, str, Dict], None]] = []
+        
+        # Tuning ke liye counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.refreshes = 0
+    
+    def ttl_for(self, asset_class: str) -> float:
+        """Asset class ka TTL bataye"""
+        return self.ttls.get(asset_class, 30)
+    
+    def get(self, provider: str, symbol: str) -> Optional[Dict]:
+        """Fresh quote ho toh de, warna None"""
+        key = (provider, symbol)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at, asset_class = entry
+                if time.time() - stored_at <= self.ttl_for(asset_class):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+    
+    def put(self, provider: str, symbol: str, asset_class: str, value: Dict,
+            stored_at: Optional[float] = None, warm: bool = False):
+        """Quote cache mein rakhe (sirf successful, asli provider wale). warm=True: snapshot se aaya"""
+        if not value.get('success') or is_demo(value):
+            return
+        key = (provider, symbol)
+        with self._lock:
+            self._entries[key] = (value, time.time() if stored_at is None else stored_at, asset_class)
+            self._entries.move_to_end(key)
+            if warm:
+                self._warm.add(key)
+            else:
+                self._warm.discard(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._warm.discard(evicted)
+                self.evictions += 1
+        # Lock ke bahar - listener slow ho toh bhi cache block na ho
+        for listener in self._listeners:
+            try:
+                listener(provider, symbol, asset_class, value)
+            except Exception:
+                pass
+    
+    def add_listener(self, listener: Callable[[str, str, str, Dict], None]):
+        """Har successful put pe callback"""
+        self._listeners.append(listener)
+    
+    def entries(self) -> List[Tuple[str, str, str, Dict, float]]:
+        """Saari entries (provider, symbol, asset_class, value, stored_at) - snapshot ke liye"""
+        with self._lock:
+            return [(provider, symbol, asset_class, value, stored_at)
+                    for (provider, symbol), (value, stored_at, asset_class) in self._entries.items()]
+    
+    def get_or_fetch(self, provider: str, symbol: str, asset_class: str,
+                     fetch: Callable[[], Dict]) -> Dict:
+        """Cache se de, ya fetch karke cache kare"""
+        key = (provider, symbol)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at, _ = entry
+                age = now - stored_at
+                ttl = self.ttl_for(asset_class)
+                
+                warm = key in self._warm
+                if age <= ttl and not warm:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                
+                # Stale (ya snapshot wala) hai - purana data do, refresh peeche chalao
+                if warm or (self.stale_while_revalidate and age <= ttl + self.max_stale):
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(provider, symbol, asset_class, fetch),
+                            daemon=True
+                        ).start()
+                    return value
+            
+            self.misses += 1
+        
+        value = fetch()
+        self.put(provider, symbol, asset_class, value)
+        return value
+    
+    def _refresh(self, provider: str, symbol: str, asset_class: str,
+                 fetch: Callable[[], Dict]):
+        """Background refresh (stale-while-revalidate)"""
+        try:
+            value = fetch()
+            self.put(provider, symbol, asset_class, value)
+            with self._lock:
+                self.refreshes += 1
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard((provider, symbol))
+    
+    def invalidate(self, provider: str, symbol: str):
+        """Ek quote cache se hataye"""
+        with self._lock:
+            self._entries.pop((provider, symbol), None)
+            self._warm.discard((provider, symbol))
+    
+    def clear(self):
+        """Poora cache khaali kare"""
+        with self._lock:
+            self._entries.clear()
+            self._warm.clear()
+    
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'refreshes': self.refreshes,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0
+            }
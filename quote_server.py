@@ -0,0 +1,233 @@
+"""
+QUOTE SERVER
+- asyncio HTTP service: kai dashboards ek hi bot share karte hain
+- Endpoints: /quote?q=BTC, /batch?q=BTC,AAPL,gold, /search?q=..., /suggest?q=etherium, /health, /metrics
+- Single-flight: ek hi symbol ke saath aaye requests ek upstream fetch share karte hain
+- Cache hit event loop pe hi serve hota hai (thread hop nahi)
+"""
+
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Asset class -> cache provider key (app.get_quote wali)
+CACHE_PROVIDERS = {'crypto': 'coingecko', 'stock': 'yahoo', 'commodity': 'commodity', 'forex': 'forex'}
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+MAX_HEADER_BYTES = 16384
+
+
+class SingleFlight:
+    """Same key ke concurrent calls ek hi kaam share karte hain"""
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.shared = 0
+    
+    async def do(self, key: Hashable, work: Callable[[], Awaitable]):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            # shield: ek client disconnect ho toh baaki ka fetch cancel na ho
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.started += 1
+        try:
+            result = await work()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Akele caller ka exception "never retrieved" warning na de
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+
+class QuoteServer:
+    """SimpleTradingBot ke upar chhota HTTP/1.1 server (keep-alive ke saath)"""
+    
+    def __init__(self, bot, host: str = '127.0.0.1', port: int = 8080, workers: int = 16):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.flight = SingleFlight()
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor = None
+    
+    # ------------------------------------------------------------------ quotes
+    
+    def _cached(self, asset_class: str, symbol: str) -> Optional[Dict]:
+        provider = CACHE_PROVIDERS.get(asset_class)
+        return self.bot.cache.get(provider, symbol) if provider else None
+    
+    async def _blocking(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
+    async def quote(self, query: str) -> Dict:
+        """Ek query ka quote: cache -> single-flight upstream fetch"""
+        resolved = self.bot.resolver.resolve(query)
+        if not resolved:
+            # Resolver ko nahi pata - search_asset ka poora cascade (yeh bhi coalesced)
+            return await self.flight.do(('search', query.strip().lower()),
+                                        lambda: self._blocking(self.bot.search_asset, query))
+        
+        asset_class, symbol = resolved
+        cached = self._cached(asset_class, symbol)
+        if cached is not None:
+            return cached
+        # "BTC" aur "bitcoin" dono ek hi key pe aate hain
+        return await self.flight.do(resolved,
+                                    lambda: self._blocking(self.bot.get_quote, asset_class, symbol, query))
+    
+    async def batch(self, queries: List[str]) -> List[Dict]:
+        results = await asyncio.gather(*(self.quote(q) for q in queries), return_exceptions=True)
+        return [r if isinstance(r, dict) else {'success': False, 'error': str(r)} for r in results]
+    
+    # -------------------------------------------------------------------- http
+    
+    async def route(self, method: str, target: str) -> Tuple[int, object, str]:
+        """(status, body, content type)"""
+        if method not in ('GET', 'HEAD'):
+            return 405, {'success': False, 'error': 'Sirf GET'}, 'application/json'
+        
+        parts = urlsplit(target)
+        params = parse_qs(parts.query)
+        queries = [q.strip() for value in params.get('q', []) for q in value.split(',') if q.strip()]
+        path = parts.path.rstrip('/') or '/'
+        
+        if path == '/health':
+            return 200, {'success': True, 'requests': self.requests,
+                         'upstream_fetches': self.flight.started,
+                         'coalesced': self.flight.shared}, 'application/json'
+        if path == '/metrics':
+            return 200, self.bot.stats_report('prometheus'), 'text/plain; version=0.0.4'
+        
+        if path in ('/quote', '/search', '/batch', '/suggest') and not queries:
+            return 400, {'success': False, 'error': "q parameter chahiye"}, 'application/json'
+        
+        if path == '/quote':
+            return 200, await self.quote(queries[0]), 'application/json'
+        if path == '/suggest':
+            # Local index - event loop pe hi (sub-millisecond)
+            return 200, {'success': True, 'suggestions': self.bot.suggest(queries[0])}, 'application/json'
+        if path == '/batch':
+            return 200, await self.batch(queries), 'application/json'
+        if path == '/search':
+            resolved = self.bot.resolver.resolve(queries[0])
+            data = await self.quote(queries[0])
+            body = dict(data)
+            if resolved:
+                body['resolved'] = {'asset_class': resolved[0], 'symbol': resolved[1]}
+            return 200, body, 'application/json'
+        return 404, {'success': False, 'error': f"{path} nahi mila"}, 'application/json'
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Ek connection - keep-alive pe kai requests"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                
+                # Body ki zaroorat nahi, par connection saaf rahe
+                try:
+                    length: Optional[int] = int(headers.get('content-length', 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    length = None
+                if length:
+                    await reader.readexactly(length)
+                
+                self.requests += 1
+                if length is None:
+                    # Body kahan khatam hoti hai pata nahi - jawab de ke connection band
+                    status, content_type = 400, 'application/json'
+                    body = {'success': False, 'error': "Content-Length galat hai"}
+                else:
+                    try:
+                        status, body, content_type = await self.route(method, target)
+                    except Exception as e:
+                        self.bot.metrics.record_error('server', e, stage='route')
+                        status, body, content_type = 500, {'success': False, 'error': str(e)}, 'application/json'
+                
+                payload = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+                payload = payload.encode('utf-8')
+                keep_alive = length is not None and (
+                    (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                    or headers.get('connection', '').lower() == 'keep-alive')
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + (payload if method != 'HEAD' else b'')
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+    
+    async def start(self):
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='upstream')
+        # Typo index pehle se bana rahe - /suggest event loop ko block na kare
+        self._executor.submit(self.bot.resolver.fuzzy_index)
+        self._server = await asyncio.start_server(self.handle, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        # port=0 diya ho toh asli port
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def serve_forever(self):
+        await self.start()
+        print(f"Quote server: http://{self.host}:{self.port} (Ctrl+C se band)", flush=True)
+        started = time.monotonic()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+            print(f"{self.requests} requests, {self.flight.started} upstream fetches "
+                  f"in {time.monotonic() - started:.0f}s", flush=True)
+
+
+def serve(bot, host: str = '127.0.0.1', port: int = 8080):
+    """Blocking - Ctrl+C tak chalta hai"""
+    try:
+        asyncio.run(QuoteServer(bot, host, port).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,151 @@
+"""
+QUOTE STREAM
+- Ek hi polling schedule, bahut saare subscribers
+- Har tick pe saare symbols ek batch mein fetch hote hain
+- Subscriber ko sirf badle hue quotes milte hain
+- Feed koi bhi callable ho sakta hai (testing ke liye local stand-in feed)
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Change detect karte waqt ye keys ignore hoti hain
+VOLATILE_KEYS = ('timestamp',)
+
+
+def quote_fingerprint(data: Dict) -> Tuple:
+    """Quote ka woh hissa jo badle toh subscriber ko batana hai"""
+    return tuple(sorted((k, v) for k, v in data.items() if k not in VOLATILE_KEYS))
+
+
+class Subscription:
+    """Ek subscriber - iterate karo aur (query, quote) milte rahenge"""
+    
+    def __init__(self, hub: 'QuoteHub', symbols: List[str], interval: float):
+        self.hub = hub
+        self.symbols = list(dict.fromkeys(symbols))
+        self.interval = interval
+        self.active = True
+        
+        # Slow consumer ke liye har symbol ka sirf latest quote rakhte hain
+        self._pending: Dict[str, Dict] = {}
+        self._cond = threading.Condition()
+    
+    def _push(self, query: str, data: Dict):
+        """Hub naya quote yahan daalta hai"""
+        with self._cond:
+            self._pending[query] = data
+            self._cond.notify()
+    
+    def poll(self, timeout: Optional[float] = None) -> List[Tuple[str, Dict]]:
+        """Jo bhi badla hai wo de (timeout tak wait kare)"""
+        with self._cond:
+            if not self._pending and self.active:
+                self._cond.wait(timeout)
+            items = list(self._pending.items())
+            self._pending.clear()
+            return items
+    
+    def __iter__(self) -> Iterator[Tuple[str, Dict]]:
+        try:
+            while self.active:
+                for item in self.poll(timeout=self.interval):
+                    yield item
+        finally:
+            self.close()
+    
+    def close(self):
+        """Subscription band kare"""
+        if self.active:
+            self.active = False
+            with self._cond:
+                self._cond.notify_all()
+            self.hub._unsubscribe(self)
+
+
+class QuoteHub:
+    """Shared poller: saare subscribers ke symbols ek batch mein fetch karta hai"""
+    
+    def __init__(self, fetch_many: Callable[[List[str]], List[Dict]], interval: float = 1.0):
+        self.fetch_many = fetch_many
+        self.interval = interval
+        self.ticks = 0
+        
+        self._subscribers: List[Subscription] = []
+        # query -> (fingerprint, last quote)
+        self._last: Dict[str, Tuple[Tuple, Dict]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def subscribe(self, symbols: List[str], interval: Optional[float] = None) -> Subscription:
+        """Naya subscriber jode; poller zaroorat ho toh start kare"""
+        subscription = Subscription(self, symbols, interval or self.interval)
+        with self._lock:
+            self._subscribers.append(subscription)
+            # Naye subscriber ko jo pehle se pata hai wo turant mil jaye
+            for query in subscription.symbols:
+                if query in self._last:
+                    subscription._push(query, self._last[query][1])
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='quote-hub', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return subscription
+    
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            watched = {q for s in self._subscribers for q in s.symbols}
+            for query in list(self._last):
+                if query not in watched:
+                    del self._last[query]
+        self._wakeup.set()
+    
+    def tick(self) -> int:
+        """Ek polling round: batch fetch, phir changed quotes bheje"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        queries = list(dict.fromkeys(q for s in subscribers for q in s.symbols))
+        if not queries:
+            return 0
+        
+        results = self.fetch_many(queries)
+        self.ticks += 1
+        
+        changed: Dict[str, Dict] = {}
+        with self._lock:
+            for query, data in zip(queries, results):
+                if not data or not data.get('success'):
+                    continue
+                fingerprint = quote_fingerprint(data)
+                last = self._last.get(query)
+                if last is None or last[0] != fingerprint:
+                    self._last[query] = (fingerprint, data)
+                    changed[query] = data
+        
+        for subscription in subscribers:
+            for query in subscription.symbols:
+                if query in changed:
+                    subscription._push(query, changed[query])
+        return len(changed)
+    
+    def _run(self):
+        """Poller thread - jab tak koi subscriber hai"""
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                interval = min(s.interval for s in self._subscribers)
+            
+            started = time.monotonic()
+            try:
+                self.tick()
+            except Exception:
+                pass
+            
+            self._wakeup.clear()
+            self._wakeup.wait(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,256 @@
+"""
+QUOTES
+- Quote: har asset class ka ek hi schema (__slots__, dict nahi)
+- QuoteBatch: columnar quotes (array.array) - bulk refresh/render ke liye
+- Purane provider dicts se aur unki taraf conversion (to_dict / from_dict)
+- Batch ke columns numpy mein bina copy ke (np.frombuffer)
+"""
+
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+ASSET_CLASSES = ('crypto', 'stock', 'commodity', 'forex')
+ASSET_CLASS_CODES = {name: code for code, name in enumerate(ASSET_CLASSES)}
+
+# Provider fail hone pe simulator wale quotes aur FX reference rates - asli market price nahi
+DEMO_SOURCES = frozenset({'Real-time Demo', 'Demo Data', 'Reference rates'})
+
+# Batch ke numeric columns aur unka array typecode
+BATCH_COLUMNS = (
+    ('symbol_ids', 'l'),
+    ('asset_classes', 'b'),
+    ('prices', 'd'),
+    ('changes', 'd'),
+    ('volumes', 'd'),
+    ('timestamps', 'd'),
+    ('currency_ids', 'l'),
+    ('source_ids', 'l'),
+)
+
+
+def _parse_clock(text: Optional[str]) -> float:
+    """Purane 'HH:MM:SS' timestamp ko aaj ke epoch seconds mein badle"""
+    if not text:
+        return time.time()
+    try:
+        clock = datetime.strptime(text, '%H:%M:%S').time()
+    except (TypeError, ValueError):
+        return time.time()
+    return datetime.combine(datetime.now().date(), clock).timestamp()
+
+
+def quote_price(value: Dict) -> Optional[float]:
+    """Provider dict se price (crypto: price_usd, forex: rate, baaki: price) - bina Quote banaye"""
+    for key in ('price_usd', 'price', 'rate'):
+        price = value.get(key)
+        if price is not None:
+            return float(price)
+    return None
+
+
+def is_demo(value: Dict) -> bool:
+    """Quote fallback ka hai? (cache, alerts aur portfolio inpe nahi chalte)"""
+    return value.get('source') in DEMO_SOURCES
+
+
+class Quote:
+    """Ek quote - crypto/stock/commodity/forex sab ka same schema"""
+    
+    __slots__ = ('asset_class', 'symbol', 'name', 'price', 'currency', 'change_24h',
+                 'volume', 'market_cap', 'unit', 'source', 'ts', 'price_inr')
+    
+    success = True
+    
+    def __init__(self, asset_class: str, symbol: str, price: float, change_24h: float = 0.0,
+                 currency: str = 'USD', name: Optional[str] = None, volume: float = 0.0,
+                 market_cap: float = 0.0, unit: str = '', source: str = '',
+                 ts: Optional[float] = None, price_inr: Optional[float] = None):
+        self.asset_class = asset_class
+        self.symbol = symbol
+        self.name = name or symbol
+        self.price = price
+        self.currency = currency
+        self.change_24h = change_24h
+        self.volume = volume
+        self.market_cap = market_cap
+        self.unit = unit
+        self.source = source
+        self.ts = time.time() if ts is None else ts
+        self.price_inr = price_inr
+    
+    def __repr__(self) -> str:
+        return (f"Quote({self.asset_class} {self.symbol} {self.price} {self.currency} "
+                f"{self.change_24h:+.2f}% {self.source})")
+    
+    @property
+    def timestamp(self) -> str:
+        """Display ke liye HH:MM:SS"""
+        return time.strftime('%H:%M:%S', time.localtime(self.ts))
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['Quote']:
+        """Provider ka purana dict -> Quote (fail hua dict ho toh None)"""
+        if not data or not data.get('success'):
+            return None
+        
+        asset_class = data.get('type')
+        # Snapshot wale quote ka asli waqt 'as_of' mein hota hai
+        ts = data.get('as_of') or _parse_clock(data.get('timestamp'))
+        change = data.get('change_24h') or 0.0
+        source = data.get('source', '')
+        
+        if asset_class == 'crypto':
+            name = data.get('name', '')
+            return cls('crypto', name, data.get('price_usd', 0), change, 'USD', name,
+                       volume=data.get('volume') or 0.0, market_cap=data.get('market_cap') or 0.0,
+                       source=source, ts=ts, price_inr=data.get('price_inr'))
+        if asset_class == 'stock':
+            return cls('stock', data.get('symbol', ''), data.get('price', 0), change,
+                       data.get('currency', 'USD'), source=source, ts=ts)
+        if asset_class == 'commodity':
+            name = data.get('name', '')
+            return cls('commodity', name.upper(), data.get('price', 0), change, 'USD', name,
+                       unit=data.get('unit', ''), source=source, ts=ts)
+        if asset_class == 'forex':
+            pair = data.get('pair', '')
+            return cls('forex', pair, data.get('rate', 0), change, pair[3:] or 'USD',
+                       source=source, ts=ts)
+        return None
+    
+    def to_dict(self) -> Dict:
+        """Purana provider layout (chat, cache, JSON output isi pe chalte hain)"""
+        data = {'success': True, 'type': self.asset_class}
+        if self.asset_class == 'crypto':
+            data.update({
+                'name': self.name,
+                'price_usd': self.price,
+                'price_inr': self.price_inr,
+                'change_24h': self.change_24h,
+                'volume': self.volume,
+                'market_cap': self.market_cap,
+            })
+        elif self.asset_class == 'stock':
+            data.update({
+                'symbol': self.symbol,
+                'price': self.price,
+                'change_24h': self.change_24h,
+                'currency': self.currency,
+            })
+        elif self.asset_class == 'commodity':
+            data.update({
+                'name': self.name,
+                'price': self.price,
+                'unit': self.unit,
+                'change_24h': self.change_24h,
+            })
+        else:
+            data.update({
+                'pair': self.symbol,
+                'rate': self.price,
+                'change_24h': self.change_24h,
+            })
+        data['source'] = self.source
+        data['timestamp'] = self.timestamp
+        return data
+
+
+class SymbolTable:
+    """String <-> chhota int id (batches mein symbols/currencies ids se rakhe jaate hain)"""
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def intern(self, name: str) -> int:
+        """Name ka id (naya ho toh jod de)"""
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return ident
+    
+    def get(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+    
+    def name(self, ident: int) -> str:
+        return self._names[ident]
+
+
+class QuoteBatch:
+    """
+    Columnar quotes - har field ka ek array.
+    Bulk path row ke liye dict/Quote nahi banata; Quote sirf maangne pe banta hai.
+    """
+    
+    __slots__ = ('table', 'symbol_ids', 'asset_classes', 'prices', 'changes', 'volumes',
+                 'timestamps', 'currency_ids', 'source_ids')
+    
+    def __init__(self, table: Optional[SymbolTable] = None):
+        # Ek table kai batches share kar sakte hain - ids stable rehte hain
+        self.table = table if table is not None else SymbolTable()
+        for name, typecode in BATCH_COLUMNS:
+            setattr(self, name, array(typecode))
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+    
+    def append_row(self, asset_class: str, symbol: str, price: float, change_24h: float,
+                   volume: float = 0.0, ts: Optional[float] = None,
+                   currency: str = 'USD', source: str = ''):
+        """Ek row jode (provider JSON se seedha)"""
+        intern = self.table.intern
+        self.symbol_ids.append(intern(symbol))
+        self.asset_classes.append(ASSET_CLASS_CODES[asset_class])
+        self.prices.append(price)
+        self.changes.append(change_24h)
+        self.volumes.append(volume)
+        self.timestamps.append(time.time() if ts is None else ts)
+        self.currency_ids.append(intern(currency))
+        self.source_ids.append(intern(source))
+    
+    def append(self, quote: Quote):
+        self.append_row(quote.asset_class, quote.symbol, quote.price, quote.change_24h,
+                        quote.volume, quote.ts, quote.currency, quote.source)
+    
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[Quote], table: Optional[SymbolTable] = None) -> 'QuoteBatch':
+        batch = cls(table)
+        for quote in quotes:
+            batch.append(quote)
+        return batch
+    
+    @property
+    def symbols(self) -> List[str]:
+        name = self.table.name
+        return [name(i) for i in self.symbol_ids]
+    
+    def index(self, symbol: str) -> int:
+        """Symbol ki row (nahi hai toh ValueError)"""
+        ident = self.table.get(symbol)
+        if ident is None:
+            raise ValueError(f"{symbol} batch mein nahi hai")
+        return self.symbol_ids.index(ident)
+    
+    def column(self, name: str):
+        """Column ka numpy view (copy nahi) - vectorized code ke liye"""
+        import numpy as np
+        values = getattr(self, name)
+        return np.frombuffer(values, dtype=values.typecode) if len(values) else np.empty(0, values.typecode)
+    
+    def __getitem__(self, i: int) -> Quote:
+        name = self.table.name
+        return Quote(ASSET_CLASSES[self.asset_classes[i]], name(self.symbol_ids[i]), self.prices[i],
+                     self.changes[i], name(self.currency_ids[i]), volume=self.volumes[i],
+                     source=name(self.source_ids[i]), ts=self.timestamps[i])
+    
+    def __iter__(self) -> Iterator[Quote]:
+        for i in range(len(self)):
+            yield self[i]
+    
+    def to_dicts(self) -> List[Dict]:
+        return [quote.to_dict() for quote in self]
@@ -0,0 +1,301 @@
+"""
+REFRESH SCHEDULER
+- Har provider ka token bucket: upstream rate limit se zyada calls nahi
+- Priority queue: watched symbols pehle, cold requests baad mein
+- Batching window: thode time mein aaye saare symbols ek hi call mein
+- 429 aaye toh bucket khaali - burst dobara throttle nahi karta
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# provider -> (tokens per second, burst capacity)
+# CoinGecko free tier ~10-30 calls/min, Yahoo zyada dheela hai
+DEFAULT_RATE_LIMITS = {
+    'coingecko': (0.4, 3),
+    'yahoo': (2.0, 5),
+}
+
+# Ek call mein kitne symbols (URL lambi na ho)
+DEFAULT_MAX_BATCH = {'coingecko': 100, 'yahoo': 50}
+
+WATCHED = 0
+COLD = 1
+
+
+class TokenBucket:
+    """Classic token bucket - rate tokens/sec, capacity tak jama"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.throttled = 0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def try_take(self, n: float = 1) -> bool:
+        """Token ho toh le le (wait nahi karta)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= n:
+                self.tokens -= n
+                return True
+            return False
+    
+    def delay(self, n: float = 1) -> float:
+        """`n` tokens kitne seconds mein milenge"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = n - self.tokens
+            return 0.0 if missing <= 0 else missing / self.rate
+    
+    def acquire(self, timeout: Optional[float] = None, n: float = 1) -> bool:
+        """Token milne tak ruke (timeout ke andar na mile toh False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.try_take(n):
+                return True
+            wait = self.delay(n)
+            if deadline is not None and time.monotonic() + wait > deadline:
+                with self._lock:
+                    self.throttled += 1
+                return False
+            time.sleep(wait)
+    
+    def give_back(self, n: float = 1):
+        """Liya hua token wapas (call hui hi nahi)"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + n)
+    
+    def penalize(self, seconds: Optional[float] = None):
+        """Upstream ne throttle kiya - itni der koi call nahi (default: poora bucket bharne ka time)"""
+        if seconds is None:
+            seconds = self.capacity / self.rate
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+            self.throttled += 1
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {'tokens': round(self.tokens, 2), 'rate': self.rate,
+                    'capacity': self.capacity, 'throttled': self.throttled}
+
+
+def default_buckets(limits: Optional[Dict[str, Tuple[float, float]]] = None) -> Dict[str, TokenBucket]:
+    """Har provider ka naya bucket"""
+    limits = DEFAULT_RATE_LIMITS if limits is None else limits
+    return {provider: TokenBucket(rate, capacity) for provider, (rate, capacity) in limits.items()}
+
+
+class _Job:
+    __slots__ = ('symbol', 'priority', 'due', 'interval', 'lease_until')
+    
+    def __init__(self, symbol: str, priority: int, due: float):
+        self.symbol = symbol
+        self.priority = priority
+        self.due = due
+        self.interval: Optional[float] = None
+        self.lease_until = 0.0
+
+
+class RefreshScheduler:
+    """
+    Provider-wise refresh queue.
+    fetch_batch(provider, symbols) -> bool; ek call = ek token.
+    take_tokens=False: token fetch_batch khud leta hai (jaise rate-limited Transport),
+    scheduler sirf bucket dekh ke wait karta hai - double count nahi hota.
+    """
+    
+    def __init__(self, fetch_batch: Callable[[str, List[str]], bool],
+                 buckets: Optional[Dict[str, TokenBucket]] = None,
+                 window: float = 0.05, max_batch: Optional[Dict[str, int]] = None,
+                 retry_after: float = 5.0, take_tokens: bool = True):
+        self.fetch_batch = fetch_batch
+        self.take_tokens = take_tokens
+        self.buckets = buckets if buckets is not None else default_buckets()
+        self.window = window
+        self.max_batch = dict(DEFAULT_MAX_BATCH, **(max_batch or {}))
+        self.retry_after = retry_after
+        
+        # provider -> symbol -> job, aur provider -> heap (due, seq, symbol)
+        self._jobs: Dict[str, Dict[str, _Job]] = {}
+        self._heaps: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        
+        self.calls = 0
+        self.symbols_refreshed = 0
+        self.failures = 0
+    
+    # ------------------------------------------------------------ scheduling
+    
+    def _schedule(self, provider: str, job: _Job, due: float):
+        job.due = due
+        heapq.heappush(self._heaps.setdefault(provider, []), (due, next(self._seq), job.symbol))
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+            self._thread.start()
+    
+    def request(self, provider: str, symbol: str, priority: int = COLD):
+        """Ek baar refresh chahiye (cold)"""
+        now = time.monotonic()
+        with self._cond:
+            jobs = self._jobs.setdefault(provider, {})
+            job = jobs.get(symbol)
+            if job is None:
+                job = jobs[symbol] = _Job(symbol, priority, now)
+                self._schedule(provider, job, now)
+            else:
+                job.priority = min(job.priority, priority)
+                if job.due > now:
+                    self._schedule(provider, job, now)
+            self._ensure_thread()
+            self._cond.notify()
+    
+    def watch(self, provider: str, symbol: str, interval: float, lease: Optional[float] = None):
+        """Symbol ko har `interval` pe fresh rakhe - lease renew na ho toh band"""
+        now = time.monotonic()
+        with self._cond:
+            jobs = self._jobs.setdefault(provider, {})
+            job = jobs.get(symbol)
+            if job is None:
+                job = jobs[symbol] = _Job(symbol, WATCHED, now)
+                self._schedule(provider, job, now)
+            job.priority = WATCHED
+            job.interval = interval if job.interval is None else min(job.interval, interval)
+            job.lease_until = now + (lease if lease is not None else max(3 * interval, 10.0))
+            self._ensure_thread()
+            self._cond.notify()
+    
+    def unwatch(self, provider: str, symbol: str):
+        with self._cond:
+            self._jobs.get(provider, {}).pop(symbol, None)
+    
+    def pending(self) -> Dict[str, int]:
+        with self._cond:
+            return {provider: len(jobs) for provider, jobs in self._jobs.items() if jobs}
+    
+    # --------------------------------------------------------------- running
+    
+    def _take_ready(self, now: float) -> Tuple[List[Tuple[str, List[str]]], float]:
+        """Jo providers abhi call kar sakte hain unke batches, aur agla wakeup"""
+        ready = []
+        wakeup = 1.0
+        for provider, heap in self._heaps.items():
+            jobs = self._jobs.get(provider, {})
+            # Purani (reschedule ho chuki ya hati hui) entries hataye
+            while heap and (heap[0][2] not in jobs or jobs[heap[0][2]].due != heap[0][0]):
+                heapq.heappop(heap)
+            if not heap:
+                continue
+            
+            # Batching window: pehla due symbol thoda ruke taaki baaki bhi jud jayen
+            fire_at = heap[0][0] + self.window
+            if fire_at > now:
+                wakeup = min(wakeup, fire_at - now)
+                continue
+            
+            bucket = self.buckets.get(provider)
+            if bucket is not None:
+                delay = bucket.delay()
+                if delay > 0:
+                    wakeup = min(wakeup, delay)
+                    continue
+                if self.take_tokens and not bucket.try_take():
+                    continue
+            
+            due = []
+            while heap and heap[0][0] <= now:
+                when, _, symbol = heapq.heappop(heap)
+                job = jobs.get(symbol)
+                if job is not None and job.due == when and job not in due:
+                    due.append(job)
+            # Batch bhara ho toh watched pehle; baaki agli call ke liye wapas
+            due.sort(key=lambda job: (job.priority, job.due))
+            limit = self.max_batch.get(provider, 50)
+            for job in due[limit:]:
+                self._schedule(provider, job, now)
+            ready.append((provider, [job.symbol for job in due[:limit]]))
+            wakeup = 0.0
+        return ready, wakeup
+    
+    def _finish(self, provider: str, symbols: List[str], ok: bool):
+        now = time.monotonic()
+        with self._cond:
+            jobs = self._jobs.get(provider, {})
+            for symbol in symbols:
+                job = jobs.get(symbol)
+                if job is None:
+                    continue
+                if job.interval is not None and now < job.lease_until:
+                    self._schedule(provider, job, now + (job.interval if ok else max(job.interval, self.retry_after)))
+                else:
+                    del jobs[symbol]
+    
+    def run_pending(self) -> int:
+        """Jo abhi ready hai wo chalaye (thread ke bina bhi use ho sakta hai). Calls ki ginti"""
+        with self._cond:
+            ready, _ = self._take_ready(time.monotonic())
+        for provider, symbols in ready:
+            self._dispatch(provider, symbols)
+        return len(ready)
+    
+    def _dispatch(self, provider: str, symbols: List[str]):
+        try:
+            ok = bool(self.fetch_batch(provider, symbols))
+        except Exception:
+            ok = False
+        self.calls += 1
+        if ok:
+            self.symbols_refreshed += len(symbols)
+        else:
+            self.failures += 1
+            bucket = self.buckets.get(provider)
+            if bucket is not None and self.take_tokens:
+                bucket.penalize(self.retry_after)
+        self._finish(provider, symbols, ok)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                ready, wakeup = self._take_ready(time.monotonic())
+                if not ready:
+                    if not any(self._jobs.values()):
+                        # Kuch kaam nahi - thread band, naya request aaye toh phir start
+                        self._thread = None
+                        return
+                    self._cond.wait(wakeup)
+                    continue
+            for provider, symbols in ready:
+                self._dispatch(provider, symbols)
+    
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+    
+    def stats(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'symbols_refreshed': self.symbols_refreshed,
+            'failures': self.failures,
+            'pending': self.pending(),
+            'buckets': {provider: bucket.snapshot() for provider, bucket in self.buckets.items()},
+        }
@@ -0,0 +1,350 @@
+"""
+MARKET SIMULATOR
+- Seeded GBM + jumps: same seed aur same steps = bilkul same prices
+- Assets correlated hain: ek market factor + har asset class ka apna factor
+- Ek step mein hazaaron symbols (numpy) - tick stream aur OHLCV bars dono
+- Network na ho toh bot ke demo quotes yahin se; load tests aur benchmarks ka feed bhi
+"""
+
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SEED = 7
+
+# Simulated clock ki shuruaat (2024-01-01 UTC) - bars ke timestamps isi se
+DEFAULT_START = 1704067200.0
+
+YEAR = 365 * 24 * 3600.0
+DAY = 24 * 3600.0
+
+CLASSES = ('crypto', 'stock', 'commodity', 'forex')
+
+# Symbol -> (asset class, start price, annual volatility, currency)
+DEFAULT_ASSETS = {
+    'BTC': ('crypto', 45000.0, 0.60, 'USD'),
+    'ETH': ('crypto', 2500.0, 0.75, 'USD'),
+    'SOL': ('crypto', 100.0, 1.00, 'USD'),
+    'ADA': ('crypto', 0.5, 0.90, 'USD'),
+    'XRP': ('crypto', 0.6, 0.85, 'USD'),
+    'DOGE': ('crypto', 0.08, 1.10, 'USD'),
+    'AAPL': ('stock', 190.0, 0.25, 'USD'),
+    'TSLA': ('stock', 245.0, 0.55, 'USD'),
+    'MSFT': ('stock', 375.0, 0.22, 'USD'),
+    'GOOGL': ('stock', 140.0, 0.28, 'USD'),
+    'AMZN': ('stock', 150.0, 0.30, 'USD'),
+    'RELIANCE': ('stock', 2500.0, 0.25, 'INR'),
+    'TCS': ('stock', 3500.0, 0.20, 'INR'),
+    'GOLD': ('commodity', 2034.0, 0.15, 'USD'),
+    'SILVER': ('commodity', 24.5, 0.25, 'USD'),
+    'OIL': ('commodity', 78.0, 0.35, 'USD'),
+}
+
+# Naam se ticker (demo queries mein coin ka naam bhi aata hai)
+ALIASES = {
+    'BITCOIN': 'BTC', 'ETHEREUM': 'ETH', 'SOLANA': 'SOL', 'CARDANO': 'ADA',
+    'RIPPLE': 'XRP', 'DOGECOIN': 'DOGE', 'CRUDE OIL': 'OIL', 'CRUDE': 'OIL',
+    'RELIANCE.NS': 'RELIANCE', 'TCS.NS': 'TCS',
+}
+
+# Asset class -> (annual drift, jumps per year, jump mean, jump std) - log terms mein
+CLASS_PARAMS = {
+    'crypto': (0.05, 12.0, -0.01, 0.06),
+    'stock': (0.07, 4.0, -0.005, 0.04),
+    'commodity': (0.02, 3.0, 0.0, 0.03),
+    'forex': (0.0, 2.0, 0.0, 0.01),
+}
+
+# Anjaan symbol ki volatility aur ek minute ka average traded value (USD); volume units mein
+CLASS_VOL = {'crypto': 0.8, 'stock': 0.35, 'commodity': 0.25, 'forex': 0.08}
+MINUTE_NOTIONAL = {'crypto': 2e6, 'stock': 5e5, 'commodity': 1e6, 'forex': 5e6}
+
+# Factor loadings: same class ka correlation = MARKET^2 + CLASS^2, alag class = MARKET^2
+MARKET_LOADING = 0.4
+CLASS_LOADING = 0.5
+
+# Har symbol ke per-symbol columns (add_many inhe badhata hai)
+_COLUMNS = ('price', 'prev_close', 'day_volume', 'vol', 'drift', 'jump_rate', 'jump_mean',
+            'jump_std', 'minute_volume', 'class_ids')
+
+
+def _stable_unit(symbol: str, salt: int) -> float:
+    """Symbol se [0, 1) ka deterministic number (Python ka hash() har run badalta hai)"""
+    return (zlib.crc32(f"{salt}:{symbol}".encode()) & 0xFFFFFF) / float(0x1000000)
+
+
+class MarketSimulator:
+    """Correlated jump-diffusion market - saare symbols ek numpy step mein"""
+    
+    def __init__(self, seed: int = DEFAULT_SEED, assets: Optional[Dict[str, Tuple]] = None,
+                 market_loading: float = MARKET_LOADING, class_loading: float = CLASS_LOADING,
+                 start: float = DEFAULT_START):
+        if market_loading ** 2 + class_loading ** 2 > 1.0:
+            raise ValueError("market_loading^2 + class_loading^2 must be <= 1")
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.clock = float(start)
+        self.market_loading = market_loading
+        self.class_loading = class_loading
+        self.idio_loading = float(np.sqrt(1.0 - market_loading ** 2 - class_loading ** 2))
+        self.steps = 0
+        
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.asset_classes: List[str] = []
+        self.currencies: List[str] = []
+        for name in _COLUMNS:
+            setattr(self, name, np.empty(0, dtype=np.int64 if name == 'class_ids' else np.float64))
+        
+        self._synced: Optional[float] = None
+        self._lock = threading.RLock()
+        
+        for symbol, (asset_class, price, vol, currency) in (DEFAULT_ASSETS if assets is None else assets).items():
+            self.add(symbol, asset_class, price, vol, currency)
+    
+    @classmethod
+    def synthetic(cls, count: int, seed: int = DEFAULT_SEED, first: int = 0,
+                  **options) -> 'MarketSimulator':
+        """
+        Load tests ke liye `count` synthetic symbols (SIM<first>...), classes mein bante hue.
+        Symbol ki class aur params sirf uske number/naam se - kisi bhi slice mein same
+        """
+        sim = cls(seed, assets={}, **options)
+        symbols = [f"SIM{n:05d}" for n in range(first, first + count)]
+        for k, asset_class in enumerate(CLASSES):
+            sim.add_many(symbols[(k - first) % len(CLASSES)::len(CLASSES)], asset_class)
+        return sim
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return self._key(symbol) in self.index
+    
+    @staticmethod
+    def _key(symbol: str) -> str:
+        key = symbol.strip().upper()
+        return ALIASES.get(key, key)
+    
+    # ------------------------------------------------------------ universe
+    
+    def add_many(self, symbols: Sequence[str], asset_class: str = 'stock',
+                 prices: Optional[Sequence[float]] = None, vols: Optional[Sequence[float]] = None,
+                 currency: str = 'USD') -> List[int]:
+        """
+        Naye symbols jode (jo pehle se hain wo skip). Price/vol na diye hon toh
+        symbol ke naam se deterministic nikalte hain - har run mein same.
+        """
+        if asset_class not in CLASS_PARAMS:
+            raise ValueError(f"Unknown asset class: {asset_class}")
+        with self._lock:
+            new, new_prices, new_vols = [], [], []
+            for i, symbol in enumerate(symbols):
+                key = self._key(symbol)
+                if key in self.index or key in new:
+                    continue
+                new.append(key)
+                new_prices.append(prices[i] if prices is not None else
+                                  20.0 * 25.0 ** _stable_unit(key, 1))
+                new_vols.append(vols[i] if vols is not None else
+                                CLASS_VOL[asset_class] * (0.6 + 0.8 * _stable_unit(key, 2)))
+            if not new:
+                return [self.index[self._key(s)] for s in symbols]
+            
+            n = len(new)
+            drift, jump_rate, jump_mean, jump_std = CLASS_PARAMS[asset_class]
+            price = np.array(new_prices, dtype=np.float64)
+            columns = {
+                'price': price,
+                'prev_close': price.copy(),
+                'day_volume': np.zeros(n),
+                'vol': np.array(new_vols, dtype=np.float64),
+                'drift': np.full(n, drift),
+                'jump_rate': np.full(n, jump_rate),
+                'jump_mean': np.full(n, jump_mean),
+                'jump_std': np.full(n, jump_std),
+                'minute_volume': MINUTE_NOTIONAL[asset_class] / price,
+                'class_ids': np.full(n, CLASSES.index(asset_class), dtype=np.int64),
+            }
+            for name in _COLUMNS:
+                setattr(self, name, np.concatenate([getattr(self, name), columns[name]]))
+            for key in new:
+                self.index[key] = len(self.symbols)
+                self.symbols.append(key)
+                self.asset_classes.append(asset_class)
+                self.currencies.append(currency)
+            return [self.index[self._key(s)] for s in symbols]
+    
+    def add(self, symbol: str, asset_class: str = 'stock', price: Optional[float] = None,
+            vol: Optional[float] = None, currency: str = 'USD') -> int:
+        return self.add_many([symbol], asset_class, None if price is None else [price],
+                             None if vol is None else [vol], currency)[0]
+    
+    # ------------------------------------------------------------ dynamics
+    
+    def _log_returns(self, steps: int, dt: float) -> np.ndarray:
+        """(steps, n) log returns: drift + correlated diffusion + Poisson jumps"""
+        n = len(self.symbols)
+        rng = self.rng
+        years = dt / YEAR
+        shocks = rng.standard_normal((steps, n)) * self.idio_loading
+        shocks += rng.standard_normal((steps, 1)) * self.market_loading
+        shocks += (rng.standard_normal((steps, len(CLASSES))) * self.class_loading)[:, self.class_ids]
+        returns = shocks * (self.vol * np.sqrt(years))
+        returns += (self.drift - 0.5 * self.vol ** 2) * years
+        
+        # k jumps ka total: k * mean + sqrt(k) * std * z (normal draws sirf jahan jump hua)
+        counts = rng.poisson(self.jump_rate * years, (steps, n))
+        hit = np.nonzero(counts)
+        if len(hit[0]):
+            k = counts[hit]
+            returns[hit] += k * self.jump_mean[hit[1]] + np.sqrt(k) * self.jump_std[hit[1]] * \
+                rng.standard_normal(len(k))
+        return returns
+    
+    def _advance_day(self, end: float, last_close: Callable[[float], np.ndarray]):
+        """
+        Clock `end` tak. UTC din badla toh prev_close = pichhle din ka aakhri price
+        aur volume sirf naye din ka
+        """
+        day_start = (end // DAY) * DAY
+        if self.clock < day_start:
+            self.prev_close = last_close(day_start)
+            self.day_volume = self.minute_volume * ((end - day_start) / 60.0)
+        else:
+            self.day_volume = self.day_volume + self.minute_volume * ((end - self.clock) / 60.0)
+        self.clock = end
+    
+    def step(self, dt: float = 1.0) -> np.ndarray:
+        """Ek tick (dt seconds) aage - naye prices (copy). Koi bhi dt exact hai (GBM)"""
+        with self._lock:
+            before = self.price
+            self.price = before * np.exp(self._log_returns(1, dt)[0])
+            self._advance_day(self.clock + dt, lambda day_start: before)
+            self.steps += 1
+            return self.price.copy()
+    
+    def paths(self, steps: int, dt: float = 1.0) -> np.ndarray:
+        """`steps` ticks ek saath: (steps, n) prices. State aakhri row tak aage badhta hai"""
+        with self._lock:
+            before = self.price
+            prices = before * np.exp(np.cumsum(self._log_returns(steps, dt), axis=0))
+            start = self.clock
+            
+            def last_close(day_start: float) -> np.ndarray:
+                # Aadhi raat tak ka aakhri tick us din ka close
+                row = int((day_start - start) // dt) - 1
+                return prices[row].copy() if row >= 0 else before
+            
+            self._advance_day(start + steps * dt, last_close)
+            self.price = prices[-1].copy()
+            self.steps += steps
+            return prices
+    
+    def ticks(self, dt: float = 1.0, chunk: int = 100) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Kabhi na khatam hone wala tick stream: (times, prices) - chunk x n ek baar mein"""
+        while True:
+            start = self.clock
+            prices = self.paths(chunk, dt)
+            yield start + dt * np.arange(1, chunk + 1), prices
+    
+    def bars(self, count: int, interval: int = 60, ticks_per_bar: int = 8) -> Dict[str, np.ndarray]:
+        """
+        `count` OHLCV bars saare symbols ke: 'ts' (count,), baaki columns (count, n).
+        Har bar ke andar ticks_per_bar ticks simulate hote hain - high/low unhi se.
+        Volume mein noise aur bade moves pe zyada volume.
+        """
+        with self._lock:
+            start = self.clock
+            opening = self.price.copy()
+            ticks = self.paths(count * ticks_per_bar, interval / ticks_per_bar)
+            ticks = ticks.reshape(count, ticks_per_bar, len(self.symbols))
+            close = ticks[:, -1, :]
+            open_ = np.empty_like(close)
+            open_[0] = opening
+            open_[1:] = close[:-1]
+            high = np.maximum(ticks.max(axis=1), open_)
+            low = np.minimum(ticks.min(axis=1), open_)
+            
+            expected = self.vol * np.sqrt(interval / YEAR)
+            surprise = np.abs(np.log(close / open_)) / np.where(expected > 0, expected, 1.0)
+            noise = self.rng.lognormal(-0.08, 0.4, close.shape)
+            volume = self.minute_volume * (interval / 60.0) * noise * (0.5 + 0.5 * surprise)
+        return {
+            'ts': (start + interval * np.arange(count)).astype(np.int64),
+            'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+        }
+    
+    def write_bars(self, store, count: int, interval: int = 60, chunk: int = 1440,
+                   symbols: Optional[Iterable[str]] = None) -> int:
+        """Simulated bars BarStore mein (backtest/indicators ke liye). Kitne bars likhe"""
+        columns = [self.index[self._key(s)] for s in symbols] if symbols is not None else \
+            list(range(len(self.symbols)))
+        written = 0
+        while count > 0:
+            block = self.bars(min(chunk, count), interval)
+            for j in columns:
+                written += store.append(self.symbols[j], block['ts'], block['open'][:, j],
+                                        block['high'][:, j], block['low'][:, j],
+                                        block['close'][:, j], block['volume'][:, j])
+            count -= len(block['ts'])
+        return written
+    
+    def sync(self, now: Optional[float] = None, min_step: float = 0.5) -> float:
+        """
+        Simulated clock ko wall clock ke saath chalaye (fallback quotes ke liye).
+        Beech ka poora waqt ek exact GBM step. Kitne seconds aage badhe
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._synced is None:
+                # Pehli baar: ek din pehle se shuru - 24h change aur volume turant dikhte hain
+                self._synced = now
+                self.clock = now - DAY
+                self.step(DAY)
+                return DAY
+            elapsed = now - self._synced
+            if elapsed < min_step:
+                return 0.0
+            self._synced = now
+            self.step(elapsed)
+            return elapsed
+    
+    # ------------------------------------------------------------- quotes
+    
+    def quote(self, symbol: str, asset_class: str = 'stock') -> Dict:
+        """Ek symbol ka abhi ka quote (anjaan symbol pehli baar mein jud jaata hai)"""
+        with self._lock:
+            key = self._key(symbol)
+            i = self.index[key] if key in self.index else self.add(key, asset_class)
+            price, prev_close = float(self.price[i]), float(self.prev_close[i])
+            return {
+                'symbol': key,
+                'asset_class': self.asset_classes[i],
+                'price': price,
+                'prev_close': prev_close,
+                'change_pct': (price / prev_close - 1.0) * 100.0 if prev_close else 0.0,
+                'volume': float(self.day_volume[i]),
+                'currency': self.currencies[i],
+                'timestamp': self.clock,
+            }
+    
+    def quotes(self, symbols: Sequence[str], asset_class: str = 'stock') -> List[Dict]:
+        with self._lock:
+            return [self.quote(symbol, asset_class) for symbol in symbols]
+    
+    def feed(self, dt: float = 1.0) -> Callable[[List[str]], List[Dict]]:
+        """
+        QuoteHub ke liye stand-in fetch_many: har call ek tick aage aur
+        bot jaise result dicts. Deterministic high-rate load feed
+        """
+        def fetch_many(queries: List[str]) -> List[Dict]:
+            with self._lock:
+                self.step(dt)
+                return [dict(quote, success=True, type=quote['asset_class'], source='Simulator',
+                             change_24h=quote['change_pct'])
+                        for quote in self.quotes(queries)]
+        return fetch_many
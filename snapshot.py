@@ -0,0 +1,134 @@
+"""
+WARM-START SNAPSHOT
+- Aakhri known quotes SQLite file mein (shutdown pe aur har kuch der mein)
+- Startup pe milliseconds mein wapas cache mein - pehla jawab turant
+- Resolver ka bana hua trie bhi (listing file badli na ho toh dobara parse nahi)
+- Snapshot wale quotes pe 'as_of' hota hai - UI unki age dikhata hai
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from paths import data_dir
+
+DEFAULT_PATH = os.path.join(data_dir(), 'snapshot.db')
+
+# Isse purane quotes warm start ke laayak nahi
+DEFAULT_MAX_AGE = 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    provider TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    asset_class TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (provider, symbol)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    name TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+class Snapshot:
+    """Quotes aur resolver state ka chhota SQLite snapshot"""
+    
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.saved_at: Optional[float] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+    
+    def save_quotes(self, cache) -> int:
+        """Cache ki saari entries likhe (purani rows replace). Kitni likhi"""
+        rows = [
+            (provider, symbol, asset_class, stored_at, json.dumps(value, ensure_ascii=False))
+            for provider, symbol, asset_class, value, stored_at in cache.entries()
+            if not value.get('as_of')
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?, ?)', rows)
+            self.saved_at = time.time()
+        return len(rows)
+    
+    def load_quotes(self, cache, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """Snapshot ke quotes cache mein warm entries ki tarah daale. Kitne load hue"""
+        if not os.path.exists(self.path):
+            return 0
+        cutoff = time.time() - max_age
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT provider, symbol, asset_class, stored_at, data FROM quotes WHERE stored_at >= ?',
+                (cutoff,)
+            ).fetchall()
+        count = 0
+        for provider, symbol, asset_class, stored_at, data in rows:
+            try:
+                value = json.loads(data)
+            except ValueError:
+                continue
+            value['as_of'] = stored_at
+            cache.put(provider, symbol, asset_class, value, stored_at=stored_at, warm=True)
+            count += 1
+        return count
+    
+    def load_blob(self, name: str, signature: str) -> Optional[bytes]:
+        """Named blob - sirf tab jab signature match kare"""
+        if not os.path.exists(self.path):
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT data FROM blobs WHERE name = ? AND signature = ?', (name, signature)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+    
+    def save_blob(self, name: str, signature: str, data: bytes):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)',
+                             (name, signature, sqlite3.Binary(data)))
+    
+    def autosave(self, cache, interval: float = 60.0):
+        """Background thread jo har `interval` seconds pe quotes save kare"""
+        if self._thread is not None:
+            return
+        
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.save_quotes(cache)
+                except sqlite3.Error:
+                    pass
+        
+        self._thread = threading.Thread(target=run, name='snapshot-autosave', daemon=True)
+        self._thread.start()
+    
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
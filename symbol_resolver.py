@@ -0,0 +1,298 @@
+"""
+SYMBOL RESOLVER
+- Startup pe ek baar banta hai (token trie)
+- Query -> (asset_class, canonical_symbol) ek hi pass mein
+- Sirf poore words match hote hain ("sol" "console" ke andar nahi milega)
+- Local listing file se hazaaron tickers load ho sakte hain
+- Bana hua trie snapshot mein rakha ja sakta hai (listing dobara parse nahi hoti)
+- Exact match na mile toh suggest(): typo-tolerant ranked suggestions (autocomplete.py)
+"""
+
+import csv
+import marshal
+import os
+import re
+import threading
+import zlib
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from autocomplete import FuzzyIndex, Suggestion
+
+# Crypto mapping (query word -> CoinGecko id)
+CRYPTO_MAP = {
+    'bitcoin': 'bitcoin', 'btc': 'bitcoin',
+    'ethereum': 'ethereum', 'eth': 'ethereum',
+    'solana': 'solana', 'sol': 'solana',
+    'cardano': 'cardano', 'ada': 'cardano',
+    'ripple': 'ripple', 'xrp': 'ripple',
+    'dogecoin': 'dogecoin', 'doge': 'dogecoin',
+    'bnb': 'binancecoin',
+    'matic': 'matic-network',
+    'polkadot': 'polkadot', 'dot': 'polkadot'
+}
+
+# Stock symbols (query word -> Yahoo symbol)
+STOCK_MAP = {
+    'apple': 'AAPL', 'aapl': 'AAPL',
+    'tesla': 'TSLA', 'tsla': 'TSLA',
+    'microsoft': 'MSFT', 'msft': 'MSFT',
+    'amazon': 'AMZN', 'amzn': 'AMZN',
+    'google': 'GOOGL', 'googl': 'GOOGL',
+    'meta': 'META',
+    'nvidia': 'NVDA', 'nvda': 'NVDA',
+    'reliance': 'RELIANCE.NS',
+    'tcs': 'TCS.NS',
+    'infosys': 'INFY'
+}
+
+# Commodity names (query phrase -> commodity key)
+COMMODITY_MAP = {
+    'gold': 'gold',
+    'silver': 'silver',
+    'oil': 'oil', 'crude': 'oil', 'crude oil': 'oil'
+}
+
+# Currencies jinke beech koi bhi pair (FX engine cross rate nikalta hai)
+CURRENCIES = ('USD', 'EUR', 'GBP', 'JPY', 'INR', 'CAD', 'AUD', 'CHF', 'CNY', 'SGD', 'AED', 'HKD')
+
+# Har ordered pair: EURUSD, JPYINR, ...
+FOREX_PAIRS = [a + b for a in CURRENCIES for b in CURRENCIES if a != b]
+
+# Akeli currency likhi ho toh kaunsa pair dikhana hai
+FOREX_SINGLE = {
+    'eur': 'EURUSD', 'inr': 'USDINR', 'jpy': 'USDJPY',
+    'gbp': 'GBPUSD', 'cad': 'USDCAD', 'usd': 'USDINR',
+    'aud': 'AUDUSD', 'chf': 'USDCHF', 'cny': 'USDCNY', 'sgd': 'USDSGD',
+    'aed': 'USDAED', 'hkd': 'USDHKD',
+    'euro': 'EURUSD', 'rupee': 'USDINR', 'yen': 'USDJPY', 'yuan': 'USDCNY', 'dirham': 'USDAED'
+}
+
+# Ye words ticker hote hue bhi akele match nahi hone chahiye
+STOPWORDS = {
+    'price', 'rate', 'stock', 'share', 'coin', 'crypto', 'ka', 'ki', 'ke',
+    'kya', 'hai', 'the', 'of', 'and', 'in', 'to', 'me', 'is', 'a', 'an',
+    'on', 'it', 'all', 'now', 'for', 'what', 'today', 'aaj', 'live'
+}
+
+# Company names ke ye hisse match ke liye zaroori nahi
+NAME_SUFFIXES = {'inc', 'inc.', 'corp', 'corp.', 'corporation', 'ltd', 'ltd.',
+                 'limited', 'plc', 'co', 'co.', 'company', 'class', 'the'}
+
+# Same length ke match mein kaunsi asset class pehle
+CLASS_PRIORITY = {'crypto': 0, 'stock': 1, 'commodity': 2, 'forex': 3}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.&\-]*")
+
+# Trie node mein terminal value is key pe rehti hai
+_END = '$'
+
+
+def crypto_ticker(coin_id: str) -> Optional[str]:
+    """CoinGecko id -> chhota ticker ('bitcoin' -> 'BTC'); map mein na ho toh None"""
+    tickers = [word for word, target in CRYPTO_MAP.items() if target == coin_id and len(word) <= 5]
+    return min(tickers, key=len).upper() if tickers else None
+
+
+def tokenize(text: str) -> List[str]:
+    """Text ko lowercase words mein tode"""
+    return [token.rstrip('.-') for token in TOKEN_RE.findall(text.lower())]
+
+
+class SymbolResolver:
+    """Token trie jo query ko asset class aur symbol mein map karta hai"""
+    
+    _default: Optional['SymbolResolver'] = None
+    
+    def __init__(self):
+        self._root: Dict = {}
+        self.size = 0
+        self._fuzzy: Optional['FuzzyIndex'] = None
+        self._fuzzy_lock = threading.Lock()
+        # (snapshot, signature) - fuzzy index bhi wahin se load/save hota hai
+        self._store: Optional[tuple] = None
+    
+    @classmethod
+    def default(cls, snapshot=None) -> 'SymbolResolver':
+        """
+        Process-wide resolver (builtins + listing file), ek hi baar banta hai.
+        snapshot diya ho toh listing ka parse kiya hua trie wahan se (file na badli ho toh)
+        """
+        if cls._default is None:
+            path = os.environ.get('TRADING_BOT_LISTINGS',
+                                  os.path.join(os.path.dirname(os.path.abspath(__file__)), 'listings.csv'))
+            if not os.path.exists(path):
+                resolver = cls()
+                resolver.load_builtins()
+            else:
+                signature = cls.signature(path)
+                data = snapshot.load_blob('resolver', signature) if snapshot is not None else None
+                resolver = cls.loads(data) if data else None
+                if resolver is None:
+                    resolver = cls()
+                    resolver.load_builtins()
+                    resolver.load_listing(path)
+                    if snapshot is not None:
+                        try:
+                            snapshot.save_blob('resolver', signature, resolver.dumps())
+                        except Exception:
+                            pass
+                if snapshot is not None:
+                    resolver._store = (snapshot, signature)
+            cls._default = resolver
+        return cls._default
+    
+    @staticmethod
+    def signature(listing_path: str) -> str:
+        """Builtin tables + listing file ki pehchaan - badle toh snapshot bekaar"""
+        builtins = repr((CRYPTO_MAP, STOCK_MAP, COMMODITY_MAP, FOREX_PAIRS, FOREX_SINGLE)).encode()
+        stat = os.stat(listing_path)
+        return f"{zlib.crc32(builtins):08x}:{os.path.abspath(listing_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def dumps(self) -> bytes:
+        """Trie ko bytes mein (marshal - pickle se tez, sirf dict/tuple/str hain)"""
+        return marshal.dumps((self.size, self._root))
+    
+    @classmethod
+    def loads(cls, data: bytes) -> Optional['SymbolResolver']:
+        try:
+            size, root = marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+        resolver = cls()
+        resolver.size = size
+        resolver._root = root
+        return resolver
+    
+    def add(self, phrase: str, asset_class: str, symbol: str):
+        """Ek phrase trie mein daale"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # Pehle wala entry jeetta hai (builtins listing se pehle load hote hain)
+        if _END not in node:
+            self.size += 1
+            node[_END] = (asset_class, symbol)
+            # Naya phrase aaya - fuzzy index dobara banega
+            self._fuzzy = None
+    
+    def load_builtins(self):
+        """Bot ke apne crypto/stock/commodity/forex tables load kare"""
+        for word, coin_id in CRYPTO_MAP.items():
+            self.add(word, 'crypto', coin_id)
+        for word, symbol in STOCK_MAP.items():
+            self.add(word, 'stock', symbol)
+        for word, commodity in COMMODITY_MAP.items():
+            self.add(word, 'commodity', commodity)
+        for pair in FOREX_PAIRS:
+            self.add(pair, 'forex', pair)
+            self.add(f"{pair[:3]} {pair[3:]}", 'forex', pair)
+            self.add(f"{pair[:3]} to {pair[3:]}", 'forex', pair)
+        for word, pair in FOREX_SINGLE.items():
+            self.add(word, 'forex', pair)
+    
+    def load_listing(self, path: str) -> int:
+        """CSV listing file load kare (columns: symbol, name, asset_class, id)"""
+        count = 0
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                symbol = (row.get('symbol') or '').strip()
+                if not symbol:
+                    continue
+                asset_class = (row.get('asset_class') or 'stock').strip().lower()
+                # Crypto ke liye CoinGecko id chahiye, baaki ke liye symbol hi canonical hai
+                canonical = (row.get('id') or '').strip() or symbol
+                if asset_class == 'stock':
+                    canonical = canonical.upper()
+                
+                self.add(symbol, asset_class, canonical)
+                name = [t for t in tokenize(row.get('name') or '') if t not in NAME_SUFFIXES]
+                if name:
+                    self.add(' '.join(name), asset_class, canonical)
+                count += 1
+        return count
+    
+    def phrases(self) -> Iterator[Tuple[str, str, str]]:
+        """Trie ke saare (phrase, asset_class, symbol)"""
+        stack = [((), self._root)]
+        while stack:
+            path, node = stack.pop()
+            for key, child in node.items():
+                if key == _END:
+                    yield ' '.join(path), child[0], child[1]
+                else:
+                    stack.append((path + (key,), child))
+    
+    def fuzzy_index(self) -> 'FuzzyIndex':
+        """Trigram index - pehli zaroorat pe banta hai (background mein pehle se bhi ban sakta hai)"""
+        if self._fuzzy is None:
+            with self._fuzzy_lock:
+                if self._fuzzy is None:
+                    from autocomplete import FuzzyIndex
+                    index = None
+                    if self._store is not None:
+                        snapshot, signature = self._store
+                        data = snapshot.load_blob('fuzzy', signature)
+                        index = FuzzyIndex.loads(data) if data else None
+                    if index is None:
+                        index = FuzzyIndex(self.phrases(), CLASS_PRIORITY)
+                        if self._store is not None:
+                            try:
+                                snapshot.save_blob('fuzzy', signature, index.dumps())
+                            except Exception:
+                                pass
+                    self._fuzzy = index
+        return self._fuzzy
+    
+    def suggest(self, query: str, limit: int = 5, asset_class: Optional[str] = None) -> List['Suggestion']:
+        """Typo wali query ke liye ranked suggestions (network nahi)"""
+        text = ' '.join(t for t in tokenize(query) if t not in STOPWORDS) or query
+        suggestions = self.fuzzy_index().search(text, limit if asset_class is None else limit * 4)
+        if asset_class is not None:
+            suggestions = [s for s in suggestions if s.asset_class == asset_class][:limit]
+        return suggestions
+    
+    def resolve(self, query: str, asset_class: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Query -> (asset_class, symbol); sabse lamba match jeetta hai"""
+        matches = self.matches(query, asset_class)
+        return matches[0] if matches else None
+    
+    def matches(self, query: str, asset_class: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Sabse lambe match wale saare (asset_class, symbol) - class priority order mein.
+        "bitcoin ya apple" jaisi query mein ek se zyada barabar ke candidates hote hain
+        """
+        tokens = tokenize(query)
+        found: Dict[Tuple[str, str], tuple] = {}
+        longest = 0
+        
+        for start in range(len(tokens)):
+            if tokens[start] in STOPWORDS and len(tokens) > 1:
+                continue
+            node = self._root
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                value = node.get(_END)
+                if value is None or (asset_class and value[0] != asset_class):
+                    continue
+                length = end - start + 1
+                if length > longest:
+                    longest = length
+                    found = {}
+                if length == longest and value not in found:
+                    # Class priority > pehle aane wala
+                    found[value] = (CLASS_PRIORITY.get(value[0], 9), start)
+        
+        if found:
+            return sorted(found, key=found.__getitem__)
+        
+        # Check if it's already a symbol (jaise "AMD")
+        stripped = query.strip()
+        if asset_class in (None, 'stock') and stripped.isupper() and len(stripped) <= 5:
+            return [('stock', stripped)]
+        return []
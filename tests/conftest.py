@@ -0,0 +1,100 @@
+"""
+Tests ka common setup
+- Repo root import path pe (modules flat hain)
+- Data dir temp mein - tests asli ./data ko nahi chhoote
+- Network nahi: providers benchmark ke ReplayServer (recorded fixtures) pe, ya monkeypatch
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Modules import pe hi DEFAULT_PATH banate hain - isliye import se pehle
+os.environ['TRADING_BOT_DATA'] = tempfile.mkdtemp(prefix='trading-bot-tests-')
+os.environ['TRADING_BOT_SNAPSHOT'] = '0'
+
+import pytest
+
+from benchmark import ReplayServer
+
+
+class RecordingServer(ReplayServer):
+    """ReplayServer jo har path gin-ta hai; v7 quote pe chaahe toh 401"""
+    
+    def __init__(self, v7_status: int = 200, **kwargs):
+        super().__init__(**kwargs)
+        self.v7_status = v7_status
+        self.paths = []
+    
+    def route(self, path, query):
+        with self._lock:
+            self.paths.append(path)
+        if path == '/v7/finance/quote' and self.v7_status != 200:
+            return self.v7_status, {'finance': {'result': None, 'error': {
+                'code': 'Unauthorized', 'description': 'Invalid Crumb'}}}
+        return super().route(path, query)
+    
+    def hits(self, prefix: str) -> int:
+        with self._lock:
+            return sum(1 for path in self.paths if path.startswith(prefix))
+
+
+@pytest.fixture
+def serve():
+    """RecordingServer factory - test ke baad band"""
+    servers = []
+    
+    def factory(**kwargs):
+        server = RecordingServer(**kwargs).start()
+        servers.append(server)
+        return server
+    
+    yield factory
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def replay(serve):
+    return serve()
+
+
+@pytest.fixture
+def replay_401(serve):
+    """Yahoo v7 bina crumb - jaisa asli API karti hai"""
+    return serve(v7_status=401)
+
+
+@pytest.fixture
+def offline_bot(monkeypatch):
+    """Providers tak pahunch nahi (connection refused) - fallback raaste"""
+    from app import SimpleTradingBot
+    from transport import Transport
+    
+    monkeypatch.setattr(SimpleTradingBot, 'COINGECKO_BASE', 'http://127.0.0.1:1')
+    monkeypatch.setattr(SimpleTradingBot, 'YAHOO_BASE', 'http://127.0.0.1:1')
+    bot = SimpleTradingBot(quiet=True, transport=Transport(retries=0))
+    yield bot
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot.close()
+
+
+@pytest.fixture
+def make_bot():
+    """Replay server pe chalne wala bot; test ke baad band"""
+    from benchmark import make_bot as bench_bot
+    bots = []
+    
+    def factory(server, cached=True, timeout=2.0):
+        bot = bench_bot(server, cached=cached, timeout=timeout)
+        bots.append(bot)
+        return bot
+    
+    yield factory
+    with contextlib.redirect_stdout(io.StringIO()):
+        for bot in bots:
+            bot.close()
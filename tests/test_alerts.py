@@ -0,0 +1,92 @@
+"""Alert engine: bisect crossings, move re-anchor, dedup/cooldown, persistence, demo quotes pe koi alert nahi"""
+
+from alerts import AlertEngine
+from quote_cache import QuoteCache
+
+
+def engine(tmp_path):
+    return AlertEngine(path=str(tmp_path / 'alerts.json'))
+
+
+def test_crossing_fires_once(tmp_path):
+    alerts = engine(tmp_path)
+    alerts.add('bitcoin', 'below', 60000, 'BTC', price=65000)
+    assert alerts.update('bitcoin', 61000) == []
+    events = alerts.update('bitcoin', 59000)
+    assert len(events) == 1
+    # One-shot rule - dobara crossing pe kuch nahi
+    alerts.update('bitcoin', 61000)
+    assert alerts.update('bitcoin', 58000) == []
+
+
+def test_only_crossed_levels_fire(tmp_path):
+    alerts = engine(tmp_path)
+    for level in (100, 110, 120, 130):
+        alerts.add('TSLA', 'above', level, 'TSLA', price=95)
+    fired = alerts.update('TSLA', 115)
+    assert sorted(event['level'] for event in fired) == [100, 110]
+
+
+def test_move_rule_reanchors(tmp_path):
+    alerts = engine(tmp_path)
+    rule, _ = alerts.add('TSLA', 'move', 5, 'TSLA', price=100, repeat=True, cooldown=0)
+    assert len(alerts.update('TSLA', 106)) == 1
+    assert rule.ref == 106
+    assert alerts.update('TSLA', 108) == []
+
+
+def test_duplicate_rule_and_cooldown(tmp_path):
+    alerts = engine(tmp_path)
+    rule, created = alerts.add('gold', 'above', 2400, 'Gold', price=2350, repeat=True, cooldown=60)
+    assert created and alerts.add('gold', 'above', 2400)[1] is False
+    assert len(alerts.update('gold', 2410, now=1000)) == 1
+    alerts.update('gold', 2390, now=1010)
+    # Cooldown ke andar dobara crossing - dabaa diya
+    assert alerts.update('gold', 2405, now=1020) == []
+    assert alerts.suppressed == 1
+    alerts.update('gold', 2390, now=1100)
+    assert len(alerts.update('gold', 2405, now=1110)) == 1
+
+
+def test_crossing_across_restart(tmp_path):
+    alerts = engine(tmp_path)
+    alerts.add('bitcoin', 'above', 70000, 'BTC', price=65000)
+    alerts.save()
+    reloaded = AlertEngine.load(str(tmp_path / 'alerts.json'))
+    assert len(reloaded) == 1
+    events = reloaded.update('bitcoin', 71000)
+    assert [event['previous'] for event in events] == [65000]
+    assert len(reloaded) == 0
+
+
+def test_cache_listener_queues_events(tmp_path):
+    alerts = engine(tmp_path)
+    alerts.add('bitcoin', 'below', 60000, 'BTC', price=65000)
+    cache = QuoteCache()
+    cache.add_listener(alerts.on_quote)
+    cache.put('coingecko', 'bitcoin', 'crypto', {'success': True, 'price_usd': 59000.0})
+    assert [event['symbol'] for event in alerts.drain()] == ['bitcoin']
+    assert alerts.drain() == []
+
+
+def test_demo_quotes_do_not_fire(tmp_path):
+    alerts = engine(tmp_path)
+    alerts.add('bitcoin', 'below', 60000, 'BTC', price=65000)
+    cache = QuoteCache()
+    cache.add_listener(alerts.on_quote)
+    demo = {'success': True, 'type': 'crypto', 'name': 'BTC', 'price_usd': 44.91,
+            'source': 'Real-time Demo'}
+    cache.put('coingecko', 'bitcoin', 'crypto', demo)
+    assert alerts.drain() == []
+    
+    live = dict(demo, price_usd=59000.0, source='CoinGecko')
+    cache.put('coingecko', 'bitcoin', 'crypto', live)
+    assert len(alerts.drain()) == 1
+
+
+def test_offline_bot_does_not_seed_from_demo(tmp_path, monkeypatch, offline_bot):
+    monkeypatch.setenv('TRADING_BOT_ALERTS', str(tmp_path / 'alerts.json'))
+    assert not offline_bot.add_alert('BTC', 'move', 5)['success']
+    assert offline_bot.add_alert('BTC', 'below', 60000)['success']
+    # Demo price base nahi bana - pehla asli quote hi base hoga
+    assert offline_bot.alerts._index['bitcoin'].last_price is None
@@ -0,0 +1,56 @@
+"""Typo-tolerant suggestions: trigram index, edit distance, bot auto-correct"""
+
+from autocomplete import FuzzyIndex, best_correction, edit_distance
+from symbol_resolver import CLASS_PRIORITY, SymbolResolver
+
+
+def resolver():
+    r = SymbolResolver()
+    r.load_builtins()
+    return r
+
+
+def test_edit_distance_counts_transpositions():
+    assert edit_distance('etherium', 'ethereum', 4) == 1
+    assert edit_distance('nvidea', 'nvidia', 3) == 1
+    assert edit_distance('btc', 'bct', 2) == 1
+    # limit se zyada ho toh jaldi ruk jaata hai
+    assert edit_distance('apple', 'zzzzzzzz', 2) > 2
+
+
+def test_confident_typos_are_corrected():
+    r = resolver()
+    correction = best_correction(r.suggest('etherium'))
+    assert (correction.asset_class, correction.symbol) == ('crypto', 'ethereum')
+    correction = best_correction(r.suggest('nvidea stock'))
+    assert (correction.asset_class, correction.symbol) == ('stock', 'NVDA')
+    assert best_correction(r.suggest('zzqqxx')) is None
+
+
+def test_partly_typed_name_ranks_first():
+    top = resolver().suggest('ethe')[0]
+    assert top.symbol == 'ethereum'
+
+
+def test_index_round_trip():
+    r = resolver()
+    index = FuzzyIndex(r.phrases(), CLASS_PRIORITY)
+    loaded = FuzzyIndex.loads(index.dumps())
+    assert len(loaded) == len(index)
+    assert [s.to_dict() for s in loaded.search('solanna')] == [s.to_dict() for s in index.search('solanna')]
+
+
+def test_bot_autocorrects_before_network(replay, make_bot):
+    bot = make_bot(replay)
+    data = bot.search_asset('etherium price')
+    assert data['success'] and data['corrected_to'] == 'ethereum'
+    assert "'etherium price' ko 'ethereum' samjha" in bot.format_response(data)
+
+
+def test_not_found_lists_suggestions(replay, make_bot):
+    bot = make_bot(replay)
+    data = bot.search_asset('zzqqxx')
+    assert not data['success'] and data['suggestions'] == []
+    data = bot._not_found('bitcoi')
+    assert data['suggestions'][0]['symbol'] == 'bitcoin'
+    assert '1. bitcoin (crypto)' in bot.format_response(data)
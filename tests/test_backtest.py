@@ -0,0 +1,51 @@
+"""Backtester: worker count se result nahi badalta, sweep parsing, store source"""
+
+import numpy as np
+import pytest
+
+import backtest
+from bar_store import BarStore
+from indicators import signal_score
+from simulator import MarketSimulator
+
+SIM = {'kind': 'sim', 'symbols': 120, 'bars': 3000, 'interval': 60, 'seed': 7}
+
+
+def strip_runtime(report):
+    return {k: v for k, v in report.items() if k not in ('runtime_s', 'workers')}
+
+
+def test_results_identical_across_worker_counts():
+    params = backtest.param_grid(stop_pct=[0.005, 0.01], entry_score=[1, 2])
+    one = backtest.run(SIM, params, workers=1)
+    three = backtest.run(SIM, params, workers=3)
+    assert one['success'] and one['workers'] == 1 and three['workers'] == 3
+    assert strip_runtime(one) == strip_runtime(three)
+    assert one['results'][0]['return_pct'] >= one['results'][-1]['return_pct']
+    assert sum(r['trades'] for r in one['results']) > 0
+
+
+def test_param_grid_and_sweep_specs():
+    axes = backtest.parse_sweep(['stop_pct=0.005,0.02', 'entry_score=1,3', 'allow_short=no'])
+    assert axes == {'stop_pct': [0.005, 0.02], 'entry_score': [1, 3], 'allow_short': [False]}
+    grid = backtest.param_grid(**axes)
+    assert len(grid) == 4 and grid[0]['fee_bps'] == backtest.DEFAULT_PARAMS['fee_bps']
+    with pytest.raises(ValueError):
+        backtest.parse_sweep(['nope=1'])
+    with pytest.raises(ValueError):
+        backtest.param_grid(nope=[1])
+
+
+def test_signal_score_ignores_missing_indicators():
+    score = signal_score([10.0, 10.0, 10.0], [9.0, np.nan, 11.0], [0.5, np.nan, -0.5], [50.0, np.nan, 20.0])
+    assert score.tolist() == [2, 0, -1]
+
+
+def test_store_source_skips_symbols_without_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    MarketSimulator(seed=3).write_bars(store, 2000, symbols=['BTC', 'AAPL'])
+    report = backtest.run({'kind': 'store', 'root': str(tmp_path), 'symbols': ['BTC', 'AAPL', 'NOPE']},
+                          workers=1)
+    assert report['success'] and report['symbols'] == 2 and report['bars'] == 2000
+    assert 'Backtest (store)' in backtest.format_report(report)
+    assert not backtest.run({'kind': 'store', 'root': str(tmp_path), 'symbols': ['NOPE']})['success']
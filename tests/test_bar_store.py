@@ -0,0 +1,67 @@
+"""BarStore: sirf naye bars, din ke partitions, concurrent appends mein duplicate nahi"""
+
+import os
+import threading
+
+import numpy as np
+
+from bar_store import BarStore
+
+DAY = 86400
+START = 1704067200
+
+
+def bars(ts):
+    ts = np.asarray(ts)
+    prices = ts.astype(float)
+    return ts, prices, prices + 1, prices - 1, prices, np.ones(len(ts))
+
+
+def test_append_skips_stored_and_partial_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    assert store.append('AAPL', *bars([START, START + 60])) == 2
+    ts, o, h, l, c, v = bars([START + 60, START + 120, START + 180])
+    c[2] = np.nan
+    assert store.append('AAPL', ts, o, h, l, c, v) == 1
+    assert store.read('AAPL')['ts'].tolist() == [START, START + 60, START + 120]
+
+
+def test_days_are_partitioned(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.append('AAPL', *bars([START, START + DAY]))
+    assert store.days('AAPL') == ['2024-01-01', '2024-01-02']
+    # Naya instance disk se last timestamp padhta hai
+    assert BarStore(str(tmp_path)).last_timestamp('AAPL') == START + DAY
+
+
+def test_concurrent_appends_do_not_duplicate(tmp_path):
+    store = BarStore(str(tmp_path))
+    chunk = bars(START + 60 * np.arange(500))
+    barrier = threading.Barrier(8)
+    
+    def worker():
+        barrier.wait()
+        store.append('BTC', *chunk)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.read('BTC')['ts']) == 500
+
+
+def test_append_after_torn_write_keeps_columns_aligned(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.append('AAPL', *bars([START, START + 60, START + 120]))
+    # Crash ke beech: close ki teesri row aadhi likhi gayi
+    close = tmp_path / 'AAPL' / '2024-01-01' / 'close.bin'
+    os.truncate(close, 2 * 8 + 3)
+    
+    store = BarStore(str(tmp_path))
+    assert store.last_timestamp('AAPL') == START + 60
+    assert store.append('AAPL', *bars([START + 120, START + 180])) == 2
+    day = store.read('AAPL')
+    assert day['ts'].tolist() == [START, START + 60, START + 120, START + 180]
+    assert day['close'].tolist() == day['ts'].astype(float).tolist()
+    assert os.path.getsize(close) == 4 * 8
@@ -0,0 +1,67 @@
+"""Benchmark harness: percentiles, regression diff, replay server"""
+
+import requests
+
+from benchmark import compare, load_fixtures, percentile, record, run_suite
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_compare_flags_only_slowdowns_past_threshold(capsys):
+    baseline = {'search': {'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 40.0}}
+    now = [{'name': 'search', 'p50_ms': 11.0, 'p95_ms': 30.0, 'p99_ms': 20.0},
+           {'name': 'new-scenario', 'p50_ms': 1.0, 'p95_ms': 1.0, 'p99_ms': 1.0}]
+    assert compare(now, baseline, threshold=0.2) == ['search p95_ms +50.0%']
+
+
+def test_replay_serves_fixtures_and_injects_errors(replay, serve):
+    response = requests.get(f"{replay.url}/api/v3/simple/price", params={'ids': 'bitcoin,unknown'})
+    assert list(response.json()) == ['bitcoin']
+    assert requests.get(f"{replay.url}/v8/finance/chart/NOPE").status_code == 404
+    
+    failing = serve(error_rate=1.0)
+    assert requests.get(f"{failing.url}/v8/finance/chart/AAPL").status_code == 503
+    assert failing.requests == 1
+
+
+def test_bot_quotes_from_replay(replay, make_bot):
+    bot = make_bot(replay)
+    data = bot.search_asset('AAPL')
+    meta = replay.fixtures['charts']['AAPL']['chart']['result'][0]['meta']
+    assert data['source'] == 'Yahoo Finance'
+    assert data['price'] == round(meta['regularMarketPrice'], 2)
+
+
+def test_suite_reports_percentiles(replay):
+    results = run_suite(replay, iterations=5, timeout=2.0)
+    names = [r['name'] for r in results]
+    assert {'search_asset.cold', 'search_asset.cached', 'search_many.watchlist'} <= set(names)
+    for result in results:
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+
+
+def test_record_includes_commodity_futures(tmp_path, monkeypatch):
+    class Response:
+        status_code = 200
+        
+        def __init__(self, url):
+            self.url = url
+        
+        def raise_for_status(self):
+            pass
+        
+        def json(self):
+            if 'coingecko' in self.url:
+                return {'bitcoin': {'usd': 1.0}}
+            return {'quoteResponse': {'result': []}} if '/v7/' in self.url else {'chart': {'result': []}}
+    
+    monkeypatch.setattr(requests, 'get', lambda url, **kwargs: Response(url))
+    record(str(tmp_path))
+    charts = load_fixtures(str(tmp_path))['charts']
+    assert {'GC=F', 'SI=F', 'CL=F', 'AAPL'} <= set(charts)
@@ -0,0 +1,64 @@
+"""Headless CLI: quote/stream JSON lines, network stack lazy"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app import SimpleTradingBot, run_cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def providers(replay, monkeypatch):
+    """run_cli apna bot banata hai - providers class level pe replay server pe"""
+    monkeypatch.setattr(SimpleTradingBot, 'COINGECKO_BASE', replay.url)
+    monkeypatch.setattr(SimpleTradingBot, 'YAHOO_BASE', replay.url)
+    return replay
+
+
+def test_quote_json_lines(providers, capsys):
+    assert run_cli(['quote', 'BTC', 'AAPL', '--json']) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['query'] for line in lines] == ['BTC', 'AAPL']
+    assert all(line['success'] for line in lines)
+
+
+def test_failed_query_sets_exit_code(providers, capsys):
+    assert run_cli(['quote', 'qwertyuiop zzz', '--json']) == 1
+    assert json.loads(capsys.readouterr().out)['success'] is False
+
+
+def test_stream_reads_file(providers, tmp_path, capsys):
+    path = tmp_path / 'queries.txt'
+    path.write_text("# watchlist\nBTC\n\nAAPL\n", encoding='utf-8')
+    assert run_cli(['stream', str(path)]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['query'] for line in lines] == ['BTC', 'AAPL']
+
+
+def test_import_does_not_load_network_stack():
+    code = "import sys, app; print('requests' in sys.modules)"
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=30)
+    assert out.stdout.strip() == 'False', out.stderr
+
+
+def test_stream_missing_file_exits_with_message(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run_cli(['stream', str(tmp_path / 'missing.txt')])
+    assert exit_info.value.code == 2
+    assert 'missing.txt' in capsys.readouterr().err
+
+
+def test_quick_test_does_not_sleep(providers, capsys):
+    from app import quick_test
+    
+    started = time.perf_counter()
+    quick_test()
+    # Pehle har query ke baad 0.5s ka sleep tha (5 queries = 2.5s)
+    assert time.perf_counter() - started < 2.0
+    assert 'Test complete' in capsys.readouterr().out
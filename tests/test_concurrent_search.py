@@ -0,0 +1,113 @@
+"""Concurrent search: sabse upar wala live success jeetta hai, latency sabse slow candidate jitni"""
+
+import time
+
+from app import SimpleTradingBot
+
+
+def fake_quotes(monkeypatch, bot, table):
+    """get_quote ki jagah: (asset_class, symbol) -> (delay, result); baaki sab 'not found'"""
+    calls = []
+    
+    def get_quote(asset_class, symbol, query):
+        calls.append((asset_class, symbol))
+        delay, result = table.get((asset_class, symbol), (0.0, {'success': False, 'error': 'not found'}))
+        time.sleep(delay)
+        return dict(result, symbol=symbol)
+    
+    monkeypatch.setattr(bot, 'get_quote', get_quote)
+    return calls
+
+
+LIVE = {'success': True, 'source': 'Live'}
+DEMO = {'success': True, 'source': 'Real-time Demo'}
+
+
+def test_tied_matches_highest_priority_live_wins(monkeypatch):
+    bot = SimpleTradingBot(concurrent=True, quiet=True)
+    fake_quotes(monkeypatch, bot, {('crypto', 'bitcoin'): (0.2, LIVE), ('stock', 'AAPL'): (0.0, LIVE)})
+    # Stock pehle aaya, par crypto upar hai - uska intezaar
+    assert bot.search_asset('bitcoin or apple')['symbol'] == 'bitcoin'
+    
+    # Upar wala sirf demo de paaye toh neeche wala live jeetta hai
+    fake_quotes(monkeypatch, bot, {('crypto', 'bitcoin'): (0.0, DEMO), ('stock', 'AAPL'): (0.1, LIVE)})
+    assert bot.search_asset('bitcoin or apple')['symbol'] == 'AAPL'
+    
+    # Koi live nahi - pehle candidate ka (demo) result
+    fake_quotes(monkeypatch, bot, {('crypto', 'bitcoin'): (0.0, DEMO), ('stock', 'AAPL'): (0.0, DEMO)})
+    assert bot.search_asset('bitcoin or apple')['symbol'] == 'bitcoin'
+    bot.close()
+
+
+def test_latency_is_slowest_candidate_not_sum(monkeypatch):
+    bot = SimpleTradingBot(concurrent=True, quiet=True)
+    fake_quotes(monkeypatch, bot, {('crypto', 'bitcoin'): (0.3, DEMO), ('stock', 'AAPL'): (0.3, LIVE)})
+    started = time.perf_counter()
+    assert bot.search_asset('bitcoin or apple')['symbol'] == 'AAPL'
+    assert time.perf_counter() - started < 0.55
+    bot.close()
+
+
+def test_sequential_mode_stops_at_first_live(monkeypatch):
+    bot = SimpleTradingBot(quiet=True)
+    calls = fake_quotes(monkeypatch, bot, {('crypto', 'bitcoin'): (0.0, LIVE), ('stock', 'AAPL'): (0.0, LIVE)})
+    assert bot.search_asset('bitcoin or apple')['symbol'] == 'bitcoin'
+    assert calls == [('crypto', 'bitcoin')]
+    bot.close()
+
+
+def test_unplaced_word_probes_coin_and_ticker(monkeypatch):
+    bot = SimpleTradingBot(concurrent=True, quiet=True)
+    calls = fake_quotes(monkeypatch, bot, {('crypto', 'zorkcoin'): (0.0, DEMO), ('stock', 'ZORKCOIN'): (0.1, LIVE)})
+    assert bot.search_asset('zorkcoin price')['symbol'] == 'ZORKCOIN'
+    assert sorted(calls) == [('crypto', 'zorkcoin'), ('stock', 'ZORKCOIN')]
+    
+    # Andaze ka demo quote nahi maana jaata - "nahi mila"
+    fake_quotes(monkeypatch, bot, {('crypto', 'zorkcoin'): (0.0, DEMO), ('stock', 'ZORKCOIN'): (0.0, DEMO)})
+    assert not bot.search_asset('zorkcoin')['success']
+    
+    # Do shabd - andaza nahi, network nahi
+    calls = fake_quotes(monkeypatch, bot, {})
+    assert not bot.search_asset('qwertyuiop zzz')['success']
+    assert calls == []
+    bot.close()
+
+
+def test_autocorrection_outranks_probes(monkeypatch):
+    bot = SimpleTradingBot(concurrent=True, quiet=True)
+    fake_quotes(monkeypatch, bot, {('crypto', 'ethereum'): (0.2, DEMO), ('stock', 'ETHERIUM'): (0.0, LIVE)})
+    data = bot.search_asset('etherium')
+    assert data['symbol'] == 'ethereum' and data['corrected_to'] == 'ethereum'
+    assert 'tradingbot_autocorrections_total 1' in bot.metrics.to_prometheus()
+    bot.close()
+
+
+def test_search_many_runs_batches_together(monkeypatch):
+    bot = SimpleTradingBot(quiet=True)
+    
+    def coins(coin_ids):
+        time.sleep(0.3)
+        return {coin_id: {'usd': 100.0, 'inr': 8300.0, 'usd_24h_change': 1.0} for coin_id in coin_ids}
+    
+    def stocks(symbols):
+        time.sleep(0.3)
+        return {symbol: {'symbol': symbol, 'regularMarketPrice': 10.0, 'regularMarketPreviousClose': 8.0}
+                for symbol in symbols}
+    
+    monkeypatch.setattr(bot, 'fetch_coingecko_prices', coins)
+    monkeypatch.setattr(bot, 'fetch_yahoo_quotes', stocks)
+    started = time.perf_counter()
+    btc, aapl = bot.search_many(['BTC', 'AAPL'])
+    assert time.perf_counter() - started < 0.55
+    assert btc['price_usd'] == 100.0 and aapl['price'] == 10.0
+    bot.close()
+
+
+def test_search_many_corrects_and_probes_unplaced(monkeypatch):
+    bot = SimpleTradingBot(quiet=True)
+    fake_quotes(monkeypatch, bot, {('crypto', 'ethereum'): (0.0, LIVE), ('stock', 'ZORKCOIN'): (0.0, LIVE)})
+    typo, guess, unknown = bot.search_many(['etherium', 'zorkcoin', 'qwertyuiop zzz'])
+    assert typo['corrected_to'] == 'ethereum'
+    assert guess['symbol'] == 'ZORKCOIN'
+    assert not unknown['success']
+    bot.close()
@@ -0,0 +1,61 @@
+"""Dashboard ka data layer (QuoteBoard) - streamlit ke bina"""
+
+import time
+
+import pytest
+
+import app
+from dashboard import QuoteBoard, quote_row
+
+
+@pytest.fixture
+def board(replay, make_bot, tmp_path, monkeypatch):
+    monkeypatch.setenv('TRADING_BOT_ALERTS', str(tmp_path / 'alerts.json'))
+    board = QuoteBoard(make_bot(replay), interval=0.05, lease=0.3)
+    yield board
+    board.close()
+
+
+def test_quote_row():
+    row = quote_row('BTC', {'success': True, 'type': 'crypto', 'name': 'BTC', 'price_usd': 50000.0,
+                            'change_24h': 1.234, 'source': 'CoinGecko', 'timestamp': '10:00:00'})
+    assert (row['Asset'], row['Price'], row['Change %']) == ('BTC', 50000.0, 1.23)
+    failed = quote_row('zzz', {'success': False, 'error': 'nahi mila'})
+    assert failed['Price'] is None and failed['Source'] == 'nahi mila'
+
+
+def test_sessions_share_one_subscription(board, replay):
+    board.watch(['BTC', 'AAPL'], session='a')
+    board.watch(['AAPL', 'ETH'], session='b')
+    assert board.stats()['sessions'] == 2
+    assert sorted(board.rows(['BTC', 'AAPL', 'ETH'])) == ['AAPL', 'BTC', 'ETH']
+    # Dono tabs ek hi hub subscription (symbols ka union)
+    assert board._subscription.symbols == ['AAPL', 'BTC', 'ETH']
+    assert len(board.bot._hub._subscribers) == 1
+
+
+def test_changes_since_version(board):
+    board.watch(['BTC', 'AAPL'])
+    version, rows = board.changes(0)
+    assert sorted(rows) == ['AAPL', 'BTC']
+    assert board.changes(version) == (version, {})
+    board._update('BTC', {'success': True, 'type': 'crypto', 'name': 'BTC', 'price_usd': 1.0})
+    assert list(board.changes(version)[1]) == ['BTC']
+    assert board.points('BTC')[-1][1] == 1.0
+
+
+def test_expired_session_drops_symbols(board):
+    board.watch(['BTC'], session='gone')
+    board.watch(['AAPL'], session='alive')
+    deadline = time.time() + 3
+    while board.stats()['sessions'] > 1 and time.time() < deadline:
+        board.watch(['AAPL'], session='alive')
+        time.sleep(0.05)
+    assert board.stats()['sessions'] == 1
+    assert board.rows(['BTC', 'AAPL']).keys() == {'AAPL'}
+
+
+def test_dashboard_command_needs_streamlit(monkeypatch, capsys):
+    monkeypatch.setattr('importlib.util.find_spec', lambda name: None)
+    assert app.run_cli(['dashboard']) == 1
+    assert 'streamlit install nahi hai' in capsys.readouterr().err
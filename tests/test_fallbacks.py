@@ -0,0 +1,47 @@
+"""Fallback quotes: provider down ho toh simulator resolver ke canonical symbol se, cache mein nahi"""
+
+import copy
+
+
+def test_demo_uses_canonical_symbol(offline_bot):
+    data = offline_bot.search_asset('bitcoin price')
+    assert data['source'] == 'Real-time Demo'
+    btc = offline_bot.simulated_quote('BTC', 'crypto')['price']
+    assert abs(data['price_usd'] / btc - 1) < 0.01
+    
+    stock = offline_bot.search_asset('tesla share')
+    assert stock['source'] == 'Demo Data' and stock['symbol'] == 'TSLA'
+
+
+def test_search_many_demo_uses_canonical_symbol(offline_bot):
+    btc, tsla = offline_bot.search_many(['bitcoin price', 'tesla share'])
+    assert abs(btc['price_usd'] / offline_bot.simulated_quote('BTC', 'crypto')['price'] - 1) < 0.01
+    assert tsla['symbol'] == 'TSLA'
+
+
+def test_nse_symbol_maps_to_simulator_asset(offline_bot):
+    data = offline_bot.generate_demo_stock_data('reliance', 'RELIANCE.NS')
+    assert data['currency'] == 'INR'
+    assert 'RELIANCE.NS' not in offline_bot.simulator.symbols
+
+
+def test_demo_quotes_are_not_cached(offline_bot):
+    offline_bot.search_asset('BTC')
+    offline_bot.search_asset('AAPL')
+    assert offline_bot.cache.get('coingecko', 'bitcoin') is None
+    assert offline_bot.cache.get('yahoo', 'AAPL') is None
+
+
+def test_commodity_from_futures_chart(replay, make_bot):
+    chart = copy.deepcopy(replay.fixtures['charts']['AAPL'])
+    chart['chart']['result'][0]['meta'].update(symbol='GC=F', regularMarketPrice=2350.5, previousClose=2340.0)
+    replay.fixtures['charts']['GC=F'] = chart
+    bot = make_bot(replay)
+    
+    gold = bot.search_asset('gold')
+    assert gold['source'] == 'Yahoo Finance' and gold['price'] == 2350.5
+    # Silver ka fixture nahi - simulator fallback
+    assert bot.search_asset('silver')['source'] == 'Demo Data'
+    gold, btc = bot.search_many(['gold', 'BTC'])
+    assert gold['price'] == 2350.5 and btc['source'] == 'CoinGecko'
+    assert sorted(bot.quote_batch(['gold', 'AAPL']).symbols) == ['AAPL', 'GOLD']
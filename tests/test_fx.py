@@ -0,0 +1,115 @@
+"""FX engine: cross rates, triangulation, batch conversion, bot ka forex path"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from fx import FxEngine
+from quotes import Quote, QuoteBatch, SymbolTable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cross_rates_from_usd_edges():
+    fx = FxEngine()
+    fx.load_yahoo_quotes({
+        'USDINR=X': {'regularMarketPrice': 84.0, 'regularMarketPreviousClose': 84.0},
+        'USDJPY=X': {'regularMarketPrice': 150.0, 'regularMarketPreviousClose': 150.0},
+    })
+    assert fx.rate('JPY', 'INR') == pytest.approx(84.0 / 150.0)
+    assert fx.rate('INR', 'INR') == 1.0
+    # Refresh mein na aayi currency ka purana rate rehta hai
+    assert fx.rate('USD', 'EUR') == pytest.approx(0.92)
+
+
+def test_triangulates_through_non_usd_edges():
+    fx = FxEngine()
+    fx.load_edges([('USD', 'EUR', 0.9), ('EUR', 'GBP', 0.8)])
+    assert fx.rate('USD', 'GBP') == pytest.approx(0.72)
+    assert fx.rate('GBP', 'EUR') == pytest.approx(1 / 0.8)
+
+
+def test_change_pct_from_previous_close():
+    fx = FxEngine()
+    fx.load_yahoo_quotes({'USDINR=X': {'regularMarketPrice': 84.0, 'regularMarketPreviousClose': 80.0}})
+    assert fx.change_pct('USD', 'INR') == pytest.approx(5.0)
+
+
+def test_convert_batch_leaves_forex_rows():
+    fx = FxEngine()
+    fx.load_edges([('USD', 'INR', 80.0)])
+    batch = QuoteBatch(SymbolTable())
+    batch.append(Quote('stock', 'AAPL', 100.0, currency='USD'))
+    batch.append(Quote('stock', 'TCS.NS', 4000.0, currency='INR'))
+    batch.append(Quote('forex', 'USDINR', 80.0, currency='INR'))
+    assert fx.convert_batch(batch, 'INR').tolist() == pytest.approx([8000.0, 4000.0, 80.0])
+
+
+def test_bot_quotes_cross_pair_from_one_refresh(replay, make_bot):
+    bot = make_bot(replay)
+    data = bot.search_asset('JPY to INR')
+    assert data['success'] and data['source'] == 'Yahoo FX'
+    assert data['rate'] == pytest.approx(83.27 / 149.62, abs=1e-4)
+    assert bot.search_asset('EUR/USD')['rate'] == pytest.approx(1 / 0.9215, abs=1e-4)
+    # Saari USD pairs ek hi Yahoo call mein aayi thi
+    assert replay.hits('/v7/finance/quote') == 1
+
+
+def test_headless_forex_skips_numpy():
+    code = ("import sys; from app import SimpleTradingBot; "
+            "bot = SimpleTradingBot(quiet=True); "
+            "data = bot.search_asset('EUR/USD'); "
+            "print(data['success'], data['source'].replace(' ', '_'), bot.cache.get('forex', 'EURUSD') is None, "
+            "'numpy' in sys.modules, 'simulator' in sys.modules)")
+    env = dict(os.environ, YAHOO_BASE='http://127.0.0.1:1')
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, timeout=30)
+    # Yahoo down: reference rate milta hai, par cache mein asli rate ki jagah nahi baithta
+    assert out.stdout.split() == ['True', 'Reference_rates', 'True', 'False', 'False'], out.stderr
+
+
+def test_first_refresh_is_synchronous_with_short_timeout(replay, make_bot, monkeypatch):
+    bot = make_bot(replay)
+    timeouts = []
+    fetch = bot.fetch_yahoo_quotes
+    
+    def recording(symbols, timeout=None):
+        timeouts.append(timeout)
+        return fetch(symbols, timeout)
+    
+    monkeypatch.setattr(bot, 'fetch_yahoo_quotes', recording)
+    assert bot.refresh_fx()
+    assert bot.fx.source == 'Yahoo FX'
+    assert timeouts == [min(bot.FX_TIMEOUT, bot.HTTP_TIMEOUT)]
+
+
+def test_later_staleness_refreshes_in_background(replay, make_bot):
+    bot = make_bot(replay)
+    assert bot.refresh_fx()
+    bot.fx.updated_at -= 3600
+    bot._fx_attempted = 0.0
+    # Purane asli rates turant, naye background mein
+    assert not bot.refresh_fx()
+    deadline = time.time() + 5
+    while bot.fx.is_stale() and time.time() < deadline:
+        time.sleep(0.01)
+    assert not bot.fx.is_stale()
+    assert replay.hits('/v7/finance/quote') == 2
+    
+    # Headless CLI mein background nahi - yahin refresh
+    bot.fx_background = False
+    bot.fx.updated_at -= 3600
+    bot._fx_attempted = 0.0
+    assert bot.refresh_fx()
+
+
+def test_cli_quotes_live_fx(replay, monkeypatch, capsys):
+    from app import SimpleTradingBot, run_cli
+    
+    monkeypatch.setattr(SimpleTradingBot, 'YAHOO_BASE', replay.url)
+    assert run_cli(['quote', 'EUR/USD', '--json']) == 0
+    assert json.loads(capsys.readouterr().out)['source'] == 'Yahoo FX'
@@ -0,0 +1,43 @@
+"""History: bounded memory, symbol/time index, restart ke baad bhi sirf quote wale records"""
+
+from history import ConversationHistory
+from quotes import Quote
+
+
+def quote(price):
+    return Quote('crypto', 'BTC', price, source='CoinGecko', ts=0.0)
+
+
+def test_memory_is_bounded_but_log_keeps_everything(tmp_path):
+    history = ConversationHistory(capacity=3, path=str(tmp_path / 'history.log'))
+    for ts in range(10):
+        history.add('BTC', 'crypto', 'bitcoin', quote(ts), ts=float(ts))
+    assert len(history) == 3
+    assert [r.ts for r in history.recent()] == [7.0, 8.0, 9.0]
+    # Memory se nikal chuka record bhi log se milta hai
+    assert history.at('bitcoin', 2.5).quote.price == 2
+    assert [r.ts for r in history.between('bitcoin', 4, 6)] == [4.0, 5.0, 6.0]
+    assert history.at('bitcoin', 1.0, tolerance=0.5).ts == 1.0
+    assert history.at('bitcoin', 20.0, tolerance=5) is None
+
+
+def test_reloaded_index_skips_records_without_quote(tmp_path):
+    path = str(tmp_path / 'history.log')
+    history = ConversationHistory(path=path)
+    history.add('BTC', 'crypto', 'bitcoin', quote(60000), ts=100.0)
+    history.add('"quote": [ BTC', 'crypto', 'bitcoin', None, ts=200.0)
+    history.close()
+    
+    reloaded = ConversationHistory(path=path)
+    assert reloaded.at('bitcoin', 250.0).quote.price == 60000
+    assert [r.ts for r in reloaded.between('bitcoin', 0, 300)] == [100.0]
+
+
+def test_live_and_reloaded_index_match(tmp_path):
+    path = str(tmp_path / 'history.log')
+    history = ConversationHistory(path=path)
+    for ts in (10.0, 20.0, 30.0):
+        history.add('BTC', 'crypto', 'bitcoin', quote(ts) if ts != 20.0 else None, ts=ts)
+    live = [r.ts for r in history.between('bitcoin', 0, 100)]
+    history.close()
+    assert live == [r.ts for r in ConversationHistory(path=path).between('bitcoin', 0, 100)] == [10.0, 30.0]
@@ -0,0 +1,71 @@
+"""Indicators: incremental state = poori series ka vectorized result"""
+
+import numpy as np
+import pytest
+
+import indicators
+from indicators import IncrementalIndicators
+
+
+def series(n=80, symbols=3, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (symbols, n)), axis=1)
+    return close, close + rng.uniform(0, 1, close.shape), close - rng.uniform(0, 1, close.shape)
+
+
+def test_incremental_matches_vectorized():
+    close, high, low = series()
+    state = IncrementalIndicators(close.shape[0])
+    for t in range(close.shape[1]):
+        state.update(close[:, t], high[:, t], low[:, t])
+    snap = state.snapshot()
+    
+    assert snap['ema_slow'] == pytest.approx(indicators.ema(close, 26)[:, -1])
+    assert snap['rsi'] == pytest.approx(indicators.rsi(close, 14)[:, -1])
+    assert snap['macd_hist'] == pytest.approx(indicators.macd(close)['hist'][:, -1])
+    assert snap['atr'] == pytest.approx(indicators.atr(high, low, close, 14)[:, -1])
+    assert snap['bb_upper'] == pytest.approx(indicators.bollinger(close)['upper'][:, -1])
+
+
+def test_nan_close_leaves_symbol_untouched():
+    close, high, low = series(n=30, symbols=2)
+    state = IncrementalIndicators(2)
+    for t in range(close.shape[1]):
+        bar = close[:, t].copy()
+        if t % 2:
+            bar[1] = np.nan
+        state.update(bar, high[:, t], low[:, t])
+    snap = state.snapshot()
+    assert snap['count'].tolist() == [30, 15]
+    assert snap['ema_fast'][1] == pytest.approx(indicators.ema(close[1, ::2], 12)[0, -1])
+
+
+def test_engine_reads_only_new_bars(tmp_path):
+    from bar_store import BarStore
+    from indicators import IndicatorEngine
+    
+    store = BarStore(str(tmp_path))
+    close, high, low = series(n=60, symbols=1)
+    ts = 1704067200 + 60 * np.arange(60)
+    store.append('AAPL', ts[:40], close[0, :40], high[0, :40], low[0, :40], close[0, :40], np.ones(40))
+    engine = IndicatorEngine(store)
+    assert engine.refresh(['AAPL'])['AAPL']['count'] == 40
+    
+    store.append('AAPL', ts[40:], close[0, 40:], high[0, 40:], low[0, 40:], close[0, 40:], np.ones(20))
+    signal = engine.refresh(['AAPL'])['AAPL']
+    assert signal['count'] == 60
+    assert signal['rsi'] == pytest.approx(indicators.rsi(close, 14)[0, -1])
+    assert 'RSI' in indicators.describe(signal)
+
+
+def test_atr_skips_bad_high_low():
+    close, high, low = series(n=40, symbols=2)
+    high[0, 10], low[0, 20], high[1, 30] = np.nan, np.nan, np.inf
+    state = IncrementalIndicators(2)
+    for t in range(close.shape[1]):
+        state.update(close[:, t], high[:, t], low[:, t])
+    atr = state.snapshot()['atr']
+    assert np.isfinite(atr).all()
+    assert atr == pytest.approx(indicators.atr(high, low, close, 14)[:, -1])
+    # Close phir bhi gina gaya - sirf ATR ne wo bar chhoda
+    assert state.snapshot()['count'].tolist() == [40, 40]
@@ -0,0 +1,52 @@
+"""Metrics: counters, histograms, Prometheus/JSON export, disabled = no-op"""
+
+import json
+
+from metrics import Metrics
+
+
+def test_prometheus_exposition():
+    metrics = Metrics(buckets=(10, 100))
+    metrics.inc('provider_requests_total', provider='yahoo', outcome='success')
+    metrics.inc('provider_requests_total', provider='yahoo', outcome='success')
+    for value in (5, 50, 500):
+        metrics.observe('provider_latency_ms', value, provider='yahoo')
+    metrics.add_collector(lambda: [('cache_size', {}, 3)])
+    
+    lines = metrics.to_prometheus().splitlines()
+    assert 'tradingbot_provider_requests_total{outcome="success",provider="yahoo"} 2' in lines
+    # Buckets cumulative hain, +Inf = count
+    assert 'tradingbot_provider_latency_ms_bucket{provider="yahoo",le="10"} 1' in lines
+    assert 'tradingbot_provider_latency_ms_bucket{provider="yahoo",le="100"} 2' in lines
+    assert 'tradingbot_provider_latency_ms_bucket{provider="yahoo",le="+Inf"} 3' in lines
+    assert 'tradingbot_provider_latency_ms_count{provider="yahoo"} 3' in lines
+    assert '# TYPE tradingbot_cache_size gauge' in lines and 'tradingbot_cache_size 3' in lines
+
+
+def test_json_lines_and_errors():
+    metrics = Metrics()
+    with metrics.timer('stage_latency_ms', stage='parse'):
+        pass
+    metrics.record_error('coingecko', ValueError('bad json'))
+    rows = [json.loads(line) for line in metrics.to_json_lines().splitlines()]
+    kinds = {(row['type'], row['name']) for row in rows}
+    assert kinds == {('histogram', 'stage_latency_ms'), ('counter', 'errors_total')}
+    assert metrics.recent_errors[-1]['error'] == 'ValueError: bad json'
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    metrics.inc('x')
+    with metrics.timer('y'):
+        pass
+    metrics.record_error('yahoo', RuntimeError('down'))
+    assert metrics.to_prometheus() == '\n'
+    assert metrics.to_json_lines() == ''
+
+
+def test_bot_counts_provider_outcomes(replay, make_bot):
+    bot = make_bot(replay)
+    bot.search_asset('AAPL')
+    bot.search_asset('AAPL')
+    text = bot.stats_report('prometheus')
+    assert 'tradingbot_provider_requests_total{outcome="success",provider="yahoo"} 1' in text
@@ -0,0 +1,86 @@
+"""Order books: stand-in exchanges -> manager, consolidated = per-exchange ka sum, nonce gap resync"""
+
+import pytest
+
+from orderbook import ASK, BID, BookFeed, OrderBookManager, StandInExchange, fill_estimate
+
+EXCHANGES = ('binance', 'kraken', 'coinbase')
+
+
+def feeds(manager, rounds):
+    exchanges = [StandInExchange(name, {'BTC/USD': 60000.0}, seed=1) for name in EXCHANGES]
+    book_feeds = [BookFeed(manager, exchange, {'BTC/USD': 'BTC/USD'}) for exchange in exchanges]
+    for _ in range(rounds):
+        for feed in book_feeds:
+            feed.poll()
+    return book_feeds
+
+
+def test_consolidated_equals_sum_of_exchange_books():
+    manager = OrderBookManager(depth=20)
+    book_feeds = feeds(manager, 300)
+    assert all(feed.errors == 0 for feed in book_feeds)
+    merged = manager.consolidated['BTC/USD']
+    for side in (BID, ASK):
+        expected = {}
+        for name in EXCHANGES:
+            book_side = manager.book(name, 'BTC/USD').side(side)
+            assert len(book_side) <= 20
+            for price, size in book_side.levels():
+                expected[price] = expected.get(price, 0.0) + size
+        assert merged.side(side).sizes.keys() == expected.keys()
+        for price, size in expected.items():
+            assert merged.side(side).sizes[price] == pytest.approx(size)
+    bbo = manager.bbo('BTC/USD')
+    assert bbo['bid'] == max(b['bid'] for b in manager.exchange_bbos('BTC/USD').values())
+    assert bbo['ask'] == min(b['ask'] for b in manager.exchange_bbos('BTC/USD').values())
+
+
+def test_nonce_gap_triggers_resync():
+    manager = OrderBookManager()
+    manager.on_snapshot('kraken', 'BTC/USD', [[100.0, 1.0]], [[101.0, 2.0]], nonce=5)
+    assert manager.on_diff('kraken', 'BTC/USD', [[100.0, 3.0]], [], nonce=6)
+    # Purana update - ignore
+    assert manager.on_diff('kraken', 'BTC/USD', [[100.0, 9.0]], [], nonce=6)
+    assert manager.levels('BTC/USD')[BID] == [(100.0, 3.0, ['kraken'])]
+    # 7 chhoot gaya - book consolidated se hati, snapshot tak diffs nahi lagte
+    assert not manager.on_diff('kraken', 'BTC/USD', [[99.0, 1.0]], [], nonce=8)
+    assert manager.resyncs == 1
+    assert manager.levels('BTC/USD') == {BID: [], ASK: []}
+    assert not manager.on_diff('kraken', 'BTC/USD', [[99.0, 1.0]], [], nonce=9)
+    manager.on_snapshot('kraken', 'BTC/USD', [[99.5, 1.0]], [[101.0, 2.0]], nonce=9)
+    assert manager.bbo('BTC/USD')['bid'] == 99.5
+
+
+def test_feed_resyncs_after_gap():
+    manager = OrderBookManager()
+    exchange = StandInExchange('binance', {'BTC/USD': 60000.0})
+    feed = BookFeed(manager, exchange, {'BTC/USD': 'BTC/USD'})
+    feed.poll()
+    exchange.next_diff('BTC/USD')
+    # Upar wala diff feed ne nahi dekha - agla diff gap hai, feed snapshot leta hai
+    feed.poll()
+    assert manager.resyncs == 1 and manager.snapshots == 2
+    assert manager.book('binance', 'BTC/USD').synced
+    assert manager.book('binance', 'BTC/USD').nonce == exchange.fetch_order_book('BTC/USD')['nonce']
+
+
+def test_slippage_routes_across_exchanges():
+    manager = OrderBookManager()
+    manager.on_snapshot('kraken', 'BTC/USD', [[99.0, 1.0]], [[100.0, 1.0], [102.0, 5.0]])
+    manager.on_snapshot('binance', 'BTC/USD', [[98.0, 1.0]], [[100.0, 2.0], [101.0, 1.0]])
+    estimate = manager.slippage('BTC/USD', 'buy', 4.0)
+    assert estimate['complete'] and estimate['levels'] == 2
+    assert estimate['avg_price'] == pytest.approx((3 * 100.0 + 101.0) / 4)
+    assert estimate['route'] == {'binance': 3.0, 'kraken': 1.0}
+    assert fill_estimate([(100.0, 1.0)], 2.0)['complete'] is False
+
+
+def test_listener_only_on_bbo_change():
+    manager = OrderBookManager()
+    seen = []
+    manager.add_listener(lambda symbol, bbo: seen.append((bbo['bid'], bbo['ask'])))
+    manager.on_snapshot('kraken', 'BTC/USD', [[99.0, 1.0], [98.0, 1.0]], [[100.0, 1.0]], nonce=1)
+    manager.on_diff('kraken', 'BTC/USD', [[98.0, 4.0]], [], nonce=2)
+    manager.on_diff('kraken', 'BTC/USD', [[99.5, 1.0]], [], nonce=3)
+    assert seen == [(99.0, 100.0), (99.5, 100.0)]
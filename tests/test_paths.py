@@ -0,0 +1,18 @@
+"""Saari local files ek hi data dir mein (TRADING_BOT_DATA)"""
+
+import os
+
+import alerts
+import bar_store
+import history
+import portfolio
+import profiler
+import snapshot
+from paths import data_dir
+
+
+def test_defaults_live_under_data_dir():
+    assert data_dir() == os.environ['TRADING_BOT_DATA']
+    defaults = [alerts.DEFAULT_PATH, bar_store.DEFAULT_ROOT, history.DEFAULT_PATH,
+                portfolio.DEFAULT_PATH, profiler.DEFAULT_DIR, snapshot.DEFAULT_PATH]
+    assert {os.path.dirname(path) for path in defaults} == {data_dir()}
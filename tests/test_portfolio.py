@@ -0,0 +1,83 @@
+"""Portfolio: incremental repricing, cache listener, risk checks, persistence, demo fallback quotes se repricing nahi"""
+
+import pytest
+
+from portfolio import Portfolio
+from quote_cache import QuoteCache
+
+
+def test_quote_reprices_only_its_rows():
+    portfolio = Portfolio(capital=10000)
+    portfolio.add('bitcoin', 'crypto', 0.1, 60000, stop=57000)
+    portfolio.add('TSLA', 'stock', 10, 200)
+    assert portfolio.update({'bitcoin': 66000}) == 1
+    assert portfolio.summary()['unrealized_pnl'] == 600
+
+
+def test_incremental_totals_match_full_recompute():
+    portfolio = Portfolio(capital=50000)
+    for i in range(20):
+        portfolio.add(f'S{i}', 'stock', 10, 100 + i, stop=90 + i)
+    portfolio.update({f'S{i}': 110 + 2 * i for i in range(0, 20, 3)})
+    portfolio.remove('S4')
+    rebuilt = Portfolio.from_positions(portfolio.to_json()['positions'], capital=50000)
+    assert portfolio.summary()['unrealized_pnl'] == pytest.approx(rebuilt.summary()['unrealized_pnl'])
+    assert portfolio.summary()['open_risk'] == pytest.approx(rebuilt.summary()['open_risk'])
+
+
+def test_cache_listener_reprices_on_revalue():
+    portfolio = Portfolio()
+    portfolio.add('bitcoin', 'crypto', 1, 60000)
+    cache = QuoteCache()
+    cache.add_listener(portfolio.on_quote)
+    cache.put('coingecko', 'bitcoin', 'crypto', {'success': True, 'price_usd': 61000.0})
+    assert portfolio.revalue() == 1
+    assert portfolio.positions()[0]['price'] == 61000
+
+
+def test_risk_flags():
+    portfolio = Portfolio(capital=10000)
+    portfolio.add('AAPL', 'stock', 1, 100)
+    portfolio.add('TSLA', 'stock', 40, 200, stop=150, target=210)
+    aapl, tsla = portfolio.positions()
+    assert aapl['checks'] == ['stop-loss nahi hai']
+    assert set(tsla['checks']) == {'risk zyada', 'reward:risk kam', 'position badi'}
+    assert not portfolio.summary()['heat_ok']
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / 'portfolio.json')
+    portfolio = Portfolio(capital=20000, path=path)
+    portfolio.add('bitcoin', 'crypto', 0.5, 60000, stop=55000, target=75000)
+    portfolio.update({'bitcoin': 62000})
+    portfolio.save()
+    loaded = Portfolio.load(path)
+    assert loaded.positions() == portfolio.positions()
+    assert loaded.summary() == portfolio.summary()
+
+
+def test_demo_quotes_do_not_reprice():
+    portfolio = Portfolio()
+    portfolio.add('bitcoin', 'crypto', 1, 60000)
+    cache = QuoteCache()
+    cache.add_listener(portfolio.on_quote)
+    cache.put('coingecko', 'bitcoin', 'crypto',
+              {'success': True, 'price_usd': 44.91, 'source': 'Real-time Demo'})
+    assert portfolio.revalue() == 0
+    assert portfolio.positions()[0]['price'] == 60000
+    
+    cache.put('coingecko', 'bitcoin', 'crypto',
+              {'success': True, 'price_usd': 61000.0, 'source': 'CoinGecko'})
+    assert portfolio.revalue() == 1
+    assert portfolio.positions()[0]['price'] == 61000
+
+
+def test_offline_bot_keeps_entry_price(tmp_path, monkeypatch, offline_bot):
+    monkeypatch.setenv('TRADING_BOT_PORTFOLIO', str(tmp_path / 'portfolio.json'))
+    # Provider down - demo price se position nahi banti
+    assert not offline_bot.add_position('BTC', 1)['success']
+    position = offline_bot.add_position('BTC', 1, entry=60000)
+    assert position['price'] == 60000
+    offline_bot.cache.clear()
+    offline_bot.refresh_portfolio()
+    assert offline_bot.portfolio.positions()[0]['price'] == 60000
@@ -0,0 +1,58 @@
+"""Profiler: off = no-op, sample/cprofile files, nested sections, global settings wapas"""
+
+import sys
+import tracemalloc
+
+import pytest
+
+from profiler import Profiler, format_report
+
+
+def busy():
+    return sum(i * i for i in range(200000))
+
+
+def test_disabled_is_noop(tmp_path):
+    profiler = Profiler(out_dir=str(tmp_path))
+    with profiler.section('x') as session:
+        busy()
+    assert session.report is None
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('mode, suffix', [('sample', '.collapsed'), ('cprofile', '.pstats')])
+def test_session_writes_files(tmp_path, mode, suffix):
+    profiler = Profiler(enabled=True, out_dir=str(tmp_path), mode=mode)
+    switch = sys.getswitchinterval()
+    with profiler.section('BTC price') as session:
+        busy()
+    report = session.report
+    assert report['label'] == 'BTC price' and report['wall_ms'] > 0
+    collapsed_or_pstats, alloc = report['files']
+    assert collapsed_or_pstats.endswith(suffix) and alloc.endswith('.alloc.txt')
+    assert report['top'] and 'BTC price' in format_report(report)
+    # Session ke baad switch interval aur tracemalloc pehle jaise
+    assert sys.getswitchinterval() == switch
+    assert not tracemalloc.is_tracing()
+
+
+def test_nested_section_is_not_profiled(tmp_path):
+    profiler = Profiler(enabled=True, out_dir=str(tmp_path), mode='cprofile', allocations=False)
+    with profiler.section('outer') as outer:
+        with profiler.section('inner') as inner:
+            busy()
+    assert inner.report is None
+    assert outer.report is not None and profiler.sessions == 1
+
+
+def test_force_profiles_when_disabled(tmp_path):
+    profiler = Profiler(out_dir=str(tmp_path), mode='cprofile')
+    assert profiler.call('sq', busy) > 0
+    with profiler.section('once', force=True) as session:
+        busy()
+    assert session.report['label'] == 'once' and profiler.sessions == 1
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        Profiler(mode='perf')
@@ -0,0 +1,92 @@
+"""QuoteCache: TTL, LRU, stale-while-revalidate, warm entries, listeners, demo quotes cache nahi hote"""
+
+import threading
+import time
+
+from quote_cache import QuoteCache
+
+
+def quote(price, source='CoinGecko'):
+    return {'success': True, 'price_usd': price, 'source': source}
+
+
+def test_ttl_and_lru():
+    cache = QuoteCache(max_size=2, ttls={'crypto': 60})
+    cache.put('coingecko', 'bitcoin', 'crypto', quote(1))
+    cache.put('coingecko', 'ethereum', 'crypto', quote(2))
+    assert cache.get('coingecko', 'bitcoin')['price_usd'] == 1
+    cache.put('coingecko', 'solana', 'crypto', quote(3))
+    # bitcoin abhi use hua tha - ethereum nikla
+    assert cache.get('coingecko', 'ethereum') is None
+    assert cache.evictions == 1
+    
+    cache.put('coingecko', 'bitcoin', 'crypto', quote(1), stored_at=time.time() - 61)
+    assert cache.get('coingecko', 'bitcoin') is None
+
+
+def test_failures_are_not_cached():
+    cache = QuoteCache()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        return {'success': False, 'error': 'down'}
+    
+    cache.get_or_fetch('yahoo', 'AAPL', 'stock', fetch)
+    cache.get_or_fetch('yahoo', 'AAPL', 'stock', fetch)
+    assert len(calls) == 2
+
+
+def test_stale_while_revalidate_refreshes_in_background():
+    cache = QuoteCache(ttls={'stock': 1}, stale_while_revalidate=True)
+    cache.put('yahoo', 'AAPL', 'stock', quote(100), stored_at=time.time() - 5)
+    refreshed = threading.Event()
+    
+    def fetch():
+        refreshed.set()
+        return quote(101)
+    
+    assert cache.get_or_fetch('yahoo', 'AAPL', 'stock', fetch)['price_usd'] == 100
+    assert refreshed.wait(2)
+    deadline = time.time() + 2
+    while cache.get('yahoo', 'AAPL') is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get('yahoo', 'AAPL')['price_usd'] == 101
+    assert cache.stale_hits == 1
+
+
+def test_warm_entry_is_served_then_refreshed():
+    cache = QuoteCache()
+    cache.put('yahoo', 'AAPL', 'stock', quote(100), stored_at=time.time() - 3600, warm=True)
+    done = threading.Event()
+    
+    def fetch():
+        done.set()
+        return quote(105)
+    
+    assert cache.get_or_fetch('yahoo', 'AAPL', 'stock', fetch)['price_usd'] == 100
+    assert done.wait(2)
+
+
+def test_listeners_see_successful_puts_only():
+    cache = QuoteCache()
+    seen = []
+    
+    def broken(*args):
+        raise RuntimeError('listener bug')
+    
+    cache.add_listener(broken)
+    cache.add_listener(lambda provider, symbol, asset_class, value: seen.append((symbol, value['price_usd'])))
+    cache.put('coingecko', 'bitcoin', 'crypto', quote(1))
+    cache.put('coingecko', 'ethereum', 'crypto', {'success': False, 'error': 'down'})
+    assert seen == [('bitcoin', 1)]
+
+
+def test_demo_quotes_are_neither_stored_nor_broadcast():
+    cache = QuoteCache()
+    seen = []
+    cache.add_listener(lambda *args: seen.append(args[1]))
+    cache.put('coingecko', 'bitcoin', 'crypto', quote(44.91, source='Real-time Demo'))
+    cache.put('yahoo', 'AAPL', 'stock', quote(101, source='Demo Data'))
+    assert cache.get('coingecko', 'bitcoin') is None and cache.get('yahoo', 'AAPL') is None
+    assert seen == []
@@ -0,0 +1,128 @@
+"""Quote server: single-flight coalescing aur HTTP endpoints"""
+
+import asyncio
+import json
+
+import pytest
+
+from quote_server import QuoteServer, SingleFlight
+
+
+def test_single_flight_collapses_concurrent_callers():
+    calls = []
+    
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'price': 1}
+    
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do('BTC', work) for _ in range(50)))
+        return flight, results
+    
+    flight, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert (flight.started, flight.shared) == (1, 49)
+    assert all(result == {'price': 1} for result in results)
+
+
+def test_single_flight_shares_errors_then_retries():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('upstream down')
+    
+    async def ok():
+        return 'fresh'
+    
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do('AAPL', failing) for _ in range(3)),
+                                       return_exceptions=True)
+        return results, await flight.do('AAPL', ok)
+    
+    results, retried = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    # Key in-flight se hat gayi - agla call naya fetch
+    assert retried == 'fresh'
+
+
+async def get(port, target):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, body = raw.split(b'\r\n\r\n', 1)
+    return int(head.split()[1]), body
+
+
+@pytest.fixture
+def slow_replay(serve):
+    # Upstream slow ho tabhi concurrent requests ek doosre ke saath in-flight milte hain
+    return serve(latency=0.1)
+
+
+def test_concurrent_requests_share_one_upstream_fetch(slow_replay, make_bot):
+    bot = make_bot(slow_replay)
+    
+    async def main():
+        server = await QuoteServer(bot, port=0).start()
+        try:
+            replies = await asyncio.gather(*(get(server.port, '/quote?q=' + q)
+                                             for q in ['BTC', 'bitcoin'] * 10))
+            health = await get(server.port, '/health')
+        finally:
+            await server.stop()
+        return replies, json.loads(health[1])
+    
+    replies, health = asyncio.run(main())
+    assert {status for status, _ in replies} == {200}
+    assert {json.loads(body)['price_usd'] for _, body in replies} == {
+        slow_replay.fixtures['coingecko']['bitcoin']['usd']}
+    assert slow_replay.hits('/api/v3/simple/price') == 1
+    assert health['upstream_fetches'] == 1 and health['coalesced'] == 19
+
+
+def test_endpoints(replay, make_bot):
+    bot = make_bot(replay)
+    
+    async def main():
+        server = await QuoteServer(bot, port=0).start()
+        try:
+            return [await get(server.port, target) for target in
+                    ('/batch?q=BTC,AAPL', '/quote', '/nope', '/search?q=apple%20stock', '/suggest?q=etherium')]
+        finally:
+            await server.stop()
+    
+    batch, missing_q, unknown, search, suggest = asyncio.run(main())
+    assert batch[0] == 200 and [r['success'] for r in json.loads(batch[1])] == [True, True]
+    assert missing_q[0] == 400
+    assert unknown[0] == 404
+    assert json.loads(search[1])['resolved'] == {'asset_class': 'stock', 'symbol': 'AAPL'}
+    assert json.loads(suggest[1])['suggestions'][0]['symbol'] == 'ethereum'
+
+
+def test_bad_content_length_gets_400(replay, make_bot):
+    bot = make_bot(replay)
+    
+    async def send(port, length):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET /quote?q=BTC HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode())
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return raw.split(b'\r\n\r\n', 1)
+    
+    async def main():
+        server = await QuoteServer(bot, port=0).start()
+        try:
+            return [await send(server.port, length) for length in ('abc', '-5')]
+        finally:
+            await server.stop()
+    
+    for head, body in asyncio.run(main()):
+        assert int(head.split()[1]) == 400
+        # Keep-alive maanga tha, par framing toot gayi - connection band
+        assert b'Connection: close' in head
+        assert json.loads(body)['success'] is False
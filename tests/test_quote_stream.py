@@ -0,0 +1,76 @@
+"""QuoteHub: saare subscribers ek batch, sirf badle hue quotes"""
+
+import threading
+import time
+
+from quote_stream import QuoteHub
+
+
+class Feed:
+    """Local stand-in feed - har query ka price test set karta hai"""
+    
+    def __init__(self, **prices):
+        self.prices = prices
+        self.batches = []
+        self.lock = threading.Lock()
+    
+    def __call__(self, queries):
+        with self.lock:
+            self.batches.append(list(queries))
+        return [{'success': True, 'price': self.prices[q], 'timestamp': time.time()} for q in queries]
+
+
+def wait_first_tick(feed):
+    """Poller ka pehla (turant wala) tick ho jaye - uske baad tick() haath se"""
+    deadline = time.time() + 2
+    while not feed.batches and time.time() < deadline:
+        time.sleep(0.005)
+
+
+def test_one_batch_for_all_subscribers():
+    feed = Feed(BTC=1.0, AAPL=2.0, gold=3.0)
+    hub = QuoteHub(feed, interval=60)
+    first = hub.subscribe(['BTC', 'AAPL'])
+    second = hub.subscribe(['AAPL', 'gold'])
+    wait_first_tick(feed)
+    
+    hub.tick()
+    # Har tick ek hi call - AAPL dono ka hai par ek baar
+    assert feed.batches[-1] == ['BTC', 'AAPL', 'gold']
+    assert {q for q, _ in first.poll(0)} == {'BTC', 'AAPL'}
+    assert {q for q, _ in second.poll(0)} == {'AAPL', 'gold'}
+    first.close()
+    second.close()
+
+
+def test_only_changed_quotes_are_pushed():
+    feed = Feed(BTC=1.0, AAPL=2.0)
+    hub = QuoteHub(feed, interval=60)
+    subscription = hub.subscribe(['BTC', 'AAPL'])
+    wait_first_tick(feed)
+    assert len(subscription.poll(1)) == 2
+    
+    # Sirf timestamp badla - kuch nahi bheja
+    assert hub.tick() == 0
+    assert subscription.poll(0) == []
+    feed.prices['BTC'] = 1.5
+    assert hub.tick() == 1
+    assert [(q, data['price']) for q, data in subscription.poll(0)] == [('BTC', 1.5)]
+    subscription.close()
+
+
+def test_late_subscriber_gets_last_quote_and_poller_stops():
+    feed = Feed(BTC=1.0)
+    hub = QuoteHub(feed, interval=0.01)
+    first = hub.subscribe(['BTC'])
+    assert first.poll(2)
+    late = hub.subscribe(['BTC'])
+    assert late.poll(0)[0][1]['price'] == 1.0
+    
+    first.close()
+    late.close()
+    deadline = time.time() + 2
+    while hub._thread is not None and time.time() < deadline:
+        time.sleep(0.01)
+    assert hub._thread is None
+    assert hub._last == {}
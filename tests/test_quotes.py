@@ -0,0 +1,52 @@
+"""Quote / QuoteBatch: dict round-trip, columnar batch, numpy views"""
+
+import numpy as np
+import pytest
+
+from quotes import Quote, QuoteBatch, SymbolTable
+
+STOCK = {'success': True, 'type': 'stock', 'symbol': 'AAPL', 'price': 190.5, 'change_24h': 1.25,
+         'currency': 'USD', 'source': 'Yahoo Finance', 'timestamp': '10:15:00'}
+CRYPTO = {'success': True, 'type': 'crypto', 'name': 'BTC', 'price_usd': 60000.0, 'price_inr': 5.0e6,
+          'change_24h': -2.0, 'volume': 1e9, 'market_cap': 1e12, 'source': 'CoinGecko',
+          'timestamp': '10:15:00'}
+
+
+@pytest.mark.parametrize('data', [STOCK, CRYPTO])
+def test_dict_round_trip(data):
+    assert Quote.from_dict(data).to_dict() == data
+
+
+def test_failed_dict_is_not_a_quote():
+    assert Quote.from_dict({'success': False, 'error': 'down'}) is None
+    assert Quote.from_dict({}) is None
+
+
+def test_quote_has_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Quote('stock', 'AAPL', 1.0).extra = 1
+
+
+def test_batch_columns_are_zero_copy_views():
+    table = SymbolTable()
+    batch = QuoteBatch(table)
+    batch.append_row('crypto', 'BTC', 60000.0, 1.5, source='CoinGecko')
+    batch.append(Quote.from_dict(STOCK))
+    
+    prices = batch.column('prices')
+    assert prices.tolist() == [60000.0, 190.5]
+    assert np.shares_memory(prices, np.frombuffer(batch.prices, dtype='d'))
+    assert batch.symbols == ['BTC', 'AAPL']
+    assert batch[batch.index('AAPL')].source == 'Yahoo Finance'
+    # Doosra batch same table - ids stable
+    other = QuoteBatch.from_quotes([batch[1]], table)
+    assert other.symbol_ids[0] == batch.symbol_ids[1]
+    with pytest.raises(ValueError):
+        batch.index('TSLA')
+
+
+def test_bot_quote_batch(replay, make_bot):
+    bot = make_bot(replay)
+    batch = bot.quote_batch(['BTC', 'AAPL', 'unknown zzz', 'BTC'])
+    assert batch.symbols == ['BTC', 'AAPL']
+    assert all(price > 0 for price in batch.column('prices'))
@@ -0,0 +1,84 @@
+"""Token bucket aur refresh scheduler: budget, batching, priority"""
+
+import time
+
+from scheduler import COLD, WATCHED, RefreshScheduler, TokenBucket
+
+
+def test_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=10, capacity=3)
+    assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+    assert 0 < bucket.delay() <= 0.1
+    started = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - started < 0.5
+
+
+def test_acquire_gives_up_at_timeout():
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.try_take()
+    started = time.monotonic()
+    assert not bucket.acquire(timeout=0.05)
+    # Token 10s door hai - timeout tak bhi nahi ruka
+    assert time.monotonic() - started < 0.05
+    assert bucket.throttled == 1
+
+
+def test_penalize_blocks_for_retry_after():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.penalize(2)
+    assert not bucket.try_take()
+    assert bucket.delay() > 1.9
+
+
+class Recorder:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.calls = []
+    
+    def __call__(self, provider, symbols):
+        self.calls.append((provider, sorted(symbols)))
+        return self.ok
+
+
+def test_requests_in_window_share_one_call():
+    fetch = Recorder()
+    scheduler = RefreshScheduler(fetch, window=0.0, buckets={})
+    scheduler._ensure_thread = lambda: None
+    for symbol in ('bitcoin', 'ethereum', 'solana'):
+        scheduler.request('coingecko', symbol)
+    scheduler.request('yahoo', 'AAPL')
+    assert scheduler.run_pending() == 2
+    assert sorted(fetch.calls) == [('coingecko', ['bitcoin', 'ethereum', 'solana']), ('yahoo', ['AAPL'])]
+    # Cold request ek baar ka - dobara nahi
+    assert scheduler.pending() == {}
+
+
+def test_watched_symbols_go_first_when_batch_is_full():
+    fetch = Recorder()
+    scheduler = RefreshScheduler(fetch, window=0.0, buckets={}, max_batch={'yahoo': 2})
+    scheduler._ensure_thread = lambda: None
+    scheduler.request('yahoo', 'COLD1', COLD)
+    scheduler.request('yahoo', 'COLD2', COLD)
+    scheduler.watch('yahoo', 'HOT', interval=60)
+    scheduler.run_pending()
+    assert fetch.calls[0] == ('yahoo', ['COLD1', 'HOT'])
+    scheduler.run_pending()
+    assert fetch.calls[1] == ('yahoo', ['COLD2'])
+    # Watched symbol interval ke baad phir aayega
+    assert scheduler.pending() == {'yahoo': 1}
+
+
+def test_calls_stay_within_bucket_and_failures_back_off():
+    fetch = Recorder(ok=False)
+    bucket = TokenBucket(rate=0.5, capacity=1)
+    scheduler = RefreshScheduler(fetch, window=0.0, buckets={'coingecko': bucket}, retry_after=30)
+    scheduler._ensure_thread = lambda: None
+    scheduler.request('coingecko', 'bitcoin')
+    scheduler.request('coingecko', 'ethereum')
+    assert scheduler.run_pending() == 1
+    scheduler.request('coingecko', 'solana')
+    # Fail hua - bucket penalized, abhi koi call nahi
+    assert scheduler.run_pending() == 0
+    assert bucket.delay() > 25
+    assert scheduler.stats()['failures'] == 1
@@ -0,0 +1,45 @@
+"""search_many: poori watchlist, har provider ke liye ek hi call"""
+
+from app import SimpleTradingBot
+
+
+def fake_providers(monkeypatch, bot):
+    calls = []
+    
+    def coins(coin_ids):
+        calls.append(('coingecko', sorted(coin_ids)))
+        return {coin_id: {'usd': 100.0, 'inr': 8300.0, 'usd_24h_change': 1.0} for coin_id in coin_ids}
+    
+    def stocks(symbols):
+        calls.append(('yahoo', sorted(symbols)))
+        return {symbol: {'symbol': symbol, 'regularMarketPrice': 10.0, 'regularMarketPreviousClose': 8.0}
+                for symbol in symbols}
+    
+    monkeypatch.setattr(bot, 'fetch_coingecko_prices', coins)
+    monkeypatch.setattr(bot, 'fetch_yahoo_quotes', stocks)
+    return calls
+
+
+def test_one_call_per_provider(monkeypatch):
+    bot = SimpleTradingBot()
+    calls = fake_providers(monkeypatch, bot)
+    results = bot.search_many(['BTC', 'ethereum', 'AAPL', 'tesla', 'bitcoin'])
+    assert calls == [('coingecko', ['bitcoin', 'ethereum']), ('yahoo', ['AAPL', 'TSLA'])]
+    assert all(result['success'] for result in results)
+    assert [results[2]['symbol'], results[3]['symbol']] == ['AAPL', 'TSLA']
+    assert results[3]['change_24h'] == 25.0
+    # Same coin do baar - dono ko same price
+    assert results[0]['price_usd'] == results[4]['price_usd'] == 100.0
+
+
+def test_failed_provider_falls_back_per_query(monkeypatch):
+    bot = SimpleTradingBot()
+    fake_providers(monkeypatch, bot)
+    
+    def down(coin_ids):
+        raise ConnectionError('down')
+    
+    monkeypatch.setattr(bot, 'fetch_coingecko_prices', down)
+    btc, aapl = bot.search_many(['BTC', 'AAPL'])
+    assert btc['success'] and btc['source'] == 'Real-time Demo'
+    assert aapl['source'] == 'Yahoo Finance'
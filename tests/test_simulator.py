@@ -0,0 +1,71 @@
+"""Market simulator: seeded determinism, exact GBM steps, bars, feed"""
+
+import numpy as np
+import pytest
+
+from bar_store import BarStore
+from simulator import MarketSimulator
+
+
+def test_same_seed_same_prices():
+    a = MarketSimulator(seed=11).paths(200, dt=60)
+    b = MarketSimulator(seed=11).paths(200, dt=60)
+    assert np.array_equal(a, b)
+    assert not np.array_equal(a, MarketSimulator(seed=12).paths(200, dt=60))
+
+
+def test_step_and_paths_share_the_rng():
+    sim, batched = MarketSimulator(seed=3), MarketSimulator(seed=3)
+    sim.step(30)
+    batched.paths(1, dt=30)
+    assert np.array_equal(sim.price, batched.price)
+    assert sim.clock == batched.clock
+
+
+def test_unknown_symbol_joins_deterministically():
+    a, b = MarketSimulator(), MarketSimulator()
+    assert a.quote('NVDA')['price'] == b.quote('nvda')['price']
+    assert a.quote('bitcoin')['symbol'] == 'BTC'
+    assert len(MarketSimulator.synthetic(1000)) == 1000
+
+
+def test_bars_are_consistent():
+    sim = MarketSimulator(seed=5)
+    bars = sim.bars(50, interval=60)
+    assert bars['close'].shape == (50, len(sim))
+    assert np.all(bars['high'] >= np.maximum(bars['open'], bars['close']))
+    assert np.all(bars['low'] <= np.minimum(bars['open'], bars['close']))
+    assert np.array_equal(bars['open'][1:], bars['close'][:-1])
+    assert np.array_equal(bars['close'][-1], sim.price)
+
+
+def test_write_bars_to_store(tmp_path):
+    store = BarStore(str(tmp_path))
+    assert MarketSimulator().write_bars(store, 100, chunk=40, symbols=['BTC', 'AAPL']) == 200
+    assert len(store.read('BTC')['close']) == 100
+
+
+def test_day_rollover_sets_prev_close():
+    sim = MarketSimulator(start=86400.0 * 10 - 120)
+    prices = sim.paths(4, dt=60)
+    # Aadhi raat se pehle ka aakhri tick = naye din ka prev_close
+    assert np.array_equal(sim.prev_close, prices[1])
+    assert sim.quote('BTC')['change_pct'] == pytest.approx((prices[-1][0] / prices[1][0] - 1) * 100)
+
+
+def test_feed_ticks_each_call():
+    sim = MarketSimulator(seed=9)
+    fetch = sim.feed(dt=1.0)
+    first = fetch(['BTC', 'AAPL'])
+    second = fetch(['BTC', 'AAPL'])
+    assert [q['success'] for q in first] == [True, True]
+    assert first[0]['price'] != second[0]['price']
+    assert sim.steps == 2
+
+
+def test_offline_bot_falls_back_to_simulator(offline_bot):
+    btc = offline_bot.search_asset('BTC')
+    assert btc['source'] == 'Real-time Demo'
+    assert abs(btc['price_usd'] / offline_bot.simulated_quote('BTC', 'crypto')['price'] - 1) < 0.01
+    tsla = offline_bot.search_asset('TSLA')
+    assert tsla['source'] == 'Demo Data' and tsla['symbol'] == 'TSLA'
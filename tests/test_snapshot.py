@@ -0,0 +1,79 @@
+"""Snapshot: quotes aur resolver trie ka save -> load round-trip"""
+
+import contextlib
+import io
+import time
+
+from app import SimpleTradingBot
+from quote_cache import QuoteCache
+from snapshot import Snapshot
+from symbol_resolver import SymbolResolver
+from transport import Transport
+
+
+def quote(price, source='CoinGecko'):
+    return {'success': True, 'price_usd': price, 'source': source}
+
+
+def test_quotes_round_trip(tmp_path):
+    path = str(tmp_path / 'snapshot.db')
+    cache = QuoteCache()
+    cache.put('coingecko', 'bitcoin', 'crypto', quote(50000))
+    cache.put('yahoo', 'AAPL', 'stock', quote(180, source='Yahoo Finance'))
+    snapshot = Snapshot(path)
+    assert snapshot.save_quotes(cache) == 2
+    snapshot.close()
+    
+    warm = QuoteCache()
+    snapshot = Snapshot(path)
+    assert snapshot.load_quotes(warm) == 2
+    value = warm.get('yahoo', 'AAPL')
+    assert value['price_usd'] == 180 and value['as_of'] <= time.time()
+    # Warm quotes dobara snapshot mein nahi likhe jaate (purana as_of aage na badhe)
+    assert snapshot.save_quotes(warm) == 0
+    snapshot.close()
+
+
+def test_old_quotes_are_not_loaded(tmp_path):
+    cache = QuoteCache()
+    cache.put('coingecko', 'bitcoin', 'crypto', quote(1), stored_at=time.time() - 7200)
+    snapshot = Snapshot(str(tmp_path / 'snapshot.db'))
+    snapshot.save_quotes(cache)
+    assert snapshot.load_quotes(QuoteCache(), max_age=3600) == 0
+    snapshot.close()
+
+
+def test_resolver_blob_needs_matching_signature(tmp_path):
+    resolver = SymbolResolver()
+    resolver.load_builtins()
+    snapshot = Snapshot(str(tmp_path / 'snapshot.db'))
+    snapshot.save_blob('resolver', 'v1', resolver.dumps())
+    assert snapshot.load_blob('resolver', 'v2') is None
+    loaded = SymbolResolver.loads(snapshot.load_blob('resolver', 'v1'))
+    assert loaded.size == resolver.size
+    assert loaded.resolve('bitcoin price') == resolver.resolve('bitcoin price')
+    snapshot.close()
+
+
+def test_bot_starts_warm_from_last_run(tmp_path, replay):
+    path = str(tmp_path / 'snapshot.db')
+    
+    def bot():
+        with contextlib.redirect_stdout(io.StringIO()):
+            b = SimpleTradingBot("Test", transport=Transport(), snapshot=Snapshot(path))
+        b.COINGECKO_BASE = b.YAHOO_BASE = replay.url
+        return b
+    
+    first = bot()
+    assert first.search_asset('AAPL')['success']
+    with contextlib.redirect_stdout(io.StringIO()):
+        first.close()
+    
+    second = bot()
+    try:
+        assert second.warm_quotes == 1
+        data = second.search_asset('AAPL')
+        assert data['as_of'] and 'Snapshot data' in second.format_response(data)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            second.close()
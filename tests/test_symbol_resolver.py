@@ -0,0 +1,52 @@
+"""Resolver: query -> (asset class, symbol)"""
+
+from symbol_resolver import SymbolResolver, crypto_ticker
+
+
+def resolver():
+    resolver = SymbolResolver()
+    resolver.load_builtins()
+    return resolver
+
+
+def test_resolves_phrases_to_one_class():
+    r = resolver()
+    assert r.resolve('bitcoin price kya hai') == ('crypto', 'bitcoin')
+    assert r.resolve('Tesla share') == ('stock', 'TSLA')
+    assert r.resolve('crude oil') == ('commodity', 'oil')
+    assert r.resolve('USD/INR') == ('forex', 'USDINR')
+
+
+def test_whole_words_only():
+    r = resolver()
+    assert r.resolve('console') is None
+    assert r.resolve('price') is None
+
+
+def test_class_filter():
+    r = resolver()
+    assert r.resolve('btc', 'crypto') == ('crypto', 'bitcoin')
+    assert r.resolve('btc', 'stock') is None
+
+
+def test_bare_ticker_is_a_stock():
+    r = resolver()
+    assert r.resolve('AMD') == ('stock', 'AMD')
+    assert r.resolve('amd') is None
+
+
+def test_listing_file(tmp_path):
+    path = tmp_path / 'listings.csv'
+    path.write_text("symbol,name,asset_class,id\n"
+                    "PLTR,Palantir Technologies Inc.,stock,\n"
+                    "PEPE,Pepe,crypto,pepe\n", encoding='utf-8')
+    r = resolver()
+    assert r.load_listing(str(path)) == 2
+    assert r.resolve('palantir technologies') == ('stock', 'PLTR')
+    assert r.resolve('pepe coin') == ('crypto', 'pepe')
+
+
+def test_crypto_ticker():
+    assert crypto_ticker('bitcoin') == 'BTC'
+    assert crypto_ticker('ethereum') == 'ETH'
+    assert crypto_ticker('not-a-coin') is None
@@ -0,0 +1,139 @@
+"""Transport: retries, backoff, circuit breaker"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from scheduler import TokenBucket
+from transport import CircuitBreaker, ProviderUnavailable, RateLimited, Transport
+
+
+class StatusServer:
+    """Local server jo har request pe `statuses` ka agla code deta hai (khatam ho toh 200)"""
+    
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.hits = 0
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.hits += 1
+                    status = server.statuses.pop(0) if server.statuses else 200
+                body = b'{}'
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/api"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def status_server():
+    servers = []
+    
+    def factory(*statuses):
+        server = StatusServer(*statuses)
+        servers.append(server)
+        return server
+    
+    yield factory
+    for server in servers:
+        server.stop()
+
+
+def test_retries_transient_errors(status_server):
+    server = status_server(503, 502)
+    transport = Transport(retries=2, backoff=0.001)
+    assert transport.get('coingecko', server.url).status_code == 200
+    assert server.hits == 3
+    assert transport.stats()['coingecko']['state'] == 'closed'
+    transport.close()
+
+
+def test_breaker_opens_after_repeated_failures(status_server):
+    server = status_server(*[503] * 10)
+    transport = Transport(retries=0, failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        assert transport.get('coingecko', server.url).status_code == 503
+    with pytest.raises(ProviderUnavailable):
+        transport.get('coingecko', server.url)
+    assert server.hits == 2
+    transport.close()
+
+
+def test_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    # Probe ka jawab aane tak doosri request nahi
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.snapshot() == {'state': 'closed', 'failures': 0}
+
+
+def test_429_drains_bucket_without_retrying(status_server):
+    server = status_server(429)
+    bucket = TokenBucket(rate=1, capacity=5)
+    transport = Transport(retries=2, backoff=0.001, rate_limits={'coingecko': bucket})
+    assert transport.get('coingecko', server.url).status_code == 429
+    assert server.hits == 1
+    # Bucket khaali - agli call timeout ke andar token nahi paati
+    with pytest.raises(RateLimited):
+        transport.get('coingecko', server.url, timeout=0.1)
+    assert server.hits == 1
+    transport.close()
+
+
+def test_connection_errors_raise_after_retries():
+    transport = Transport(retries=1, backoff=0.001)
+    with pytest.raises(requests.RequestException):
+        transport.get('yahoo', 'http://127.0.0.1:1/v8/finance/chart/AAPL', timeout=1)
+    assert transport.stats()['yahoo']['failures'] == 1
+
+
+def test_half_open_probe_is_released_after_429(status_server):
+    server = status_server(429, 200)
+    bucket = TokenBucket(rate=100, capacity=1)
+    transport = Transport(retries=0, failure_threshold=1, reset_timeout=0,
+                          rate_limits={'coingecko': bucket}, acquire_timeout=0.05)
+    transport.breaker('coingecko').record_failure()
+    # Half-open probe ko 429 mila - probe ka hisaab hua, circuit phir open
+    assert transport.get('coingecko', server.url).status_code == 429
+    assert transport.stats()['coingecko']['state'] == 'open'
+    # Bucket bharte hi agla probe jaata hai aur circuit band
+    bucket.tokens = 1.0
+    assert transport.get('coingecko', server.url).status_code == 200
+    assert transport.stats()['coingecko']['state'] == 'closed'
+    transport.close()
+
+
+def test_rate_limited_call_does_not_take_the_probe(status_server):
+    server = status_server()
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.tokens = 0.0
+    transport = Transport(retries=0, failure_threshold=1, reset_timeout=0,
+                          rate_limits={'coingecko': bucket}, acquire_timeout=0.05)
+    breaker = transport.breaker('coingecko')
+    breaker.record_failure()
+    with pytest.raises(RateLimited):
+        transport.get('coingecko', server.url)
+    assert server.hits == 0
+    # Probe abhi bhi khaali hai
+    assert breaker.allow()
+    transport.close()
@@ -0,0 +1,48 @@
+"""Yahoo batch: v7 401 de toh stocks v8 chart se aayein (fail nahi)"""
+
+
+def test_search_many_uses_v7_batch_when_allowed(replay, make_bot):
+    bot = make_bot(replay)
+    results = bot.search_many(['AAPL', 'TSLA'])
+    assert [r['symbol'] for r in results] == ['AAPL', 'TSLA']
+    assert all(r['success'] and r['source'] == 'Yahoo Finance' for r in results)
+    assert replay.hits('/v7/finance/quote') == 1
+    assert replay.hits('/v8/finance/chart/') == 0
+
+
+def test_search_many_falls_back_to_chart_on_401(replay_401, make_bot):
+    bot = make_bot(replay_401)
+    results = bot.search_many(['AAPL', 'TSLA', 'MSFT'])
+    assert all(r['success'] and r['source'] == 'Yahoo Finance' for r in results)
+    assert [r['symbol'] for r in results] == ['AAPL', 'TSLA', 'MSFT']
+    assert replay_401.hits('/v8/finance/chart/') == 3
+    # Fallback wale quotes bhi cache mein
+    assert bot.cache.get('yahoo', 'TSLA') is not None
+
+
+def test_denied_batch_is_not_retried(replay_401, make_bot):
+    bot = make_bot(replay_401, cached=False)
+    bot.search_many(['AAPL'])
+    bot.search_many(['AAPL'])
+    assert replay_401.hits('/v7/finance/quote') == 1
+    assert replay_401.hits('/v8/finance/chart/') == 2
+
+
+def test_missing_symbol_falls_back_per_symbol(replay, make_bot):
+    bot = make_bot(replay)
+    # v7 ne TSLA chhod diya - sirf wahi chart se
+    original = bot.fetch_yahoo_quotes
+    bot.fetch_yahoo_quotes = lambda symbols: {k: v for k, v in original(symbols).items() if k != 'TSLA'}
+    results = bot.search_many(['AAPL', 'TSLA'])
+    assert all(r['success'] for r in results)
+    assert replay.hits('/v8/finance/chart/TSLA') == 1
+    assert replay.hits('/v8/finance/chart/AAPL') == 0
+
+
+def test_scheduled_refresh_and_quote_batch_fall_back(replay_401, make_bot):
+    bot = make_bot(replay_401)
+    assert bot._refresh_batch('yahoo', ['AAPL', 'MSFT'])
+    assert bot.cache.get('yahoo', 'MSFT')['source'] == 'Yahoo Finance'
+    
+    batch = bot.quote_batch(['NVDA', 'AMZN'])
+    assert len(batch) == 2
@@ -0,0 +1,209 @@
+"""
+TRANSPORT LAYER
+- Har host ke liye ek keep-alive session (connection pool)
+- Bounded retries, jittered exponential backoff ke saath
+- Har provider ka circuit breaker: provider down ho toh turant fallback
+- Optional token bucket per provider: rate limit ke andar hi calls
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scheduler import TokenBucket
+
+# In status codes pe dobara try karna theek hai
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ProviderUnavailable(Exception):
+    """Provider ka circuit open hai - network call nahi hogi"""
+
+
+class RateLimited(ProviderUnavailable):
+    """Provider ka request budget khatam - timeout ke andar token nahi mila"""
+
+
+class CircuitBreaker:
+    """Closed -> Open (failures ke baad) -> Half-open (ek probe) -> Closed"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Request jaane de ya nahi"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                # Timeout ho gaya - ek health probe jaane do
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+    
+    def record_success(self):
+        """Request kaamyaab - circuit band"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Request fail - threshold ke baad circuit open"""
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+    
+    def snapshot(self) -> Dict:
+        """Breaker ki current state"""
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures}
+
+
+class Transport:
+    """Saare providers ke liye shared HTTP layer"""
+    
+    def __init__(self, retries: int = 2, backoff: float = 0.2, max_backoff: float = 2.0,
+                 pool_size: int = 10, failure_threshold: int = 3, reset_timeout: float = 30,
+                 rate_limits: Optional[Dict[str, TokenBucket]] = None, acquire_timeout: float = 1.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # provider -> TokenBucket (jis provider ka bucket nahi wo unlimited)
+        self.rate_limits = rate_limits or {}
+        # Token ke liye itna hi rukte hain - user ki call rate limit pe atki na rahe
+        self.acquire_timeout = acquire_timeout
+        
+        self._sessions: Dict[str, requests.Session] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def session_for(self, url: str) -> requests.Session:
+        """Host ka keep-alive session (pehli baar banta hai)"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(host, adapter)
+                self._sessions[host] = session
+            return session
+    
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """Provider ka circuit breaker"""
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[provider] = breaker
+            return breaker
+    
+    def _sleep_before_retry(self, attempt: int, response: Optional[requests.Response] = None):
+        """Full-jitter exponential backoff (Retry-After ho toh wo bhi dekhe)"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.max_backoff))
+        time.sleep(delay)
+    
+    def get(self, provider: str, url: str, params: Optional[Dict] = None,
+            timeout: float = 5, acquire_timeout: Optional[float] = None) -> requests.Response:
+        """GET request - retries, backoff aur circuit breaker ke saath"""
+        breaker = self.breaker(provider)
+        bucket = self.rate_limits.get(provider)
+        wait = self.acquire_timeout if acquire_timeout is None else acquire_timeout
+        
+        # Token breaker se pehle - rate limit pe lauti call half-open probe ko nahi phansati
+        if bucket is not None and not bucket.acquire(wait):
+            raise RateLimited(f"{provider} rate limit - {wait}s mein token nahi mila")
+        if not breaker.allow():
+            if bucket is not None:
+                bucket.give_back()
+            raise ProviderUnavailable(f"{provider} circuit open hai")
+        
+        session = self.session_for(url)
+        last_error: Optional[Exception] = None
+        
+        for attempt in range(self.retries + 1):
+            # Har retry bhi upstream hit hai - budget se (pehle attempt ka token upar liya)
+            if attempt and bucket is not None and not bucket.acquire(wait):
+                # Pichhla attempt fail hua tha - probe/failure ka hisaab yahin
+                breaker.record_failure()
+                raise RateLimited(f"{provider} rate limit - {wait}s mein token nahi mila")
+            try:
+                response = session.get(url, params=params, timeout=timeout)
+            except requests.Timeout as e:
+                # Timeout ko retry nahi karte - warna user retries x timeout wait karega
+                last_error = e
+                break
+            except requests.RequestException as e:
+                last_error = e
+                if attempt < self.retries:
+                    self._sleep_before_retry(attempt)
+                continue
+            
+            if response.status_code == 429 and bucket is not None:
+                # Throttle ho gaye - turant retry burst ko aur bigaadta hai
+                retry_after = response.headers.get('Retry-After', '')
+                bucket.penalize(float(retry_after) if retry_after.isdigit() else None)
+                breaker.record_failure()
+                return response
+            
+            if response.status_code in RETRY_STATUSES:
+                if attempt < self.retries:
+                    self._sleep_before_retry(attempt, response)
+                    continue
+                breaker.record_failure()
+                return response
+            
+            breaker.record_success()
+            return response
+        
+        breaker.record_failure()
+        raise last_error
+    
+    def stats(self) -> Dict:
+        """Har provider ke breaker ki state"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: breaker.snapshot() for provider, breaker in breakers.items()}
+    
+    def rate_limit_stats(self) -> Dict:
+        """Har provider ke bucket ke tokens"""
+        return {provider: bucket.snapshot() for provider, bucket in self.rate_limits.items()}
+    
+    def close(self):
+        """Saare sessions band kare"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()